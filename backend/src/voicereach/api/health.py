@@ -1,6 +1,6 @@
-"""Health check endpoint."""
+"""Health check endpoints."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 
 router = APIRouter(tags=["health"])
 
@@ -9,3 +9,12 @@ router = APIRouter(tags=["health"])
 async def health_check() -> dict:
     """Basic health check."""
     return {"status": "ok", "version": "0.1.0"}
+
+
+@router.get("/health/tts")
+async def tts_health(request: Request) -> dict:
+    """TTS engine state and synthesis latency."""
+    pipeline = getattr(request.app.state, "pipeline", None)
+    if pipeline is None:
+        return {"status": "unavailable"}
+    return {"status": "ok", **pipeline.tts_health()}
@@ -6,7 +6,7 @@ import json
 import logging
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 
 from voicereach.models.events import (
     CandidateSelected,
@@ -43,6 +43,17 @@ class ConnectionManager:
         for connection in self.caregiver_connections:
             await connection.send_json(message)
 
+    async def send_to_patients(self, message: BaseModel) -> None:
+        """Send a server message (CandidateUpdate, TTSStreamStart, ...) to the patient UI."""
+        data = message.model_dump(mode="json")
+        for connection in self.patient_connections:
+            await connection.send_json(data)
+
+    async def send_audio_to_patients(self, frame: bytes) -> None:
+        """Send a binary TTS audio frame to the patient UI."""
+        for connection in self.patient_connections:
+            await connection.send_bytes(frame)
+
 
 manager = ConnectionManager()
 
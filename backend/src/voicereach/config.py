@@ -25,6 +25,8 @@ class Settings(BaseSettings):
     local_llm_base_url: str = "http://127.0.0.1:8000/v1"
     local_llm_model_fast: str = "Qwen/Qwen3-0.6B"
     local_llm_model_quality: str = "Qwen/Qwen3-1.7B"
+    local_llm_max_concurrency: int = 1  # running requests per model
+    local_llm_max_total: int = 2  # running requests on the server
 
     # Cloud LLM
     gemini_api_key: str = ""
@@ -36,18 +38,67 @@ class Settings(BaseSettings):
 
     # Cloud LLM timeout
     cloud_llm_timeout_s: float = 2.0
+    cloud_max_connections: int = 8  # per provider
+    cloud_keepalive_expiry_s: float = 120.0  # idle time before a pooled connection is dropped
+    cloud_keepalive_interval_s: float = 30.0  # 0 disables keepalive pings
+
+    # Cloud request hedging: start the next provider when the current one
+    # is slower than its own cloud_hedge_percentile latency
+    cloud_hedging: bool = True
+    cloud_hedge_percentile: float = 90.0
+    cloud_hedge_min_samples: int = 20  # below this, cloud_hedge_default_delay_ms applies
+    cloud_hedge_default_delay_ms: int = 800
+    cloud_hedge_min_delay_ms: int = 150
+
+    # Provider-side prompt caching of the static + session prompt layers
+    anthropic_prompt_cache: bool = True
+    gemini_context_cache: bool = True
+    gemini_cache_ttl_s: int = 600
+    gemini_cache_refresh_margin_s: int = 60  # extend the TTL once less than this remains
 
     # TTS
     tts_engine: str = "cosyvoice"
     tts_model_path: Path = Path("models/cosyvoice")
     tts_model_dir: str = "models/CosyVoice2-0.5B"
     tts_default_speaker: str = "default"
+    tts_streaming: bool = True  # push PCM chunks over the WebSocket while synthesizing
+    tts_stream_chunk_ms: int = 100  # chunk size when replaying cached audio
+    tts_cache_max_mb: int = 512
+    tts_cache_max_entries: int = 5000
+    tts_cache_hot_entries: int = 32  # most frequently hit utterances kept in memory
+    tts_cache_eviction: str = "lru"  # "lru" or "lfu"
+    # "inline" runs TTS in the server process; "process" moves model loading
+    # and synthesis into a dedicated worker process
+    tts_execution: str = "inline"
+    tts_warmup_texts: list[str] = ["はい", "ありがとうございます"]  # synthesized at worker boot
+    tts_worker_timeout_s: float = 30.0
+    # Reuse cached audio of frequent phrases ("すみません、") inside new utterances
+    tts_segment_stitching: bool = True
+    tts_segment_min_count: int = 2  # occurrences before a phrase is cached on its own
+    tts_segment_max_entries: int = 500
+    tts_segment_crossfade_ms: int = 20
+    tts_presynthesis: bool = True  # synthesize displayed candidates before selection
+    tts_presynth_max_per_set: int = 4
+    tts_presynth_budget_s: float = 10.0
 
     # Eye tracking
     camera_id: int = 0
     gaze_model_path: str = "models/l2cs_net.onnx"
     num_zones: int = 4
     calibration_points: int = 5
+    # "inline" runs gaze estimation on the event loop; "process" moves
+    # face tracking + gaze estimation into a dedicated worker process
+    gaze_execution: str = "inline"
+    # "dual_axis" (independent random-walk filters) or "constant_velocity"
+    gaze_smoother: str = "dual_axis"
+    # Lower the tracking rate during stable fixations (see AdaptiveFrameScheduler)
+    adaptive_tracking: bool = False
+    adaptive_reduced_fps: float = 10.0
+    adaptive_stable_after_s: float = 1.0
+    # Run FaceMesh on a crop around the previous face instead of the full
+    # frame; roi_max_size > 0 also downsamples the crop (longer side, px)
+    face_roi_tracking: bool = False
+    face_roi_max_size: int = 0
 
     # Data paths
     data_dir: Path = Path("data")
@@ -61,9 +112,27 @@ class Settings(BaseSettings):
 
     # Candidate generation
     num_candidates: int = 4
+    # Stream LLM tokens and publish each candidate as soon as it is parsed
+    llm_streaming: bool = True
     stage1_temperature: float = 0.4
     stage2_temperature: float = 0.5
     stage3_temperature: float = 0.8
 
+    # Stage 0: candidates cached from earlier, similar conversations
+    patient_id: str = "default"
+    candidate_cache: bool = True
+    candidate_cache_capacity: int = 2000
+    candidate_cache_ttl_days: float = 30.0
+    candidate_cache_similarity: float = 0.9
+    template_candidates: bool = True  # BM25-ranked templates and past utterances
+    template_max_utterances: int = 500
+    # Changes to the cache and selection counts are saved this long after the first one
+    stage0_save_delay_s: float = 30.0
+
+    # Speculative Stage 1/2 prefetch on partial partner transcripts
+    speculative_prefetch: bool = True
+    prefetch_min_chars: int = 4
+    prefetch_match_threshold: float = 0.75  # transcript similarity needed to reuse a run
+
 
 settings = Settings()
@@ -0,0 +1,242 @@
+"""Adaptive frame scheduling for the gaze pipeline.
+
+During a stable fixation the patient's zone does not change for seconds,
+yet every frame would still pay for FaceMesh + GazeEstimator + smoother +
+zone mapping.  AdaptiveFrameScheduler lowers the processing rate once gaze
+has been stable for a while and returns to full rate as soon as something
+moves:
+
+  full rate --(same zone, no saccade, still landmarks for stable_after_s)--> reduced rate
+  reduced rate --(saccade | landmark motion | eye-region pixel motion)--> full rate
+
+While at the reduced rate, skipped frames are still checked cheaply: a tiny
+grayscale thumbnail of the eye region is compared with the one from the
+last processed frame, so a saccade that starts between processed frames
+restores full rate on the very next frame instead of waiting for the
+reduced-rate tick.
+
+Intended for 12+ hour sessions on fanless hardware, where the saved CPU
+time directly reduces thermal throttling.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+from voicereach.engine.gaze.mediapipe_tracker import LEFT_EYE_INDICES, RIGHT_EYE_INDICES
+
+logger = logging.getLogger(__name__)
+
+_EYE_INDICES = LEFT_EYE_INDICES + RIGHT_EYE_INDICES
+_THUMB_SIZE = (32, 16)  # (w, h) of the eye-region motion thumbnail
+
+
+@dataclass
+class SchedulerStats:
+    """Frame scheduling metrics."""
+    frames_seen: int = 0
+    frames_processed: int = 0
+    frames_skipped: int = 0
+    rate_reductions: int = 0  # full -> reduced transitions
+    rate_restores: int = 0  # reduced -> full transitions
+    avg_processing_ms: float = 0.0  # EMA of full-pipeline time per processed frame
+    cpu_saved_ms: float = 0.0  # skipped frames x avg processing time
+    added_latency_ms_total: float = 0.0  # sum over skipped frames of result staleness
+    added_latency_ms_max: float = 0.0
+
+    @property
+    def skip_ratio(self) -> float:
+        return self.frames_skipped / self.frames_seen if self.frames_seen else 0.0
+
+    @property
+    def added_latency_ms_avg(self) -> float:
+        """Average staleness of the published zone across all frames seen."""
+        return self.added_latency_ms_total / self.frames_seen if self.frames_seen else 0.0
+
+
+class AdaptiveFrameScheduler:
+    """Decides per camera frame whether to run the full gaze pipeline.
+
+    Usage per frame::
+
+        if scheduler.should_process(frame.timestamp, frame.image):
+            ...run tracker + gaze...
+            scheduler.record(frame.timestamp, frame.image, zone_id,
+                             saccade=smoother.last_saccade,
+                             landmarks=face_data.landmarks,
+                             processing_ms=elapsed)
+    """
+
+    def __init__(
+        self,
+        reduced_fps: float = 10.0,
+        stable_after_s: float = 1.0,
+        landmark_motion_px: float = 3.0,
+        pixel_motion_threshold: float = 8.0,
+    ) -> None:
+        """
+        Args:
+            reduced_fps: Processing rate during stable fixations.
+            stable_after_s: How long gaze must stay in one zone, without
+                saccades or landmark motion, before the rate drops.
+            landmark_motion_px: Mean eye-landmark displacement between
+                processed frames that counts as motion.
+            pixel_motion_threshold: Mean absolute grey-level difference of
+                the eye-region thumbnail that counts as motion on skipped frames.
+        """
+        self._min_interval_s = 1.0 / reduced_fps
+        self._stable_after_s = stable_after_s
+        self._landmark_motion_px = landmark_motion_px
+        self._pixel_threshold = pixel_motion_threshold
+
+        self._reduced = False
+        self._stable_since: float | None = None
+        self._last_zone: int | None = None
+        self._last_processed_ts: float | None = None
+        self._prev_eye_pts: np.ndarray | None = None
+        self._roi: tuple[int, int, int, int] | None = None  # x1, y1, x2, y2
+        self._ref_thumb: np.ndarray | None = None
+        self._thumb = np.empty((_THUMB_SIZE[1], _THUMB_SIZE[0]), dtype=np.uint8)
+        self._thumb_bgr = np.empty((_THUMB_SIZE[1], _THUMB_SIZE[0], 3), dtype=np.uint8)
+        self.stats = SchedulerStats()
+
+    @property
+    def reduced(self) -> bool:
+        """True while running at the reduced rate."""
+        return self._reduced
+
+    def reset(self) -> None:
+        """Return to full rate and forget the stability history (e.g. face lost)."""
+        if self._reduced:
+            self.stats.rate_restores += 1
+        self._reduced = False
+        self._stable_since = None
+        self._last_zone = None
+        self._prev_eye_pts = None
+        self._ref_thumb = None
+
+    # ------------------------------------------------------------------
+    # Per-frame decisions
+    # ------------------------------------------------------------------
+
+    def should_process(self, timestamp: float, frame: np.ndarray | None = None) -> bool:
+        """Whether this frame should run the full pipeline."""
+        self.stats.frames_seen += 1
+        if not self._reduced or self._last_processed_ts is None:
+            return True
+
+        if timestamp - self._last_processed_ts >= self._min_interval_s:
+            return True
+
+        if frame is not None and self._pixel_motion(frame):
+            self._restore()
+            return True
+
+        self._skip(timestamp)
+        return False
+
+    def record(
+        self,
+        timestamp: float,
+        frame: np.ndarray | None,
+        zone_id: int | None,
+        saccade: bool = False,
+        landmarks: np.ndarray | None = None,
+        processing_ms: float | None = None,
+    ) -> None:
+        """Feed back the outcome of a processed frame."""
+        stats = self.stats
+        stats.frames_processed += 1
+        self._last_processed_ts = timestamp
+        if processing_ms is not None:
+            if stats.avg_processing_ms == 0.0:
+                stats.avg_processing_ms = processing_ms
+            else:
+                stats.avg_processing_ms += 0.1 * (processing_ms - stats.avg_processing_ms)
+
+        if zone_id is None:
+            # No face: stay at full rate so reacquisition is fast
+            self.reset()
+            return
+
+        moving = saccade or zone_id != self._last_zone
+        if landmarks is not None:
+            eye_pts = landmarks[_EYE_INDICES, :2]
+            if self._prev_eye_pts is not None:
+                shift = float(np.linalg.norm(eye_pts - self._prev_eye_pts, axis=1).mean())
+                moving = moving or shift > self._landmark_motion_px
+            self._prev_eye_pts = eye_pts
+            self._roi = self._eye_roi(eye_pts, frame)
+        self._last_zone = zone_id
+
+        if moving:
+            if self._reduced:
+                self._restore()
+            self._stable_since = timestamp
+        elif self._stable_since is None:
+            self._stable_since = timestamp
+        elif not self._reduced and timestamp - self._stable_since >= self._stable_after_s:
+            self._reduced = True
+            stats.rate_reductions += 1
+            logger.debug("Gaze stable; reducing tracking rate")
+
+        if frame is not None and self._reduced:
+            self._ref_thumb = self._thumbnail(frame).copy()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _skip(self, timestamp: float) -> None:
+        stats = self.stats
+        stats.frames_skipped += 1
+        stats.cpu_saved_ms += stats.avg_processing_ms
+        staleness_ms = (timestamp - self._last_processed_ts) * 1000.0
+        stats.added_latency_ms_total += staleness_ms
+        stats.added_latency_ms_max = max(stats.added_latency_ms_max, staleness_ms)
+
+    def _restore(self) -> None:
+        self._reduced = False
+        self._stable_since = None
+        self._ref_thumb = None
+        self.stats.rate_restores += 1
+        logger.debug("Gaze motion; restoring full tracking rate")
+
+    def _eye_roi(
+        self, eye_pts: np.ndarray, frame: np.ndarray | None
+    ) -> tuple[int, int, int, int] | None:
+        if frame is None:
+            return None
+        h, w = frame.shape[:2]
+        (x1, y1), (x2, y2) = eye_pts.min(axis=0), eye_pts.max(axis=0)
+        pad_x, pad_y = (x2 - x1) * 0.15, (y2 - y1) * 0.5 + 2
+        roi = (
+            max(0, int(x1 - pad_x)),
+            max(0, int(y1 - pad_y)),
+            min(w, int(x2 + pad_x) + 1),
+            min(h, int(y2 + pad_y) + 1),
+        )
+        if roi[2] - roi[0] < 2 or roi[3] - roi[1] < 2:
+            return None
+        return roi
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        """Small grayscale thumbnail of the eye region (whole frame if unknown)."""
+        if self._roi is not None:
+            x1, y1, x2, y2 = self._roi
+            frame = frame[y1:y2, x1:x2]
+        if frame.ndim == 3:
+            cv2.resize(frame, _THUMB_SIZE, dst=self._thumb_bgr, interpolation=cv2.INTER_AREA)
+            return cv2.cvtColor(self._thumb_bgr, cv2.COLOR_BGR2GRAY, dst=self._thumb)
+        return cv2.resize(frame, _THUMB_SIZE, dst=self._thumb, interpolation=cv2.INTER_AREA)
+
+    def _pixel_motion(self, frame: np.ndarray) -> bool:
+        if self._ref_thumb is None:
+            return False
+        thumb = self._thumbnail(frame)
+        diff = cv2.absdiff(thumb, self._ref_thumb)
+        return float(diff.mean()) > self._pixel_threshold
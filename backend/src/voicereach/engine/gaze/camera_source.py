@@ -0,0 +1,261 @@
+"""Threaded camera capture with a latest-frame-wins ring buffer.
+
+Frames are read from ``cv2.VideoCapture`` on a dedicated thread so a slow
+tracker iteration never delays the next camera read.  The consumer always
+receives the newest frame; anything it did not get to in time is counted
+as dropped rather than queued, which bounds gaze latency to one frame.
+
+  capture thread --> [ring buffer, newest wins] --> frames() async iterator
+                                                        |
+                                        MediaPipeTracker -> Pipeline
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from voicereach.config import settings
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CapturedFrame:
+    """A camera frame and its capture metadata.
+
+    ``image`` lives in the source's ring buffer and stays valid until the
+    consumer takes the next frame.
+    """
+    image: np.ndarray
+    timestamp: float  # time.monotonic() when the read completed
+    seq: int  # capture sequence number, starting at 1
+
+    @property
+    def age_s(self) -> float:
+        return time.monotonic() - self.timestamp
+
+
+@dataclass
+class CameraStats:
+    """Capture counters."""
+    frames_captured: int = 0
+    frames_delivered: int = 0
+    frames_dropped: int = 0  # overwritten by a newer frame before being consumed
+    frames_stale: int = 0  # skipped at delivery because older than max_age_s
+    read_failures: int = 0
+
+
+class CameraSource:
+    """Reads camera frames on a background thread into a small ring buffer.
+
+    The writer never touches the newest published slot or the slot the
+    consumer currently holds, so ``buffer_size`` must be at least 3.
+    """
+
+    def __init__(
+        self,
+        camera_id: int | None = None,
+        buffer_size: int = 3,
+        max_age_s: float | None = 0.1,
+        capture_factory: Callable[[int], object] | None = None,
+    ) -> None:
+        if buffer_size < 3:
+            raise ValueError("buffer_size must be at least 3")
+        self._camera_id = settings.camera_id if camera_id is None else camera_id
+        self._max_age_s = max_age_s
+        self._capture_factory = capture_factory
+        self._capture = None  # cv2.VideoCapture-like: read(), release(), isOpened()
+
+        self._slots: list[np.ndarray | None] = [None] * buffer_size
+        self._slot_ts = [0.0] * buffer_size
+        self._slot_seq = [0] * buffer_size
+        self._latest = -1  # slot index of newest unconsumed frame, -1 if none
+        self._held = -1  # slot index currently checked out by the consumer
+        self._write_idx = 0
+        self._seq = 0
+
+        self._lock = threading.Condition()
+        self._listeners: list[Callable[[], None]] = []
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._stats = CameraStats()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def stats(self) -> CameraStats:
+        with self._lock:
+            return CameraStats(**vars(self._stats))
+
+    def start(self) -> None:
+        """Open the camera and start the capture thread."""
+        if self.running:
+            return
+        if self._capture_factory is not None:
+            self._capture = self._capture_factory(self._camera_id)
+        else:
+            import cv2
+
+            self._capture = cv2.VideoCapture(self._camera_id)
+        if not self._capture.isOpened():
+            self._capture.release()
+            self._capture = None
+            raise RuntimeError(f"Cannot open camera {self._camera_id}")
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._capture_loop, name="camera-capture", daemon=True
+        )
+        self._thread.start()
+        logger.info("Camera %s capture started", self._camera_id)
+
+    def stop(self) -> None:
+        """Stop the capture thread and release the camera."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+        self._notify()
+
+    # ------------------------------------------------------------------
+    # Capture thread
+    # ------------------------------------------------------------------
+
+    def _capture_loop(self) -> None:
+        try:
+            while not self._stop.is_set():
+                with self._lock:
+                    slot = self._next_write_slot()
+                buf = self._slots[slot]
+                ok, image = self._capture.read(buf) if buf is not None else self._capture.read()
+                now = time.monotonic()
+
+                if not ok or image is None:
+                    with self._lock:
+                        self._stats.read_failures += 1
+                    # End of stream (file / unplugged camera)
+                    break
+
+                with self._lock:
+                    self._slots[slot] = image
+                    self._seq += 1
+                    self._slot_ts[slot] = now
+                    self._slot_seq[slot] = self._seq
+                    if self._latest != -1:
+                        self._stats.frames_dropped += 1
+                    self._latest = slot
+                    self._stats.frames_captured += 1
+                self._notify()
+        except Exception:
+            logger.exception("Camera capture thread failed")
+        finally:
+            self._stop.set()
+            self._notify()
+
+    def _next_write_slot(self) -> int:
+        """Round-robin over slots, skipping the newest and the held one."""
+        n = len(self._slots)
+        for _ in range(n):
+            idx = self._write_idx
+            self._write_idx = (self._write_idx + 1) % n
+            if idx != self._latest and idx != self._held:
+                return idx
+        raise RuntimeError("no free capture slot")  # unreachable with n >= 3
+
+    def _notify(self) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+            self._lock.notify_all()
+        for wake in listeners:
+            wake()
+
+    # ------------------------------------------------------------------
+    # Consumer API
+    # ------------------------------------------------------------------
+
+    def _take_latest(self) -> CapturedFrame | None:
+        """Check out the newest frame, or None if nothing new is ready."""
+        with self._lock:
+            while self._latest != -1:
+                slot = self._latest
+                self._latest = -1
+                ts = self._slot_ts[slot]
+                if self._max_age_s is not None and time.monotonic() - ts > self._max_age_s:
+                    self._stats.frames_stale += 1
+                    continue
+                self._held = slot
+                self._stats.frames_delivered += 1
+                return CapturedFrame(
+                    image=self._slots[slot], timestamp=ts, seq=self._slot_seq[slot]
+                )
+            return None
+
+    def read(self, timeout: float | None = None) -> CapturedFrame | None:
+        """Block until a new frame is available (thread-side consumers).
+
+        Returns None on timeout or once capture has stopped.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            frame = self._take_latest()
+            if frame is not None:
+                return frame
+            with self._lock:
+                if self._latest != -1:
+                    continue
+                if self._stop.is_set():
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._lock.wait(remaining)
+
+    async def frames(self) -> AsyncIterator[CapturedFrame]:
+        """Yield the newest frame each time one arrives, until capture stops.
+
+        Intermediate frames the consumer was too slow for are skipped.
+        """
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(ready.set)
+
+        with self._lock:
+            self._listeners.append(wake)
+        try:
+            while True:
+                ready.clear()
+                frame = self._take_latest()
+                if frame is not None:
+                    yield frame
+                    continue
+                if self._stop.is_set():
+                    return
+                await ready.wait()
+        finally:
+            with self._lock:
+                self._listeners.remove(wake)
+                self._held = -1
+
+    def __aiter__(self) -> AsyncIterator[CapturedFrame]:
+        return self.frames()
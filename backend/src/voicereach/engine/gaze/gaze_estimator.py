@@ -33,6 +33,9 @@ from voicereach.engine.gaze.mediapipe_tracker import (
 
 logger = logging.getLogger(__name__)
 
+# L2CS-Net input resolution
+_INPUT_SIZE = 224
+
 
 @dataclass
 class GazeResult:
@@ -59,6 +62,13 @@ class GazeEstimator:
         self._model_path = model_path or settings.gaze_model_path
         self._session = None  # onnxruntime.InferenceSession | None
         self._available = False
+        # Cached at initialize() so the per-frame path does no metadata lookups
+        self._input_name: str | None = None
+        self._output_names: list[str] = []
+        self._io_binding = None  # onnxruntime.IOBinding | None
+        self._batched = False
+        # (2, 3, 224, 224) input reused every frame: [left, right]
+        self._input_buf = np.zeros((2, 3, _INPUT_SIZE, _INPUT_SIZE), dtype=np.float32)
 
     # ------------------------------------------------------------------
     # Lifecycle
@@ -91,8 +101,13 @@ class GazeEstimator:
             self._session = ort.InferenceSession(
                 str(model_file), providers=preferred
             )
+            self._bind_session()
             self._available = True
-            logger.info("Gaze estimator loaded with providers: %s", preferred)
+            logger.info(
+                "Gaze estimator loaded with providers: %s (batched=%s)",
+                preferred,
+                self._batched,
+            )
         except ImportError:
             logger.info("onnxruntime not installed, using heuristic gaze estimation")
         except Exception:
@@ -100,6 +115,30 @@ class GazeEstimator:
                 "Failed to load gaze model, using heuristic", exc_info=True
             )
 
+    def _bind_session(self) -> None:
+        """Cache input/output names and prepare the batched IO binding.
+
+        Both eyes are stacked into a single (2, 3, 224, 224) batch when the
+        model's batch dimension is dynamic (or fixed at 2).  Models exported
+        with a static batch of 1 fall back to one run per eye.
+        """
+        model_input = self._session.get_inputs()[0]
+        self._input_name = model_input.name
+        self._output_names = [o.name for o in self._session.get_outputs()]
+
+        batch_dim = model_input.shape[0] if model_input.shape else None
+        self._batched = not isinstance(batch_dim, int) or batch_dim == 2
+
+        self._io_binding = None
+        if self._batched:
+            try:
+                binding = self._session.io_binding()
+                for name in self._output_names:
+                    binding.bind_output(name)
+                self._io_binding = binding
+            except Exception:
+                logger.debug("IO binding unavailable, using session.run", exc_info=True)
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -119,69 +158,83 @@ class GazeEstimator:
 
         L2CS-Net expects (B, 3, 224, 224) RGB input.  Our eye patches
         are 64x64 grayscale, so we resize and replicate across channels.
+        Both eyes go through the model as one batch of two.
         """
         import cv2  # already a project dependency
 
-        left = face_data.left_eye_patch  # (64, 64) float32 [0, 1]
-        right = face_data.right_eye_patch
-
-        # Resize to L2CS expected resolution
-        left_resized = cv2.resize(left, (224, 224))
-        right_resized = cv2.resize(right, (224, 224))
-
-        # Grayscale -> pseudo-RGB: (1, 3, 224, 224)
-        left_rgb = np.stack([left_resized] * 3, axis=0)[np.newaxis]
-        right_rgb = np.stack([right_resized] * 3, axis=0)[np.newaxis]
+        buf = self._input_buf
+        # Resize straight into channel 0 of each batch slot, then
+        # replicate grayscale -> pseudo-RGB in place.
+        cv2.resize(
+            face_data.left_eye_patch, (_INPUT_SIZE, _INPUT_SIZE), dst=buf[0, 0]
+        )
+        cv2.resize(
+            face_data.right_eye_patch, (_INPUT_SIZE, _INPUT_SIZE), dst=buf[1, 0]
+        )
+        buf[:, 1] = buf[:, 0]
+        buf[:, 2] = buf[:, 0]
 
         try:
-            input_name = self._session.get_inputs()[0].name
-
-            left_out = self._session.run(
-                None, {input_name: left_rgb.astype(np.float32)}
-            )
-            right_out = self._session.run(
-                None, {input_name: right_rgb.astype(np.float32)}
-            )
+            outputs = self._run_batch(buf)
 
             # L2CS outputs: gaze_pitch, gaze_yaw (each as bin probabilities)
             # Average both eyes for final estimate
-            left_pitch, left_yaw = self._decode_gaze(left_out)
-            right_pitch, right_yaw = self._decode_gaze(right_out)
-
-            pitch = (left_pitch + right_pitch) / 2
-            yaw = (left_yaw + right_yaw) / 2
+            pitches, yaws = self._decode_gaze(outputs)
 
             return GazeResult(
-                pitch=pitch, yaw=yaw, confidence=0.9, method="onnx"
+                pitch=float(pitches.mean()),
+                yaw=float(yaws.mean()),
+                confidence=0.9,
+                method="onnx",
             )
         except Exception:
             logger.warning("ONNX inference failed, falling back to heuristic")
             return self._estimate_heuristic(face_data)
 
+    def _run_batch(self, batch: np.ndarray) -> list[np.ndarray]:
+        """Run the model on a (2, 3, 224, 224) batch of [left, right] eyes."""
+        if self._io_binding is not None:
+            # Re-binding the input is cheap; outputs stay bound from initialize()
+            self._io_binding.bind_cpu_input(self._input_name, batch)
+            self._session.run_with_iobinding(self._io_binding)
+            return self._io_binding.copy_outputs_to_cpu()
+
+        if self._batched:
+            return self._session.run(self._output_names, {self._input_name: batch})
+
+        # Static batch-of-1 model: one run per eye, stacked back together
+        per_eye = [
+            self._session.run(self._output_names, {self._input_name: batch[i : i + 1]})
+            for i in range(batch.shape[0])
+        ]
+        return [
+            np.concatenate([out[k] for out in per_eye], axis=0)
+            for k in range(len(per_eye[0]))
+        ]
+
     @staticmethod
-    def _decode_gaze(outputs) -> tuple[float, float]:
+    def _decode_gaze(outputs) -> tuple[np.ndarray, np.ndarray]:
         """Decode L2CS bin probabilities to continuous angles.
 
         L2CS uses 90 bins covering -180 to 180 degrees.  A softmax over
         the logits followed by a weighted sum gives the predicted angle.
+        Decodes the whole batch at once and returns ``(pitches, yaws)``,
+        each of shape (B,).
         """
-        pitch_logits = outputs[0][0]  # (90,)
-        yaw_logits = outputs[1][0]  # (90,)
+        pitch_logits = np.asarray(outputs[0], dtype=np.float64)  # (B, 90)
+        yaw_logits = np.asarray(outputs[1], dtype=np.float64)  # (B, 90)
 
-        num_bins = len(pitch_logits)
+        num_bins = pitch_logits.shape[-1]
         bin_width = 2 * 180.0 / num_bins
         bins = np.arange(num_bins) * bin_width - 180.0 + bin_width / 2
 
-        # Softmax
-        pitch_probs = np.exp(pitch_logits - pitch_logits.max())
-        pitch_probs /= pitch_probs.sum()
-        yaw_probs = np.exp(yaw_logits - yaw_logits.max())
-        yaw_probs /= yaw_probs.sum()
-
-        pitch = float(np.sum(bins * pitch_probs))
-        yaw = float(np.sum(bins * yaw_probs))
+        # Softmax along the bin axis
+        pitch_probs = np.exp(pitch_logits - pitch_logits.max(axis=-1, keepdims=True))
+        pitch_probs /= pitch_probs.sum(axis=-1, keepdims=True)
+        yaw_probs = np.exp(yaw_logits - yaw_logits.max(axis=-1, keepdims=True))
+        yaw_probs /= yaw_probs.sum(axis=-1, keepdims=True)
 
-        return pitch, yaw
+        return pitch_probs @ bins, yaw_probs @ bins
 
     # ------------------------------------------------------------------
     # Heuristic path (iris displacement)
@@ -239,5 +292,6 @@ class GazeEstimator:
 
     def close(self) -> None:
         """Release ONNX runtime resources."""
+        self._io_binding = None
         self._session = None
         self._available = False
@@ -0,0 +1,404 @@
+"""Out-of-process gaze pipeline.
+
+Runs MediaPipeTracker -> GazeEstimator -> DualAxisSmoother -> ZoneMapper in
+a dedicated worker process so the 5-10 ms of MediaPipe/ONNX/Kalman work per
+frame never blocks the asyncio event loop that serves WebSockets and LLM
+streams.
+
+  event loop                          worker process
+  ----------                          --------------
+  frame / FaceData --> shared memory --> tracker + estimator + smoother
+  await ZoneResult <------- pipe <------ ZoneResult (a few floats)
+
+Frames and landmark/patch arrays are written into one shared memory block;
+only small control messages and ZoneResults cross the pipe.  One request is
+in flight at a time, which matches the latest-frame-wins camera source.
+After a request times out, the block is not written again until the worker
+has answered it (or has been restarted), so the worker never reads a frame
+that is being overwritten.  A worker process that dies between requests
+(a crash in MediaPipe/ONNX, an OOM kill) is restarted by the next request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing as mp
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from voicereach.config import settings
+from voicereach.engine.gaze.mediapipe_tracker import FaceData
+
+if TYPE_CHECKING:
+    from voicereach.engine.gaze.zone_mapper import ZoneResult
+
+logger = logging.getLogger(__name__)
+
+MAX_LANDMARKS = 478
+PATCH_SIZE = 64
+
+
+def _shared_layout(
+    max_frame_shape: tuple[int, int, int],
+) -> tuple[dict[str, tuple[tuple[int, ...], np.dtype, int]], int]:
+    """Return ``{name: (shape, dtype, offset)}`` and the total byte size."""
+    fields = [
+        ("frame", (int(np.prod(max_frame_shape)),), np.dtype(np.uint8)),
+        ("landmarks", (MAX_LANDMARKS, 3), np.dtype(np.float32)),
+        ("patches", (2, PATCH_SIZE, PATCH_SIZE), np.dtype(np.float32)),
+        ("iris", (2, 2), np.dtype(np.float32)),
+        ("head_pose", (3,), np.dtype(np.float32)),
+    ]
+    layout = {}
+    offset = 0
+    for name, shape, dtype in fields:
+        # Keep float arrays aligned after the variable-size frame region
+        offset = -(-offset // dtype.alignment) * dtype.alignment
+        layout[name] = (shape, dtype, offset)
+        offset += int(np.prod(shape)) * dtype.itemsize
+    return layout, offset
+
+
+class SharedGazeBuffers:
+    """NumPy views over the shared memory block used by both processes.
+
+    Layout: frame (uint8, max H*W*C) | landmarks (478, 3) f32 |
+    eye patches (2, 64, 64) f32 | iris (2, 2) f32 | head pose (3,) f32
+    """
+
+    def __init__(self, buf, max_frame_shape: tuple[int, int, int]) -> None:
+        layout, _ = _shared_layout(max_frame_shape)
+        for name, (shape, dtype, offset) in layout.items():
+            setattr(self, name, np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset))
+
+    @staticmethod
+    def size_for(max_frame_shape: tuple[int, int, int]) -> int:
+        return _shared_layout(max_frame_shape)[1]
+
+    def release(self) -> None:
+        """Drop the views so the shared memory block can be closed."""
+        del self.frame, self.landmarks, self.patches, self.iris, self.head_pose
+
+
+# ----------------------------------------------------------------------
+# Worker process
+# ----------------------------------------------------------------------
+
+def _worker_main(
+    conn,
+    shm_name: str,
+    max_frame_shape: tuple[int, int, int],
+    model_path: str | None,
+    num_zones: int,
+) -> None:
+    """Entry point of the gaze worker process."""
+    from voicereach.engine.gaze.gaze_estimator import GazeEstimator
+    from voicereach.engine.gaze.smoother import create_smoother
+    from voicereach.engine.gaze.zone_mapper import ZoneMapper, gaze_to_screen
+
+    shm = SharedMemory(name=shm_name)
+    bufs = SharedGazeBuffers(shm.buf, max_frame_shape)
+    estimator = GazeEstimator(model_path=model_path)
+    estimator.initialize()
+    smoother = create_smoother()
+    mapper = ZoneMapper(num_zones=num_zones)
+    tracker = None
+    frame = face_data = None
+
+    conn.send(("ready",))
+    try:
+        while True:
+            msg = conn.recv()
+            kind, seq = msg[0], msg[1]
+            if kind == "stop":
+                break
+            try:
+                t0 = time.perf_counter()
+                if kind == "frame":
+                    _, _, h, w, c = msg
+                    if tracker is None:
+                        from voicereach.engine.gaze.mediapipe_tracker import MediaPipeTracker
+
+                        # Each FaceData is consumed before the next frame
+                        tracker = MediaPipeTracker.from_settings(reuse_buffers=True)
+                        tracker.initialize()
+                    frame = bufs.frame[: h * w * c].reshape(h, w, c)
+                    face_data = tracker.process_frame(frame)
+                elif kind == "face":
+                    _, _, n, bbox, confidence = msg
+                    face_data = FaceData(
+                        landmarks=bufs.landmarks[:n],
+                        left_eye_patch=bufs.patches[0],
+                        right_eye_patch=bufs.patches[1],
+                        left_iris=bufs.iris[0],
+                        right_iris=bufs.iris[1],
+                        head_pose=bufs.head_pose,
+                        face_bbox=bbox,
+                        confidence=confidence,
+                    )
+                elif kind == "reset":
+                    smoother.reset()
+                    conn.send(("ok", seq))
+                    continue
+                elif kind == "set_zones":
+                    mapper.set_num_zones(msg[2])
+                    conn.send(("ok", seq))
+                    continue
+                else:
+                    raise ValueError(f"unknown gaze worker message: {kind!r}")
+
+                result = None
+                if face_data is not None:
+                    gaze = estimator.estimate(face_data)
+                    pitch, yaw = smoother.update(gaze.pitch, gaze.yaw)
+                    result = mapper.map(*gaze_to_screen(pitch, yaw))
+                conn.send(("result", seq, result, (time.perf_counter() - t0) * 1000.0))
+            except Exception as e:
+                conn.send(("error", seq, repr(e)))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        if tracker is not None:
+            tracker.close()
+        estimator.close()
+        # Views into shared memory must be gone before it can be closed
+        frame = face_data = None
+        bufs.release()
+        shm.close()
+
+
+# ----------------------------------------------------------------------
+# Event-loop side
+# ----------------------------------------------------------------------
+
+@dataclass
+class GazeWorkerStats:
+    """Worker request counters and timings."""
+    requests: int = 0
+    failures: int = 0
+    restarts: int = 0  # after the worker died or never answered a timed-out request
+    last_compute_ms: float = 0.0  # time spent inside the worker
+    last_roundtrip_ms: float = 0.0  # submit -> result, as seen by the loop
+
+
+class GazeWorker:
+    """Client for the gaze worker process.
+
+    All public coroutines are safe to call from the event loop; the only
+    blocking call (waiting on the pipe) runs on a dedicated helper thread.
+    """
+
+    def __init__(
+        self,
+        model_path: str | None = None,
+        num_zones: int | None = None,
+        max_frame_shape: tuple[int, int, int] = (1080, 1920, 3),
+        response_timeout_s: float = 1.0,
+    ) -> None:
+        self._model_path = model_path
+        self._num_zones = settings.num_zones if num_zones is None else num_zones
+        self._max_frame_shape = max_frame_shape
+        self._timeout = response_timeout_s
+        self._shm: SharedMemory | None = None
+        self._bufs: SharedGazeBuffers | None = None
+        self._conn = None
+        self._process = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = asyncio.Lock()
+        self._seq = 0
+        self._stale_seq: int | None = None  # timed-out request not yet answered
+        self.stats = GazeWorkerStats()
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self, startup_timeout_s: float = 30.0) -> None:
+        """Spawn the worker and wait for it to load its models (blocking)."""
+        if self.running:
+            return
+        ctx = mp.get_context("spawn")
+        self._shm = SharedMemory(
+            create=True, size=SharedGazeBuffers.size_for(self._max_frame_shape)
+        )
+        self._bufs = SharedGazeBuffers(self._shm.buf, self._max_frame_shape)
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_worker_main,
+            args=(
+                child_conn,
+                self._shm.name,
+                self._max_frame_shape,
+                self._model_path,
+                self._num_zones,
+            ),
+            name="gaze-worker",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gaze-worker-io")
+
+        try:
+            ready = self._conn.poll(startup_timeout_s) and self._conn.recv() == ("ready",)
+        except (EOFError, OSError):  # the worker died during startup
+            ready = False
+        if not ready:
+            self.stop()
+            raise RuntimeError("Gaze worker failed to start")
+        logger.info("Gaze worker started (pid %s)", self._process.pid)
+
+    def stop(self) -> None:
+        """Stop the worker process and free the shared memory block."""
+        if self._conn is not None:
+            with contextlib.suppress(BrokenPipeError, OSError):
+                self._conn.send(("stop", 0))
+        if self._process is not None:
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join(timeout=1.0)
+            self._process = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._bufs is not None:
+            self._bufs.release()
+            self._bufs = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    async def process_frame(self, frame: np.ndarray) -> ZoneResult | None:
+        """Track a BGR camera frame in the worker and return its zone."""
+        self._require_started()
+        h, w = frame.shape[:2]
+        c = frame.shape[2] if frame.ndim == 3 else 1
+        if h * w * c > self._bufs.frame.size:
+            raise ValueError(
+                f"Frame {frame.shape} exceeds shared buffer {self._max_frame_shape}"
+            )
+        async with self._lock:
+            await self._settle()
+            await self._revive()
+            self._bufs.frame[: h * w * c].reshape(frame.shape)[...] = frame
+            return await self._request("frame", h, w, c)
+
+    async def process_face_data(self, face_data: FaceData) -> ZoneResult | None:
+        """Run gaze estimation + smoothing + zone mapping on extracted face data."""
+        self._require_started()
+        n = min(len(face_data.landmarks), MAX_LANDMARKS)
+        async with self._lock:
+            await self._settle()
+            await self._revive()
+            bufs = self._bufs
+            bufs.landmarks[:n] = face_data.landmarks[:n]
+            bufs.patches[0] = face_data.left_eye_patch
+            bufs.patches[1] = face_data.right_eye_patch
+            bufs.iris[0] = face_data.left_iris[:2]
+            bufs.iris[1] = face_data.right_iris[:2]
+            bufs.head_pose[:] = face_data.head_pose
+            bbox = tuple(int(v) for v in face_data.face_bbox)
+            return await self._request("face", n, bbox, float(face_data.confidence))
+
+    async def reset(self) -> None:
+        """Reset the worker's smoother state."""
+        async with self._lock:
+            await self._settle()
+            await self._request("reset")
+
+    async def set_num_zones(self, num_zones: int) -> None:
+        """Change the worker's zone layout."""
+        self._num_zones = num_zones  # kept across a restart
+        async with self._lock:
+            await self._settle()
+            await self._request("set_zones", num_zones)
+
+    async def _settle(self) -> None:
+        """Wait out a timed-out request before its buffers are overwritten.
+
+        Restarts the worker if it still does not answer.
+        """
+        if self._stale_seq is None:
+            return
+        seq, self._stale_seq = self._stale_seq, None
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(self._executor, self._recv, seq) is None:
+            logger.warning("Gaze worker unresponsive, restarting it")
+            self.stats.restarts += 1
+            await loop.run_in_executor(None, self.restart)
+
+    async def _revive(self) -> None:
+        """Restart the worker if its process died since the last request."""
+        if self._process is None or self._process.is_alive():
+            return
+        logger.warning("Gaze worker died (exit code %s), restarting it", self._process.exitcode)
+        self.stats.restarts += 1
+        await asyncio.get_running_loop().run_in_executor(None, self.restart)
+
+    def restart(self) -> None:
+        """Replace the worker process (and its shared memory block)."""
+        self.stop()
+        self.start()
+
+    def _require_started(self) -> None:
+        if self._process is None:
+            raise RuntimeError("Gaze worker is not running")
+
+    def _require_running(self) -> None:
+        if not self.running:
+            raise RuntimeError("Gaze worker is not running")
+
+    async def _request(self, kind: str, *args) -> ZoneResult | None:
+        self._require_running()
+        self._seq += 1
+        seq = self._seq
+        t0 = time.perf_counter()
+        self._conn.send((kind, seq, *args))
+        loop = asyncio.get_running_loop()
+        reply = await loop.run_in_executor(self._executor, self._recv, seq)
+        self.stats.requests += 1
+        self.stats.last_roundtrip_ms = (time.perf_counter() - t0) * 1000.0
+
+        if reply is None:
+            self._stale_seq = seq  # the worker may still be reading its buffers
+            self.stats.failures += 1
+            logger.warning("Gaze worker did not answer within %.1fs", self._timeout)
+            return None
+        if reply[0] == "error":
+            self.stats.failures += 1
+            logger.warning("Gaze worker error: %s", reply[2])
+            return None
+        if reply[0] == "result":
+            self.stats.last_compute_ms = reply[3]
+            return reply[2]
+        return None
+
+    def _recv(self, seq: int):
+        """Wait for the reply to ``seq``, discarding late replies to earlier requests."""
+        deadline = time.monotonic() + self._timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._conn.poll(remaining):
+                    return None
+                reply = self._conn.recv()
+                if reply[1] == seq:
+                    return reply
+        except (EOFError, OSError):
+            return None
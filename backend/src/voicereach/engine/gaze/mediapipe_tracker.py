@@ -4,16 +4,41 @@ Extracts 468 facial landmarks + iris landmarks from camera frames.
 Provides eye region patches and head pose estimation.
 
 Performance target: ~5ms per frame (docs/02_EYE_TRACKING_AND_INPUT.md)
+
+With reuse_buffers=True, steady-state frames reuse a preallocated buffer
+pool (RGB frame, landmark array, eye patches), so the arrays in a returned
+FaceData are overwritten by the next process_frame() call.  Hot loops that
+consume each FaceData before the next frame opt in; anything that keeps
+one must call FaceData.copy().  The default allocates fresh arrays.
+
+With ROI tracking enabled, each frame after a detection is cropped to the
+previous face bbox plus a margin (and optionally downsampled) before the
+colour conversion and FaceMesh run, so a 1080p camera only pays for the
+face region:
+
+  frame --crop(prev bbox + margin)--> [downsample] --> RGB --> FaceMesh
+                                                                  |
+  full-frame landmarks <-- x * crop_w + x1, y * crop_h + y1 <-----+
+
+Crops run through a separate static-image FaceMesh graph: their origin
+and size change from frame to frame, which would break the video-mode
+graph's tracking from the previous frame.  The video-mode graph only ever
+sees full frames.  If the face is not found in the crop, the same frame is
+searched again at full size and ROI tracking restarts from the next
+detection.
 """
 
 from __future__ import annotations
 
+import itertools
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 import cv2
 import numpy as np
 
+from voicereach.config import settings
+
 logger = logging.getLogger(__name__)
 
 # Key landmark indices
@@ -36,9 +61,32 @@ MODEL_POINTS = np.array([
 ], dtype=np.float64)
 
 
+def rotation_to_euler(rotation_mat: np.ndarray) -> np.ndarray:
+    """Euler angles (pitch, yaw, roll) in degrees from a 3x3 rotation matrix.
+
+    Uses the R = Rz(roll) @ Ry(yaw) @ Rx(pitch) convention, matching the
+    angles cv2.decomposeProjectionMatrix / cv2.RQDecomp3x3 report, without
+    building a projection matrix.
+    """
+    r = rotation_mat
+    pitch = np.degrees(np.arctan2(r[2, 1], r[2, 2]))
+    yaw = np.degrees(-np.arcsin(np.clip(r[2, 0], -1.0, 1.0)))
+    roll = np.degrees(np.arctan2(r[1, 0], r[0, 0]))
+    return np.array([pitch, yaw, roll], dtype=np.float32)
+
+
+def wrap_degrees(angles: np.ndarray) -> np.ndarray:
+    """Wrap angles in degrees into (-180, 180]."""
+    return angles + 360.0 * np.floor((180.0 - angles) / 360.0)  # exact for in-range angles
+
+
 @dataclass
 class FaceData:
-    """Extracted face data from a single frame."""
+    """Extracted face data from a single frame.
+
+    From a tracker with reuse_buffers=True, the arrays (including the iris
+    views into ``landmarks``) are only valid until its next frame.
+    """
     landmarks: np.ndarray           # (468+10, 3) all landmarks
     left_eye_patch: np.ndarray      # (64, 64) normalized eye region
     right_eye_patch: np.ndarray     # (64, 64) normalized eye region
@@ -48,6 +96,70 @@ class FaceData:
     face_bbox: tuple[int, int, int, int]  # x, y, w, h
     confidence: float
 
+    def copy(self) -> FaceData:
+        """Return a FaceData that owns its arrays (detached from the buffer pool)."""
+        return replace(
+            self,
+            landmarks=self.landmarks.copy(),
+            left_eye_patch=self.left_eye_patch.copy(),
+            right_eye_patch=self.right_eye_patch.copy(),
+            left_iris=self.left_iris.copy(),
+            right_iris=self.right_iris.copy(),
+            head_pose=self.head_pose.copy(),
+        )
+
+
+class FrameBufferPool:
+    """Preallocated per-frame arrays reused across process_frame() calls.
+
+    Buffers are (re)allocated only when the frame size or landmark count
+    changes, so steady-state tracking writes into the same memory via
+    OpenCV ``dst=`` / NumPy ``out=`` arguments.
+    """
+
+    def __init__(self, patch_size: int = 64) -> None:
+        self.patch_size = patch_size
+        self.rgb: np.ndarray | None = None  # (H, W, 3) uint8
+        self.landmarks: np.ndarray | None = None  # (N, 3) float32, pixels
+        self.landmark_scale = np.ones(3, dtype=np.float32)
+        # Per-eye scratch: resized BGR crop -> grayscale -> float32 [0, 1]
+        self.patch_bgr = [np.empty((patch_size, patch_size, 3), dtype=np.uint8) for _ in range(2)]
+        self.patch_gray = [np.empty((patch_size, patch_size), dtype=np.uint8) for _ in range(2)]
+        self.patches = [np.zeros((patch_size, patch_size), dtype=np.float32) for _ in range(2)]
+        # ROI crops change size every frame, so they are views into stores
+        # that only grow; the view is cached while the shape stays the same
+        self._roi_stores: dict[str, np.ndarray] = {}
+        self._roi_views: dict[str, np.ndarray] = {}
+
+    def rgb_for(self, frame: np.ndarray) -> np.ndarray:
+        """Return the RGB buffer sized for ``frame``."""
+        if self.rgb is None or self.rgb.shape != frame.shape:
+            self.rgb = np.empty(frame.shape, dtype=np.uint8)
+        self.rgb.flags.writeable = True
+        return self.rgb
+
+    def roi_for(self, name: str, shape: tuple[int, ...]) -> np.ndarray:
+        """Return a contiguous uint8 buffer of ``shape`` for ROI processing."""
+        view = self._roi_views.get(name)
+        if view is None or view.shape != shape:
+            size = int(np.prod(shape))
+            store = self._roi_stores.get(name)
+            if store is None or store.size < size:
+                store = self._roi_stores[name] = np.empty(size, dtype=np.uint8)
+            view = self._roi_views[name] = store[:size].reshape(shape)
+        view.flags.writeable = True
+        return view
+
+    def landmarks_for(self, count: int, w: int, h: int) -> np.ndarray:
+        """Return the landmark buffer for ``count`` points, scale set to (w, h, w)."""
+        if self.landmarks is None or self.landmarks.shape[0] != count:
+            self.landmarks = np.empty((count, 3), dtype=np.float32)
+        # MediaPipe z uses roughly the same scale as x
+        self.landmark_scale[0] = w
+        self.landmark_scale[1] = h
+        self.landmark_scale[2] = w
+        return self.landmarks
+
 
 class MediaPipeTracker:
     """Wrapper around MediaPipe Face Mesh for landmark extraction."""
@@ -58,13 +170,67 @@ class MediaPipeTracker:
         refine_landmarks: bool = True,
         min_detection_confidence: float = 0.5,
         min_tracking_confidence: float = 0.5,
+        reuse_buffers: bool = False,
+        head_pose_interval: int = 1,
+        roi_tracking: bool = False,
+        roi_margin: float = 0.5,
+        roi_max_size: int = 0,
     ) -> None:
+        """
+        Args:
+            reuse_buffers: Write per-frame arrays into a preallocated pool;
+                returned FaceData is then only valid until the next frame.
+            head_pose_interval: Solve head pose every N frames and
+                extrapolate in between; 0 disables head pose (zeros).
+            roi_tracking: Crop each frame to the previous face bbox
+                before running FaceMesh.
+            roi_margin: Margin added on every side of the previous bbox,
+                as a fraction of its larger side.
+            roi_max_size: Downsample the crop so its longer side is at
+                most this many pixels; 0 keeps the crop at full resolution.
+        """
+        if head_pose_interval < 0:
+            raise ValueError("head_pose_interval must be >= 0")
+        if roi_margin < 0:
+            raise ValueError("roi_margin must be >= 0")
+        if roi_max_size < 0:
+            raise ValueError("roi_max_size must be >= 0")
         self._max_faces = max_num_faces
         self._refine = refine_landmarks
         self._min_detect = min_detection_confidence
         self._min_track = min_tracking_confidence
-        self._face_mesh = None
+        self._face_mesh = None  # video mode, full frames only
+        self._roi_mesh = None  # static image mode, ROI crops
         self._frame_size: tuple[int, int] | None = None
+        self._reuse_buffers = reuse_buffers
+        self._pool = FrameBufferPool()
+
+        # ROI tracking state
+        self._roi_tracking = roi_tracking
+        self._roi_margin = roi_margin
+        self._roi_max_size = roi_max_size
+        self._roi: tuple[int, int, int, int] | None = None  # x1, y1, x2, y2
+
+        # Head pose state
+        self._pose_interval = head_pose_interval
+        self._intrinsics_size: tuple[int, int] | None = None
+        self._camera_matrix = np.zeros((3, 3), dtype=np.float64)
+        self._dist_coeffs = np.zeros((4, 1), dtype=np.float64)
+        self._rvec: np.ndarray | None = None  # previous solution, extrinsic guess
+        self._tvec: np.ndarray | None = None
+        self._pose_frame = 0  # frames since the last solved pose
+        self._last_pose: np.ndarray | None = None
+        self._pose_velocity = np.zeros(3, dtype=np.float32)  # degrees per frame
+
+    @classmethod
+    def from_settings(cls, **kwargs) -> MediaPipeTracker:
+        """Tracker configured from settings (ROI tracking); ``kwargs`` override."""
+        options = {
+            "roi_tracking": settings.face_roi_tracking,
+            "roi_max_size": settings.face_roi_max_size,
+        }
+        options.update(kwargs)
+        return cls(**options)
 
     def initialize(self) -> None:
         """Initialize MediaPipe Face Mesh."""
@@ -75,6 +241,13 @@ class MediaPipeTracker:
             min_detection_confidence=self._min_detect,
             min_tracking_confidence=self._min_track,
         )
+        if self._roi_tracking:
+            self._roi_mesh = mp.solutions.face_mesh.FaceMesh(
+                static_image_mode=True,
+                max_num_faces=self._max_faces,
+                refine_landmarks=self._refine,
+                min_detection_confidence=self._min_detect,
+            )
         logger.info("MediaPipe Face Mesh initialized")
 
     def process_frame(self, frame: np.ndarray) -> FaceData | None:
@@ -90,32 +263,43 @@ class MediaPipeTracker:
             raise RuntimeError("Call initialize() first")
 
         h, w = frame.shape[:2]
+        if self._frame_size != (w, h):
+            self._roi = None
         self._frame_size = (w, h)
 
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        rgb.flags.writeable = False
-        results = self._face_mesh.process(rgb)
-
-        if not results.multi_face_landmarks:
-            return None
-
-        face_lm = results.multi_face_landmarks[0]
-        landmarks = np.array(
-            [(lm.x * w, lm.y * h, lm.z * w) for lm in face_lm.landmark],
-            dtype=np.float32,
-        )
-
-        left_patch = self._extract_eye_patch(frame, landmarks, LEFT_EYE_INDICES)
-        right_patch = self._extract_eye_patch(frame, landmarks, RIGHT_EYE_INDICES)
-
-        left_iris = landmarks[LEFT_IRIS_CENTER, :2] if len(landmarks) > LEFT_IRIS_CENTER else np.zeros(2)
-        right_iris = landmarks[RIGHT_IRIS_CENTER, :2] if len(landmarks) > RIGHT_IRIS_CENTER else np.zeros(2)
+        face_lm = None
+        roi = self._roi
+        if roi is not None:
+            face_lm = self._detect_in_roi(frame, roi)
+            if face_lm is None:
+                # Lost in the crop: search the whole frame before giving up
+                self._roi = roi = None
+        if face_lm is None:
+            face_lm = self._detect_full(frame)
+            if face_lm is None:
+                self.reset_head_pose()
+                return None
+
+        if roi is None:
+            landmarks = self._convert_landmarks(face_lm, w, h)
+        else:
+            x1, y1, x2, y2 = roi
+            landmarks = self._convert_landmarks(face_lm, x2 - x1, y2 - y1, origin=(x1, y1))
+
+        left_patch = self._extract_eye_patch(frame, landmarks, LEFT_EYE_INDICES, slot=0)
+        right_patch = self._extract_eye_patch(frame, landmarks, RIGHT_EYE_INDICES, slot=1)
+
+        n = len(landmarks)
+        left_iris = landmarks[LEFT_IRIS_CENTER, :2] if n > LEFT_IRIS_CENTER else np.zeros(2)
+        right_iris = landmarks[RIGHT_IRIS_CENTER, :2] if n > RIGHT_IRIS_CENTER else np.zeros(2)
 
         head_pose = self._estimate_head_pose(landmarks, w, h)
 
         face_pts = landmarks[:468, :2]
         x_min, y_min = face_pts.min(axis=0).astype(int)
         x_max, y_max = face_pts.max(axis=0).astype(int)
+        if self._roi_tracking:
+            self._roi = self._next_roi(x_min, y_min, x_max, y_max, w, h)
 
         return FaceData(
             landmarks=landmarks,
@@ -128,14 +312,113 @@ class MediaPipeTracker:
             confidence=1.0,
         )
 
+    @property
+    def roi(self) -> tuple[int, int, int, int] | None:
+        """Crop (x1, y1, x2, y2) the next frame will be searched in, if any."""
+        return self._roi
+
+    def reset_roi(self) -> None:
+        """Search the next frame at full size."""
+        self._roi = None
+
+    def _detect_full(self, frame: np.ndarray):
+        """Run FaceMesh on the whole frame; return the first face or None."""
+        if self._reuse_buffers:
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._pool.rgb_for(frame))
+        else:
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        rgb.flags.writeable = False
+        results = self._face_mesh.process(rgb)
+        return results.multi_face_landmarks[0] if results.multi_face_landmarks else None
+
+    def _detect_in_roi(self, frame: np.ndarray, roi: tuple[int, int, int, int]):
+        """Run FaceMesh on the (optionally downsampled) crop; first face or None.
+
+        Landmarks come back normalised to the crop, which is all
+        _convert_landmarks needs, so downsampling does not affect them.
+        """
+        x1, y1, x2, y2 = roi
+        crop = frame[y1:y2, x1:x2]
+        crop_h, crop_w = crop.shape[:2]
+        scale = 1.0
+        if self._roi_max_size and max(crop_w, crop_h) > self._roi_max_size:
+            scale = self._roi_max_size / max(crop_w, crop_h)
+        out_w = max(1, round(crop_w * scale))
+        out_h = max(1, round(crop_h * scale))
+
+        pool = self._pool if self._reuse_buffers else None
+        if scale < 1.0:
+            small = pool.roi_for("bgr", (out_h, out_w, 3)) if pool else None
+            # Resize first so the colour conversion runs on the small image
+            crop = cv2.resize(crop, (out_w, out_h), dst=small, interpolation=cv2.INTER_AREA)
+        if pool is not None:
+            rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB, dst=pool.roi_for("rgb", (out_h, out_w, 3)))
+        else:
+            rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+        rgb.flags.writeable = False
+        results = self._roi_mesh.process(rgb)
+        return results.multi_face_landmarks[0] if results.multi_face_landmarks else None
+
+    def _next_roi(
+        self, x_min: int, y_min: int, x_max: int, y_max: int, frame_w: int, frame_h: int
+    ) -> tuple[int, int, int, int] | None:
+        """Expanded face bbox for the next frame, or None if it covers the frame."""
+        margin = max(x_max - x_min, y_max - y_min) * self._roi_margin
+        x1 = max(0, int(x_min - margin))
+        y1 = max(0, int(y_min - margin))
+        x2 = min(frame_w, int(x_max + margin) + 1)
+        y2 = min(frame_h, int(y_max + margin) + 1)
+        if x2 - x1 < 16 or y2 - y1 < 16:
+            return None
+        if (x2 - x1) * (y2 - y1) >= frame_w * frame_h:
+            return None
+        return (x1, y1, x2, y2)
+
+    def _convert_landmarks(
+        self, face_lm, w: int, h: int, origin: tuple[int, int] = (0, 0)
+    ) -> np.ndarray:
+        """Convert a MediaPipe landmark list to an (N, 3) pixel-space array.
+
+        The protobuf fields are flattened with a single ``np.fromiter`` pass
+        and scaled by (w, h, w) in one vectorised multiply.  ``w``/``h`` are
+        the size of the image FaceMesh saw, in frame pixels, and ``origin``
+        its top-left corner in the frame (non-zero for ROI crops).
+        """
+        points = face_lm.landmark
+        count = len(points)
+        flat = np.fromiter(
+            itertools.chain.from_iterable((lm.x, lm.y, lm.z) for lm in points),
+            dtype=np.float32,
+            count=count * 3,
+        ).reshape(count, 3)
+
+        if not self._reuse_buffers:
+            landmarks = flat * np.array([w, h, w], dtype=np.float32)
+        else:
+            landmarks = self._pool.landmarks_for(count, w, h)
+            np.multiply(flat, self._pool.landmark_scale, out=landmarks)
+        if origin != (0, 0):
+            landmarks[:, 0] += origin[0]
+            landmarks[:, 1] += origin[1]
+        return landmarks
+
     def _extract_eye_patch(
         self,
         frame: np.ndarray,
         landmarks: np.ndarray,
         indices: list[int],
         patch_size: int = 64,
+        slot: int = 0,
     ) -> np.ndarray:
-        """Extract and normalize an eye region patch."""
+        """Extract and normalize an eye region patch.
+
+        The crop is a view into ``frame``; with buffer reuse enabled the
+        resize, grayscale conversion and float scaling all write into the
+        pool's ``slot`` buffers (0 = left eye, 1 = right eye).
+        """
+        if self._reuse_buffers and patch_size == self._pool.patch_size:
+            return self._extract_eye_patch_pooled(frame, landmarks, indices, slot)
+
         eye_pts = landmarks[indices, :2]
         center = eye_pts.mean(axis=0)
         eye_w = np.linalg.norm(eye_pts[0] - eye_pts[1])  # eye width
@@ -154,47 +437,127 @@ class MediaPipeTracker:
         resized = cv2.resize(gray, (patch_size, patch_size))
         return resized.astype(np.float32) / 255.0
 
+    def _extract_eye_patch_pooled(
+        self,
+        frame: np.ndarray,
+        landmarks: np.ndarray,
+        indices: list[int],
+        slot: int,
+    ) -> np.ndarray:
+        """Allocation-free variant of _extract_eye_patch using the buffer pool."""
+        pool = self._pool
+        out = pool.patches[slot]
+        size = (pool.patch_size, pool.patch_size)
+
+        eye_pts = landmarks[indices, :2]
+        cx = float(eye_pts[:, 0].mean())
+        cy = float(eye_pts[:, 1].mean())
+        margin = float(np.hypot(eye_pts[0, 0] - eye_pts[1, 0], eye_pts[0, 1] - eye_pts[1, 1])) * 0.5
+
+        x1 = max(0, int(cx - margin))
+        y1 = max(0, int(cy - margin * 0.7))
+        x2 = min(frame.shape[1], int(cx + margin))
+        y2 = min(frame.shape[0], int(cy + margin * 0.7))
+
+        if x2 <= x1 or y2 <= y1:
+            out.fill(0.0)
+            return out
+
+        crop = frame[y1:y2, x1:x2]
+        if crop.ndim == 3:
+            # Resize first, then convert: both are linear, and the grayscale
+            # conversion then runs on 64x64 pixels instead of the full crop.
+            cv2.resize(crop, size, dst=pool.patch_bgr[slot])
+            gray = cv2.cvtColor(pool.patch_bgr[slot], cv2.COLOR_BGR2GRAY, dst=pool.patch_gray[slot])
+        else:
+            gray = cv2.resize(crop, size, dst=pool.patch_gray[slot])
+        np.multiply(gray, np.float32(1.0 / 255.0), out=out)
+        return out
+
+    def reset_head_pose(self) -> None:
+        """Forget the previous pose (no warm start, no extrapolation)."""
+        self._rvec = None
+        self._tvec = None
+        self._last_pose = None
+        self._pose_velocity[:] = 0.0
+        self._pose_frame = 0
+
+    def _camera_matrix_for(self, frame_w: int, frame_h: int) -> np.ndarray:
+        """Approximate pinhole intrinsics, rebuilt only when the frame size changes."""
+        if self._intrinsics_size != (frame_w, frame_h):
+            self._camera_matrix[:] = [
+                [frame_w, 0, frame_w / 2],
+                [0, frame_w, frame_h / 2],
+                [0, 0, 1],
+            ]
+            self._intrinsics_size = (frame_w, frame_h)
+            # Different intrinsics invalidate the previous extrinsics
+            self.reset_head_pose()
+        return self._camera_matrix
+
     def _estimate_head_pose(
         self, landmarks: np.ndarray, frame_w: int, frame_h: int
     ) -> np.ndarray:
-        """Estimate head pose (pitch, yaw, roll) using PnP."""
-        image_points = np.array(
-            [landmarks[i, :2] for i in HEAD_POSE_INDICES],
-            dtype=np.float64,
-        )
+        """Estimate head pose (pitch, yaw, roll) in degrees.
 
-        focal_length = frame_w
-        center = (frame_w / 2, frame_h / 2)
-        camera_matrix = np.array(
-            [[focal_length, 0, center[0]],
-             [0, focal_length, center[1]],
-             [0, 0, 1]],
-            dtype=np.float64,
-        )
-        dist_coeffs = np.zeros((4, 1))
+        Solves PnP every ``head_pose_interval`` frames, warm-started from
+        the previous rvec/tvec, and extrapolates at constant angular
+        velocity on the frames in between.
+        """
+        if self._pose_interval == 0:
+            return np.zeros(3, dtype=np.float32)
 
-        success, rotation_vec, _ = cv2.solvePnP(
-            MODEL_POINTS, image_points, camera_matrix, dist_coeffs,
-            flags=cv2.SOLVEPNP_ITERATIVE,
-        )
+        camera_matrix = self._camera_matrix_for(frame_w, frame_h)
 
-        if not success:
-            return np.zeros(3, dtype=np.float32)
+        if self._last_pose is not None and self._pose_frame + 1 < self._pose_interval:
+            self._pose_frame += 1
+            return wrap_degrees(self._last_pose + self._pose_velocity * self._pose_frame)
 
-        rotation_mat, _ = cv2.Rodrigues(rotation_vec)
-        pose_mat = cv2.hconcat([rotation_mat, np.zeros((3, 1))])
-        _, _, _, _, _, _, euler_angles = cv2.decomposeProjectionMatrix(
-            cv2.hconcat([pose_mat, np.array([[0, 0, 0, 1]], dtype=np.float64).T])[:3]
-        )
+        pose = self._solve_head_pose(landmarks, camera_matrix)
+        if pose is None:
+            self.reset_head_pose()
+            return np.zeros(3, dtype=np.float32)
 
-        pitch = float(euler_angles[0][0])
-        yaw = float(euler_angles[1][0])
-        roll = float(euler_angles[2][0])
+        if self._last_pose is not None:
+            # An upright face has pitch near +-180, so take the short way round
+            delta = wrap_degrees(pose - self._last_pose)
+            self._pose_velocity[:] = delta / max(self._pose_frame + 1, 1)
+        self._last_pose = pose
+        self._pose_frame = 0
+        return pose.copy()
+
+    def _solve_head_pose(
+        self, landmarks: np.ndarray, camera_matrix: np.ndarray
+    ) -> np.ndarray | None:
+        """Run PnP and convert the rotation to Euler angles, or None on failure."""
+        image_points = landmarks[HEAD_POSE_INDICES, :2].astype(np.float64)
+
+        if self._rvec is not None:
+            success, rotation_vec, translation_vec = cv2.solvePnP(
+                MODEL_POINTS, image_points, camera_matrix, self._dist_coeffs,
+                rvec=self._rvec, tvec=self._tvec, useExtrinsicGuess=True,
+                flags=cv2.SOLVEPNP_ITERATIVE,
+            )
+        else:
+            success, rotation_vec, translation_vec = cv2.solvePnP(
+                MODEL_POINTS, image_points, camera_matrix, self._dist_coeffs,
+                flags=cv2.SOLVEPNP_ITERATIVE,
+            )
+
+        # A solution behind the camera is a degenerate fit; don't warm-start from it
+        if not success or translation_vec[2, 0] <= 0:
+            return None
 
-        return np.array([pitch, yaw, roll], dtype=np.float32)
+        self._rvec = rotation_vec
+        self._tvec = translation_vec
+        rotation_mat, _ = cv2.Rodrigues(rotation_vec)
+        return rotation_to_euler(rotation_mat)
 
     def close(self) -> None:
         """Release MediaPipe resources."""
         if self._face_mesh:
             self._face_mesh.close()
             self._face_mesh = None
+        if self._roi_mesh:
+            self._roi_mesh.close()
+            self._roi_mesh = None
@@ -2,12 +2,22 @@
 
 Adapts gain based on saccade detection: high velocity relaxes the filter,
 low velocity tightens it for stability.
+
+Two filters are available:
+  - DualAxisSmoother: two independent scalar random-walk filters.
+  - ConstantVelocitySmoother: a 2D constant-velocity filter with NumPy
+    state and update_batch() for replaying whole recorded traces.
 """
 
 from __future__ import annotations
 
 import numpy as np
 
+from voicereach.config import settings
+
+# Relative change below which the covariance recursion counts as converged
+_RICCATI_TOL = 1e-13
+
 
 class GazeSmoother:
     """1D Kalman filter with adaptive process noise for gaze signals."""
@@ -29,6 +39,7 @@ class GazeSmoother:
         self._p = 1.0  # estimation error covariance
         self._prev_measurement = 0.0
         self._initialized = False
+        self.last_saccade = False  # whether the latest update was a saccade
 
     def update(self, measurement: float) -> float:
         """Update filter with new measurement and return smoothed value."""
@@ -41,6 +52,7 @@ class GazeSmoother:
         # Detect saccade (rapid eye movement)
         velocity = abs(measurement - self._prev_measurement)
         is_saccade = velocity > self._saccade_threshold
+        self.last_saccade = is_saccade
 
         # Adaptive process noise
         q = self._q_base * self._saccade_multiplier if is_saccade else self._q_base
@@ -62,6 +74,7 @@ class GazeSmoother:
         self._initialized = False
         self._x = 0.0
         self._p = 1.0
+        self.last_saccade = False
 
 
 class DualAxisSmoother:
@@ -78,6 +91,286 @@ class DualAxisSmoother:
             self._yaw_filter.update(yaw),
         )
 
+    @property
+    def last_saccade(self) -> bool:
+        """Whether the latest update detected a saccade on either axis."""
+        return self._pitch_filter.last_saccade or self._yaw_filter.last_saccade
+
     def reset(self) -> None:
         self._pitch_filter.reset()
         self._yaw_filter.reset()
+
+
+class ConstantVelocitySmoother:
+    """2D constant-velocity Kalman filter for (pitch, yaw) gaze.
+
+    State per axis is (position, velocity) with one frame as the time
+    step, so smoothed gaze keeps up with slow pursuits instead of lagging
+    like the random-walk model.  Saccade handling matches GazeSmoother:
+    a per-axis jump above ``saccade_threshold`` multiplies that axis's
+    process noise for the update.
+
+    The covariance recursion does not depend on the measurements, only on
+    the per-frame saccade flags, so update_batch() splits a trace into:
+      1. saccade flags           -- one vectorised diff
+      2. Kalman gains            -- Riccati recursion, short-circuited once
+                                    it converges within a run of equal flags
+      3. smoothed states         -- parallel prefix scan over the affine
+                                    per-frame updates, log2(T) NumPy passes
+    """
+
+    def __init__(
+        self,
+        process_noise: float = 0.1,
+        measurement_noise: float = 1.0,
+        saccade_threshold: float = 15.0,
+        saccade_noise_multiplier: float = 10.0,
+    ) -> None:
+        self._q_base = process_noise
+        self._r = measurement_noise
+        self._saccade_threshold = saccade_threshold
+        self._saccade_multiplier = saccade_noise_multiplier
+
+        # State, one row per axis (pitch, yaw)
+        self._x = np.zeros((2, 2))  # position, velocity
+        self._p = np.zeros((2, 3))  # covariance entries P00, P01, P11
+        self._prev_measurement = np.zeros(2)
+        self._initialized = False
+        self._saccade = np.zeros(2, dtype=bool)
+        self.reset()
+
+    @property
+    def last_saccade(self) -> bool:
+        """Whether the latest update detected a saccade on either axis."""
+        return bool(self._saccade.any())
+
+    @property
+    def velocity(self) -> tuple[float, float]:
+        """Estimated (pitch, yaw) velocity in degrees per frame."""
+        return float(self._x[0, 1]), float(self._x[1, 1])
+
+    def reset(self) -> None:
+        """Reset filter state."""
+        self._initialized = False
+        self._x[:] = 0.0
+        self._p[:] = (1.0, 0.0, 1.0)
+        self._prev_measurement[:] = 0.0
+        self._saccade[:] = False
+
+    def _init(self, measurement: np.ndarray) -> None:
+        self._x[:, 0] = measurement
+        self._x[:, 1] = 0.0
+        self._prev_measurement[:] = measurement
+        self._initialized = True
+
+    def _riccati_step(
+        self, p: np.ndarray, saccade: np.ndarray | bool
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """One predict+update of the covariance; returns (new P, k_pos, k_vel)."""
+        q = np.where(saccade, self._q_base * self._saccade_multiplier, self._q_base)
+        a, b, c = p[..., 0], p[..., 1], p[..., 2]
+        # Predict with F = [[1, 1], [0, 1]], Q = q * [[1/4, 1/2], [1/2, 1]]
+        a_pred = a + 2.0 * b + c + 0.25 * q
+        b_pred = b + c + 0.5 * q
+        c_pred = c + q
+        # Update with H = [1, 0]
+        s = a_pred + self._r
+        k0 = a_pred / s
+        k1 = b_pred / s
+        new_p = np.stack([(1.0 - k0) * a_pred, (1.0 - k0) * b_pred, c_pred - k1 * b_pred], axis=-1)
+        return new_p, k0, k1
+
+    def update(self, pitch: float, yaw: float) -> tuple[float, float]:
+        """Update with new pitch/yaw and return smoothed values."""
+        z = np.array((pitch, yaw), dtype=np.float64)
+        if not self._initialized:
+            self._init(z)
+            return pitch, yaw
+
+        np.greater(np.abs(z - self._prev_measurement), self._saccade_threshold, out=self._saccade)
+        self._p, k0, k1 = self._riccati_step(self._p, self._saccade)
+
+        pos_pred = self._x[:, 0] + self._x[:, 1]
+        innovation = z - pos_pred
+        self._x[:, 0] = pos_pred + k0 * innovation
+        self._x[:, 1] += k1 * innovation
+
+        self._prev_measurement[:] = z
+        return float(self._x[0, 0]), float(self._x[1, 0])
+
+    def update_batch(
+        self, pitches: np.ndarray, yaws: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Smooth a whole trace; equivalent to calling update() per sample.
+
+        The filter state carries over in both directions, so a long
+        recording can be fed in chunks.
+
+        Returns:
+            (smoothed_pitches, smoothed_yaws) as float64 arrays.
+        """
+        z = np.column_stack([
+            np.asarray(pitches, dtype=np.float64), np.asarray(yaws, dtype=np.float64)
+        ])  # (T, 2)
+        if len(z) == 0:
+            return np.empty(0), np.empty(0)
+
+        out = np.empty_like(z)
+        if not self._initialized:
+            self._init(z[0])
+            out[0] = z[0]
+            z_rest, out_rest = z[1:], out[1:]
+        else:
+            z_rest, out_rest = z, out
+        if len(z_rest) == 0:
+            return out[:, 0], out[:, 1]
+
+        prev = np.vstack([self._prev_measurement, z_rest[:-1]])
+        saccades = np.abs(z_rest - prev) > self._saccade_threshold  # (T, 2)
+        k0, k1 = self._gain_sequence(saccades)
+
+        # Per-frame affine map x_t = A_t x_{t-1} + b_t (per axis), with
+        # A_t = (I - K_t H) F = [[1-k0, 1-k0], [-k1, 1-k1]], b_t = K_t z_t
+        a00 = 1.0 - k0
+        a01 = a00.copy()
+        a10 = -k1
+        a11 = 1.0 - k1
+        b0 = k0 * z_rest
+        b1 = k1 * z_rest
+        _affine_prefix_scan(a00, a01, a10, a11, b0, b1)
+
+        x_pos, x_vel = self._x[:, 0], self._x[:, 1]
+        pos = a00 * x_pos + a01 * x_vel + b0
+        vel = a10 * x_pos + a11 * x_vel + b1
+        out_rest[:] = pos
+
+        self._x[:, 0] = pos[-1]
+        self._x[:, 1] = vel[-1]
+        self._prev_measurement[:] = z_rest[-1]
+        self._saccade[:] = saccades[-1]
+        return out[:, 0], out[:, 1]
+
+    def _gain_sequence(self, saccades: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Kalman gains for each frame and axis; advances the covariance state.
+
+        Within a run of equal saccade flags the recursion converges to a
+        fixed point after a few dozen frames, after which the gain is
+        constant for the rest of the run and is filled in directly.  The
+        remaining steps run on plain floats, which is much cheaper than
+        NumPy for three-element state.
+        """
+        n = len(saccades)
+        k0 = np.empty((n, 2))
+        k1 = np.empty((n, 2))
+        r = self._r
+        for axis in range(2):
+            flags = saccades[:, axis]
+            boundaries = np.flatnonzero(flags[1:] != flags[:-1]) + 1
+            run_starts = np.concatenate(([0], boundaries)).tolist()
+            run_ends = np.concatenate((boundaries, [n])).tolist()
+            g0_out = k0[:, axis]
+            g1_out = k1[:, axis]
+            a, b, c = self._p[axis].tolist()
+            for start, end in zip(run_starts, run_ends, strict=True):
+                q = self._q_base * self._saccade_multiplier if flags[start] else self._q_base
+                i = start
+                while i < end:
+                    a_pred = a + 2.0 * b + c + 0.25 * q
+                    b_pred = b + c + 0.5 * q
+                    c_pred = c + q
+                    s = a_pred + r
+                    g0 = a_pred / s
+                    g1 = b_pred / s
+                    na, nb, nc = (1.0 - g0) * a_pred, (1.0 - g0) * b_pred, c_pred - g1 * b_pred
+                    converged = (
+                        abs(na - a) <= _RICCATI_TOL * abs(na)
+                        and abs(nb - b) <= _RICCATI_TOL * abs(nb)
+                        and abs(nc - c) <= _RICCATI_TOL * abs(nc)
+                    )
+                    a, b, c = na, nb, nc
+                    g0_out[i] = g0
+                    g1_out[i] = g1
+                    i += 1
+                    if converged:
+                        g0_out[i:end] = g0
+                        g1_out[i:end] = g1
+                        break
+            self._p[axis] = (a, b, c)
+        return k0, k1
+
+
+def _compose(later: tuple, earlier: tuple) -> tuple:
+    """Compose two 2x2 affine maps given as (a00, a01, a10, a11, b0, b1)."""
+    c00, c01, c10, c11, c0, c1 = later
+    p00, p01, p10, p11, q0, q1 = earlier
+    return (
+        c00 * p00 + c01 * p10,
+        c00 * p01 + c01 * p11,
+        c10 * p00 + c11 * p10,
+        c10 * p01 + c11 * p11,
+        c00 * q0 + c01 * q1 + c0,
+        c10 * q0 + c11 * q1 + c1,
+    )
+
+
+def _affine_prefix_scan(
+    a00: np.ndarray, a01: np.ndarray, a10: np.ndarray, a11: np.ndarray,
+    b0: np.ndarray, b1: np.ndarray,
+) -> None:
+    """In-place inclusive scan composing 2x2 affine maps along axis 0.
+
+    After the scan, entry t holds map_t o ... o map_0.  The trace is cut
+    into ~sqrt(T) blocks: a sequential scan runs inside all blocks at once
+    (one vectorised step per block position), the block totals are scanned
+    recursively, and each block is then composed with its carry-in.  The
+    maps are contractions here, so the composed products stay well
+    conditioned.
+    """
+    maps = (a00, a01, a10, a11, b0, b1)
+    n = len(a00)
+    block = int(np.sqrt(n))
+    if block < 8:
+        for t in range(1, n):
+            composed = _compose(tuple(m[t] for m in maps), tuple(m[t - 1] for m in maps))
+            for m, v in zip(maps, composed, strict=True):
+                m[t] = v
+        return
+
+    num_blocks = -(-n // block)
+    pad = num_blocks * block - n
+    identity = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+    blocks = []
+    for m, fill in zip(maps, identity, strict=True):
+        padded = np.concatenate([m, np.full((pad, *m.shape[1:]), fill)]) if pad else m.copy()
+        blocks.append(padded.reshape(num_blocks, block, *m.shape[1:]))
+
+    # 1. Sequential scan inside every block, vectorised across blocks
+    for j in range(1, block):
+        composed = _compose(tuple(b[:, j] for b in blocks), tuple(b[:, j - 1] for b in blocks))
+        for b, v in zip(blocks, composed, strict=True):
+            b[:, j] = v
+
+    # 2. Scan of the block totals gives each block's carry-in
+    totals = tuple(b[:, -1].copy() for b in blocks)
+    _affine_prefix_scan(*totals)
+
+    # 3. Compose blocks 1.. with the carry from all earlier blocks
+    carry = tuple(t[:-1, None] for t in totals)
+    composed = _compose(tuple(b[1:] for b in blocks), carry)
+    for b, v in zip(blocks, composed, strict=True):
+        b[1:] = v
+
+    for m, b in zip(maps, blocks, strict=True):
+        m[:] = b.reshape(-1, *m.shape[1:])[:n]
+
+
+def create_smoother(
+    kind: str | None = None, **kwargs
+) -> DualAxisSmoother | ConstantVelocitySmoother:
+    """Build the gaze smoother selected by ``kind`` (default: settings.gaze_smoother)."""
+    kind = kind or settings.gaze_smoother
+    if kind == "dual_axis":
+        return DualAxisSmoother(**kwargs)
+    if kind == "constant_velocity":
+        return ConstantVelocitySmoother(**kwargs)
+    raise ValueError(f"Unknown gaze smoother: {kind!r}")
@@ -11,10 +11,25 @@ Zone layouts (from docs/02_EYE_TRACKING_AND_INPUT.md):
 
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
 
 import numpy as np
 
+# Gaze angle range mapped onto the normalised screen (degrees)
+YAW_RANGE = (-30.0, 30.0)
+PITCH_RANGE = (-20.0, 20.0)
+
+# Max possible distance in normalized space, used for confidence
+_MAX_DIST = math.sqrt(0.5)
+
+
+def gaze_to_screen(pitch: float, yaw: float) -> tuple[float, float]:
+    """Map smoothed (pitch, yaw) in degrees to clamped 0-1 screen coordinates."""
+    norm_x = (yaw - YAW_RANGE[0]) / (YAW_RANGE[1] - YAW_RANGE[0])
+    norm_y = (pitch - PITCH_RANGE[0]) / (PITCH_RANGE[1] - PITCH_RANGE[0])
+    return max(0.0, min(1.0, norm_x)), max(0.0, min(1.0, norm_y))
+
 
 @dataclass
 class ZoneResult:
@@ -25,18 +40,45 @@ class ZoneResult:
     center_y: float
 
 
+@dataclass
+class ZoneBatchResult:
+    """Zone mapping results for a sequence of gaze samples."""
+    zone_ids: np.ndarray  # (N,) int
+    confidences: np.ndarray  # (N,) float
+    center_x: np.ndarray  # (N,) float
+    center_y: np.ndarray  # (N,) float
+
+
 class ZoneMapper:
-    """Maps gaze position to screen zones with hysteresis."""
+    """Maps gaze position to screen zones with hysteresis.
+
+    Zone geometry is kept as NumPy arrays and compiled into lookup grids
+    over the unit square: one per "current zone" hysteresis state, built
+    lazily, plus one for the nearest-centre fallback.  A grid cell stores
+    a zone id when the decision cannot change anywhere inside it; other
+    cells keep the short list of zones whose (margined) box crosses them.
+    ``map`` is therefore a grid lookup, plus a check of the few zones
+    near boundaries, instead of a scan over every zone.  Results are
+    identical to scanning all zones in id order.
+    """
+
+    _AMBIGUOUS = -1
+    _TIE_EPS = 1e-12
 
     def __init__(
         self,
         num_zones: int = 4,
         hysteresis_margin: float = 0.05,
+        grid_resolution: int = 128,
     ) -> None:
+        # A power of two keeps x * res exact, so cell assignment is exact
+        if grid_resolution < 1 or grid_resolution & (grid_resolution - 1):
+            raise ValueError("grid_resolution must be a power of two")
         self._num_zones = num_zones
         self._hysteresis = hysteresis_margin
+        self._grid_res = grid_resolution
         self._current_zone = -1
-        self._zones = self._build_zones(num_zones)
+        self._set_geometry(self._build_zones(num_zones))
 
     def map(self, screen_x: float, screen_y: float) -> ZoneResult:
         """Map normalized screen coordinates (0-1) to a zone.
@@ -48,49 +90,245 @@ class ZoneMapper:
         Returns:
             ZoneResult with zone ID and confidence.
         """
-        best_zone = -1
-        best_dist = float("inf")
-
-        for zone_id, (cx, cy, x1, y1, x2, y2) in self._zones.items():
-            # Check if point is in zone (with hysteresis)
-            margin = -self._hysteresis if zone_id == self._current_zone else self._hysteresis
-            in_zone = (
-                x1 - margin <= screen_x <= x2 + margin
-                and y1 - margin <= screen_y <= y2 + margin
-            )
-
-            dist = np.sqrt((screen_x - cx) ** 2 + (screen_y - cy) ** 2)
-            if in_zone and dist < best_dist:
-                best_zone = zone_id
-                best_dist = dist
-
-        if best_zone == -1:
-            # Fallback: nearest zone center
-            for zone_id, (cx, cy, *_) in self._zones.items():
-                dist = np.sqrt((screen_x - cx) ** 2 + (screen_y - cy) ** 2)
-                if dist < best_dist:
-                    best_zone = zone_id
-                    best_dist = dist
-
+        best_zone = self._decide(screen_x, screen_y, self._current_zone)
         self._current_zone = best_zone
 
-        cx, cy = self._zones[best_zone][0], self._zones[best_zone][1]
-        max_dist = np.sqrt(0.5)  # max possible distance in normalized space
-        confidence = max(0.0, 1.0 - best_dist / max_dist)
+        cx, cy = self._center_list[best_zone]
+        best_dist = math.sqrt((screen_x - cx) ** 2 + (screen_y - cy) ** 2)
+        # Same result as np.round(x, 3): round half to even on x * 1000
+        confidence = round(max(0.0, 1.0 - best_dist / _MAX_DIST) * 1000.0) / 1000.0
 
         return ZoneResult(
             zone_id=best_zone,
-            confidence=round(confidence, 3),
+            confidence=confidence,
             center_x=cx,
             center_y=cy,
         )
 
+    def map_batch(self, xs, ys) -> ZoneBatchResult:
+        """Map a sequence of gaze samples, applying hysteresis in order.
+
+        Equivalent to calling ``map`` on each (x, y) pair in turn, including
+        the final ``current_zone``.  Cell indices and confidences are
+        computed vectorised; only the sequential state walk is a loop.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        if xs.shape != ys.shape or xs.ndim != 1:
+            raise ValueError("xs and ys must be 1-D arrays of equal length")
+
+        res = self._grid_res
+        sx, sy = xs * res, ys * res
+        ix, iy = np.floor(sx), np.floor(sy)
+        # Points off the unit square or exactly on a grid line take the exact path
+        fast = (
+            (xs >= 0.0) & (xs < 1.0) & (ys >= 0.0) & (ys < 1.0)
+            & (sx != ix) & (sy != iy)
+        )
+        cells = np.where(fast, iy * res + ix, -1).astype(np.int64).tolist()
+        x_list, y_list = xs.tolist(), ys.tolist()
+
+        zone_ids = np.empty(len(cells), dtype=np.int64)
+        state = self._current_zone
+        for i, cell in enumerate(cells):
+            if cell >= 0:
+                grid = self._grids.get(state) or self._build_grid(state)
+                zone = grid[1][cell]
+                if zone == self._AMBIGUOUS:
+                    candidates = self._candidates(grid, cell)
+                    zone = self._resolve(x_list[i], y_list[i], candidates, grid[3])
+            else:
+                zone = self._map_exact(x_list[i], y_list[i], state)
+            zone_ids[i] = zone
+            state = zone
+        self._current_zone = state
+
+        cx = self._centers[zone_ids, 0]
+        cy = self._centers[zone_ids, 1]
+        dist = np.sqrt((xs - cx) ** 2 + (ys - cy) ** 2)
+        confidences = np.round(np.maximum(0.0, 1.0 - dist / _MAX_DIST), 3)
+        return ZoneBatchResult(
+            zone_ids=zone_ids, confidences=confidences, center_x=cx, center_y=cy
+        )
+
     def set_num_zones(self, num_zones: int) -> None:
         """Change the zone layout."""
         self._num_zones = num_zones
-        self._zones = self._build_zones(num_zones)
+        self._set_geometry(self._build_zones(num_zones))
         self._current_zone = -1
 
+    # ------------------------------------------------------------------
+    # Decision
+    # ------------------------------------------------------------------
+
+    def _decide(self, x: float, y: float, current_zone: int) -> int:
+        res = self._grid_res
+        sx, sy = x * res, y * res
+        if 0.0 <= x < 1.0 and 0.0 <= y < 1.0:
+            ix, iy = int(sx), int(sy)
+            if sx != ix and sy != iy:
+                grid = self._grids.get(current_zone) or self._build_grid(current_zone)
+                cell = iy * res + ix
+                zone = grid[1][cell]
+                if zone != self._AMBIGUOUS:
+                    return zone
+                return self._resolve(x, y, self._candidates(grid, cell), grid[3])
+        return self._map_exact(x, y, current_zone)
+
+    def _resolve(
+        self,
+        x: float,
+        y: float,
+        candidates: tuple[int, ...],
+        boxes: list[tuple[float, float, float, float]],
+    ) -> int:
+        """Closest centre among ``candidates`` containing the point, else closest overall."""
+        best_zone = -1
+        best_dist = math.inf
+        centers = self._center_list
+        for zone_id in candidates:
+            x1, y1, x2, y2 = boxes[zone_id]
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                cx, cy = centers[zone_id]
+                dist = math.sqrt((x - cx) ** 2 + (y - cy) ** 2)
+                if dist < best_dist:
+                    best_zone = zone_id
+                    best_dist = dist
+        if best_zone == -1:
+            return self._nearest(x, y)
+        return best_zone
+
+    def _nearest(self, x: float, y: float) -> int:
+        """Closest zone centre (first zone wins ties)."""
+        res = self._grid_res
+        sx, sy = x * res, y * res
+        if 0.0 <= x < 1.0 and 0.0 <= y < 1.0:
+            ix, iy = int(sx), int(sy)
+            if sx != ix and sy != iy:
+                if self._nearest_cells is None:
+                    self._nearest_cells = self._corner_consistent_zones(
+                        np.ones((len(self._center_list), res, res), dtype=bool)
+                    ).ravel().tolist()
+                zone = self._nearest_cells[iy * res + ix]
+                if zone != self._AMBIGUOUS:
+                    return zone
+        best_zone = 0
+        best_dist = math.inf
+        for zone_id, (cx, cy) in enumerate(self._center_list):
+            dist = math.sqrt((x - cx) ** 2 + (y - cy) ** 2)
+            if dist < best_dist:
+                best_zone = zone_id
+                best_dist = dist
+        return best_zone
+
+    def _map_exact(self, x: float, y: float, current_zone: int) -> int:
+        """Reference decision: scan every zone."""
+        boxes = self._margined_boxes(current_zone)
+        return self._resolve(x, y, tuple(range(len(boxes))), boxes)
+
+    # ------------------------------------------------------------------
+    # Geometry and lookup grids
+    # ------------------------------------------------------------------
+
+    def _set_geometry(
+        self, zones: dict[int, tuple[float, float, float, float, float, float]]
+    ) -> None:
+        self._zones = zones
+        geom = np.array([zones[i] for i in range(len(zones))], dtype=np.float64)
+        self._centers = geom[:, 0:2]  # (n, 2) cx, cy
+        self._boxes = geom[:, 2:6]  # (n, 4) x1, y1, x2, y2
+        self._center_list = [(float(cx), float(cy)) for cx, cy in self._centers]
+        # state -> (cell zones array, cell zones list, crossing mask, margined boxes,
+        #           {cell: candidates})
+        self._grids: dict[int, tuple] = {}
+        self._nearest_cells: list[int] | None = None
+
+        res = self._grid_res
+        edges = np.arange(res + 1) / res
+        # Zone-major layouts keep per-cell reductions over zones cheap
+        dx = edges[None, None, :] - self._centers[:, 0, None, None]
+        dy = edges[None, :, None] - self._centers[:, 1, None, None]
+        self._corner_dist = np.sqrt(dx * dx + dy * dy)  # (n, res+1, res+1)
+
+    def _margined_boxes(self, current_zone: int) -> list[tuple[float, float, float, float]]:
+        """Zone boxes with hysteresis: the current zone shrinks, the others grow."""
+        boxes = []
+        for zone_id, (x1, y1, x2, y2) in enumerate(self._boxes.tolist()):
+            margin = -self._hysteresis if zone_id == current_zone else self._hysteresis
+            boxes.append((x1 - margin, y1 - margin, x2 + margin, y2 + margin))
+        return boxes
+
+    def _build_grid(self, current_zone: int) -> tuple:
+        """Build the lookup grid for one hysteresis state.
+
+        Every zone box is classified per cell as containing it, excluding
+        it, or crossing it.  Cells with no crossing box get a fixed zone if
+        the nearest candidate centre is the same at all four corners
+        (nearest-centre regions are convex).  Remaining cells keep the
+        zones whose box contains or crosses them as candidates.
+        """
+        res = self._grid_res
+        edges = np.arange(res + 1) / res
+        lo, hi = edges[None, :-1], edges[None, 1:]
+
+        boxes = self._margined_boxes(current_zone)
+        b = np.array(boxes, dtype=np.float64)
+        bx1, by1, bx2, by2 = (b[:, k, None] for k in range(4))
+
+        # Per-axis interval relations, shape (n, res)
+        x_in = (bx1 <= lo) & (hi <= bx2)
+        x_out = (hi < bx1) | (lo > bx2)
+        y_in = (by1 <= lo) & (hi <= by2)
+        y_out = (hi < by1) | (lo > by2)
+
+        # Cell relations, shape (n, res_y, res_x)
+        cell_in = y_in[:, :, None] & x_in[:, None, :]
+        cell_out = y_out[:, :, None] | x_out[:, None, :]
+        decided = (cell_in | cell_out).all(axis=0)
+        # No containing zone -> nearest over all zones
+        candidates = cell_in | ~cell_in.any(axis=0)
+
+        zones = self._corner_consistent_zones(candidates)
+        zones = np.where(decided, zones, self._AMBIGUOUS).astype(np.int16)
+
+        # (res * res, n) so a cell's candidate row is contiguous
+        crossing = np.ascontiguousarray(~cell_out.reshape(len(boxes), -1).T)
+        grid = (zones, zones.ravel().tolist(), crossing, boxes, {})
+        self._grids[current_zone] = grid
+        return grid
+
+    @staticmethod
+    def _candidates(grid: tuple, cell: int) -> tuple[int, ...]:
+        """Zones whose box contains or crosses an ambiguous cell (memoised)."""
+        cache = grid[4]
+        cands = cache.get(cell)
+        if cands is None:
+            cands = cache[cell] = tuple(np.flatnonzero(grid[2][cell]).tolist())
+        return cands
+
+    def _corner_consistent_zones(self, candidates: np.ndarray) -> np.ndarray:
+        """Per cell, the zone nearest to all four corners, or _AMBIGUOUS.
+
+        ``candidates`` is an (n, res, res) mask of zones to consider per
+        cell.  A zone qualifies if it is (within float tolerance) nearest at
+        every corner and strictly nearest at one or more; ties on the cell's
+        lower edges are handled by routing grid-line points to the exact path.
+        """
+        res = self._grid_res
+        corner_dist = self._corner_dist
+
+        nearest_all = np.ones(candidates.shape, dtype=bool)
+        strict_any = np.zeros(candidates.shape, dtype=bool)
+        for oy, ox in ((0, 0), (0, 1), (1, 0), (1, 1)):
+            d = np.where(candidates, corner_dist[:, oy : oy + res, ox : ox + res], np.inf)
+            tied = d <= d.min(axis=0) + self._TIE_EPS
+            nearest_all &= tied
+            strict_any |= tied & (tied.sum(axis=0) == 1)
+
+        qualifies = nearest_all & strict_any
+        unique = qualifies.sum(axis=0) == 1
+        return np.where(unique, qualifies.argmax(axis=0), self._AMBIGUOUS)
+
     def _build_zones(self, n: int) -> dict[int, tuple[float, float, float, float, float, float]]:
         """Build zone definitions: {id: (center_x, center_y, x1, y1, x2, y2)}."""
         if n == 4:
@@ -2,6 +2,9 @@
 
 Parses LLM output into structured Candidate objects.
 Handles various output formats (JSON, plain text).
+
+StreamingCandidateParser parses the JSON array incrementally while tokens
+arrive, emitting each Candidate as soon as its object closes.
 """
 
 from __future__ import annotations
@@ -57,23 +60,35 @@ def _try_parse_json(
 
     candidates = []
     for i, item in enumerate(items):
-        if not isinstance(item, dict) or "text" not in item:
-            continue
+        candidate = _candidate_from_item(item, i, stage, latency_ms)
+        if candidate is not None:
+            candidates.append(candidate)
 
-        intent_str = item.get("intent", "")
-        intent = _resolve_intent(intent_str, i)
-        confidence = float(item.get("confidence", 0.7))
-        confidence = max(0.0, min(1.0, confidence))
+    return candidates
 
-        candidates.append(Candidate(
-            text=item["text"].strip(),
-            intent_axis=intent,
-            confidence=confidence,
-            generation_stage=stage,
-            latency_ms=latency_ms,
-        ))
 
-    return candidates
+def _candidate_from_item(
+    item: object, index: int, stage: GenerationStage, latency_ms: int
+) -> Candidate | None:
+    """Build a Candidate from one decoded JSON array item, or None if invalid."""
+    if not isinstance(item, dict) or "text" not in item:
+        return None
+
+    intent_str = item.get("intent", "")
+    intent = _resolve_intent(intent_str, index)
+    try:
+        confidence = float(item.get("confidence", 0.7))
+    except (TypeError, ValueError):
+        confidence = 0.7
+    confidence = max(0.0, min(1.0, confidence))
+
+    return Candidate(
+        text=str(item["text"]).strip(),
+        intent_axis=intent,
+        confidence=confidence,
+        generation_stage=stage,
+        latency_ms=latency_ms,
+    )
 
 
 def _try_parse_lines(
@@ -113,3 +128,101 @@ def _resolve_intent(intent_str: str, index: int) -> IntentAxis:
         return IntentAxis(intent_str)
     # Fallback: cycle through default intents
     return DEFAULT_INTENT_CYCLE[index % len(DEFAULT_INTENT_CYCLE)]
+
+
+class StreamingCandidateParser:
+    """Incremental parser for a streamed JSON array of candidate objects.
+
+    Feed text chunks as they arrive; each call returns the candidates whose
+    objects closed within that chunk.  Text before the first ``[`` (e.g. a
+    code fence) is skipped, and finish() falls back to parse_candidates()
+    on the full text when no JSON candidates were found.
+    """
+
+    def __init__(self, stage: GenerationStage, max_candidates: int = 4) -> None:
+        self._stage = stage
+        self._max = max_candidates
+        self._text: list[str] = []
+        self._candidates: list[Candidate] = []
+        self._items = 0  # array items seen, for intent fallback cycling
+
+        # Scanner state
+        self._depth = 0  # 0 = outside the array, 1 = inside it, 2+ = inside an item
+        self._array_done = False
+        self._in_string = False
+        self._escape = False
+        self._item_chars: list[str] = []
+
+    @property
+    def candidates(self) -> list[Candidate]:
+        return list(self._candidates)
+
+    @property
+    def text(self) -> str:
+        return "".join(self._text)
+
+    @property
+    def done(self) -> bool:
+        """True once the array closed or max_candidates were parsed."""
+        return self._array_done or len(self._candidates) >= self._max
+
+    def feed(self, chunk: str, latency_ms: int) -> list[Candidate]:
+        """Consume a chunk; return candidates completed by it."""
+        self._text.append(chunk)
+        if self.done:
+            return []
+
+        new: list[Candidate] = []
+        item = self._item_chars
+        for ch in chunk:
+            if self._depth == 0:
+                if ch == "[":
+                    self._depth = 1
+                continue
+            if self._depth >= 2:
+                item.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 2:
+                    item.append(ch)
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._array_done = True
+                    break
+                if self._depth == 1:
+                    candidate = self._finish_item("".join(item), latency_ms)
+                    item.clear()
+                    if candidate is not None:
+                        new.append(candidate)
+                        if self.done:
+                            break
+        return new
+
+    def finish(self, latency_ms: int) -> list[Candidate]:
+        """All parsed candidates, with line-based fallback for non-JSON output."""
+        if self._candidates:
+            return list(self._candidates)
+        return parse_candidates(self.text, self._stage, latency_ms, self._max)
+
+    def _finish_item(self, raw: str, latency_ms: int) -> Candidate | None:
+        index = self._items
+        self._items += 1
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        candidate = _candidate_from_item(item, index, self._stage, latency_ms)
+        if candidate is not None:
+            self._candidates.append(candidate)
+        return candidate
@@ -0,0 +1,287 @@
+"""Semantic cache of past candidate sets (Stage 0).
+
+Most of a patient's day is made of recurring situations - greetings,
+"are you in pain?", meal times - so the candidates generated the last
+time the same thing was said are usually good candidates now.  The cache
+maps a conversation context to the best CandidateSet generated for it and
+serves it instantly, before Stage 1 has even started.
+
+Contexts are matched on:
+  - the environment (location, people, time of day, activity): exact
+  - the last few conversation turns: cosine similarity of hashed
+    character-bigram vectors, which tolerates small wording and
+    punctuation differences without needing an embedding model
+
+Entries expire after a TTL and the least recently used ones are evicted
+beyond the capacity.  Each patient's cache is persisted to its own JSON
+file under ``settings.cache_dir``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+import numpy as np
+
+from voicereach.config import settings
+from voicereach.models.events import Candidate, CandidateSet, GenerationStage
+
+if TYPE_CHECKING:
+    from voicereach.models.context import ContextFrame
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+_VECTOR_DIM = 512
+
+
+def _normalize(text: str) -> str:
+    return "".join(unicodedata.normalize("NFKC", text).lower().split())
+
+
+def _embed(text: str) -> np.ndarray:
+    """L2-normalized hashed character-bigram counts."""
+    vec = np.zeros(_VECTOR_DIM, dtype=np.float32)
+    padded = f"^{text}$"
+    for i in range(len(padded) - 1):
+        vec[zlib.crc32(padded[i:i + 2].encode()) % _VECTOR_DIM] += 1.0
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+@dataclass
+class _Entry:
+    env_key: str
+    history: str
+    candidates: list[dict]
+    created_at: float  # time.time()
+    last_used: float
+    hits: int = 0
+    vector: np.ndarray | None = field(default=None, repr=False)
+
+
+@dataclass
+class CandidateCacheStats:
+    """Lookup counters."""
+    lookups: int = 0
+    exact_hits: int = 0
+    similar_hits: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        return (self.exact_hits + self.similar_hits) / self.lookups if self.lookups else 0.0
+
+
+class CandidateCache:
+    """Context -> CandidateSet cache with similarity lookup, TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        capacity: int = 2000,
+        ttl_s: float = 30 * 86400,
+        similarity_threshold: float = 0.9,
+        history_turns: int = 2,
+    ) -> None:
+        """
+        Args:
+            path: JSON file to load from / save to (None: memory only).
+            capacity: Maximum entries; least recently used are evicted.
+            ttl_s: Entries older than this are dropped.
+            similarity_threshold: Minimum cosine similarity of the recent
+                conversation for a non-exact match.
+            history_turns: Conversation turns that make up the key.
+        """
+        self.path = Path(path) if path is not None else None
+        self._capacity = capacity
+        self._ttl_s = ttl_s
+        self._threshold = similarity_threshold
+        self._history_turns = history_turns
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._dirty = False
+        self.stats = CandidateCacheStats()
+
+    @classmethod
+    def for_patient(cls, patient_id: str, **kwargs) -> CandidateCache:
+        """The persistent cache of one patient, under settings.cache_dir."""
+        return cls(settings.cache_dir / "candidates" / f"{patient_id}.json", **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _env_key(context: ContextFrame) -> str:
+        env = context.environment
+        return "|".join((
+            _normalize(env.location),
+            ",".join(sorted(_normalize(p) for p in env.people_present)),
+            _normalize(env.time_of_day),
+            _normalize(env.activity),
+        ))
+
+    def _history_key(self, context: ContextFrame) -> str:
+        turns = context.conversation_history[-self._history_turns:]
+        return "\n".join(f"{t.role}:{_normalize(t.text)}" for t in turns)
+
+    @staticmethod
+    def _key(env_key: str, history: str) -> str:
+        return hashlib.sha1(f"{env_key}\n{history}".encode()).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def lookup(self, context: ContextFrame, request_id: str | None = None) -> CandidateSet | None:
+        """Stage 0 candidates for ``context``, or None if nothing similar is cached."""
+        self.stats.lookups += 1
+        env_key = self._env_key(context)
+        history = self._history_key(context)
+        now = time.time()
+
+        key = self._key(env_key, history)
+        entry = self._entries.get(key)
+        similarity = 1.0
+        if entry is not None and now - entry.created_at > self._ttl_s:
+            self._drop(key)
+            entry = None
+        if entry is not None:
+            self.stats.exact_hits += 1
+        else:
+            entry, similarity = self._most_similar(env_key, history, now)
+            if entry is None:
+                return None
+            self.stats.similar_hits += 1
+
+        entry.hits += 1
+        entry.last_used = now
+        self._entries.move_to_end(self._key(entry.env_key, entry.history))
+        self._dirty = True
+        return CandidateSet(
+            candidates=[
+                Candidate(
+                    **{**c, "confidence": c["confidence"] * similarity},
+                    generation_stage=GenerationStage.INSTANT,
+                    latency_ms=0,
+                )
+                for c in entry.candidates
+            ],
+            stage=GenerationStage.INSTANT,
+            request_id=request_id or uuid4().hex[:12],
+        )
+
+    def store(self, context: ContextFrame, candidate_set: CandidateSet) -> None:
+        """Remember ``candidate_set`` as the answer to ``context``."""
+        if not candidate_set.candidates or not context.conversation_history:
+            return
+        env_key = self._env_key(context)
+        history = self._history_key(context)
+        key = self._key(env_key, history)
+        now = time.time()
+        self._entries.pop(key, None)
+        self._entries[key] = _Entry(
+            env_key=env_key,
+            history=history,
+            candidates=[
+                c.model_dump(mode="json", include={"text", "intent_axis", "confidence"})
+                for c in candidate_set.candidates
+            ],
+            created_at=now,
+            last_used=now,
+            vector=_embed(history),
+        )
+        self.stats.stores += 1
+        self._dirty = True
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _most_similar(
+        self, env_key: str, history: str, now: float
+    ) -> tuple[_Entry | None, float]:
+        candidates = [
+            (key, e) for key, e in self._entries.items()
+            if e.env_key == env_key and now - e.created_at <= self._ttl_s
+        ]
+        if not candidates:
+            return None, 0.0
+        matrix = np.stack([e.vector for _, e in candidates])
+        scores = matrix @ _embed(history)
+        best = int(np.argmax(scores))
+        if scores[best] < self._threshold:
+            return None, 0.0
+        return candidates[best][1], float(scores[best])
+
+    def _drop(self, key: str) -> None:
+        del self._entries[key]
+        self.stats.evictions += 1
+        self._dirty = True
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self) -> int:
+        """Load entries from ``path``; returns how many were loaded."""
+        if self.path is None or not self.path.exists():
+            return 0
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            logger.warning("Unreadable candidate cache at %s; starting empty", self.path)
+            return 0
+        if data.get("version") != CACHE_FORMAT_VERSION:
+            logger.warning("Ignoring candidate cache with version %r", data.get("version"))
+            return 0
+        now = time.time()
+        self._entries.clear()
+        # Saved least recently used first, so insertion order is LRU order
+        for raw in data["entries"]:
+            if now - raw["created_at"] > self._ttl_s:
+                continue
+            entry = _Entry(**raw)
+            entry.vector = _embed(entry.history)
+            self._entries[self._key(entry.env_key, entry.history)] = entry
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+        self._dirty = False
+        logger.info("Loaded %d cached candidate sets from %s", len(self._entries), self.path)
+        return len(self._entries)
+
+    def save(self) -> None:
+        """Write entries to ``path`` (atomically) if anything changed."""
+        if self.path is None or not self._dirty:
+            return
+        entries = [
+            {
+                "env_key": e.env_key,
+                "history": e.history,
+                "candidates": e.candidates,
+                "created_at": e.created_at,
+                "last_used": e.last_used,
+                "hits": e.hits,
+            }
+            for e in self._entries.values()
+        ]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(
+            {"version": CACHE_FORMAT_VERSION, "entries": entries}, ensure_ascii=False
+        ))
+        tmp.replace(self.path)
+        self._dirty = False
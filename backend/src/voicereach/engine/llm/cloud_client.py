@@ -2,19 +2,46 @@
 
 Provider priority: Gemini 2.5 Flash -> Claude Haiku 4.5 -> GPT-4.1 nano
 Supports prompt caching for 90% cost reduction.
+
+Each provider gets one long-lived SDK client backed by a pooled keep-alive
+HTTP client (HTTP/2 when the ``h2`` package is installed), created on
+first use and warmed at startup, so a request only pays for the TLS
+handshake if the pooled connection was dropped.  ``timeout_s`` is one
+deadline for the whole call, failover included.
+
+The static and session prompt layers are cached provider-side (see
+prompt_cache); cache_stats reports the hit ratios.
+
+Requests are hedged: when the current provider has not answered within
+its own recent p90 latency (cloud_hedge_percentile), the next provider
+is started in parallel and the first valid answer wins.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import importlib.util
 import logging
+from dataclasses import dataclass
 from enum import Enum
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import httpx
 
 from voicereach.config import settings
+from voicereach.engine.llm.prompt_cache import GeminiContextCache, PromptCacheStats
+from voicereach.engine.metrics import LatencyHistogram
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
 
 logger = logging.getLogger(__name__)
 
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+T = TypeVar("T")
+
 
 class CloudProvider(str, Enum):
     GEMINI = "gemini"
@@ -22,6 +49,21 @@ class CloudProvider(str, Enum):
     OPENAI = "openai"
 
 
+# Hosts contacted by warmup() / the keepalive loop
+BASE_URLS: dict[CloudProvider, str] = {
+    CloudProvider.GEMINI: "https://generativelanguage.googleapis.com",
+    CloudProvider.ANTHROPIC: "https://api.anthropic.com",
+    CloudProvider.OPENAI: "https://api.openai.com",
+}
+
+
+@dataclass
+class CloudStats:
+    """Hedging counters."""
+    hedges: int = 0  # backup requests fired while an earlier one was still running
+    hedge_wins: int = 0  # races won by a backup request
+
+
 class CloudLLMClient:
     """Multi-provider cloud LLM client with automatic failover."""
 
@@ -33,6 +75,142 @@ class CloudLLMClient:
             self._providers.append(CloudProvider.ANTHROPIC)
         if settings.openai_api_key:
             self._providers.append(CloudProvider.OPENAI)
+        self._http: dict[CloudProvider, Any] = {}
+        self._sdk: dict[CloudProvider, Any] = {}
+        self._keepalive_task: asyncio.Task | None = None
+        # Per-provider latency of full completions / of the first streamed delta
+        self.latency: dict[CloudProvider, LatencyHistogram] = {}
+        self.first_token_latency: dict[CloudProvider, LatencyHistogram] = {}
+        self.stats = CloudStats()
+        self.cache_stats = {provider: PromptCacheStats() for provider in CloudProvider}
+        self._gemini_cache: GeminiContextCache | None = None
+        if settings.gemini_context_cache:
+            self._gemini_cache = GeminiContextCache(
+                lambda: self._sdk_client(CloudProvider.GEMINI),
+                settings.gemini_model,
+                ttl_s=settings.gemini_cache_ttl_s,
+                refresh_margin_s=settings.gemini_cache_refresh_margin_s,
+            )
+
+    # ------------------------------------------------------------------
+    # Connection management
+    # ------------------------------------------------------------------
+
+    def _new_http_client(self, provider: CloudProvider):
+        """Build the pooled HTTP client for one provider.
+
+        The OpenAI and Anthropic SDKs ship their own httpx flavour, so
+        their clients come from the SDK's DefaultAsyncHttpxClient factory.
+        """
+        kwargs = dict(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.cloud_max_connections,
+                max_keepalive_connections=settings.cloud_max_connections,
+                keepalive_expiry=settings.cloud_keepalive_expiry_s,
+            ),
+            timeout=httpx.Timeout(
+                settings.cloud_llm_timeout_s, connect=settings.cloud_llm_timeout_s
+            ),
+        )
+        if provider == CloudProvider.ANTHROPIC:
+            import anthropic
+
+            return anthropic.DefaultAsyncHttpxClient(**kwargs)
+        if provider == CloudProvider.OPENAI:
+            import openai
+
+            return openai.DefaultAsyncHttpxClient(**kwargs)
+        return httpx.AsyncClient(**kwargs)
+
+    def _http_client(self, provider: CloudProvider):
+        """The provider's pooled HTTP client, (re)created if missing or closed."""
+        client = self._http.get(provider)
+        if client is None or client.is_closed:
+            client = self._http[provider] = self._new_http_client(provider)
+            self._sdk.pop(provider, None)
+        return client
+
+    def _sdk_client(self, provider: CloudProvider):
+        """The provider's long-lived SDK client, bound to its pooled HTTP client."""
+        http = self._http_client(provider)
+        client = self._sdk.get(provider)
+        if client is not None:
+            return client
+        # Failover to the next provider beats retrying inside the deadline
+        if provider == CloudProvider.GEMINI:
+            from google import genai
+
+            client = genai.Client(
+                api_key=settings.gemini_api_key,
+                http_options=genai.types.HttpOptions(
+                    httpx_async_client=http,
+                    retry_options=genai.types.HttpRetryOptions(attempts=1),
+                ),
+            )
+        elif provider == CloudProvider.ANTHROPIC:
+            import anthropic
+
+            client = anthropic.AsyncAnthropic(
+                api_key=settings.anthropic_api_key, http_client=http, max_retries=0
+            )
+        else:
+            from openai import AsyncOpenAI
+
+            client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=http, max_retries=0)
+        self._sdk[provider] = client
+        return client
+
+    async def warmup(self) -> None:
+        """Open a pooled connection to every configured provider.
+
+        Any HTTP response counts: the point is the TCP + TLS handshake, not
+        the status code.  Starts the keepalive loop when
+        ``cloud_keepalive_interval_s`` is set.
+        """
+        await asyncio.gather(*(self._ping(p) for p in self._providers))
+        interval = settings.cloud_keepalive_interval_s
+        if interval > 0 and self._providers and self._keepalive_task is None:
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop(interval))
+
+    async def _ping(self, provider: CloudProvider) -> None:
+        try:
+            await self._http_client(provider).head(
+                BASE_URLS[provider], timeout=settings.cloud_llm_timeout_s
+            )
+        except Exception as e:
+            logger.warning("Could not pre-connect to %s: %s", provider.value, e)
+
+    async def _keepalive_loop(self, interval: float) -> None:
+        """Touch each provider periodically so idle connections are not dropped."""
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.gather(*(self._ping(p) for p in self._providers))
+
+    async def aclose(self) -> None:
+        """Stop the keepalive loop and close all pooled connections."""
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._keepalive_task
+            self._keepalive_task = None
+        if self._gemini_cache is not None:
+            await self._gemini_cache.aclose()
+        for provider, stats in self.cache_stats.items():
+            if stats.requests:
+                logger.info(
+                    "%s prompt cache: %.0f%% of requests hit, %.0f%% of prompt tokens cached",
+                    provider.value, stats.hit_ratio * 100, stats.token_hit_ratio * 100,
+                )
+        clients = list(self._http.values())
+        self._http.clear()
+        self._sdk.clear()
+        for client in clients:
+            await client.aclose()
+
+    # ------------------------------------------------------------------
+    # Generation
+    # ------------------------------------------------------------------
 
     async def generate(
         self,
@@ -43,23 +221,187 @@ class CloudLLMClient:
     ) -> str | None:
         """Generate using cloud LLM with automatic failover.
 
-        Tries providers in priority order until one succeeds.
+        Providers are tried in priority order within one ``timeout_s``
+        deadline; with hedging enabled a slow provider is raced against
+        the next one (see _race).
+        """
+        timeout_s = timeout_s or settings.cloud_llm_timeout_s
+
+        async def attempt(provider: CloudProvider, remaining: float) -> str | None:
+            return await self._call_provider(
+                provider, messages, temperature, max_tokens, remaining
+            )
+
+        won = await self._race(attempt, timeout_s, self.latency)
+        if won is None:
+            logger.error("All cloud providers failed")
+            return None
+        return won[1]
+
+    async def generate_stream(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.8,
+        max_tokens: int = 100,
+        timeout_s: float | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream text deltas from the first provider that starts answering.
+
+        Failover and hedging only happen before the first delta; a
+        provider failing mid-stream ends the stream (its partial text has
+        already been consumed).
         """
         timeout_s = timeout_s or settings.cloud_llm_timeout_s
 
-        for provider in self._providers:
+        async def attempt(provider: CloudProvider, remaining: float):
+            stream = self._stream_provider(
+                provider, messages, temperature, max_tokens, remaining
+            )
             try:
-                result = await self._call_provider(
-                    provider, messages, temperature, max_tokens, timeout_s
-                )
-                if result:
-                    return result
-            except Exception:
-                logger.warning("Cloud provider %s failed, trying next", provider)
-                continue
+                first = await anext(stream)
+            except StopAsyncIteration:
+                return None
+            except BaseException:
+                await stream.aclose()
+                raise
+            return stream, first
+
+        won = await self._race(
+            attempt, timeout_s, self.first_token_latency, discard=lambda r: r[0].aclose()
+        )
+        if won is None:
+            logger.error("All cloud providers failed")
+            return
+        provider, (stream, first) = won
+        try:
+            yield first
+            async for delta in stream:
+                yield delta
+        except Exception:
+            logger.warning("Cloud provider %s failed mid-stream", provider)
+        finally:
+            await stream.aclose()
+
+    # ------------------------------------------------------------------
+    # Failover / hedging
+    # ------------------------------------------------------------------
+
+    def hedge_delay_s(
+        self,
+        provider: CloudProvider,
+        histograms: dict[CloudProvider, LatencyHistogram] | None = None,
+    ) -> float:
+        """How long to wait on ``provider`` before firing the next one.
 
-        logger.error("All cloud providers failed")
-        return None
+        The configured percentile of the provider's recent latencies once
+        enough samples exist, cloud_hedge_default_delay_ms before that;
+        infinite (plain sequential failover) with hedging disabled.
+        """
+        if not settings.cloud_hedging:
+            return float("inf")
+        histogram = (histograms if histograms is not None else self.latency).get(provider)
+        if histogram is not None and len(histogram) >= settings.cloud_hedge_min_samples:
+            delay_ms = histogram.percentile(settings.cloud_hedge_percentile)
+        else:
+            delay_ms = settings.cloud_hedge_default_delay_ms
+        return max(delay_ms, settings.cloud_hedge_min_delay_ms) / 1000
+
+    async def _race(
+        self,
+        attempt: Callable[[CloudProvider, float], Awaitable[T | None]],
+        timeout_s: float,
+        histograms: dict[CloudProvider, LatencyHistogram],
+        discard: Callable[[T], Awaitable[None]] | None = None,
+    ) -> tuple[CloudProvider, T] | None:
+        """Run ``attempt`` per provider until one returns a truthy result.
+
+        The next provider starts when every running attempt has failed
+        (failover) or when the most recently started one has been running
+        for longer than its hedge delay (hedging).  The first valid result
+        wins; the other attempts are cancelled and any result they already
+        produced is handed to ``discard``.  All attempts share the
+        ``timeout_s`` deadline.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_s
+        queue = list(self._providers)
+        running: dict[asyncio.Task, tuple[CloudProvider, float, bool]] = {}
+        next_hedge_at = float("inf")
+        winner: tuple[CloudProvider, T] | None = None
+
+        def launch(hedge: bool) -> None:
+            nonlocal next_hedge_at
+            provider = queue.pop(0)
+            now = loop.time()
+            task = asyncio.create_task(attempt(provider, deadline - now))
+            running[task] = (provider, now, hedge)
+            next_hedge_at = now + self.hedge_delay_s(provider, histograms)
+            if hedge:
+                self.stats.hedges += 1
+                logger.debug("Hedging cloud request with %s", provider.value)
+
+        try:
+            while winner is None and (running or queue):
+                now = loop.time()
+                if now >= deadline:
+                    logger.warning("Cloud deadline of %.1fs exhausted", timeout_s)
+                    break
+                if queue and (not running or now >= next_hedge_at):
+                    launch(hedge=bool(running))
+                    continue
+                wake = min(deadline, next_hedge_at) if queue else deadline
+                done, _ = await asyncio.wait(
+                    running, timeout=wake - now, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    provider, started, hedged = running.pop(task)
+                    exc = task.exception()
+                    if exc is not None or not task.result():
+                        logger.warning("Cloud provider %s failed: %r", provider, exc)
+                        continue
+                    histograms.setdefault(provider, LatencyHistogram()).record(
+                        (loop.time() - started) * 1000
+                    )
+                    if winner is None:
+                        winner = (provider, task.result())
+                        if hedged:
+                            self.stats.hedge_wins += 1
+                    elif discard is not None:
+                        await discard(task.result())
+        finally:
+            losers = list(running)
+            now = loop.time()
+            for task in losers:
+                provider, started, _ = running[task]
+                histograms.setdefault(provider, LatencyHistogram()).record_censored(
+                    (now - started) * 1000
+                )
+                task.cancel()
+            if losers:
+                await asyncio.wait(losers)
+                for task in losers:
+                    if (
+                        discard is not None
+                        and not task.cancelled()
+                        and task.exception() is None
+                        and task.result()
+                    ):
+                        await discard(task.result())
+        return winner
+
+    def _stream_provider(
+        self,
+        provider: CloudProvider,
+        messages: list[dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        timeout_s: float,
+    ) -> AsyncIterator[str]:
+        if provider == CloudProvider.GEMINI:
+            return self._stream_gemini(messages, temperature, max_tokens, timeout_s)
+        if provider == CloudProvider.ANTHROPIC:
+            return self._stream_anthropic(messages, temperature, max_tokens, timeout_s)
+        return self._stream_openai(messages, temperature, max_tokens, timeout_s)
 
     async def _call_provider(
         self,
@@ -82,30 +424,16 @@ class CloudLLMClient:
         self, messages, temperature, max_tokens, timeout_s
     ) -> str | None:
         """Call Google Gemini API."""
-        from google import genai
-
-        client = genai.Client(api_key=settings.gemini_api_key)
-
-        # Convert messages to Gemini format
-        contents = []
-        system_instruction = None
-        for msg in messages:
-            if msg["role"] == "system":
-                system_instruction = msg["content"]
-            else:
-                contents.append({"role": msg["role"], "parts": [{"text": msg["content"]}]})
-
-        config = genai.types.GenerateContentConfig(
-            temperature=temperature,
-            max_output_tokens=max_tokens,
-            system_instruction=system_instruction,
-        )
-
-        response = await client.aio.models.generate_content(
-            model=settings.gemini_model,
-            contents=contents,
-            config=config,
-        )
+        client = self._sdk_client(CloudProvider.GEMINI)
+        request = self._gemini_request(messages, temperature, max_tokens, timeout_s)
+        try:
+            response = await client.aio.models.generate_content(
+                model=settings.gemini_model, **request
+            )
+        except Exception:
+            self._drop_gemini_cache(request)
+            raise
+        self._record_gemini_usage(response.usage_metadata)
 
         if response.text:
             return response.text.strip()
@@ -115,25 +443,18 @@ class CloudLLMClient:
         self, messages, temperature, max_tokens, timeout_s
     ) -> str | None:
         """Call Anthropic Claude API."""
-        import anthropic
-
-        client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
-
-        system_text = ""
-        api_messages = []
-        for msg in messages:
-            if msg["role"] == "system":
-                system_text = msg["content"]
-            else:
-                api_messages.append(msg)
+        client = self._sdk_client(CloudProvider.ANTHROPIC)
+        system, api_messages = _anthropic_system(messages)
 
         response = await client.messages.create(
             model=settings.anthropic_model,
             max_tokens=max_tokens,
-            system=system_text,
+            system=system,
             messages=api_messages,
             temperature=temperature,
+            timeout=timeout_s,
         )
+        self._record_anthropic_usage(response.usage)
 
         if response.content:
             return response.content[0].text.strip()
@@ -143,9 +464,7 @@ class CloudLLMClient:
         self, messages, temperature, max_tokens, timeout_s
     ) -> str | None:
         """Call OpenAI API."""
-        from openai import AsyncOpenAI
-
-        client = AsyncOpenAI(api_key=settings.openai_api_key)
+        client = self._sdk_client(CloudProvider.OPENAI)
 
         response = await client.chat.completions.create(
             model=settings.openai_model,
@@ -154,10 +473,172 @@ class CloudLLMClient:
             max_tokens=max_tokens,
             timeout=timeout_s,
         )
+        self._record_openai_usage(response.usage)
 
         content = response.choices[0].message.content
         return content.strip() if content else None
 
+    async def _stream_gemini(
+        self, messages, temperature, max_tokens, timeout_s
+    ) -> AsyncIterator[str]:
+        """Stream from Google Gemini."""
+        client = self._sdk_client(CloudProvider.GEMINI)
+        request = self._gemini_request(messages, temperature, max_tokens, timeout_s)
+        try:
+            stream = await client.aio.models.generate_content_stream(
+                model=settings.gemini_model, **request
+            )
+        except Exception:
+            self._drop_gemini_cache(request)
+            raise
+        usage = None
+        try:
+            async for chunk in stream:
+                usage = chunk.usage_metadata or usage
+                if chunk.text:
+                    yield chunk.text
+        finally:
+            self._record_gemini_usage(usage)
+
+    async def _stream_anthropic(
+        self, messages, temperature, max_tokens, timeout_s
+    ) -> AsyncIterator[str]:
+        """Stream from Anthropic Claude."""
+        client = self._sdk_client(CloudProvider.ANTHROPIC)
+        system, api_messages = _anthropic_system(messages)
+        async with client.messages.stream(
+            model=settings.anthropic_model,
+            max_tokens=max_tokens,
+            system=system,
+            messages=api_messages,
+            temperature=temperature,
+            timeout=timeout_s,
+        ) as stream:
+            async for event in stream:
+                if event.type == "message_start":
+                    self._record_anthropic_usage(event.message.usage)
+                elif event.type == "text" and event.text:
+                    yield event.text
+
+    async def _stream_openai(
+        self, messages, temperature, max_tokens, timeout_s
+    ) -> AsyncIterator[str]:
+        """Stream from OpenAI."""
+        client = self._sdk_client(CloudProvider.OPENAI)
+        stream = await client.chat.completions.create(
+            model=settings.openai_model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout_s,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        try:
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    self._record_openai_usage(chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+
+    # ------------------------------------------------------------------
+    # Prompt caching
+    # ------------------------------------------------------------------
+
+    def _gemini_request(self, messages, temperature, max_tokens, timeout_s) -> dict:
+        """contents + config for a Gemini call, using a context cache when one exists."""
+        from google import genai
+
+        system_instruction, contents = _to_gemini_contents(messages)
+        cached_content = None
+        if system_instruction and self._gemini_cache is not None:
+            cached_content = self._gemini_cache.lookup(system_instruction)
+        config = genai.types.GenerateContentConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens,
+            # A cached system instruction must not be sent again
+            system_instruction=None if cached_content else system_instruction,
+            cached_content=cached_content,
+            http_options=genai.types.HttpOptions(timeout=max(1, int(timeout_s * 1000))),
+        )
+        return {"contents": contents, "config": config}
+
+    def _drop_gemini_cache(self, request: dict) -> None:
+        """Forget the context cache a failed request used; it may have expired server-side."""
+        name = request["config"].cached_content
+        if name and self._gemini_cache is not None:
+            self._gemini_cache.invalidate(name)
+
+    def _record_gemini_usage(self, usage) -> None:
+        if usage is not None and usage.prompt_token_count:
+            self.cache_stats[CloudProvider.GEMINI].record(
+                usage.prompt_token_count, usage.cached_content_token_count or 0
+            )
+
+    def _record_anthropic_usage(self, usage) -> None:
+        if usage is None:
+            return
+        cache_read = usage.cache_read_input_tokens or 0
+        cache_write = usage.cache_creation_input_tokens or 0
+        self.cache_stats[CloudProvider.ANTHROPIC].record(
+            usage.input_tokens + cache_read + cache_write, cache_read
+        )
+
+    def _record_openai_usage(self, usage) -> None:
+        if usage is None:
+            return
+        details = usage.prompt_tokens_details
+        cached = (details.cached_tokens or 0) if details is not None else 0
+        self.cache_stats[CloudProvider.OPENAI].record(usage.prompt_tokens, cached)
+
     @property
     def available_providers(self) -> list[CloudProvider]:
         return list(self._providers)
+
+
+def _split_system(messages: list[dict[str, str]]) -> tuple[str, list[dict[str, str]]]:
+    """Separate the system prompt from the chat turns (Anthropic format)."""
+    system_text = ""
+    api_messages = []
+    for msg in messages:
+        if msg["role"] == "system":
+            system_text = msg["content"]
+        else:
+            api_messages.append(msg)
+    return system_text, api_messages
+
+
+def _anthropic_system(
+    messages: list[dict[str, str]],
+) -> tuple[str | list[dict[str, Any]], list[dict[str, str]]]:
+    """System prompt + chat turns for Anthropic, with cache breakpoints.
+
+    A layered SystemPrompt becomes one text block per layer, each marked
+    with cache_control so the static layer stays cached even when the
+    session layer changes.
+    """
+    system_text, api_messages = _split_system(messages)
+    layers = getattr(system_text, "layers", None)
+    if not settings.anthropic_prompt_cache or layers is None:
+        return str(system_text), api_messages
+    blocks = [
+        {"type": "text", "text": str(layer), "cache_control": {"type": "ephemeral"}}
+        for layer in layers
+        if layer
+    ]
+    return blocks, api_messages
+
+
+def _to_gemini_contents(messages: list[dict[str, str]]) -> tuple[str | None, list[dict]]:
+    """Convert OpenAI-style messages to a Gemini system instruction + contents."""
+    contents = []
+    system_instruction = None
+    for msg in messages:
+        if msg["role"] == "system":
+            # Plain str: genai's pydantic models do not accept str subclasses
+            system_instruction = str(msg["content"])
+        else:
+            contents.append({"role": msg["role"], "parts": [{"text": msg["content"]}]})
+    return system_instruction, contents
@@ -2,15 +2,31 @@
 
 Connects to a locally running vllm-mlx server that serves
 Qwen3-0.6B and Qwen3-1.7B models with prefix caching.
+
+Every request first takes a slot from the LocalInferenceScheduler, so
+Stage 1 is not slowed down by Stage 2, prefetch or background requests
+competing for the same server.  A request's ``timeout_s`` covers its
+time in the scheduler queue as well as the generation itself.
 """
 
 from __future__ import annotations
 
 import logging
+import time
+from typing import TYPE_CHECKING
 
 from openai import AsyncOpenAI
 
 from voicereach.config import settings
+from voicereach.engine.llm.scheduler import (
+    AdmissionRejectedError,
+    LocalInferenceScheduler,
+    PreemptedError,
+    Priority,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
 
 logger = logging.getLogger(__name__)
 
@@ -18,12 +34,18 @@ logger = logging.getLogger(__name__)
 class LocalLLMClient:
     """Client for local LLM inference via vllm-mlx."""
 
-    def __init__(self, base_url: str | None = None) -> None:
+    def __init__(
+        self, base_url: str | None = None, scheduler: LocalInferenceScheduler | None = None
+    ) -> None:
         self._base_url = base_url or settings.local_llm_base_url
         self._client = AsyncOpenAI(
             base_url=self._base_url,
             api_key="not-needed",  # Local server
         )
+        self.scheduler = scheduler or LocalInferenceScheduler(
+            max_concurrency=settings.local_llm_max_concurrency,
+            max_total=settings.local_llm_max_total,
+        )
 
     async def generate(
         self,
@@ -32,6 +54,7 @@ class LocalLLMClient:
         temperature: float = 0.5,
         max_tokens: int = 100,
         timeout_s: float = 5.0,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> str | None:
         """Generate a completion from a local model.
 
@@ -40,25 +63,97 @@ class LocalLLMClient:
             messages: Chat messages in OpenAI format
             temperature: Sampling temperature
             max_tokens: Maximum output tokens
-            timeout_s: Timeout in seconds
+            timeout_s: Timeout in seconds, including time queued
+            priority: Scheduling class of the request
 
         Returns:
-            Generated text or None if failed.
+            Generated text or None if failed, rejected or preempted.
         """
+        deadline = time.monotonic() + timeout_s
         try:
-            response = await self._client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                timeout=timeout_s,
-            )
+            async with self.scheduler.slot(model, priority, timeout_s):
+                response = await self._client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout=_remaining(deadline),
+                )
             content = response.choices[0].message.content
             return content.strip() if content else None
+        except (AdmissionRejectedError, PreemptedError) as e:
+            logger.debug("Local LLM request for %s not completed: %s", model, e)
+            return None
         except Exception:
             logger.exception("Local LLM generation failed for %s", model)
             return None
 
+    async def generate_stream(
+        self,
+        model: str,
+        messages: list[dict[str, str]],
+        temperature: float = 0.5,
+        max_tokens: int = 100,
+        timeout_s: float = 5.0,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> AsyncIterator[str]:
+        """Stream a completion from a local model as text deltas.
+
+        Yields nothing (more) if the request fails, is rejected by the
+        scheduler or is preempted.  Closing the iterator early closes the
+        underlying HTTP stream, so the server stops generating.  The
+        scheduler slot is held until the stream ends.
+        """
+        deadline = time.monotonic() + timeout_s
+        stream = None
+        try:
+            async with self.scheduler.slot(model, priority, timeout_s):
+                stream = await self._client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout=_remaining(deadline),
+                    stream=True,
+                )
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+        except (AdmissionRejectedError, PreemptedError) as e:
+            logger.debug("Local LLM stream for %s not completed: %s", model, e)
+        except Exception:
+            logger.exception("Local LLM streaming failed for %s", model)
+        finally:
+            if stream is not None:
+                await stream.close()
+
+    async def warm_prefix(self, model: str, prefix: str, timeout_s: float = 30.0) -> bool:
+        """Prefill ``prefix`` as a system prompt so the server's prefix cache holds it.
+
+        Generates a single token; later requests that start with the same
+        bytes skip prefilling that part.  Runs as background work that any
+        candidate request preempts.  Returns False if the request failed.
+        """
+        deadline = time.monotonic() + timeout_s
+        try:
+            async with self.scheduler.slot(model, Priority.BACKGROUND, timeout_s):
+                await self._client.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "system", "content": prefix}],
+                    max_tokens=1,
+                    timeout=_remaining(deadline),
+                )
+            return True
+        except (AdmissionRejectedError, PreemptedError) as e:
+            logger.debug("Prefix warmup for %s not completed: %s", model, e)
+            return False
+        except Exception:
+            logger.warning("Prefix warmup failed for %s", model)
+            return False
+
     async def health_check(self) -> bool:
         """Check if the local LLM server is accessible."""
         try:
@@ -66,3 +161,7 @@ class LocalLLMClient:
             return True
         except Exception:
             return False
+
+
+def _remaining(deadline: float) -> float:
+    return max(deadline - time.monotonic(), 0.001)
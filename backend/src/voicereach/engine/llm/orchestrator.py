@@ -6,6 +6,11 @@ Coordinates concurrent inference across local and cloud LLMs:
   Stage 3: Gemini 2.5 Flash     ~800ms - high-quality candidates
 
 All stages run concurrently. Results are yielded as they complete.
+
+In streaming mode each stage parses its token stream incrementally and
+publishes a partial CandidateSet (is_partial=True) every time another
+candidate is complete, so the first candidate reaches the UI after one
+candidate's worth of tokens instead of the whole completion.
 """
 
 from __future__ import annotations
@@ -13,19 +18,31 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from collections.abc import AsyncIterator
+from collections import OrderedDict
+from functools import partial
+from typing import TYPE_CHECKING
 from uuid import uuid4
 
 from voicereach.config import settings
-from voicereach.engine.llm.candidate import parse_candidates
+from voicereach.engine.llm.candidate import StreamingCandidateParser, parse_candidates
 from voicereach.engine.llm.cloud_client import CloudLLMClient
 from voicereach.engine.llm.local_client import LocalLLMClient
-from voicereach.engine.llm.prompt_builder import build_messages
-from voicereach.models.context import ContextFrame
+from voicereach.engine.llm.prompt_builder import PromptAssembler
+from voicereach.engine.llm.scheduler import Priority
 from voicereach.models.events import CandidateSet, GenerationStage
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Collection
+
+    from voicereach.engine.llm.candidate_cache import CandidateCache
+    from voicereach.engine.llm.templates import TemplateCandidateGenerator
+    from voicereach.models.context import ContextFrame
+
 logger = logging.getLogger(__name__)
 
+MAX_OUTPUT_TOKENS = 200
+MAX_CANCELLED_IDS = 256  # recently cancelled request IDs remembered
+
 
 class HybridLLMOrchestrator:
     """Three-stage hybrid LLM inference pipeline."""
@@ -34,82 +51,283 @@ class HybridLLMOrchestrator:
         self,
         local_client: LocalLLMClient | None = None,
         cloud_client: CloudLLMClient | None = None,
+        streaming: bool | None = None,
+        candidate_cache: CandidateCache | None = None,
+        templates: TemplateCandidateGenerator | None = None,
     ) -> None:
         self._local = local_client or LocalLLMClient()
         self._cloud = cloud_client or CloudLLMClient()
-        self._cancelled: set[str] = set()
+        self._streaming = settings.llm_streaming if streaming is None else streaming
+        # Stage tasks of requests still generating, and recently cancelled IDs
+        self._active: dict[str, list[asyncio.Task]] = {}
+        self._cancelled: OrderedDict[str, None] = OrderedDict()
+        self._prompts = PromptAssembler()
+        self._warmed_prefix: str | None = None
+        self._cache = candidate_cache
+        self._templates = templates
 
     async def generate_candidates(
         self,
         context: ContextFrame,
         num_candidates: int = 4,
+        stages: Collection[GenerationStage] | None = None,
+        priority: Priority | None = None,
+        request_id: str | None = None,
     ) -> AsyncIterator[CandidateSet]:
         """Generate candidates through three concurrent stages.
 
-        Yields CandidateSets as each stage completes.
-        Earlier stages yield first for immediate display.
+        ``stages`` restricts the run to a subset of stages (all by default),
+        e.g. local-only speculative prefetch.  ``priority`` overrides the
+        local scheduling class of both local stages (by default Stage 1 is
+        INTERACTIVE and Stage 2 QUALITY).  ``request_id`` continues a set
+        already on screen under that ID (a prefetched warm set), so that
+        selecting from it cancels this run; a new ID is drawn by default.
+
+        Stage 0 (INSTANT) is yielded first, before any model answers: the
+        cached set of a similar earlier context, topped up with ranked
+        template sentences.  The best complete set of this run is stored
+        in the candidate cache for next time.
+
+        Yields CandidateSets as each stage completes (and, in streaming
+        mode, partial sets while a stage is still generating).
+        Earlier stages yield first for immediate display.  Partial sets
+        from a stage are dropped once a later stage has completed, so the
+        display never regresses to lower-quality candidates.
         """
-        request_id = uuid4().hex[:12]
-        messages = build_messages(context, num_candidates)
+        request_id = request_id or uuid4().hex[:12]
+        if request_id in self._cancelled:
+            return  # already selected from before this run started
+        messages = self._prompts.build_messages(context, num_candidates)
+        queue: asyncio.Queue[CandidateSet | None] = asyncio.Queue()
+
+        local_stages = (
+            (GenerationStage.LOCAL_FAST, settings.local_llm_model_fast,
+             settings.stage1_temperature, settings.stage1_timeout_ms,
+             Priority.INTERACTIVE if priority is None else priority),
+            (GenerationStage.LOCAL_QUALITY, settings.local_llm_model_quality,
+             settings.stage2_temperature, settings.stage2_timeout_ms,
+             Priority.QUALITY if priority is None else priority),
+        )
 
         # Launch all stages concurrently
-        tasks = {
-            GenerationStage.LOCAL_FAST: asyncio.create_task(
-                self._run_stage(
-                    stage=GenerationStage.LOCAL_FAST,
-                    messages=messages,
-                    model=settings.local_llm_model_fast,
-                    temperature=settings.stage1_temperature,
-                    timeout_ms=settings.stage1_timeout_ms,
-                    request_id=request_id,
-                    num_candidates=num_candidates,
+        emit = queue.put_nowait
+        stage_runs: list[Callable[[], Awaitable[None]]] = []
+        for stage, model, temperature, timeout_ms, local_priority in local_stages:
+            if stages is not None and stage not in stages:
+                continue
+            if self._streaming:
+                run = partial(
+                    self._stream_stage, stage, partial(
+                        self._local.generate_stream,
+                        model=model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=MAX_OUTPUT_TOKENS,
+                        timeout_s=timeout_ms / 1000,
+                        priority=local_priority,
+                    ), timeout_ms, request_id, num_candidates, emit,
                 )
-            ),
-            GenerationStage.LOCAL_QUALITY: asyncio.create_task(
-                self._run_stage(
-                    stage=GenerationStage.LOCAL_QUALITY,
+            else:
+                run = partial(self._emit, emit, partial(
+                    self._run_stage,
+                    stage=stage,
                     messages=messages,
-                    model=settings.local_llm_model_quality,
-                    temperature=settings.stage2_temperature,
-                    timeout_ms=settings.stage2_timeout_ms,
+                    model=model,
+                    temperature=temperature,
+                    timeout_ms=timeout_ms,
                     request_id=request_id,
                     num_candidates=num_candidates,
-                )
-            ),
-            GenerationStage.CLOUD: asyncio.create_task(
-                self._run_cloud_stage(
+                    priority=local_priority,
+                ))
+            stage_runs.append(run)
+
+        if stages is None or GenerationStage.CLOUD in stages:
+            if self._streaming:
+                stage_runs.append(partial(
+                    self._stream_stage, GenerationStage.CLOUD, partial(
+                        self._cloud.generate_stream,
+                        messages=messages,
+                        temperature=settings.stage3_temperature,
+                        max_tokens=MAX_OUTPUT_TOKENS,
+                        timeout_s=settings.stage3_timeout_ms / 1000,
+                    ), settings.stage3_timeout_ms, request_id, num_candidates, emit,
+                ))
+            else:
+                stage_runs.append(partial(self._emit, emit, partial(
+                    self._run_cloud_stage,
                     messages=messages,
                     temperature=settings.stage3_temperature,
                     timeout_ms=settings.stage3_timeout_ms,
                     request_id=request_id,
                     num_candidates=num_candidates,
-                )
-            ),
-        }
-
-        # Yield results as they complete
-        completed_stages: set[GenerationStage] = set()
-        for coro in asyncio.as_completed(tasks.values()):
-            try:
-                result = await coro
-                if result and request_id not in self._cancelled:
-                    completed_stages.add(result.stage)
-                    is_final = result.stage == GenerationStage.CLOUD
-                    result.is_final = is_final
-                    yield result
-            except asyncio.CancelledError:
-                break
-            except Exception:
-                logger.exception("Stage failed")
-
-        # Cancel any remaining tasks
-        for task in tasks.values():
-            if not task.done():
-                task.cancel()
+                )))
+
+        instant = stages is None or GenerationStage.INSTANT in stages
+        use_cache = instant and self._cache is not None
+        cached = None
+        if use_cache:
+            # Key on the context as it is now; history grows while we generate
+            cache_context = context.model_copy(
+                update={"conversation_history": list(context.conversation_history)}
+            )
+            cached = self._cache.lookup(cache_context, request_id)
+        if instant and self._templates is not None:
+            cached = self._merge_instant(
+                cached, self._templates.generate(context, num_candidates, request_id),
+                num_candidates,
+            )
+
+        tasks = [asyncio.create_task(self._guard(run, queue)) for run in stage_runs]
+        self._active[request_id] = tasks
+
+        # Yield results as they arrive
+        remaining = len(tasks)
+        best_complete = 0
+        best: CandidateSet | None = None
+        try:
+            if cached is not None:
+                yield cached
+            while remaining:
+                result = await queue.get()
+                if result is None:
+                    remaining -= 1
+                    continue
+                if request_id in self._cancelled:
+                    break
+                if result.is_partial and result.stage < best_complete:
+                    continue
+                if not result.is_partial:
+                    best_complete = max(best_complete, result.stage)
+                    if best is None or result.stage > best.stage:
+                        best = result
+                result.is_final = result.stage == GenerationStage.CLOUD and not result.is_partial
+                yield result
+        finally:
+            # Cancel any remaining tasks (closing their HTTP streams)
+            self._active.pop(request_id, None)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            if use_cache and best is not None:
+                self._cache.store(cache_context, best)
+
+    @staticmethod
+    def _merge_instant(
+        cached: CandidateSet | None, templated: CandidateSet | None, num_candidates: int
+    ) -> CandidateSet | None:
+        """Cached candidates first, then template ones not already among them."""
+        if cached is None or templated is None:
+            return cached or templated
+        texts = {c.text for c in cached.candidates}
+        extra = [c for c in templated.candidates if c.text not in texts]
+        cached.candidates = (cached.candidates + extra)[:num_candidates]
+        return cached
+
+    async def warmup(self) -> None:
+        """Pre-connect to the cloud providers (see CloudLLMClient.warmup)."""
+        await self._cloud.warmup()
+
+    async def prewarm(self, context: ContextFrame, num_candidates: int = 4) -> None:
+        """Load the current stable prompt prefix into both local models' KV caches.
+
+        A no-op while the prefix is unchanged since the last prewarm.
+        """
+        prefix = self._prompts.stable_prefix(context, num_candidates)
+        if prefix is self._warmed_prefix:
+            return
+        self._warmed_prefix = prefix
+        await asyncio.gather(
+            self._local.warm_prefix(settings.local_llm_model_fast, prefix),
+            self._local.warm_prefix(settings.local_llm_model_quality, prefix),
+        )
+
+    async def aclose(self) -> None:
+        """Release pooled cloud connections and log local scheduling stats."""
+        self._local.scheduler.log_stats()
+        await self._cloud.aclose()
 
     async def cancel_pending(self, request_id: str) -> None:
-        """Mark a request as cancelled (remaining stages will be skipped)."""
-        self._cancelled.add(request_id)
+        """Abort a request's remaining stages.
+
+        Running stage tasks are cancelled, which closes their local and
+        cloud HTTP streams so the servers stop generating; anything they
+        already queued is dropped.
+        """
+        self._cancelled[request_id] = None
+        while len(self._cancelled) > MAX_CANCELLED_IDS:
+            self._cancelled.popitem(last=False)
+        for task in self._active.get(request_id, ()):
+            task.cancel()
+
+    async def cancel_all(self) -> None:
+        """Abort every request still generating (e.g. superseded by a new one)."""
+        for request_id in list(self._active):
+            await self.cancel_pending(request_id)
+
+    @property
+    def active_requests(self) -> int:
+        return len(self._active)
+
+    @staticmethod
+    async def _guard(run: Callable[[], Awaitable[None]], queue: asyncio.Queue) -> None:
+        """Run one stage, log its failure, and always signal completion."""
+        try:
+            await run()
+        except Exception:
+            logger.exception("Stage failed")
+        finally:
+            queue.put_nowait(None)
+
+    @staticmethod
+    async def _emit(
+        emit: Callable[[CandidateSet], None], run: Callable[[], Awaitable[CandidateSet | None]]
+    ) -> None:
+        result = await run()
+        if result is not None:
+            emit(result)
+
+    async def _stream_stage(
+        self,
+        stage: GenerationStage,
+        open_stream: Callable[[], AsyncIterator[str]],
+        timeout_ms: int,
+        request_id: str,
+        num_candidates: int,
+        emit: Callable[[CandidateSet], None],
+    ) -> None:
+        """Run a streaming stage, emitting a partial set per new candidate.
+
+        The stream is closed as soon as ``num_candidates`` candidates are
+        parsed (or the array ends), so no tokens are spent past the last
+        candidate.  On timeout the candidates parsed so far are kept.
+        """
+        start = time.monotonic()
+        parser = StreamingCandidateParser(stage, max_candidates=num_candidates)
+        stream = open_stream()
+
+        def latency() -> int:
+            return int((time.monotonic() - start) * 1000)
+
+        try:
+            async with asyncio.timeout(timeout_ms / 1000):
+                async for chunk in stream:
+                    if parser.feed(chunk, latency()):
+                        if parser.done:
+                            break
+                        emit(CandidateSet(
+                            candidates=parser.candidates,
+                            stage=stage,
+                            request_id=request_id,
+                            is_partial=True,
+                        ))
+        except TimeoutError:
+            logger.debug("Stage %s timed out after %d ms", stage.name, timeout_ms)
+        finally:
+            await stream.aclose()
+
+        candidates = parser.finish(latency())
+        if candidates:
+            emit(CandidateSet(candidates=candidates, stage=stage, request_id=request_id))
 
     async def _run_stage(
         self,
@@ -120,6 +338,7 @@ class HybridLLMOrchestrator:
         timeout_ms: int,
         request_id: str,
         num_candidates: int,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> CandidateSet | None:
         """Run a local LLM stage."""
         start = time.monotonic()
@@ -128,8 +347,9 @@ class HybridLLMOrchestrator:
             model=model,
             messages=messages,
             temperature=temperature,
-            max_tokens=200,
+            max_tokens=MAX_OUTPUT_TOKENS,
             timeout_s=timeout_ms / 1000,
+            priority=priority,
         )
 
         if not raw:
@@ -161,7 +381,7 @@ class HybridLLMOrchestrator:
         raw = await self._cloud.generate(
             messages=messages,
             temperature=temperature,
-            max_tokens=200,
+            max_tokens=MAX_OUTPUT_TOKENS,
             timeout_s=timeout_ms / 1000,
         )
 
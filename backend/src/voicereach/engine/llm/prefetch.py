@@ -0,0 +1,185 @@
+"""Speculative candidate prefetch on partial partner transcripts.
+
+Waiting for the partner to finish speaking before starting generation
+puts the whole Stage 1/2 latency after the end of the utterance.  The
+prefetcher instead starts local-only generation runs on the interim
+transcript while the partner is still talking:
+
+  partial "今日は"          -> too short, ignored
+  partial "今日は天気が"    -> run A
+  partial "今日は天気がい"  -> same as A give or take a few chars, deduplicated
+  partial "今日は天気がいいね" -> run B (A keeps running as a fallback)
+  partial "明日は..."       -> ASR revised the text: A and B are stale, cancelled
+  final   "今日は天気がいいね" -> take(): best candidates of the runs whose
+                               transcript matches the final text, re-ranked
+
+take() also cancels every run still in flight, since the real generation
+starts right after it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import unicodedata
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from voicereach.engine.llm.scheduler import Priority
+from voicereach.models.events import Candidate, CandidateSet, GenerationStage
+
+if TYPE_CHECKING:
+    from voicereach.engine.llm.orchestrator import HybridLLMOrchestrator
+    from voicereach.models.context import ContextFrame
+
+logger = logging.getLogger(__name__)
+
+SPECULATIVE_STAGES = (GenerationStage.LOCAL_FAST, GenerationStage.LOCAL_QUALITY)
+
+
+def _normalize(text: str) -> str:
+    """NFKC, no whitespace or trailing punctuation: ASR partials vary in both."""
+    text = "".join(unicodedata.normalize("NFKC", text).split())
+    return text.rstrip("。、.,!?！？…")
+
+
+@dataclass
+class PrefetchStats:
+    """Speculative run counters."""
+    runs_started: int = 0
+    runs_cancelled: int = 0  # stale or superseded runs stopped early
+    partials_deduplicated: int = 0  # partials too close to a running transcript
+    hits: int = 0  # finalized utterances served a warm candidate set
+    misses: int = 0
+
+
+@dataclass
+class _Run:
+    transcript: str  # normalized partial the run was started for
+    task: asyncio.Task | None = None
+    best: CandidateSet | None = None
+
+
+class SpeculativePrefetcher:
+    """Runs Stage 1/2 generation on partial transcripts ahead of time."""
+
+    def __init__(
+        self,
+        orchestrator: HybridLLMOrchestrator,
+        num_candidates: int = 4,
+        min_chars: int = 4,
+        min_growth_chars: int = 3,
+        match_threshold: float = 0.75,
+        max_runs: int = 2,
+    ) -> None:
+        """
+        Args:
+            orchestrator: Generates the speculative candidates.
+            num_candidates: Candidates per set.
+            min_chars: Partials shorter than this (normalized) are ignored.
+            min_growth_chars: A partial extending the latest run's
+                transcript by fewer characters does not start a new run.
+            match_threshold: Minimum similarity between a run's transcript
+                and the final utterance for its candidates to be used.
+            max_runs: Concurrent speculative runs; the oldest is cancelled
+                to make room.
+        """
+        self._llm = orchestrator
+        self._num_candidates = num_candidates
+        self._min_chars = min_chars
+        self._min_growth = min_growth_chars
+        self._match_threshold = match_threshold
+        self._max_runs = max_runs
+        self._runs: list[_Run] = []
+        self.stats = PrefetchStats()
+
+    @property
+    def active_runs(self) -> int:
+        return sum(1 for run in self._runs if run.task is not None and not run.task.done())
+
+    def update(self, context: ContextFrame, partial: str) -> None:
+        """Feed an interim transcript; ``context`` already ends with it as partner turn."""
+        transcript = _normalize(partial)
+        if len(transcript) < self._min_chars:
+            return
+        if self._runs:
+            latest = self._runs[-1].transcript
+            if transcript.startswith(latest) and len(transcript) - len(latest) < self._min_growth:
+                self.stats.partials_deduplicated += 1
+                return
+
+        # Runs whose transcript the new partial no longer extends were
+        # started on text the ASR has since revised
+        for run in [r for r in self._runs if not transcript.startswith(r.transcript)]:
+            self._cancel(run)
+        while len(self._runs) >= self._max_runs:
+            self._cancel(self._runs[0])
+
+        run = _Run(transcript)
+        run.task = asyncio.create_task(self._generate(run, context))
+        self._runs.append(run)
+        self.stats.runs_started += 1
+
+    def take(self, final_text: str) -> CandidateSet | None:
+        """Warm candidates for the finalized utterance, or None; cancels all runs.
+
+        Candidates of every run whose transcript is similar enough to the
+        final text are pooled, deduplicated by normalized text and ranked
+        by confidence weighted with that similarity (later stages win ties).
+        """
+        final = _normalize(final_text)
+        scored: dict[str, tuple[float, Candidate]] = {}
+        stage = None
+        for run in self._runs:
+            if run.best is None:
+                continue
+            similarity = SequenceMatcher(None, run.transcript, final).ratio()
+            if similarity < self._match_threshold:
+                continue
+            stage = run.best.stage if stage is None else max(stage, run.best.stage)
+            for candidate in run.best.candidates:
+                key = _normalize(candidate.text)
+                score = similarity * candidate.confidence + 0.01 * candidate.generation_stage
+                if key not in scored or score > scored[key][0]:
+                    scored[key] = (score, candidate)
+        self.cancel_all()
+
+        if not scored:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        ranked = sorted(scored.values(), key=lambda sc: sc[0], reverse=True)
+        return CandidateSet(
+            candidates=[c for _, c in ranked[: self._num_candidates]],
+            stage=stage,
+            request_id=uuid4().hex[:12],
+        )
+
+    def cancel_all(self) -> None:
+        """Cancel every speculative run and forget their results."""
+        for run in list(self._runs):
+            self._cancel(run)
+
+    def _cancel(self, run: _Run) -> None:
+        self._runs.remove(run)
+        if run.task is not None and not run.task.done():
+            run.task.cancel()
+            self.stats.runs_cancelled += 1
+
+    async def _generate(self, run: _Run, context: ContextFrame) -> None:
+        try:
+            async for candidate_set in self._llm.generate_candidates(
+                context, self._num_candidates, stages=SPECULATIVE_STAGES,
+                priority=Priority.SPECULATIVE,
+            ):
+                best = run.best
+                if (
+                    best is None
+                    or candidate_set.stage > best.stage
+                    or (candidate_set.stage == best.stage and best.is_partial)
+                ):
+                    run.best = candidate_set
+        except Exception:
+            logger.exception("Speculative generation failed")
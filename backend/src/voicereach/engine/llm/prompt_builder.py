@@ -5,18 +5,38 @@ following the 3-layer cache design:
   Layer 1 (static): PVP + task instructions (~2300 tokens)
   Layer 2 (session): environment + conversation partner (~300 tokens)
   Layer 3 (dynamic): conversation history + feedback (~900 tokens)
+
+Layers 1 and 2 form the system prompt.  It is returned as a SystemPrompt,
+a plain str that also remembers where each layer starts and ends, so
+cloud clients can put cache breakpoints on the layer boundaries (see
+CloudLLMClient).  Each layer depends only on its own inputs, so an
+unchanged layer is byte-identical from call to call, and a provider-side
+prefix cache keeps hitting until the layer itself changes.
+
+PromptAssembler memoizes the rendered layers, so repeated generations
+only rebuild the history tail.  Its stable_prefix() is also what local
+servers are pre-warmed with (LocalLLMClient.warm_prefix).
 """
 
 from __future__ import annotations
 
-from voicereach.models.context import ContextFrame
+import hashlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from voicereach.models.context import ContextFrame, EnvironmentContext
 
+HISTORY_LIMIT = 10  # conversation entries sent as Layer 3
+OPENING_PROMPT = "（会話が始まったところです。最初の発話候補を生成してください）"
 
-SYSTEM_PROMPT_TEMPLATE = """あなたはALS患者の代わりに発話候補を生成するアシスタントです。
+
+STATIC_PROMPT_TEMPLATE = """あなたはALS患者の代わりに発話候補を生成するアシスタントです。
 
 ## 指示
 - 患者が会話の中で言いそうな発話候補を{num_candidates}個生成してください
-- 各候補は異なる意図軸（感情表現、質問、自己言及、他者言及、行動依頼、ユーモア、話題転換）から選んでください
+- 各候補は異なる意図軸（感情表現、質問、自己言及、他者言及、行動依頼、ユーモア、話題転換）\
+から選んでください
 - 患者の口調・語彙・表現パターンを忠実に再現してください
 - 短く自然な日本語で、1-2文以内にしてください
 
@@ -29,22 +49,45 @@ SYSTEM_PROMPT_TEMPLATE = """あなたはALS患者の代わりに発話候補を
 ]
 ```
 
-意図軸: emotional_response, question, self_reference, other_reference, action_request, humor, topic_change
+意図軸: emotional_response, question, self_reference, other_reference, \
+action_request, humor, topic_change
 
 {pvp_section}
-{environment_section}"""
+"""
 
+SESSION_PROMPT_TEMPLATE = "{environment_section}"
 
-def build_system_prompt(
-    context: ContextFrame,
-    num_candidates: int = 4,
-) -> str:
-    """Build the system prompt for candidate generation."""
+SYSTEM_PROMPT_TEMPLATE = STATIC_PROMPT_TEMPLATE + SESSION_PROMPT_TEMPLATE
+
+
+class SystemPrompt(str):
+    """System prompt text that remembers its cacheable layers.
+
+    Behaves exactly like the concatenated string (local and OpenAI
+    clients send it as-is); ``layers`` gives (static, session).
+    """
+
+    layers: tuple[str, str]
+
+    def __new__(cls, static: str, session: str) -> SystemPrompt:
+        prompt = super().__new__(cls, static + session)
+        prompt.layers = (static, session)
+        return prompt
+
+    def __reduce__(self):
+        return SystemPrompt, self.layers
+
+
+def build_static_layer(pvp_text: str | None, num_candidates: int = 4) -> str:
+    """Layer 1: task instructions + PVP."""
     pvp_section = ""
-    if context.pvp_text:
-        pvp_section = f"\n## パーソナルボイスプロファイル (PVP)\n{context.pvp_text}"
+    if pvp_text:
+        pvp_section = f"\n## パーソナルボイスプロファイル (PVP)\n{pvp_text}"
+    return STATIC_PROMPT_TEMPLATE.format(num_candidates=num_candidates, pvp_section=pvp_section)
+
 
-    env = context.environment
+def build_session_layer(env: EnvironmentContext) -> str:
+    """Layer 2: environment information."""
     env_parts = []
     if env.location:
         env_parts.append(f"場所: {env.location}")
@@ -58,11 +101,17 @@ def build_system_prompt(
     environment_section = ""
     if env_parts:
         environment_section = "\n## 環境情報\n" + "\n".join(f"- {p}" for p in env_parts)
+    return SESSION_PROMPT_TEMPLATE.format(environment_section=environment_section)
 
-    return SYSTEM_PROMPT_TEMPLATE.format(
-        num_candidates=num_candidates,
-        pvp_section=pvp_section,
-        environment_section=environment_section,
+
+def build_system_prompt(
+    context: ContextFrame,
+    num_candidates: int = 4,
+) -> SystemPrompt:
+    """Build the system prompt for candidate generation."""
+    return SystemPrompt(
+        build_static_layer(context.pvp_text, num_candidates),
+        build_session_layer(context.environment),
     )
 
 
@@ -72,18 +121,76 @@ def build_messages(
 ) -> list[dict[str, str]]:
     """Build the full message list for LLM generation."""
     system = build_system_prompt(context, num_candidates)
-    messages: list[dict[str, str]] = [{"role": "system", "content": system}]
+    return [{"role": "system", "content": system}, *_history_messages(context)]
 
-    # Add conversation history
-    for entry in context.conversation_history[-10:]:
-        role = "assistant" if entry.role == "patient" else "user"
-        messages.append({"role": role, "content": entry.text})
 
-    # If no recent conversation, add a generic prompt
+def _history_messages(context: ContextFrame) -> list[dict[str, str]]:
+    """Layer 3: the recent conversation, or an opening prompt without one."""
     if not context.conversation_history:
-        messages.append({
-            "role": "user",
-            "content": "（会話が始まったところです。最初の発話候補を生成してください）",
-        })
-
-    return messages
+        return [{"role": "user", "content": OPENING_PROMPT}]
+    return [
+        {"role": "assistant" if entry.role == "patient" else "user", "content": entry.text}
+        for entry in context.conversation_history[-HISTORY_LIMIT:]
+    ]
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class PromptAssembler:
+    """Memoizing build_messages().
+
+    The static layer is rendered once per (PVP, num_candidates) and the
+    session layer once per environment, keyed by content hashes.  The
+    combined SystemPrompt is cached too, so while neither input changes,
+    every call returns the very same string object: the stable prefix is
+    byte-identical by construction.  Only the history tail is rebuilt per
+    call.
+    """
+
+    def __init__(self, max_entries: int = 8) -> None:
+        self._max_entries = max_entries
+        self._static: OrderedDict[tuple[str, int], str] = OrderedDict()
+        self._session: OrderedDict[str, str] = OrderedDict()
+        self._prompts: OrderedDict[tuple[tuple[str, int], str], SystemPrompt] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def stable_prefix(self, context: ContextFrame, num_candidates: int = 4) -> SystemPrompt:
+        """The system prompt (Layers 1 + 2), shared by every request until they change."""
+        static_key = (_digest(context.pvp_text or ""), num_candidates)
+        session_key = _digest(context.environment.model_dump_json())
+        key = (static_key, session_key)
+        prompt = self._prompts.get(key)
+        if prompt is not None:
+            self._prompts.move_to_end(key)
+            self.hits += 1
+            return prompt
+
+        self.misses += 1
+        static = self._remember(
+            self._static, static_key,
+            lambda: build_static_layer(context.pvp_text, num_candidates),
+        )
+        session = self._remember(
+            self._session, session_key, lambda: build_session_layer(context.environment)
+        )
+        return self._remember(self._prompts, key, lambda: SystemPrompt(static, session))
+
+    def build_messages(
+        self, context: ContextFrame, num_candidates: int = 4
+    ) -> list[dict[str, str]]:
+        """Same messages as build_messages(), from the cached layers."""
+        system = self.stable_prefix(context, num_candidates)
+        return [{"role": "system", "content": system}, *_history_messages(context)]
+
+    def _remember(self, cache: OrderedDict, key, render):
+        value = cache.get(key)
+        if value is None:
+            value = cache[key] = render()
+            while len(cache) > self._max_entries:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return value
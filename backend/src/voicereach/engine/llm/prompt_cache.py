@@ -0,0 +1,188 @@
+"""Provider-side prompt caching.
+
+The static (PVP + instructions) and session (environment) layers of the
+system prompt are identical from request to request, so the providers
+can cache them instead of reprocessing ~2600 tokens per call:
+
+  Anthropic: cache_control breakpoints on the layer blocks (per request,
+             no state here)
+  Gemini:    an explicit CachedContent per distinct system prompt, created
+             in the background on first use and kept alive by extending
+             its TTL shortly before it expires
+  OpenAI:    automatic prefix caching, nothing to set up
+
+PromptCacheStats records what the providers report back, so hit ratios
+can be checked in the logs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PromptCacheStats:
+    """Prompt cache usage as reported by one provider."""
+    requests: int = 0
+    hits: int = 0  # requests that read at least one cached token
+    prompt_tokens: int = 0  # including cached tokens
+    cached_tokens: int = 0
+
+    def record(self, prompt_tokens: int, cached_tokens: int) -> None:
+        self.requests += 1
+        self.prompt_tokens += prompt_tokens
+        self.cached_tokens += cached_tokens
+        if cached_tokens:
+            self.hits += 1
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+    @property
+    def token_hit_ratio(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+
+@dataclass
+class _CacheEntry:
+    name: str
+    expires_at: float  # time.monotonic()
+
+
+class GeminiContextCache:
+    """CachedContent handles for Gemini, one per distinct system prompt.
+
+    lookup() never blocks the request: on a miss it returns None (the
+    request goes out uncached) and creates the cache in the background,
+    and an entry close to expiry has its TTL extended in the background.
+    Prompts the API refuses to cache (e.g. below the model's minimum
+    token count) are not retried for one TTL.
+    """
+
+    def __init__(
+        self,
+        client: Callable[[], Any],
+        model: str,
+        ttl_s: int = 600,
+        refresh_margin_s: int = 60,
+        max_entries: int = 4,
+    ) -> None:
+        """
+        Args:
+            client: Returns the genai.Client to use (the pooled one).
+            model: Model the cached content is created for.
+            ttl_s: TTL requested for each cache entry.
+            refresh_margin_s: Extend the TTL once less than this remains.
+            max_entries: Older entries beyond this are deleted.
+        """
+        self._client = client
+        self._model = model
+        self._ttl_s = ttl_s
+        self._refresh_margin_s = refresh_margin_s
+        self._max_entries = max_entries
+        self._entries: dict[str, _CacheEntry] = {}
+        self._retry_at: dict[str, float] = {}  # key -> monotonic time of next create attempt
+        self._busy: set[str] = set()  # keys with a create/refresh in flight
+        self._tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def key(system_instruction: str) -> str:
+        return hashlib.sha256(system_instruction.encode()).hexdigest()
+
+    def lookup(self, system_instruction: str) -> str | None:
+        """Cached-content name for this system prompt, or None if not cached yet."""
+        key = self.key(system_instruction)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and entry.expires_at <= now:
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            if self._retry_at.get(key, 0.0) <= now:
+                self._spawn(key, self._create(key, system_instruction))
+            return None
+        if entry.expires_at - now < self._refresh_margin_s:
+            self._spawn(key, self._refresh(key, entry))
+        return entry.name
+
+    def invalidate(self, name: str) -> None:
+        """Forget an entry the API no longer knows about."""
+        for key, entry in list(self._entries.items()):
+            if entry.name == name:
+                del self._entries[key]
+
+    async def aclose(self) -> None:
+        """Cancel background work; server-side entries expire on their own."""
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.wait(self._tasks)
+
+    def _spawn(self, key: str, coro) -> None:
+        if key in self._busy:
+            coro.close()
+            return
+        self._busy.add(key)
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+
+        def done(t: asyncio.Task) -> None:
+            self._tasks.discard(t)
+            self._busy.discard(key)
+
+        task.add_done_callback(done)
+
+    async def _create(self, key: str, system_instruction: str) -> None:
+        from google import genai
+
+        started = time.monotonic()
+        try:
+            cached = await self._client().aio.caches.create(
+                model=self._model,
+                config=genai.types.CreateCachedContentConfig(
+                    system_instruction=system_instruction,
+                    ttl=f"{self._ttl_s}s",
+                    display_name=f"voicereach-{key[:12]}",
+                ),
+            )
+        except Exception as e:
+            self._retry_at[key] = time.monotonic() + self._ttl_s
+            logger.warning("Gemini context cache not created: %s", e)
+            return
+        self._entries[key] = _CacheEntry(cached.name, started + self._ttl_s)
+        logger.info("Created Gemini context cache %s", cached.name)
+        while len(self._entries) > self._max_entries:
+            oldest = next(iter(self._entries))
+            await self._delete(self._entries.pop(oldest).name)
+
+    async def _refresh(self, key: str, entry: _CacheEntry) -> None:
+        from google import genai
+
+        started = time.monotonic()
+        try:
+            await self._client().aio.caches.update(
+                name=entry.name,
+                config=genai.types.UpdateCachedContentConfig(ttl=f"{self._ttl_s}s"),
+            )
+        except Exception as e:
+            self._entries.pop(key, None)
+            logger.warning("Gemini context cache %s not refreshed: %s", entry.name, e)
+            return
+        entry.expires_at = started + self._ttl_s
+
+    async def _delete(self, name: str) -> None:
+        try:
+            await self._client().aio.caches.delete(name=name)
+        except Exception as e:
+            logger.debug("Gemini context cache %s not deleted: %s", name, e)
@@ -0,0 +1,239 @@
+"""Priority scheduling of local LLM requests.
+
+Both local stages, speculative prefetch and background work (prefix
+warmup, future summarization) share one vllm-mlx server, where
+concurrent requests slow each other down.  Every local request takes a
+slot from the scheduler first:
+
+  - at most ``max_concurrency`` requests run per model, and at most
+    ``max_total`` on the server
+  - waiting requests are granted slots by priority class, FIFO within
+    a class
+  - admission control: a class with a queue limit rejects requests once
+    that many are waiting, and a request whose deadline passes while
+    queued is dropped instead of starting late
+  - preemption: a request that cannot run evicts a running request of a
+    preemptible (lower) class, whose holder sees ``PreemptedError``
+
+Queue wait and service (generation) time are recorded separately per
+class, so a slow Stage 1 can be told apart from a congested one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from voicereach.engine.metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Local request classes, most urgent first."""
+    INTERACTIVE = 0  # Stage 1: the first candidates the patient sees
+    QUALITY = 1  # Stage 2
+    SPECULATIVE = 2  # prefetch on partial transcripts
+    BACKGROUND = 3  # prefix warmup, summarization
+
+
+class AdmissionRejectedError(Exception):
+    """The request was not admitted (queue full or deadline passed while queued)."""
+
+
+class PreemptedError(Exception):
+    """The request's slot was taken by a higher-priority request."""
+
+
+@dataclass
+class ClassStats:
+    """Counters and latencies of one priority class."""
+    admitted: int = 0
+    rejected: int = 0
+    preempted: int = 0
+    queue_wait: LatencyHistogram = field(default_factory=LatencyHistogram)
+    service: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+class _Slot:
+    def __init__(self, scheduler: LocalInferenceScheduler, model: str,
+                 priority: Priority, timeout_s: float | None) -> None:
+        self._scheduler = scheduler
+        self.model = model
+        self.priority = priority
+        self._timeout_s = timeout_s
+        self.task: asyncio.Task | None = None
+        self.granted: asyncio.Future | None = None
+        self.granted_at = 0.0
+        self.preempted = False
+
+    async def __aenter__(self) -> _Slot:
+        self.task = asyncio.current_task()
+        await self._scheduler._acquire(self, self._timeout_s)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool | None:
+        self._scheduler._release(self)
+        # Same idea as asyncio.timeout(): turn our own cancellation into
+        # Preempted, unless the task was also cancelled by someone else
+        if self.preempted and exc_type is asyncio.CancelledError and self.task.uncancel() == 0:
+            raise PreemptedError(f"{self.model} request preempted") from exc
+        return None
+
+
+class LocalInferenceScheduler:
+    """Admission, priority ordering, concurrency limits and preemption."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 1,
+        max_total: int = 2,
+        queue_limits: dict[Priority, int] | None = None,
+        preemptible: Priority = Priority.SPECULATIVE,
+    ) -> None:
+        """
+        Args:
+            max_concurrency: Requests running at once per model.
+            max_total: Requests running at once on the server.
+            queue_limits: Maximum waiting requests per class (no limit for
+                classes not listed).
+            preemptible: Running requests of this class or lower priority
+                can be preempted by more urgent ones.
+        """
+        self._max_concurrency = max_concurrency
+        self._max_total = max_total
+        self._queue_limits = (
+            {Priority.SPECULATIVE: 2, Priority.BACKGROUND: 4}
+            if queue_limits is None else queue_limits
+        )
+        self._preemptible = preemptible
+        self._running: list[_Slot] = []
+        self._waiting: list[tuple[int, int, _Slot]] = []  # heap of (priority, seq, slot)
+        self._seq = itertools.count()
+        self.stats = {p: ClassStats() for p in Priority}
+
+    def slot(self, model: str, priority: Priority, timeout_s: float | None = None) -> _Slot:
+        """Async context manager holding a slot on ``model`` for its body.
+
+        Raises AdmissionRejectedError if the request is not admitted within
+        ``timeout_s``, and PreemptedError (on exit) if the slot was taken back.
+        """
+        return _Slot(self, model, priority, timeout_s)
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for *_, s in self._waiting if not s.granted.done())
+
+    def log_stats(self) -> None:
+        """Log queue wait and service time percentiles per class."""
+        for priority, stats in self.stats.items():
+            if not stats.admitted and not stats.rejected:
+                continue
+            logger.info(
+                "Local %s: %d admitted, %d rejected, %d preempted; "
+                "queue wait p50 %.0f ms p95 %.0f ms, service p50 %.0f ms p95 %.0f ms",
+                priority.name, stats.admitted, stats.rejected, stats.preempted,
+                stats.queue_wait.percentile(50), stats.queue_wait.percentile(95),
+                stats.service.percentile(50), stats.service.percentile(95),
+            )
+
+    # ------------------------------------------------------------------
+    # Acquire / release
+    # ------------------------------------------------------------------
+
+    async def _acquire(self, slot: _Slot, timeout_s: float | None) -> None:
+        stats = self.stats[slot.priority]
+        limit = self._queue_limits.get(slot.priority)
+        if (
+            limit is not None
+            and not self._can_run(slot.model)
+            and self._queued(slot.priority) >= limit
+        ):
+            stats.rejected += 1
+            raise AdmissionRejectedError(f"{slot.priority.name} queue full")
+
+        slot.granted = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (slot.priority, next(self._seq), slot))
+        self._dispatch()
+        if not slot.granted.done():
+            self._preempt_for(slot)
+
+        queued_at = time.monotonic()
+        try:
+            async with asyncio.timeout(timeout_s):
+                await asyncio.shield(slot.granted)
+        except (TimeoutError, asyncio.CancelledError) as e:
+            if slot.granted.done():
+                self._release(slot)  # granted just as we gave up, or preempted right away
+            else:
+                slot.granted.cancel()  # lazily dropped from the heap
+            if isinstance(e, TimeoutError):
+                stats.rejected += 1
+                raise AdmissionRejectedError(
+                    f"{slot.priority.name} request expired in queue"
+                ) from None
+            if slot.preempted and slot.task.uncancel() == 0:
+                raise PreemptedError(f"{slot.model} request preempted") from e
+            raise
+        stats.admitted += 1
+        stats.queue_wait.record((time.monotonic() - queued_at) * 1000)
+
+    def _release(self, slot: _Slot) -> None:
+        if slot in self._running:
+            self._running.remove(slot)
+            self.stats[slot.priority].service.record((time.monotonic() - slot.granted_at) * 1000)
+            self._dispatch()
+
+    def _can_run(self, model: str) -> bool:
+        return (
+            len(self._running) < self._max_total
+            and sum(1 for s in self._running if s.model == model) < self._max_concurrency
+        )
+
+    def _queued(self, priority: Priority) -> int:
+        return sum(1 for p, _, s in self._waiting if p == priority and not s.granted.done())
+
+    def _dispatch(self) -> None:
+        """Grant slots to waiting requests in priority order."""
+        pending = []
+        while self._waiting:
+            entry = heapq.heappop(self._waiting)
+            slot = entry[2]
+            if slot.granted.done():  # expired or cancelled while waiting
+                continue
+            if self._can_run(slot.model):
+                slot.granted_at = time.monotonic()
+                self._running.append(slot)
+                slot.granted.set_result(None)
+            else:
+                pending.append(entry)
+        for entry in pending:
+            heapq.heappush(self._waiting, entry)
+
+    def _preempt_for(self, slot: _Slot) -> None:
+        """Cancel the least urgent preemptible request standing in ``slot``'s way."""
+        if slot.priority >= self._preemptible:
+            return
+        model_full = sum(1 for s in self._running if s.model == slot.model) >= self._max_concurrency
+        victims = [
+            s for s in self._running
+            if s.priority >= self._preemptible and not s.preempted
+            and (s.model == slot.model or not model_full)
+        ]
+        if not victims:
+            return
+        # Least urgent first, then the most recently started (least work lost)
+        victim = max(victims, key=lambda s: (s.priority, s.granted_at))
+        victim.preempted = True
+        self.stats[victim.priority].preempted += 1
+        logger.debug("Preempting %s request on %s", victim.priority.name, victim.model)
+        victim.task.cancel()
@@ -0,0 +1,249 @@
+"""Template-based Stage 0 candidates (no model).
+
+Ranks the patient's template sentences (ContextFrame.template_sentences)
+and the utterances they have selected before against what the partner
+just said, using BM25 over character bigrams (no tokenizer needed for
+Japanese).  Frequently selected utterances get a prior on top, so with
+no lexical overlap at all the patient's most used phrases come first.
+
+Scoring a few thousand short sentences takes well under a millisecond
+per query term, so the set is ready before any LLM stage has started,
+and it is the only source of candidates when both the local and the
+cloud LLMs are unreachable.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from voicereach.config import settings
+from voicereach.engine.llm.candidate import DEFAULT_INTENT_CYCLE
+from voicereach.models.events import Candidate, CandidateSet, GenerationStage, IntentAxis
+
+if TYPE_CHECKING:
+    from voicereach.models.context import ContextFrame
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_FORMAT_VERSION = 1
+_PUNCTUATION = "。、.,!?！？…「」『』()（）・~〜ー"
+_MAX_CONFIDENCE = 0.5  # template candidates never outrank an LLM's confident ones
+_MIN_CONFIDENCE = 0.1
+
+
+def _normalize(text: str) -> str:
+    text = "".join(unicodedata.normalize("NFKC", text).lower().split())
+    return "".join(ch for ch in text if ch not in _PUNCTUATION)
+
+
+def _bigrams(text: str) -> list[str]:
+    padded = f"^{_normalize(text)}$"
+    return [padded[i:i + 2] for i in range(len(padded) - 1)]
+
+
+@dataclass
+class _Doc:
+    text: str
+    terms: Counter
+    length: int
+    template: bool = False
+    count: int = 0  # times the patient selected it
+
+
+class TemplateCandidateGenerator:
+    """BM25 index over template sentences and frequently selected utterances."""
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_utterances: int = 500,
+        frequency_weight: float = 1.0,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> None:
+        """
+        Args:
+            path: JSON file the selection counts are loaded from / saved to
+                (None: memory only).
+            max_utterances: Past utterances kept; the least selected are
+                dropped beyond this.
+            frequency_weight: Weight of log(1 + selections) added to the
+                BM25 score.
+            k1, b: BM25 term-frequency saturation and length normalization.
+        """
+        self.path = Path(path) if path is not None else None
+        self._max_utterances = max_utterances
+        self._frequency_weight = frequency_weight
+        self._k1 = k1
+        self._b = b
+        self._docs: dict[str, _Doc] = {}  # normalized text -> doc
+        self._templates: tuple[str, ...] = ()
+        # Inverted index, rebuilt lazily after the documents change
+        self._postings: dict[str, list[tuple[_Doc, int]]] | None = None
+        self._avg_length = 0.0
+        self._dirty = False
+
+    @classmethod
+    def for_patient(cls, patient_id: str, **kwargs) -> TemplateCandidateGenerator:
+        """The persistent generator of one patient, under settings.cache_dir."""
+        return cls(settings.cache_dir / "templates" / f"{patient_id}.json", **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # ------------------------------------------------------------------
+    # Documents
+    # ------------------------------------------------------------------
+
+    def set_templates(self, sentences: list[str]) -> None:
+        """Replace the template sentences (a no-op if unchanged)."""
+        templates = tuple(sentences)
+        if templates == self._templates:
+            return
+        self._templates = templates
+        for key, doc in list(self._docs.items()):
+            doc.template = False
+            if not doc.count:
+                del self._docs[key]
+        for sentence in templates:
+            self._doc(sentence).template = True
+        self._postings = None
+
+    def record_selection(self, text: str) -> None:
+        """Count an utterance the patient selected (or typed)."""
+        if not _normalize(text):
+            return
+        self._doc(text).count += 1
+        self._dirty = True
+        utterances = [d for d in self._docs.values() if d.count]
+        if len(utterances) > self._max_utterances:
+            utterances.sort(key=lambda d: d.count)
+            for doc in utterances[: len(utterances) - self._max_utterances]:
+                doc.count = 0
+                if not doc.template:
+                    del self._docs[_normalize(doc.text)]
+        self._postings = None
+
+    def _doc(self, text: str) -> _Doc:
+        key = _normalize(text)
+        doc = self._docs.get(key)
+        if doc is None:
+            terms = Counter(_bigrams(text))
+            doc = self._docs[key] = _Doc(text.strip(), terms, sum(terms.values()))
+        return doc
+
+    def _index(self) -> dict[str, list[tuple[_Doc, int]]]:
+        if self._postings is None:
+            postings: dict[str, list[tuple[_Doc, int]]] = {}
+            for doc in self._docs.values():
+                for term, tf in doc.terms.items():
+                    postings.setdefault(term, []).append((doc, tf))
+            self._postings = postings
+            self._avg_length = (
+                sum(d.length for d in self._docs.values()) / len(self._docs) if self._docs else 0.0
+            )
+        return self._postings
+
+    # ------------------------------------------------------------------
+    # Ranking
+    # ------------------------------------------------------------------
+
+    def rank(self, query: str, limit: int) -> list[tuple[float, _Doc]]:
+        """Top ``limit`` documents for ``query``, best first."""
+        postings = self._index()
+        n = len(self._docs)
+        scores = {
+            id(doc): self._frequency_weight * math.log1p(doc.count)
+            for doc in self._docs.values()
+        }
+        for term in set(_bigrams(query)) if _normalize(query) else ():
+            matches = postings.get(term)
+            if not matches:
+                continue
+            idf = math.log(1 + (n - len(matches) + 0.5) / (len(matches) + 0.5))
+            for doc, tf in matches:
+                norm = self._k1 * (1 - self._b + self._b * doc.length / self._avg_length)
+                scores[id(doc)] += idf * tf * (self._k1 + 1) / (tf + norm)
+        # Stable sort: equal scores keep template order, then selection order
+        ranked = sorted(
+            ((scores[id(doc)], doc) for doc in self._docs.values()),
+            key=lambda sd: sd[0],
+            reverse=True,
+        )
+        return ranked[:limit]
+
+    def generate(
+        self, context: ContextFrame, num_candidates: int = 4, request_id: str | None = None
+    ) -> CandidateSet | None:
+        """Stage 0 candidates for ``context``, or None without any sentences."""
+        self.set_templates(context.template_sentences)
+        query = next(
+            (t.text for t in reversed(context.conversation_history) if t.role == "partner"), ""
+        )
+        ranked = self.rank(query, num_candidates)
+        if not ranked:
+            return None
+        top = ranked[0][0] or 1.0
+        return CandidateSet(
+            candidates=[
+                Candidate(
+                    text=doc.text,
+                    intent_axis=_intent(doc.text, i),
+                    confidence=max(_MIN_CONFIDENCE, _MAX_CONFIDENCE * score / top),
+                    generation_stage=GenerationStage.INSTANT,
+                    latency_ms=0,
+                )
+                for i, (score, doc) in enumerate(ranked)
+            ],
+            stage=GenerationStage.INSTANT,
+            request_id=request_id or uuid4().hex[:12],
+        )
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self) -> int:
+        """Load selection counts from ``path``; returns how many utterances were loaded."""
+        if self.path is None or not self.path.exists():
+            return 0
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            logger.warning("Unreadable template index at %s; starting empty", self.path)
+            return 0
+        if data.get("version") != TEMPLATE_FORMAT_VERSION:
+            logger.warning("Ignoring template index with version %r", data.get("version"))
+            return 0
+        for text, count in data["utterances"].items():
+            self._doc(text).count = count
+        self._postings = None
+        self._dirty = False
+        return len(data["utterances"])
+
+    def save(self) -> None:
+        """Write selection counts to ``path`` (atomically) if anything changed."""
+        if self.path is None or not self._dirty:
+            return
+        utterances = {d.text: d.count for d in self._docs.values() if d.count}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(
+            {"version": TEMPLATE_FORMAT_VERSION, "utterances": utterances}, ensure_ascii=False
+        ))
+        tmp.replace(self.path)
+        self._dirty = False
+
+
+def _intent(text: str, index: int) -> IntentAxis:
+    if text.rstrip().endswith(("?", "？")):
+        return IntentAxis.QUESTION
+    return DEFAULT_INTENT_CYCLE[index % len(DEFAULT_INTENT_CYCLE)]
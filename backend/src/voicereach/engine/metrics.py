@@ -0,0 +1,56 @@
+"""Latency metrics shared by the engine components.
+
+LatencyHistogram keeps a sliding window of recent latencies; the cloud
+client hedges on its percentiles, and the local LLM scheduler and the TTS
+worker report them.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+
+
+class LatencyHistogram:
+    """Latencies (ms) of the most recent requests of one kind.
+
+    A request cancelled before it answered (e.g. it lost a hedged race,
+    or the deadline ran out) is recorded as censored: its latency is only
+    known to exceed the time it ran.  Dropping those would leave just the
+    fast requests and bias the percentiles low; percentile() uses the
+    Kaplan-Meier estimate instead, which counts a censored sample as
+    "still running" up to its elapsed time.
+    """
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: deque[tuple[float, bool]] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency_ms: float) -> None:
+        self._samples.append((latency_ms, True))
+
+    def record_censored(self, elapsed_ms: float) -> None:
+        """A request abandoned after ``elapsed_ms`` without an answer."""
+        self._samples.append((elapsed_ms, False))
+
+    def percentile(self, p: float) -> float:
+        """Percentile (0-100) of the window; 0.0 when empty.
+
+        Nearest-rank when nothing is censored.  If censored samples keep
+        the estimate from ever reaching ``p``, the largest time seen is
+        returned: the true value is at least that.
+        """
+        if not self._samples:
+            return 0.0
+        # Completions sort before censorings at the same time (standard KM tie rule)
+        ordered = sorted(self._samples, key=lambda s: (s[0], not s[1]))
+        at_risk = len(ordered)
+        survival = 1.0
+        for latency, observed in ordered:
+            if observed:
+                survival *= 1 - 1 / at_risk
+                if 1 - survival >= p / 100 - 1e-9:
+                    return latency
+            at_risk -= 1
+        return ordered[-1][0]
@@ -10,61 +10,140 @@ interacts with.
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
 import time
+from typing import TYPE_CHECKING
 
 import numpy as np
 
 from voicereach.config import settings
+from voicereach.engine.gaze.adaptive_scheduler import AdaptiveFrameScheduler
 from voicereach.engine.gaze.calibration import GazeCalibrator
 from voicereach.engine.gaze.gaze_estimator import GazeEstimator
-from voicereach.engine.gaze.mediapipe_tracker import FaceData
-from voicereach.engine.gaze.smoother import DualAxisSmoother
-from voicereach.engine.gaze.zone_mapper import ZoneMapper, ZoneResult
+from voicereach.engine.gaze.gaze_worker import GazeWorker
+from voicereach.engine.gaze.mediapipe_tracker import FaceData, MediaPipeTracker
+from voicereach.engine.gaze.smoother import create_smoother
+from voicereach.engine.gaze.zone_mapper import ZoneMapper, ZoneResult, gaze_to_screen
 from voicereach.engine.input.ial import IAL
 from voicereach.engine.input.keyboard_adapter import KeyboardAdapter
+from voicereach.engine.llm.candidate_cache import CandidateCache
 from voicereach.engine.llm.orchestrator import HybridLLMOrchestrator
+from voicereach.engine.llm.prefetch import SpeculativePrefetcher
+from voicereach.engine.llm.templates import TemplateCandidateGenerator
 from voicereach.engine.tts.cosyvoice import CosyVoiceEngine
+from voicereach.engine.tts.presynth import PreSynthesizer
 from voicereach.engine.tts.router import TTSRouter
+from voicereach.engine.tts.streaming import encode_pcm_frame
+from voicereach.engine.tts.tts_worker import TTSWorker
 from voicereach.models.context import ContextFrame, ConversationEntry, PatientState
 from voicereach.models.events import (
     CandidateSet,
     CandidateUpdate,
+    ErrorMessage,
     EventType,
     IALEvent,
     ServerMessage,
     TTSReady,
+    TTSStreamEnd,
+    TTSStreamStart,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from voicereach.engine.gaze.camera_source import CameraSource
+
 logger = logging.getLogger(__name__)
 
 
 class Pipeline:
     """Main VoiceReach processing pipeline."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self, gaze_execution: str | None = None, tts_execution: str | None = None
+    ) -> None:
         # Gaze components
         self._calibrator = GazeCalibrator()
-        self._smoother = DualAxisSmoother()
+        self._smoother = create_smoother()
         self._zone_mapper = ZoneMapper(num_zones=settings.num_zones)
         self._gaze_estimator = GazeEstimator()
+        mode = gaze_execution or settings.gaze_execution
+        if mode not in ("inline", "process"):
+            raise ValueError(f"Unknown gaze execution mode: {mode!r}")
+        self._gaze_worker = GazeWorker() if mode == "process" else None
+        self._frame_scheduler = (
+            AdaptiveFrameScheduler(
+                reduced_fps=settings.adaptive_reduced_fps,
+                stable_after_s=settings.adaptive_stable_after_s,
+            )
+            if settings.adaptive_tracking
+            else None
+        )
 
         # Input
         self._ial = IAL()
         self._keyboard = KeyboardAdapter()
 
         # LLM
-        self._llm = HybridLLMOrchestrator()
+        self._candidate_cache = (
+            CandidateCache.for_patient(
+                settings.patient_id,
+                capacity=settings.candidate_cache_capacity,
+                ttl_s=settings.candidate_cache_ttl_days * 86400,
+                similarity_threshold=settings.candidate_cache_similarity,
+            )
+            if settings.candidate_cache
+            else None
+        )
+        self._templates = (
+            TemplateCandidateGenerator.for_patient(
+                settings.patient_id, max_utterances=settings.template_max_utterances
+            )
+            if settings.template_candidates
+            else None
+        )
+        self._llm = HybridLLMOrchestrator(
+            candidate_cache=self._candidate_cache, templates=self._templates
+        )
+        self._llm_warmup: asyncio.Task | None = None
+        self._stage0_save: asyncio.Task | None = None
+        self._prefetcher = (
+            SpeculativePrefetcher(
+                self._llm,
+                num_candidates=settings.num_candidates,
+                min_chars=settings.prefetch_min_chars,
+                match_threshold=settings.prefetch_match_threshold,
+            )
+            if settings.speculative_prefetch
+            else None
+        )
 
         # TTS
         self._tts_engine = CosyVoiceEngine()
+        tts_mode = tts_execution or settings.tts_execution
+        if tts_mode not in ("inline", "process"):
+            raise ValueError(f"Unknown TTS execution mode: {tts_mode!r}")
+        self._tts_worker = TTSWorker() if tts_mode == "process" else None
         self._tts_router = TTSRouter()
+        self._presynth = (
+            PreSynthesizer(
+                self._tts_router,
+                max_per_set=settings.tts_presynth_max_per_set,
+                budget_s=settings.tts_presynth_budget_s,
+            )
+            if settings.tts_presynthesis
+            else None
+        )
 
         # State
         self._context = ContextFrame()
         self._current_request_id: str | None = None
         self._current_candidates: CandidateSet | None = None
+        self._generation_task: asyncio.Task | None = None
         self._message_callback = None
+        self._audio_callback = None
+        self._stream_ids = itertools.count(1)
 
     async def initialize(self) -> None:
         """Initialize all pipeline components."""
@@ -73,28 +152,119 @@ class Pipeline:
         self._ial.subscribe(self._on_ial_event)
         await self._ial.start()
 
-        # Initialize gaze estimator (ONNX model, falls back to heuristic)
-        self._gaze_estimator.initialize()
-
-        # Initialize TTS
-        await self._tts_engine.initialize()
-        self._tts_router.set_engine(self._tts_engine)
+        # Initialize gaze estimator (ONNX model, falls back to heuristic),
+        # either here or in the worker process
+        if self._gaze_worker is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._gaze_worker.start)
+        else:
+            self._gaze_estimator.initialize()
+
+        if self._candidate_cache is not None:
+            self._candidate_cache.load()
+        if self._templates is not None:
+            self._templates.load()
+
+        # Initialize TTS, either here or in the worker process (which also
+        # warms the model up); fall back to inline if the worker fails
+        if self._tts_worker is not None:
+            try:
+                await self._tts_worker.initialize()
+                self._tts_router.set_engine(self._tts_worker)
+            except RuntimeError:
+                logger.warning("TTS worker unavailable, synthesizing inline")
+                self._tts_worker = None
+        if self._tts_worker is None:
+            await self._tts_engine.initialize()
+            self._tts_router.set_engine(self._tts_engine)
+
+        # Open cloud LLM connections and prefill the local models' prompt
+        # prefix in the background; startup need not wait
+        self._llm_warmup = asyncio.create_task(self._warm_llm())
 
         logger.info("Pipeline initialized")
 
+    async def _warm_llm(self) -> None:
+        await asyncio.gather(
+            self._llm.warmup(),
+            self._llm.prewarm(self._context, settings.num_candidates),
+        )
+
     async def shutdown(self) -> None:
         """Shutdown all components."""
         await self._ial.stop()
         self._gaze_estimator.close()
+        if self._gaze_worker is not None:
+            # stop() joins the process; keep the event loop serving meanwhile
+            await asyncio.get_running_loop().run_in_executor(None, self._gaze_worker.stop)
+        if self._llm_warmup is not None:
+            self._llm_warmup.cancel()
+        if self._prefetcher is not None:
+            self._prefetcher.cancel_all()
+        if self._generation_task is not None:
+            self._generation_task.cancel()
+        if self._presynth is not None:
+            self._presynth.cancel_all()
+        if self._tts_worker is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._tts_worker.stop)
+        await self._llm.cancel_all()
+        if self._stage0_save is not None:
+            self._stage0_save.cancel()
+        self._save_stage0()
+        self._tts_router.close()
+        await self._llm.aclose()
         logger.info("Pipeline shut down")
 
+    def _schedule_stage0_save(self) -> None:
+        """Save the candidate cache and selection counts soon.
+
+        Debounced: changes made before the pending save runs are written
+        with it, so the files are rewritten at most once per
+        ``stage0_save_delay_s`` and a crash loses at most that much.
+        """
+        if self._stage0_save is None or self._stage0_save.done():
+            self._stage0_save = asyncio.create_task(self._save_stage0_later())
+
+    async def _save_stage0_later(self) -> None:
+        await asyncio.sleep(settings.stage0_save_delay_s)
+        self._save_stage0()
+
+    def _save_stage0(self) -> None:
+        try:
+            if self._candidate_cache is not None:
+                self._candidate_cache.save()
+            if self._templates is not None:
+                self._templates.save()
+        except OSError:
+            logger.exception("Could not save Stage 0 state")
+
+    def tts_health(self) -> dict:
+        """TTS execution mode, model state and (worker) latency metrics."""
+        if self._tts_worker is not None:
+            health = self._tts_worker.health()
+        else:
+            health = {"execution": "inline", "model_loaded": self._tts_engine.is_available}
+        segments = self._tts_router.segment_stats
+        if segments is not None:
+            health["segment_ratio"] = round(segments.segment_ratio, 3)
+        return health
+
     def set_message_callback(self, callback) -> None:
         """Set callback for sending messages to the client."""
         self._message_callback = callback
 
+    def set_audio_callback(self, callback) -> None:
+        """Set callback for sending binary audio frames to the client.
+
+        With an audio callback (and settings.tts_streaming), selected
+        candidates are spoken as a TTS stream instead of a TTSReady URL.
+        """
+        self._audio_callback = callback
+
     def handle_gaze_update(self, zone_id: int, confidence: float) -> ZoneResult:
         """Process a gaze zone update from the client."""
         self._context.current_zone_id = zone_id
+        if self._presynth is not None:
+            self._presynth.note_gaze(zone_id)
         return self._zone_mapper.map(zone_id / max(settings.num_zones - 1, 1), 0.5)
 
     def process_face_data(self, face_data: FaceData) -> ZoneResult | None:
@@ -110,12 +280,83 @@ class Pipeline:
             gaze.pitch, gaze.yaw
         )
         # Normalise to 0-1 range for the zone mapper
-        norm_x = (smoothed_yaw + 30) / 60  # yaw:  -30 .. +30 degrees
-        norm_y = (smoothed_pitch + 20) / 40  # pitch: -20 .. +20 degrees
-        norm_x = max(0.0, min(1.0, norm_x))
-        norm_y = max(0.0, min(1.0, norm_y))
+        norm_x, norm_y = gaze_to_screen(smoothed_pitch, smoothed_yaw)
         return self._zone_mapper.map(norm_x, norm_y)
 
+    async def submit_face_data(self, face_data: FaceData) -> ZoneResult | None:
+        """Event-loop friendly process_face_data.
+
+        In "process" execution mode the work runs in the gaze worker and
+        only the ZoneResult comes back; otherwise it runs inline.
+        """
+        if self._gaze_worker is not None:
+            return await self._gaze_worker.process_face_data(face_data)
+        return self.process_face_data(face_data)
+
+    async def track_camera(
+        self, camera: CameraSource, tracker: MediaPipeTracker | None = None
+    ) -> AsyncIterator[ZoneResult]:
+        """Run the gaze pipeline on live camera frames.
+
+        Consumes ``camera.frames()`` (newest frame wins), extracts face data
+        and yields a ZoneResult per frame with a detected face.  Frames the
+        pipeline was too slow for are dropped by the camera source rather
+        than queued, so latency stays bounded by one frame.
+
+        In "process" execution mode frames go to the gaze worker, which
+        owns its own tracker, and ``tracker`` is ignored.  Inline, a
+        tracker configured from settings is used unless one is passed.
+
+        With adaptive tracking enabled, frames during stable fixations are
+        skipped (no result is yielded for them) until motion is detected.
+        """
+        owned = None
+        if self._gaze_worker is None and tracker is None:
+            # Each FaceData is consumed before the next frame
+            tracker = owned = MediaPipeTracker.from_settings(reuse_buffers=True)
+            tracker.initialize()
+        try:
+            async for result in self._track(camera, tracker):
+                yield result
+        finally:
+            if owned is not None:
+                owned.close()
+
+    async def _track(
+        self, camera: CameraSource, tracker: MediaPipeTracker | None
+    ) -> AsyncIterator[ZoneResult]:
+        scheduler = self._frame_scheduler
+        async for frame in camera.frames():
+            if scheduler is not None and not scheduler.should_process(
+                frame.timestamp, frame.image
+            ):
+                continue
+
+            t0 = time.perf_counter()
+            landmarks = None
+            saccade = False
+            if self._gaze_worker is not None:
+                result = await self._gaze_worker.process_frame(frame.image)
+            else:
+                face_data = tracker.process_frame(frame.image)
+                result = None
+                if face_data is not None:
+                    result = self.process_face_data(face_data)
+                    landmarks = face_data.landmarks
+                    saccade = self._smoother.last_saccade
+
+            if scheduler is not None:
+                scheduler.record(
+                    frame.timestamp,
+                    frame.image,
+                    result.zone_id if result is not None else None,
+                    saccade=saccade,
+                    landmarks=landmarks,
+                    processing_ms=(time.perf_counter() - t0) * 1000.0,
+                )
+            if result is not None:
+                yield result
+
     def handle_key(self, key: str) -> None:
         """Forward a keyboard event to the keyboard adapter."""
         self._keyboard.handle_key(key)
@@ -131,33 +372,104 @@ class Pipeline:
                 self._context.conversation_history.append(
                     ConversationEntry(role="patient", text=text)
                 )
+                if self._templates is not None:
+                    self._templates.record_selection(text)
+                    self._schedule_stage0_save()
 
-                # Cancel pending LLM stages
+                # Cancel pending LLM stages and pre-synthesis of the others
                 await self._llm.cancel_pending(request_id)
+                if self._presynth is not None:
+                    self._presynth.selected(text)
 
                 # Synthesize speech
-                audio_path = await self._tts_router.synthesize(text)
-                if audio_path and self._message_callback:
-                    await self._message_callback(TTSReady(
-                        audio_url=f"/audio/{audio_path.name}",
-                        text=text,
+                if settings.tts_streaming and self._audio_callback and self._message_callback:
+                    await self._stream_speech(text)
+                else:
+                    await self._send_speech(text)
+
+    async def _send_speech(self, text: str) -> None:
+        """Synthesize ``text`` as a whole and send its URL as TTSReady."""
+        audio_path = await self._tts_router.synthesize(text)
+        if audio_path and self._message_callback:
+            await self._message_callback(TTSReady(
+                audio_url=f"/audio/{audio_path.name}",
+                text=text,
+            ))
+
+    async def _stream_speech(self, text: str) -> None:
+        """Send ``text`` as TTS stream: start message, PCM frames, end message.
+
+        The start message goes out with the first chunk, so the client
+        can begin playback while the rest is still being synthesized.
+        A stream that produces no audio falls back to TTSReady; one cut
+        short after its first chunk ends with an ErrorMessage instead of
+        TTSStreamEnd.
+        """
+        stream_id = next(self._stream_ids)
+        seq = 0
+        duration_ms = 0.0
+        try:
+            async for chunk in self._tts_router.synthesize_stream(text):
+                if seq == 0:
+                    await self._message_callback(TTSStreamStart(
+                        stream_id=stream_id, text=text, sample_rate=chunk.sample_rate,
                     ))
-
-    async def trigger_generation(self) -> None:
-        """Trigger new candidate generation based on current context."""
-        async for candidate_set in self._llm.generate_candidates(
-            context=self._context,
-            num_candidates=settings.num_candidates,
-        ):
-            self._current_candidates = candidate_set
-            self._current_request_id = candidate_set.request_id
-
-            if self._message_callback:
-                await self._message_callback(CandidateUpdate(
-                    request_id=candidate_set.request_id,
-                    candidate_set=candidate_set,
-                    is_final=candidate_set.is_final,
-                ))
+                await self._audio_callback(encode_pcm_frame(stream_id, seq, chunk.samples))
+                seq += 1
+                duration_ms += chunk.duration_ms
+        except Exception:
+            logger.exception("TTS stream %d cut short", stream_id)
+            await self._message_callback(ErrorMessage(
+                detail=f"Speech synthesis failed after {int(duration_ms)} ms",
+            ))
+            return
+        if not seq:
+            await self._send_speech(text)
+            return
+        await self._message_callback(TTSStreamEnd(
+            stream_id=stream_id, duration_ms=int(duration_ms),
+        ))
+
+    async def trigger_generation(self, warm: CandidateSet | None = None) -> None:
+        """Trigger new candidate generation based on current context.
+
+        A prefetched ``warm`` set is published immediately; generated sets
+        only replace it once they come from a later stage (or are a
+        complete set of the same stage).  The generation runs under the
+        warm set's request ID, so selecting a warm candidate cancels it
+        like any other pending stage.
+        """
+        if warm is not None:
+            await self._publish_candidates(warm)
+        try:
+            async for candidate_set in self._llm.generate_candidates(
+                context=self._context,
+                num_candidates=settings.num_candidates,
+                request_id=warm.request_id if warm is not None else None,
+            ):
+                if warm is not None and (
+                    candidate_set.stage < warm.stage
+                    or (candidate_set.stage == warm.stage and candidate_set.is_partial)
+                ):
+                    continue
+                await self._publish_candidates(candidate_set)
+        finally:
+            # The run stored its best set in the candidate cache
+            if self._candidate_cache is not None:
+                self._schedule_stage0_save()
+
+    async def _publish_candidates(self, candidate_set: CandidateSet) -> None:
+        self._current_candidates = candidate_set
+        self._current_request_id = candidate_set.request_id
+
+        if self._message_callback:
+            await self._message_callback(CandidateUpdate(
+                request_id=candidate_set.request_id,
+                candidate_set=candidate_set,
+                is_final=candidate_set.is_final,
+            ))
+        if self._presynth is not None:
+            self._presynth.schedule(candidate_set)
 
     def _on_ial_event(self, event: IALEvent) -> None:
         """Handle IAL events."""
@@ -182,9 +494,31 @@ class Pipeline:
             logger.warning("EMERGENCY event received!")
             # TODO: Trigger emergency notification to caregivers
 
+    def add_partner_partial(self, text: str) -> None:
+        """Feed an interim transcript of the partner's ongoing utterance.
+
+        Starts speculative Stage 1/2 generation so candidates are ready
+        when the utterance is finalized via add_partner_utterance().
+        """
+        if self._prefetcher is None:
+            return
+        history = [
+            *self._context.conversation_history, ConversationEntry(role="partner", text=text)
+        ]
+        self._prefetcher.update(
+            self._context.model_copy(update={"conversation_history": history}), text
+        )
+
     def add_partner_utterance(self, text: str) -> None:
-        """Add a conversation partner's utterance and trigger generation."""
+        """Add a conversation partner's utterance and trigger generation.
+
+        A generation still running for an earlier utterance is superseded:
+        its task is cancelled, which aborts its LLM stages.
+        """
         self._context.conversation_history.append(
             ConversationEntry(role="partner", text=text)
         )
-        asyncio.create_task(self.trigger_generation())
+        warm = self._prefetcher.take(text) if self._prefetcher is not None else None
+        if self._generation_task is not None and not self._generation_task.done():
+            self._generation_task.cancel()
+        self._generation_task = asyncio.create_task(self.trigger_generation(warm))
@@ -0,0 +1,258 @@
+"""Bounded on-disk cache of synthesized utterances.
+
+One WAV per cache key, plus an ``index.json`` recording each entry's size,
+hit count and last use, so the cache can be bounded without scanning or
+stat-ing the directory on every request:
+
+  - total size and entry count are capped; beyond either, entries are
+    evicted least recently used first ("lru") or least frequently used
+    first, oldest among equals ("lfu")
+  - the most frequently hit entries ("はい", "ありがとう") are also kept
+    decoded in memory, so replaying them touches no file
+  - synthesized files are moved into the cache (or samples written
+    straight into it), never copied, so no temp WAV is left behind
+
+Files in the directory that the index does not know (e.g. from before the
+index existed) are adopted at startup; index entries whose file is gone
+are dropped.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING
+
+import soundfile as sf
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 1
+INDEX_FILE = "index.json"
+
+
+@dataclass
+class _Entry:
+    size: int
+    hits: int = 0
+    last_used: float = 0.0  # time.time()
+
+
+@dataclass
+class AudioCacheStats:
+    """Lookup counters."""
+    hits: int = 0
+    hot_hits: int = 0  # hits served from memory
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class AudioCache:
+    """Size- and count-bounded WAV cache with an index and an in-memory hot tier."""
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = 512 * 1024 * 1024,
+        max_entries: int = 5000,
+        hot_entries: int = 32,
+        hot_min_hits: int = 3,
+        eviction: str = "lru",
+    ) -> None:
+        """
+        Args:
+            directory: Where the WAV files and the index live.
+            max_bytes: Maximum total size of the cached files.
+            max_entries: Maximum number of cached files.
+            hot_entries: Entries kept decoded in memory.
+            hot_min_hits: Hits before an entry may enter the hot tier.
+            eviction: "lru" or "lfu".
+        """
+        if eviction not in ("lru", "lfu"):
+            raise ValueError(f"Unknown eviction policy: {eviction!r}")
+        self._dir = directory
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+        self._hot_entries = hot_entries
+        self._hot_min_hits = hot_min_hits
+        self._eviction = eviction
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()  # LRU order
+        self._hot: dict[str, tuple[np.ndarray, int]] = {}
+        self._bytes = 0
+        self._dirty = False
+        self.stats = AudioCacheStats()
+        self._load_index()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def path(self, key: str) -> Path:
+        return self._dir / f"{key}.wav"
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get_path(self, key: str) -> Path | None:
+        """Path of the cached WAV for ``key``, or None (counts as a lookup)."""
+        if not self._touch(key):
+            return None
+        return self.path(key)
+
+    def get_samples(self, key: str) -> tuple[np.ndarray, int] | None:
+        """(float32 samples, sample rate) for ``key``, or None (counts as a lookup)."""
+        if key in self._hot:
+            self._touch(key)
+            self.stats.hot_hits += 1
+            return self._hot[key]
+        if not self._touch(key):
+            return None
+        samples, sample_rate = sf.read(str(self.path(key)), dtype="float32")
+        self._promote(key, samples, sample_rate)
+        return samples, sample_rate
+
+    def _touch(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return False
+        entry.hits += 1
+        entry.last_used = time.time()
+        self._entries.move_to_end(key)
+        self._dirty = True
+        self.stats.hits += 1
+        return True
+
+    def _promote(self, key: str, samples: np.ndarray, sample_rate: int) -> None:
+        """Keep ``key`` in memory if it is among the most frequently hit entries."""
+        hits = self._entries[key].hits
+        if self._hot_entries <= 0 or hits < self._hot_min_hits:
+            return
+        if len(self._hot) >= self._hot_entries:
+            coldest = min(self._hot, key=lambda k: self._entries[k].hits)
+            if self._entries[coldest].hits >= hits:
+                return
+            del self._hot[coldest]
+        self._hot[key] = (samples, sample_rate)
+
+    # ------------------------------------------------------------------
+    # Insertion
+    # ------------------------------------------------------------------
+
+    def put_file(self, key: str, source: Path) -> Path:
+        """Move a synthesized WAV into the cache; returns its cached path."""
+        dest = self.path(key)
+        try:
+            os.replace(source, dest)
+        except OSError:
+            shutil.move(str(source), dest)  # different filesystem
+        self._add(key, dest.stat().st_size)
+        return dest
+
+    def put_samples(self, key: str, samples: np.ndarray, sample_rate: int) -> Path:
+        """Write audio straight into the cache; returns its cached path."""
+        dest = self.path(key)
+        tmp = dest.with_suffix(".part")
+        sf.write(str(tmp), samples, sample_rate, format="WAV")
+        os.replace(tmp, dest)
+        self._add(key, dest.stat().st_size)
+        return dest
+
+    def _add(self, key: str, size: int) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+            self._hot.pop(key, None)
+        self._entries[key] = _Entry(size=size, last_used=time.time())
+        self._bytes += size
+        self._dirty = True
+        self._evict(keep=key)
+        self.save_index()
+
+    def _evict(self, keep: str) -> None:
+        while len(self._entries) > 1 and (
+            self._bytes > self._max_bytes or len(self._entries) > self._max_entries
+        ):
+            if self._eviction == "lru":
+                victim = next(k for k in self._entries if k != keep)
+            else:
+                # Least hits; OrderedDict order breaks ties by least recent use
+                victim = min((k for k in self._entries if k != keep),
+                             key=lambda k: self._entries[k].hits)
+            self._remove(victim)
+            self.stats.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        self._hot.pop(key, None)
+        self.path(key).unlink(missing_ok=True)
+        self._dirty = True
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def save_index(self) -> None:
+        """Write the index (atomically) if anything changed."""
+        if not self._dirty:
+            return
+        index = self._dir / INDEX_FILE
+        tmp = index.with_suffix(".tmp")
+        tmp.write_text(json.dumps({
+            "version": INDEX_FORMAT_VERSION,
+            "entries": {k: asdict(e) for k, e in self._entries.items()},
+        }))
+        tmp.replace(index)
+        self._dirty = False
+
+    def _load_index(self) -> None:
+        entries: dict[str, dict] = {}
+        index = self._dir / INDEX_FILE
+        if index.exists():
+            try:
+                data = json.loads(index.read_text())
+                if data.get("version") == INDEX_FORMAT_VERSION:
+                    entries = data["entries"]
+                else:
+                    logger.warning("Ignoring TTS cache index with version %r", data.get("version"))
+            except (OSError, ValueError):
+                logger.warning("Unreadable TTS cache index at %s; rebuilding", index)
+
+        on_disk = {p.stem: p for p in self._dir.glob("*.wav")}
+        # Indexed entries in their saved (LRU) order, then unknown files
+        for key, raw in entries.items():
+            if key in on_disk:
+                self._entries[key] = _Entry(**raw)
+        unknown = set(on_disk) - set(self._entries)
+        for key in sorted(unknown, key=lambda k: on_disk[k].stat().st_mtime, reverse=True):
+            stat = on_disk[key].stat()
+            self._entries[key] = _Entry(size=stat.st_size, last_used=stat.st_mtime)
+            self._entries.move_to_end(key, last=False)
+        self._bytes = sum(e.size for e in self._entries.values())
+        self._dirty = len(self._entries) != len(entries)
+        self._evict(keep="")
+        self.save_index()
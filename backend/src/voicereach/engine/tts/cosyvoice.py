@@ -10,6 +10,10 @@ Falls back to a placeholder sine-wave tone when the CosyVoice model
 is not installed or the model directory is missing, so the full pipeline
 can still be exercised during development.
 
+synthesize_stream() yields the audio chunk by chunk as CosyVoice
+produces it (stream=True), so playback can start after the first chunk
+instead of after the whole sentence.
+
 References:
   - docs/08_VOICE_PRESERVATION.md  (voice cloning rationale)
   - docs/04_AI_CANDIDATE_GENERATION.md  (TTS in the generation pipeline)
@@ -17,17 +21,27 @@ References:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import tempfile
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import numpy as np
 import soundfile as sf
 
 from voicereach.config import settings
+from voicereach.engine.tts.streaming import AudioChunk, split_audio
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
 
 logger = logging.getLogger(__name__)
 
+COSYVOICE_SAMPLE_RATE = 22050
+PLACEHOLDER_SAMPLE_RATE = 24000
+
 
 class CosyVoiceEngine:
     """CosyVoice TTS engine wrapper.
@@ -67,6 +81,18 @@ class CosyVoiceEngine:
                 "CosyVoice initialization failed, using placeholder", exc_info=True
             )
 
+    async def warmup(self, texts: list[str]) -> float:
+        """Synthesize and discard ``texts`` so the first real request is not cold.
+
+        Returns the time taken in milliseconds.
+        """
+        t0 = time.perf_counter()
+        for text in texts:
+            path = await self.synthesize(text)
+            if path is not None:
+                path.unlink(missing_ok=True)
+        return (time.perf_counter() - t0) * 1000.0
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -82,6 +108,41 @@ class CosyVoiceEngine:
             return await self._synthesize_cosyvoice(text, speaker_id, emotion)
         return self._synthesize_placeholder(text)
 
+    async def synthesize_stream(
+        self,
+        text: str,
+        speaker_id: str = "default",
+        emotion: dict | None = None,
+        chunk_ms: int = 100,
+    ) -> AsyncIterator[AudioChunk]:
+        """Synthesize *text*, yielding audio chunks as they are produced.
+
+        Each model step runs in the default executor, so the event loop
+        keeps serving WebSocket and gaze traffic between chunks.  The
+        placeholder tone is yielded in ``chunk_ms`` pieces.
+
+        If the model fails before its first chunk, the placeholder tone is
+        streamed instead; a failure after that is raised, since the audio
+        already yielded is incomplete.
+        """
+        if self._available and self._model:
+            produced = False
+            try:
+                loop = asyncio.get_running_loop()
+                output = self._model.inference_sft(text, speaker_id, stream=True)
+                while (chunk := await loop.run_in_executor(None, next, output, None)) is not None:
+                    produced = True
+                    samples = chunk["tts_speech"].squeeze(0).cpu().numpy().astype(np.float32)
+                    yield AudioChunk(samples, COSYVOICE_SAMPLE_RATE)
+            except Exception:
+                logger.exception("CosyVoice streaming synthesis failed")
+                if produced:
+                    raise
+            if produced:
+                return
+        for chunk in split_audio(_placeholder_tone(text), PLACEHOLDER_SAMPLE_RATE, chunk_ms):
+            yield chunk
+
     async def synthesize_with_reference(
         self,
         text: str,
@@ -115,8 +176,8 @@ class CosyVoiceEngine:
                 return self._synthesize_placeholder(text)
 
             audio = torch.cat(audio_chunks, dim=1)
-            tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-            torchaudio.save(tmp.name, audio, sample_rate=22050)
+            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+                torchaudio.save(tmp.name, audio, sample_rate=COSYVOICE_SAMPLE_RATE)
             return Path(tmp.name)
         except Exception:
             logger.exception("Zero-shot synthesis failed")
@@ -140,8 +201,13 @@ class CosyVoiceEngine:
           3. Instruct mode
           4. Standard TTS (inference_sft)
 
-        For MVP we use standard TTS mode.
+        For MVP we use standard TTS mode.  Inference runs in the default
+        executor so it does not block the event loop.
         """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._infer_sft_to_file, text, speaker_id)
+
+    def _infer_sft_to_file(self, text: str, speaker_id: str) -> Path:
         import torch  # type: ignore[import-untyped]
         import torchaudio  # type: ignore[import-untyped]
 
@@ -158,8 +224,8 @@ class CosyVoiceEngine:
 
             audio = torch.cat(audio_chunks, dim=1)
 
-            tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-            torchaudio.save(tmp.name, audio, sample_rate=22050)
+            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+                torchaudio.save(tmp.name, audio, sample_rate=COSYVOICE_SAMPLE_RATE)
             return Path(tmp.name)
         except Exception:
             logger.exception(
@@ -177,18 +243,8 @@ class CosyVoiceEngine:
         Generates a short sine wave so the pipeline can be tested
         end-to-end without the actual TTS model.
         """
-        sr = 24000
-        duration = min(0.5 + len(text) * 0.1, 5.0)
-        t = np.linspace(0, duration, int(sr * duration), endpoint=False)
-        audio = 0.3 * np.sin(2 * np.pi * 440 * t).astype(np.float32)
-
-        # Simple envelope
-        fade_len = int(sr * 0.05)
-        audio[:fade_len] *= np.linspace(0, 1, fade_len)
-        audio[-fade_len:] *= np.linspace(1, 0, fade_len)
-
-        tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-        sf.write(tmp.name, audio, sr)
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+            sf.write(tmp.name, _placeholder_tone(text), PLACEHOLDER_SAMPLE_RATE)
         return Path(tmp.name)
 
     # ------------------------------------------------------------------
@@ -198,3 +254,17 @@ class CosyVoiceEngine:
     @property
     def is_available(self) -> bool:
         return self._available
+
+
+def _placeholder_tone(text: str) -> np.ndarray:
+    """440 Hz tone whose length grows with the text, with 50 ms fades."""
+    sr = PLACEHOLDER_SAMPLE_RATE
+    duration = min(0.5 + len(text) * 0.1, 5.0)
+    t = np.linspace(0, duration, int(sr * duration), endpoint=False)
+    audio = 0.3 * np.sin(2 * np.pi * 440 * t).astype(np.float32)
+
+    # Simple envelope
+    fade_len = int(sr * 0.05)
+    audio[:fade_len] *= np.linspace(0, 1, fade_len)
+    audio[-fade_len:] *= np.linspace(1, 0, fade_len)
+    return audio
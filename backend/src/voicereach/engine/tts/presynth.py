@@ -0,0 +1,182 @@
+"""Speculative synthesis of the displayed candidates.
+
+TTS normally starts only once the patient confirms a candidate.  While
+the candidates are on screen, though, the TTS engine is idle and the
+patient is taking seconds to choose, so the PreSynthesizer synthesizes
+the displayed candidates into TTSRouter's cache in the meantime, one at
+a time:
+
+  - the candidate the patient is looking at goes first, then the ones
+    looked at longest, then the rest by confidence
+  - at most ``max_per_set`` candidates and ``budget_s`` seconds of work
+    per candidate set; each generation stage's set gets a fresh budget,
+    and a synthesis cancelled because its text was replaced is not
+    counted against it
+  - when a new set replaces the displayed one, queued texts that are no
+    longer shown are dropped and an in-flight synthesis of such a text
+    is cancelled (texts still shown keep their progress)
+
+When the patient confirms, synthesize() finds the audio in the cache or
+joins the synthesis already under way.
+
+Pre-synthesis runs through the engine's streaming path, so cancelling it
+takes effect between chunks, not only once the whole utterance is done.
+The chunk being computed still finishes: a confirmed utterance can wait
+for up to one chunk of speculative inference (one model step inline, or
+one chunk in the TTS worker process, whose queue is first-come
+first-served).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from voicereach.engine.tts.router import TTSRouter
+    from voicereach.models.events import CandidateSet
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PreSynthStats:
+    """Pre-synthesis counters."""
+    synthesized: int = 0
+    cancelled: int = 0  # in-flight syntheses of texts no longer displayed
+    over_budget: int = 0  # sets whose queue was cut short by the time budget
+    ready: int = 0  # selections whose audio was cached or in flight
+    not_ready: int = 0
+
+    @property
+    def ready_ratio(self) -> float:
+        total = self.ready + self.not_ready
+        return self.ready / total if total else 0.0
+
+
+class PreSynthesizer:
+    """Background pre-synthesis of displayed candidates into the TTS cache."""
+
+    def __init__(self, router: TTSRouter, max_per_set: int = 4, budget_s: float = 10.0) -> None:
+        """
+        Args:
+            router: TTS router whose cache is filled.
+            max_per_set: Candidates synthesized per candidate set.
+            budget_s: Seconds of synthesis per candidate set (request
+                and stage).
+        """
+        self._router = router
+        self._max_per_set = max_per_set
+        self._budget_s = budget_s
+        self._request_id: str | None = None
+        self._stage = -1
+        self._displayed: list[str] = []
+        self._confidence: dict[str, float] = {}
+        self._dwell: dict[str, float] = {}  # seconds looked at, per text
+        self._gaze: tuple[int, float] | None = None  # (index, since)
+        self._pending: list[str] = []
+        self._started: int = 0  # syntheses started for the current set
+        self._deadline = 0.0
+        self._current: tuple[str, asyncio.Task] | None = None
+        self._worker: asyncio.Task | None = None
+        self.stats = PreSynthStats()
+
+    @property
+    def pending(self) -> list[str]:
+        """Texts waiting to be synthesized, next first."""
+        return list(self._pending)
+
+    def schedule(self, candidate_set: CandidateSet) -> None:
+        """Pre-synthesize the candidates of a newly displayed set."""
+        if candidate_set.request_id != self._request_id:
+            self._request_id = candidate_set.request_id
+            self._stage = -1
+            self._dwell.clear()
+            self._gaze = None
+        if candidate_set.stage > self._stage:
+            # A later stage replaces the candidates: budget them afresh
+            self._stage = candidate_set.stage
+            self._started = 0
+            self._deadline = time.monotonic() + self._budget_s
+        self._displayed = [c.text for c in candidate_set.candidates]
+        self._confidence = {c.text: c.confidence for c in candidate_set.candidates}
+
+        if self._current is not None and self._current[0] not in self._displayed:
+            self._current[1].cancel()
+            self.stats.cancelled += 1
+        in_flight = self._current[0] if self._current is not None else None
+        self._pending = [
+            t for t in self._displayed if t != in_flight and not self._router.is_cached(t)
+        ]
+        self._sort()
+        if not self._router.has_engine:
+            self._pending.clear()
+        elif self._pending and (self._worker is None or self._worker.done()):
+            self._worker = asyncio.create_task(self._run())
+
+    def note_gaze(self, index: int) -> None:
+        """Record that the patient is looking at displayed candidate ``index``."""
+        now = time.monotonic()
+        if self._gaze is not None:
+            previous, since = self._gaze
+            if previous < len(self._displayed):
+                text = self._displayed[previous]
+                self._dwell[text] = self._dwell.get(text, 0.0) + now - since
+        self._gaze = (index, now)
+        self._sort()
+
+    def selected(self, text: str) -> None:
+        """The patient confirmed ``text``: stop all other pre-synthesis."""
+        in_flight = self._current is not None and self._current[0] == text
+        if in_flight or self._router.is_cached(text):
+            self.stats.ready += 1
+        else:
+            self.stats.not_ready += 1
+        self._pending.clear()
+        if self._current is not None and not in_flight:
+            self._current[1].cancel()
+            self.stats.cancelled += 1
+
+    def cancel_all(self) -> None:
+        self._pending.clear()
+        if self._worker is not None:
+            self._worker.cancel()
+        if self._current is not None:
+            self._current[1].cancel()
+
+    def _sort(self) -> None:
+        gazed = None
+        if self._gaze is not None and self._gaze[0] < len(self._displayed):
+            gazed = self._displayed[self._gaze[0]]
+        self._pending.sort(key=lambda t: (
+            t != gazed, -self._dwell.get(t, 0.0), -self._confidence.get(t, 0.0)
+        ))
+
+    async def _run(self) -> None:
+        while self._pending:
+            if self._started >= self._max_per_set:
+                self._pending.clear()
+                break
+            if time.monotonic() >= self._deadline:
+                self.stats.over_budget += 1
+                self._pending.clear()
+                break
+            text = self._pending.pop(0)
+            if self._router.is_cached(text):
+                continue
+            self._started += 1
+            task = self._router.presynthesize(text)
+            self._current = (text, task)
+            try:
+                await task
+                self.stats.synthesized += 1
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    raise
+                self._started -= 1  # its text is no longer shown
+                logger.debug("Pre-synthesis of %r cancelled", text[:20])
+            finally:
+                self._current = None
@@ -1,12 +1,35 @@
-"""TTS routing: cache check -> streaming -> batch synthesis."""
+"""TTS routing: cache check -> streaming -> batch synthesis.
+
+Synthesized audio is kept in a bounded AudioCache (see audio_cache.py).
+
+presynthesize() fills the cache ahead of time in a cancellable task that
+synthesizes through the streaming path, so cancelling it stops the engine
+between chunks; a synthesize() call for the same text while that task
+runs waits for it instead of synthesizing the text a second time.
+
+On a cache miss, an utterance containing frequent phrases is assembled
+from their cached audio plus synthesis of the novel runs only (see
+segments.py).
+"""
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
-from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import soundfile as sf
 
 from voicereach.config import settings
+from voicereach.engine.tts.audio_cache import AudioCache
+from voicereach.engine.tts.segments import PhraseStitcher, SegmentCache, SegmentStats, split_phrases
+from voicereach.engine.tts.streaming import AudioChunk, split_audio
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
@@ -15,9 +38,26 @@ class TTSRouter:
     """Routes TTS requests through cache or synthesis engine."""
 
     def __init__(self, cache_dir: Path | None = None) -> None:
-        self._cache_dir = cache_dir or settings.cache_dir / "tts"
-        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_dir = cache_dir or settings.cache_dir / "tts"
+        self._cache = AudioCache(
+            cache_dir,
+            max_bytes=settings.tts_cache_max_mb * 1024 * 1024,
+            max_entries=settings.tts_cache_max_entries,
+            hot_entries=settings.tts_cache_hot_entries,
+            eviction=settings.tts_cache_eviction,
+        )
+        self._segments = (
+            SegmentCache(
+                cache_dir / "segments",
+                min_count=settings.tts_segment_min_count,
+                max_entries=settings.tts_segment_max_entries,
+            )
+            if settings.tts_segment_stitching
+            else None
+        )
         self._engine = None
+        self._inflight: dict[str, asyncio.Task] = {}  # cache key -> presynthesis
+        self._learning: set[asyncio.Task] = set()  # segment syntheses
 
     def set_engine(self, engine) -> None:
         """Set the TTS synthesis engine."""
@@ -34,7 +74,8 @@ class TTSRouter:
         Returns path to the audio file, or None if synthesis failed.
         """
         cache_key = self._cache_key(text, speaker_id)
-        cached = self._check_cache(cache_key)
+        await self._join_inflight(cache_key)
+        cached = self._cache.get_path(cache_key)
         if cached:
             logger.debug("TTS cache hit: %s", text[:20])
             return cached
@@ -44,26 +85,237 @@ class TTSRouter:
             return None
 
         try:
-            audio_path = await self._engine.synthesize(text, speaker_id, emotion)
-            if audio_path:
-                self._save_cache(cache_key, audio_path)
-            return audio_path
+            pieces = self._plan(text, speaker_id)
+            if pieces:
+                chunks = [c async for c in self._stitch(pieces, speaker_id, emotion)]
+                if not chunks:
+                    return None
+                path = self._cache.put_samples(
+                    cache_key, np.concatenate([c.samples for c in chunks]), chunks[0].sample_rate
+                )
+            else:
+                audio_path = await self._engine.synthesize(text, speaker_id, emotion)
+                if not audio_path:
+                    return None
+                path = self._cache.put_file(cache_key, audio_path)
+                if self._segments is not None:
+                    self._segments.stats.synthesized_ms += sf.info(str(path)).duration * 1000
         except Exception:
             logger.exception("TTS synthesis failed")
             return None
+        self._learn_segments(text, speaker_id)
+        return path
+
+    async def synthesize_stream(
+        self,
+        text: str,
+        speaker_id: str = "default",
+        emotion: dict | None = None,
+        chunk_ms: int | None = None,
+    ) -> AsyncIterator[AudioChunk]:
+        """Synthesize text to speech chunk by chunk, using cache if available.
+
+        Cached audio is replayed in ``chunk_ms`` pieces; otherwise the
+        engine's chunks are passed through as they arrive and the complete
+        utterance is written to the cache once the stream finishes.
+        Yields nothing if synthesis failed before the first chunk; if it
+        fails part-way, the error is raised after the chunks so far and
+        nothing is cached.
+        """
+        chunk_ms = chunk_ms or settings.tts_stream_chunk_ms
+        cache_key = self._cache_key(text, speaker_id)
+        await self._join_inflight(cache_key)
+        cached = self._cache.get_samples(cache_key)
+        if cached:
+            logger.debug("TTS cache hit: %s", text[:20])
+            samples, sample_rate = cached
+            for chunk in split_audio(samples, sample_rate, chunk_ms):
+                yield chunk
+            return
+
+        if self._engine is None:
+            logger.warning("No TTS engine configured")
+            return
+
+        chunks: list[AudioChunk] = []
+        try:
+            pieces = self._plan(text, speaker_id)
+            if pieces:
+                source = self._stitch(pieces, speaker_id, emotion, chunk_ms)
+            else:
+                source = self._engine.synthesize_stream(
+                    text, speaker_id, emotion, chunk_ms=chunk_ms
+                )
+            async for chunk in source:
+                chunks.append(chunk)
+                if not pieces and self._segments is not None:
+                    self._segments.stats.synthesized_ms += chunk.duration_ms
+                yield chunk
+        except Exception:
+            # The chunks so far are a truncated utterance: never cache them
+            if chunks:
+                raise
+            logger.exception("TTS streaming synthesis failed")
+            return
+        if chunks:
+            self._cache.put_samples(
+                cache_key, np.concatenate([c.samples for c in chunks]), chunks[0].sample_rate
+            )
+            self._learn_segments(text, speaker_id)
+
+    @property
+    def has_engine(self) -> bool:
+        return self._engine is not None
+
+    @property
+    def cache(self) -> AudioCache:
+        return self._cache
+
+    def is_cached(self, text: str, speaker_id: str = "default") -> bool:
+        return self._cache_key(text, speaker_id) in self._cache
+
+    @property
+    def segment_stats(self) -> SegmentStats | None:
+        return self._segments.stats if self._segments is not None else None
+
+    def flush(self) -> None:
+        """Persist the cache index (hit counts and recency) and phrase counts."""
+        self._cache.save_index()
+        if self._segments is not None:
+            self._segments.save()
+
+    def close(self) -> None:
+        """Stop learning segments, persist the caches and log segment reuse."""
+        for task in list(self._learning):
+            task.cancel()
+        self.flush()
+        stats = self.segment_stats
+        if stats is not None and stats.stitched:
+            logger.info(
+                "TTS segments: %d utterances stitched, %.0f%% of synthesized audio "
+                "served from %d cached phrases",
+                stats.stitched, stats.segment_ratio * 100, len(self._segments),
+            )
+
+    def presynthesize(self, text: str, speaker_id: str = "default") -> asyncio.Task:
+        """Synthesize ``text`` into the cache in a background task.
+
+        Returns the running task for the same text if there is one.
+        Cancelling the task abandons the synthesis; callers waiting for it
+        in synthesize() then synthesize the text themselves.
+        """
+        cache_key = self._cache_key(text, speaker_id)
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._fill(text, speaker_id))
+            self._inflight[cache_key] = task
+
+            def done(t: asyncio.Task) -> None:
+                if self._inflight.get(cache_key) is t:
+                    del self._inflight[cache_key]
+
+            task.add_done_callback(done)
+        return task
+
+    async def _fill(self, text: str, speaker_id: str) -> None:
+        """Synthesize ``text`` into the cache chunk by chunk."""
+        try:
+            async for _ in self.synthesize_stream(text, speaker_id):
+                pass
+        except Exception:
+            logger.exception("TTS presynthesis failed")
+
+    async def _join_inflight(self, cache_key: str) -> None:
+        """Wait for a running presynthesis of ``cache_key``, if any."""
+        task = self._inflight.get(cache_key)
+        if task is None or task is asyncio.current_task():
+            return
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise
+            # The presynthesis was cancelled, not us: synthesize normally
+
+    # ------------------------------------------------------------------
+    # Phrase segments
+    # ------------------------------------------------------------------
+
+    def _plan(self, text: str, speaker_id: str) -> list[tuple[str, str | None]] | None:
+        if self._segments is None:
+            return None
+        phrases = split_phrases(text)
+        return self._segments.plan(phrases, [self._cache_key(p, speaker_id) for p in phrases])
+
+    async def _stitch(
+        self,
+        pieces: list[tuple[str, str | None]],
+        speaker_id: str,
+        emotion: dict | None,
+        chunk_ms: int | None = None,
+    ) -> AsyncIterator[AudioChunk]:
+        """Cached segments and synthesized runs, crossfaded, as chunks."""
+        chunk_ms = chunk_ms or settings.tts_stream_chunk_ms
+        stats = self._segments.stats
+        stats.stitched += 1
+        stitcher: PhraseStitcher | None = None
+        for text, key in pieces:
+            segment = self._segments.get(key) if key is not None else None
+            if segment is not None:
+                source = _replay(*segment, chunk_ms)
+            else:  # novel, or evicted since planning
+                source = self._engine.synthesize_stream(
+                    text, speaker_id, emotion, chunk_ms=chunk_ms
+                )
+            if stitcher is not None:
+                stitcher.begin_piece()
+            async for chunk in source:
+                if stitcher is None:
+                    stitcher = PhraseStitcher(chunk.sample_rate, settings.tts_segment_crossfade_ms)
+                if segment is not None:
+                    stats.segment_ms += chunk.duration_ms
+                else:
+                    stats.synthesized_ms += chunk.duration_ms
+                out = stitcher.feed(chunk.samples, chunk.sample_rate)
+                if len(out):
+                    yield AudioChunk(out, stitcher.sample_rate)
+        if stitcher is not None:
+            out = stitcher.finish()
+            if len(out):
+                yield AudioChunk(out, stitcher.sample_rate)
+
+    def _learn_segments(self, text: str, speaker_id: str) -> None:
+        """Count ``text``'s phrases; synthesize newly frequent ones in the background."""
+        if self._segments is None:
+            return
+        phrases = split_phrases(text)
+        due = self._segments.observe(phrases, [self._cache_key(p, speaker_id) for p in phrases])
+        if due:
+            task = asyncio.create_task(self._synthesize_segments(due, speaker_id))
+            self._learning.add(task)
+            task.add_done_callback(self._learning.discard)
+
+    async def _synthesize_segments(self, due: list[tuple[str, str]], speaker_id: str) -> None:
+        for phrase, key in due:
+            try:
+                path = await self._engine.synthesize(phrase.strip(), speaker_id)
+                if path is None:
+                    continue
+                samples, sample_rate = sf.read(str(path), dtype="float32")
+                path.unlink(missing_ok=True)
+                self._segments.put(key, samples, sample_rate)
+                logger.debug("Cached TTS segment %r", phrase)
+            except Exception:
+                logger.exception("TTS segment synthesis failed")
 
     def _cache_key(self, text: str, speaker_id: str) -> str:
         """Generate a cache key from text and speaker."""
         raw = f"{speaker_id}:{text}"
         return hashlib.sha256(raw.encode()).hexdigest()[:16]
 
-    def _check_cache(self, key: str) -> Path | None:
-        """Check if audio is in cache."""
-        path = self._cache_dir / f"{key}.wav"
-        return path if path.exists() else None
 
-    def _save_cache(self, key: str, source_path: Path) -> None:
-        """Copy audio to cache."""
-        import shutil
-        dest = self._cache_dir / f"{key}.wav"
-        shutil.copy2(source_path, dest)
+async def _replay(
+    samples: np.ndarray, sample_rate: int, chunk_ms: int
+) -> AsyncIterator[AudioChunk]:
+    for chunk in split_audio(samples, sample_rate, chunk_ms):
+        yield chunk
@@ -0,0 +1,223 @@
+"""Phrase-level audio reuse.
+
+Patients reuse the same openers and closers ("すみません、", "お願いします")
+inside many different candidates.  Text is split into phrases at prosodic
+boundaries (after 、。！？ and the like, where the TTS pauses anyway),
+and phrases seen ``min_count`` times are synthesized once on their own
+and kept in a SegmentCache.  A later utterance made of cached
+phrases plus novel ones then only synthesizes the novel runs:
+
+  "すみません、" (cached) + "窓を開けて" (synthesized) + "ください。" (cached)
+
+and the pieces are joined with a short equal-power crossfade so the seams
+do not click.  Consecutive novel phrases are synthesized together, so they
+keep their natural prosody.
+
+SegmentStats records how much of the audio produced on an utterance cache
+miss came from cached segments.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from voicereach.engine.tts.audio_cache import AudioCache
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+COUNTS_FORMAT_VERSION = 1
+COUNTS_FILE = "phrases.json"
+
+# A phrase ends after a run of boundary punctuation (plus any whitespace)
+_PHRASE = re.compile(r".+?(?:[、。，．！？!?…]+\s*|$)", re.DOTALL)
+_PUNCTUATION = re.compile(r"[\s、。，．！？!?…]")
+
+
+def split_phrases(text: str) -> list[str]:
+    """Split ``text`` after each punctuation run; the phrases join back to ``text``."""
+    return [p for p in _PHRASE.findall(text) if p]
+
+
+def resample(samples: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """Linear-interpolation resampling (only needed if the engine changed rate)."""
+    if from_rate == to_rate or not len(samples):
+        return samples
+    n = max(1, round(len(samples) * to_rate / from_rate))
+    positions = np.linspace(0, len(samples) - 1, n)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+class PhraseStitcher:
+    """Joins audio pieces with an equal-power crossfade, incrementally.
+
+    The last ``crossfade_ms`` of output is held back until it is known
+    whether the next samples continue the same piece (appended as is) or
+    start a new one (crossfaded), so pieces can be fed chunk by chunk.
+    """
+
+    def __init__(self, sample_rate: int, crossfade_ms: int = 20) -> None:
+        self.sample_rate = sample_rate
+        self._fade = sample_rate * crossfade_ms // 1000
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._join = False
+
+    def begin_piece(self) -> None:
+        """The next samples fed start a new piece."""
+        self._join = len(self._tail) > 0
+
+    def feed(self, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Add samples; returns the output that is now final."""
+        samples = resample(samples.astype(np.float32, copy=False), sample_rate, self.sample_rate)
+        if self._join:
+            n = min(self._fade, len(self._tail), len(samples))
+            theta = np.linspace(0.0, np.pi / 2, n, dtype=np.float32)
+            mixed = self._tail[len(self._tail) - n:] * np.cos(theta) + samples[:n] * np.sin(theta)
+            out = np.concatenate([self._tail[:len(self._tail) - n], mixed, samples[n:]])
+            self._join = False
+        else:
+            out = np.concatenate([self._tail, samples])
+        keep = min(self._fade, len(out))
+        self._tail = out[len(out) - keep:]
+        return out[:len(out) - keep]
+
+    def finish(self) -> np.ndarray:
+        """The held-back end of the output."""
+        out, self._tail = self._tail, np.zeros(0, dtype=np.float32)
+        return out
+
+
+@dataclass
+class SegmentStats:
+    """Where audio produced on utterance cache misses came from (ms of audio)."""
+    stitched: int = 0  # utterances assembled from segments
+    learned: int = 0  # phrases synthesized into the segment cache
+    segment_ms: float = 0.0
+    synthesized_ms: float = 0.0
+
+    @property
+    def segment_ratio(self) -> float:
+        total = self.segment_ms + self.synthesized_ms
+        return self.segment_ms / total if total else 0.0
+
+
+class SegmentCache:
+    """Cached audio of frequent phrases, and phrase counts to decide which."""
+
+    def __init__(
+        self,
+        directory: Path,
+        min_count: int = 2,
+        min_chars: int = 2,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entries: int = 500,
+        max_counted: int = 5000,
+    ) -> None:
+        """
+        Args:
+            directory: Where the segment WAVs, their index and the counts live.
+            min_count: Occurrences (in synthesized utterances) before a
+                phrase is cached as a segment.
+            min_chars: Shorter phrases (ignoring punctuation) are never cached.
+            max_bytes: Maximum total size of the segment WAVs.
+            max_entries: Maximum number of segments.
+            max_counted: Distinct phrases whose counts are kept.
+        """
+        self._audio = AudioCache(
+            directory, max_bytes=max_bytes, max_entries=max_entries, eviction="lfu"
+        )
+        self._dir = directory
+        self._min_count = min_count
+        self._min_chars = min_chars
+        self._max_counted = max_counted
+        self._counts: Counter[str] = Counter()
+        self._dirty = False
+        self.stats = SegmentStats()
+        self._load_counts()
+
+    def __len__(self) -> int:
+        return len(self._audio)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._audio
+
+    def get(self, key: str) -> tuple[np.ndarray, int] | None:
+        """(samples, sample rate) of a cached segment."""
+        return self._audio.get_samples(key)
+
+    def put(self, key: str, samples: np.ndarray, sample_rate: int) -> None:
+        self._audio.put_samples(key, samples, sample_rate)
+        self.stats.learned += 1
+
+    def plan(self, phrases: list[str], keys: list[str]) -> list[tuple[str, str | None]] | None:
+        """Pieces to assemble an utterance from: (text, segment key or None).
+
+        Runs of uncached phrases are merged into one piece to synthesize.
+        Returns None if no phrase is cached.
+        """
+        if not any(k in self._audio for k in keys):
+            return None
+        pieces: list[tuple[str, str | None]] = []
+        for phrase, key in zip(phrases, keys, strict=True):
+            if key in self._audio:
+                pieces.append((phrase, key))
+            elif pieces and pieces[-1][1] is None:
+                pieces[-1] = (pieces[-1][0] + phrase, None)
+            else:
+                pieces.append((phrase, None))
+        return pieces
+
+    def observe(self, phrases: list[str], keys: list[str]) -> list[tuple[str, str]]:
+        """Count the phrases of a synthesized utterance.
+
+        Returns the (phrase, key) pairs that are now frequent enough to be
+        cached but are not yet.
+        """
+        if len(phrases) < 2:
+            return []  # a single phrase is the utterance, already cached whole
+        due = []
+        for phrase, key in zip(phrases, keys, strict=True):
+            if len(_PUNCTUATION.sub("", phrase)) < self._min_chars:
+                continue
+            self._counts[key] += 1
+            self._dirty = True
+            if self._counts[key] >= self._min_count and key not in self._audio:
+                due.append((phrase, key))
+        if len(self._counts) > self._max_counted:
+            self._counts = Counter(dict(self._counts.most_common(self._max_counted // 2)))
+        return due
+
+    def save(self) -> None:
+        """Persist the segment index and phrase counts."""
+        self._audio.save_index()
+        if not self._dirty:
+            return
+        path = self._dir / COUNTS_FILE
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({
+            "version": COUNTS_FORMAT_VERSION,
+            "counts": dict(self._counts.most_common(self._max_counted)),
+        }))
+        tmp.replace(path)
+        self._dirty = False
+
+    def _load_counts(self) -> None:
+        path = self._dir / COUNTS_FILE
+        if not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text())
+            if data.get("version") == COUNTS_FORMAT_VERSION:
+                self._counts = Counter(data["counts"])
+        except (OSError, ValueError):
+            logger.warning("Unreadable phrase counts at %s; starting over", path)
+
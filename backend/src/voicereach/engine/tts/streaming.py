@@ -0,0 +1,60 @@
+"""Chunked audio delivery to the patient UI.
+
+A streamed utterance is sent over the patient WebSocket as
+
+  text   {"type": "tts_stream_start", "stream_id": N, "sample_rate": ..., ...}
+  binary header + PCM chunk 0
+  binary header + PCM chunk 1
+  ...
+  text   {"type": "tts_stream_end", "stream_id": N, "duration_ms": ...}
+
+Each binary frame starts with AUDIO_FRAME_HEADER (little-endian uint32
+stream ID, uint32 chunk sequence number) followed by 16-bit signed
+little-endian mono PCM, so the UI can schedule the chunk as soon as it
+arrives and drop chunks of a stream it has already stopped.
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+AUDIO_FRAME_HEADER = struct.Struct("<II")
+PCM_ENCODING = "pcm_s16le"
+
+
+@dataclass
+class AudioChunk:
+    """A piece of synthesized mono audio."""
+    samples: np.ndarray  # float32 in [-1, 1]
+    sample_rate: int
+
+    @property
+    def duration_ms(self) -> float:
+        return len(self.samples) * 1000.0 / self.sample_rate
+
+
+def split_audio(samples: np.ndarray, sample_rate: int, chunk_ms: int) -> Iterator[AudioChunk]:
+    """Cut already synthesized audio into chunks of ``chunk_ms``."""
+    size = max(1, sample_rate * chunk_ms // 1000)
+    for start in range(0, len(samples), size):
+        yield AudioChunk(samples[start:start + size], sample_rate)
+
+
+def encode_pcm_frame(stream_id: int, seq: int, samples: np.ndarray) -> bytes:
+    """Binary WebSocket frame for one chunk of a stream."""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2")
+    return AUDIO_FRAME_HEADER.pack(stream_id, seq) + pcm.tobytes()
+
+
+def decode_pcm_frame(frame: bytes) -> tuple[int, int, np.ndarray]:
+    """(stream_id, seq, float32 samples) of a frame built by encode_pcm_frame."""
+    stream_id, seq = AUDIO_FRAME_HEADER.unpack_from(frame)
+    pcm = np.frombuffer(frame, dtype="<i2", offset=AUDIO_FRAME_HEADER.size)
+    return stream_id, seq, pcm.astype(np.float32) / 32767.0
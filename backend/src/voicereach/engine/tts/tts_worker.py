@@ -0,0 +1,413 @@
+"""Out-of-process TTS engine.
+
+Runs CosyVoiceEngine in a dedicated, long-lived worker process so model
+loading and the hundreds of milliseconds of inference per utterance never
+block the asyncio event loop that serves WebSockets and gaze frames.
+
+  event loop                            worker process
+  ----------                            --------------
+  synthesize / synthesize_stream --> pipe --> request queue --> CosyVoice
+  await path / AudioChunks <-------- pipe <-- result / chunks / done
+
+The worker loads the model and synthesizes a few warmup sentences before
+reporting ready, so the first patient utterance is not a cold start.
+Requests are served FIFO; a request that is cancelled on the event loop
+(e.g. a pre-synthesis of a candidate no longer displayed) is dropped from
+the worker's queue, or stopped between chunks if it is already running.
+
+TTSWorker is a drop-in engine for TTSRouter.  A helper thread reads the
+pipe and hands each reply to the coroutine waiting for it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import logging
+import multiprocessing as mp
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from voicereach.config import settings
+from voicereach.engine.metrics import LatencyHistogram
+from voicereach.engine.tts.streaming import AudioChunk
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------------------------
+# Worker process
+# ----------------------------------------------------------------------
+
+class _RequestQueue:
+    """Worker-side queue of requests read from the pipe."""
+
+    def __init__(self, conn) -> None:
+        self._conn = conn
+        self.requests: deque[tuple] = deque()
+        self.current: int | None = None
+        self.current_cancelled = False
+        self.stopping = False
+
+    def receive(self, block: bool) -> None:
+        """Read pending messages; with ``block``, wait for at least one."""
+        while not self.stopping and (block or self._conn.poll()):
+            block = False
+            msg = self._conn.recv()
+            kind = msg[0]
+            if kind == "stop":
+                self.stopping = True
+            elif kind == "cancel":
+                request_id = msg[1]
+                if request_id == self.current:
+                    self.current_cancelled = True
+                else:
+                    self.requests = deque(r for r in self.requests if r[1] != request_id)
+            else:
+                self.requests.append(msg)
+
+
+def _worker_main(conn, model_dir: str, warmup_texts: list[str]) -> None:
+    """Entry point of the TTS worker process."""
+    from voicereach.engine.tts.cosyvoice import CosyVoiceEngine
+
+    loop = asyncio.new_event_loop()
+    engine = CosyVoiceEngine(model_dir=model_dir)
+    loop.run_until_complete(engine.initialize())
+    warmup_ms = loop.run_until_complete(engine.warmup(warmup_texts))
+
+    conn.send(("ready", engine.is_available, warmup_ms))
+    queue = _RequestQueue(conn)
+    try:
+        while True:
+            queue.receive(block=not queue.requests)
+            if queue.stopping:
+                break
+            msg = queue.requests.popleft()
+            kind, request_id = msg[0], msg[1]
+            queue.current, queue.current_cancelled = request_id, False
+            try:
+                t0 = time.perf_counter()
+                if kind == "synthesize":
+                    _, _, text, speaker_id, emotion = msg
+                    path = loop.run_until_complete(engine.synthesize(text, speaker_id, emotion))
+                    queue.receive(block=False)
+                    if queue.current_cancelled:
+                        if path is not None:
+                            path.unlink(missing_ok=True)
+                        continue
+                    compute_ms = (time.perf_counter() - t0) * 1000.0
+                    conn.send(("result", request_id, str(path) if path else None, compute_ms))
+                elif kind == "stream":
+                    _, _, text, speaker_id, emotion, chunk_ms = msg
+                    stream = engine.synthesize_stream(text, speaker_id, emotion, chunk_ms=chunk_ms)
+                    try:
+                        while True:
+                            try:
+                                chunk = loop.run_until_complete(stream.__anext__())
+                            except StopAsyncIteration:
+                                break
+                            queue.receive(block=False)
+                            if queue.current_cancelled or queue.stopping:
+                                break
+                            conn.send(("chunk", request_id, chunk.samples, chunk.sample_rate))
+                    finally:
+                        loop.run_until_complete(stream.aclose())
+                    if not queue.current_cancelled:
+                        compute_ms = (time.perf_counter() - t0) * 1000.0
+                        conn.send(("done", request_id, compute_ms))
+                else:
+                    raise ValueError(f"unknown TTS worker message: {kind!r}")
+            except Exception as e:
+                conn.send(("error", request_id, repr(e)))
+            finally:
+                queue.current = None
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        loop.close()
+
+
+# ----------------------------------------------------------------------
+# Event-loop side
+# ----------------------------------------------------------------------
+
+@dataclass
+class TTSWorkerStats:
+    """Worker request counters and latencies (submit -> reply, as seen by the loop)."""
+    requests: int = 0
+    completed: int = 0
+    cancelled: int = 0
+    failures: int = 0  # errors, timeouts and requests lost with the worker
+    warmup_ms: float = 0.0
+    first_chunk: LatencyHistogram = field(default_factory=LatencyHistogram)  # streams
+    total: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+class TTSWorker:
+    """Client for the TTS worker process, usable as a TTSRouter engine.
+
+    All coroutines are safe to call from the event loop; the only blocking
+    call (reading the pipe) runs on a dedicated helper thread.
+    """
+
+    def __init__(
+        self,
+        model_dir: str | None = None,
+        warmup_texts: list[str] | None = None,
+        response_timeout_s: float | None = None,
+    ) -> None:
+        """
+        Args:
+            model_dir: CosyVoice model directory (settings.tts_model_dir).
+            warmup_texts: Sentences synthesized at startup.
+            response_timeout_s: Longest wait for a result, or between two
+                chunks of a stream.
+        """
+        self._model_dir = model_dir or str(settings.tts_model_dir)
+        self._warmup_texts = (
+            list(settings.tts_warmup_texts) if warmup_texts is None else warmup_texts
+        )
+        self._timeout = (
+            settings.tts_worker_timeout_s if response_timeout_s is None else response_timeout_s
+        )
+        self._conn = None
+        self._process = None
+        self._reader: threading.Thread | None = None
+        self._available = False
+        self._ids = itertools.count(1)
+        # request ID -> (loop, reply queue); also touched by the reader thread
+        self._pending: dict[int, tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = {}
+        self._pending_lock = threading.Lock()
+        self.stats = TTSWorkerStats()
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    @property
+    def is_available(self) -> bool:
+        """Whether the worker loaded the CosyVoice model (else: placeholder tone)."""
+        return self._available
+
+    @property
+    def in_flight(self) -> int:
+        """Requests submitted and not yet answered (queued or running)."""
+        return len(self._pending)
+
+    async def initialize(self) -> None:
+        """Start the worker without blocking the event loop."""
+        await asyncio.get_running_loop().run_in_executor(None, self.start)
+
+    def start(self, startup_timeout_s: float = 120.0) -> None:
+        """Spawn the worker and wait for model load and warmup (blocking)."""
+        if self.running:
+            return
+        ctx = mp.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self._model_dir, self._warmup_texts),
+            name="tts-worker",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+
+        try:
+            reply = self._conn.recv() if self._conn.poll(startup_timeout_s) else None
+        except (EOFError, OSError):  # the worker died while loading
+            reply = None
+        if not reply or reply[0] != "ready":
+            self.stop()
+            raise RuntimeError("TTS worker failed to start")
+        _, self._available, self.stats.warmup_ms = reply
+        self._reader = threading.Thread(
+            target=self._read_replies, name="tts-worker-io", daemon=True
+        )
+        self._reader.start()
+        logger.info(
+            "TTS worker started (pid %s, %s, warmup %.0f ms)",
+            self._process.pid, "CosyVoice" if self._available else "placeholder",
+            self.stats.warmup_ms,
+        )
+
+    def stop(self) -> None:
+        """Stop the worker process; requests still waiting fail."""
+        if self._conn is not None:
+            with contextlib.suppress(OSError):
+                self._conn.send(("stop", 0))
+        if self._process is not None:
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join(timeout=1.0)
+            self._process = None
+        if self._reader is not None:
+            self._reader.join(timeout=1.0)  # ends on EOF once the worker is gone
+            self._reader = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._fail_pending("TTS worker stopped")
+
+    def health(self) -> dict:
+        """Liveness, queue depth and latency percentiles for /health."""
+        stats = self.stats
+        return {
+            "execution": "process",
+            "running": self.running,
+            "model_loaded": self._available,
+            "warmup_ms": round(stats.warmup_ms, 1),
+            "in_flight": self.in_flight,
+            "requests": stats.requests,
+            "completed": stats.completed,
+            "cancelled": stats.cancelled,
+            "failures": stats.failures,
+            "first_chunk_p50_ms": round(stats.first_chunk.percentile(50), 1),
+            "first_chunk_p95_ms": round(stats.first_chunk.percentile(95), 1),
+            "total_p50_ms": round(stats.total.percentile(50), 1),
+            "total_p95_ms": round(stats.total.percentile(95), 1),
+        }
+
+    # ------------------------------------------------------------------
+    # Engine API
+    # ------------------------------------------------------------------
+
+    async def synthesize(
+        self,
+        text: str,
+        speaker_id: str = "default",
+        emotion: dict | None = None,
+    ) -> Path | None:
+        """Synthesize *text* in the worker and return the WAV path."""
+        request_id, replies = self._submit("synthesize", text, speaker_id, emotion)
+        t0 = time.perf_counter()
+        answered = False
+        try:
+            async with asyncio.timeout(self._timeout):
+                reply = await replies.get()
+            answered = True
+        except TimeoutError:
+            answered = True  # not a cancellation; the worker is told below
+            self._send_cancel(request_id)
+            self.stats.failures += 1
+            logger.warning("TTS worker did not answer within %.1fs", self._timeout)
+            return None
+        finally:
+            self._finish(request_id, answered)
+
+        if reply[0] != "result":
+            self.stats.failures += 1
+            logger.warning("TTS worker error: %s", reply[2])
+            return None
+        self.stats.completed += 1
+        self.stats.total.record((time.perf_counter() - t0) * 1000.0)
+        return Path(reply[2]) if reply[2] else None
+
+    async def synthesize_stream(
+        self,
+        text: str,
+        speaker_id: str = "default",
+        emotion: dict | None = None,
+        chunk_ms: int = 100,
+    ) -> AsyncIterator[AudioChunk]:
+        """Synthesize *text* in the worker, yielding chunks as they arrive.
+
+        Closing the iterator early cancels the request in the worker.
+        Raises RuntimeError if the worker fails or stalls, so a stream cut
+        short is never mistaken for a complete utterance.
+        """
+        request_id, replies = self._submit("stream", text, speaker_id, emotion, chunk_ms)
+        t0 = time.perf_counter()
+        answered = False
+        try:
+            first = True
+            while True:
+                async with asyncio.timeout(self._timeout):
+                    reply = await replies.get()
+                if reply[0] == "chunk":
+                    if first:
+                        self.stats.first_chunk.record((time.perf_counter() - t0) * 1000.0)
+                        first = False
+                    yield AudioChunk(reply[2], reply[3])
+                    continue
+                answered = True
+                if reply[0] == "done":
+                    self.stats.completed += 1
+                    self.stats.total.record((time.perf_counter() - t0) * 1000.0)
+                    return
+                self.stats.failures += 1
+                raise RuntimeError(f"TTS worker error: {reply[2]}")
+        except TimeoutError:
+            answered = True  # not a cancellation; the worker is told below
+            self._send_cancel(request_id)
+            self.stats.failures += 1
+            raise RuntimeError(f"TTS worker stream stalled for {self._timeout:.1f}s") from None
+        finally:
+            self._finish(request_id, answered)
+
+    # ------------------------------------------------------------------
+    # Channel
+    # ------------------------------------------------------------------
+
+    def _submit(self, kind: str, *args) -> tuple[int, asyncio.Queue]:
+        if not self.running:
+            raise RuntimeError("TTS worker is not running")
+        request_id = next(self._ids)
+        replies: asyncio.Queue = asyncio.Queue()
+        with self._pending_lock:
+            self._pending[request_id] = (asyncio.get_running_loop(), replies)
+        self._conn.send((kind, request_id, *args))
+        self.stats.requests += 1
+        return request_id, replies
+
+    def _finish(self, request_id: int, answered: bool) -> None:
+        """Forget ``request_id``; if it was abandoned, cancel it in the worker."""
+        with self._pending_lock:
+            self._pending.pop(request_id, None)
+        if not answered:
+            self._send_cancel(request_id)
+            self.stats.cancelled += 1
+
+    def _send_cancel(self, request_id: int) -> None:
+        if self._conn is None:
+            return
+        with contextlib.suppress(OSError):
+            self._conn.send(("cancel", request_id))
+
+    def _read_replies(self) -> None:
+        """Reader thread: route each reply to the coroutine waiting for it."""
+        conn = self._conn
+        while True:
+            try:
+                reply = conn.recv()
+            except (EOFError, OSError):
+                break
+            self._deliver(reply[1], reply)
+        self._fail_pending("TTS worker exited")
+
+    def _fail_pending(self, reason: str) -> None:
+        with self._pending_lock:
+            request_ids = list(self._pending)
+        for request_id in request_ids:
+            self._deliver(request_id, ("error", request_id, reason))
+
+    def _deliver(self, request_id: int, reply: tuple) -> None:
+        with self._pending_lock:
+            entry = self._pending.get(request_id)
+        if entry is None:  # cancelled or timed out; late reply
+            if reply[0] == "result" and reply[2]:
+                Path(reply[2]).unlink(missing_ok=True)
+            return
+        loop, replies = entry
+        with contextlib.suppress(RuntimeError):  # loop already closed
+            loop.call_soon_threadsafe(replies.put_nowait, reply)
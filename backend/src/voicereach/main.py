@@ -10,6 +10,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from voicereach.api.health import router as health_router
+from voicereach.api.ws import manager
 from voicereach.api.ws import router as ws_router
 from voicereach.config import settings
 from voicereach.engine.pipeline import Pipeline
@@ -26,7 +27,10 @@ async def lifespan(app: FastAPI):
         level=logging.DEBUG if settings.debug else logging.INFO,
         format="%(asctime)s %(name)s %(levelname)s %(message)s",
     )
+    pipeline.set_message_callback(manager.send_to_patients)
+    pipeline.set_audio_callback(manager.send_audio_to_patients)
     await pipeline.initialize()
+    app.state.pipeline = pipeline
     logger.info("VoiceReach backend started on %s:%d", settings.host, settings.port)
     yield
     await pipeline.shutdown()
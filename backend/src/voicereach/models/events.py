@@ -67,6 +67,7 @@ class IntentAxis(str, Enum):
 
 class GenerationStage(int, Enum):
     """LLM generation stage in the three-tier hybrid pipeline."""
+    INSTANT = 0         # cached / precomputed, no LLM call (~0ms)
     LOCAL_FAST = 1      # Qwen3-0.6B (~150ms)
     LOCAL_QUALITY = 2   # Qwen3-1.7B (~350ms)
     CLOUD = 3           # Gemini 2.5 Flash (~800ms)
@@ -88,6 +89,7 @@ class CandidateSet(BaseModel):
     request_id: str
     timestamp_ms: int = Field(default_factory=lambda: int(time.time() * 1000))
     is_final: bool = False
+    is_partial: bool = False  # stage still streaming; more candidates may follow
 
 
 # --- WebSocket Protocol Messages ---
@@ -129,12 +131,36 @@ class TTSReady(BaseModel):
     duration_ms: int = 0
 
 
+class TTSStreamStart(BaseModel):
+    """Server -> Client: Streamed TTS audio follows as binary PCM frames."""
+    type: Literal["tts_stream_start"] = "tts_stream_start"
+    stream_id: int
+    text: str
+    sample_rate: int
+    encoding: Literal["pcm_s16le"] = "pcm_s16le"
+
+
+class TTSStreamEnd(BaseModel):
+    """Server -> Client: Last binary frame of a TTS stream has been sent."""
+    type: Literal["tts_stream_end"] = "tts_stream_end"
+    stream_id: int
+    duration_ms: int = 0
+
+
 class EmergencyAck(BaseModel):
     """Server -> Client: Emergency acknowledged."""
     type: Literal["emergency_ack"] = "emergency_ack"
     notified_caregivers: list[str] = Field(default_factory=list)
 
 
+class ErrorMessage(BaseModel):
+    """Server -> Client: A request could not be completed."""
+    type: Literal["error"] = "error"
+    detail: str
+
+
 # Union type for WebSocket message routing
 ClientMessage = GazeUpdate | InputEvent | CandidateSelected
-ServerMessage = CandidateUpdate | TTSReady | EmergencyAck
+ServerMessage = (
+    CandidateUpdate | TTSReady | TTSStreamStart | TTSStreamEnd | EmergencyAck | ErrorMessage
+)
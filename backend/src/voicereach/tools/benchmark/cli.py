@@ -5,6 +5,8 @@ Usage:
     voicereach-bench llm  [--model MODEL] [--runs N]
     voicereach-bench tts  [--runs N]
     voicereach-bench pipeline [--synthetic]
+    voicereach-bench record-trace OUTPUT [--duration SECS] [--camera ID]
+    voicereach-bench replay TRACE [--save FILE] [--baseline FILE]
     voicereach-bench all
 """
 
@@ -14,7 +16,6 @@ import argparse
 import asyncio
 import sys
 
-
 # ── Formatting helpers ──────────────────────────────────────────────
 
 BOX_WIDTH = 52
@@ -175,6 +176,58 @@ def _run_pipeline(args: argparse.Namespace) -> dict | None:
     }
 
 
+def _run_record_trace(args: argparse.Namespace) -> dict | None:
+    """Record a gaze trace from the camera."""
+    from voicereach.tools.benchmark.gaze_trace import record_gaze_trace
+
+    try:
+        frames = record_gaze_trace(args.output, camera_id=args.camera, duration_s=args.duration)
+    except RuntimeError as e:
+        print(f"[SKIP] Trace recording: {e}", file=sys.stderr)
+        return None
+
+    _print_section("Gaze Trace Recording", [
+        ("Output:", str(args.output)),
+        ("Frames recorded:", str(frames)),
+    ])
+    return {"frames": frames}
+
+
+def _run_replay(args: argparse.Namespace) -> dict | None:
+    """Replay a recorded gaze trace."""
+    from voicereach.tools.benchmark.gaze_replay import compare_decisions, replay_trace
+
+    result = replay_trace(args.trace)
+    rows = [
+        ("Frames / faces:", f"{result.frames} / {result.faces}"),
+        ("Throughput:", f"{result.fps:.0f} frames/s"),
+        ("P50 latency:", f"{result.latency_p50_ms:.3f} ms"),
+        ("P95 latency:", f"{result.latency_p95_ms:.3f} ms"),
+        ("P99 latency:", f"{result.latency_p99_ms:.3f} ms"),
+    ]
+    summary = {
+        "fps": result.fps,
+        "p50_ms": result.latency_p50_ms,
+        "p95_ms": result.latency_p95_ms,
+        "p99_ms": result.latency_p99_ms,
+    }
+    if args.baseline:
+        try:
+            diff = compare_decisions(args.baseline, result)
+        except ValueError as e:
+            print(f"[SKIP] Baseline comparison: {e}", file=sys.stderr)
+        else:
+            rows.append(
+                ("Zone changes vs baseline:", f"{diff.changed} ({diff.changed_ratio:.2%})")
+            )
+            summary["zone_changes"] = diff.changed
+    if args.save:
+        result.save_decisions(args.save)
+        rows.append(("Decisions saved:", str(args.save)))
+    _print_section("Gaze Trace Replay", rows)
+    return summary
+
+
 # ── Main CLI ────────────────────────────────────────────────────────
 
 def build_parser() -> argparse.ArgumentParser:
@@ -225,6 +278,30 @@ def build_parser() -> argparse.ArgumentParser:
         help="Attempt to use real LLM server",
     )
 
+    # voicereach-bench record-trace
+    rec_p = sub.add_parser("record-trace", help="Record a gaze trace from the camera")
+    rec_p.add_argument("output", help="Trace directory to write")
+    rec_p.add_argument(
+        "--duration", type=float, default=60.0,
+        help="Recording duration in seconds (default: 60)",
+    )
+    rec_p.add_argument(
+        "--camera", type=int, default=0,
+        help="Camera device index (default: 0)",
+    )
+
+    # voicereach-bench replay
+    replay_p = sub.add_parser("replay", help="Replay a recorded gaze trace")
+    replay_p.add_argument("trace", help="Trace directory to replay")
+    replay_p.add_argument(
+        "--save", default=None,
+        help="Save per-frame zone decisions to this .npy file",
+    )
+    replay_p.add_argument(
+        "--baseline", default=None,
+        help="Compare zone decisions against a saved .npy file",
+    )
+
     # voicereach-bench all
     sub.add_parser("all", help="Run all benchmarks")
 
@@ -250,6 +327,10 @@ def main() -> None:
         _run_tts(args)
     elif args.command == "pipeline":
         _run_pipeline(args)
+    elif args.command == "record-trace":
+        _run_record_trace(args)
+    elif args.command == "replay":
+        _run_replay(args)
     elif args.command == "all":
         # Run all benchmarks with sensible defaults for "all" mode
         gaze_args = argparse.Namespace(duration=5.0, synthetic=True)
@@ -102,7 +102,7 @@ def run_gaze_benchmark(
     """
     from voicereach.engine.gaze.mediapipe_tracker import MediaPipeTracker
 
-    tracker = MediaPipeTracker()
+    tracker = MediaPipeTracker.from_settings(reuse_buffers=True)
     tracker.initialize()
 
     cap = None
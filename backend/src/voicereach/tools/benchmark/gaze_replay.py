@@ -0,0 +1,139 @@
+"""Deterministic replay of recorded gaze traces.
+
+Pushes every frame of a GazeTrace through GazeEstimator -> smoother ->
+ZoneMapper as fast as possible (no camera, no frame pacing) and reports
+throughput, per-frame latency percentiles and the zone decision for each
+frame.  Decisions can be saved and compared against a later run to catch
+accuracy regressions alongside performance ones.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from voicereach.config import settings
+from voicereach.engine.gaze.gaze_estimator import GazeEstimator
+from voicereach.engine.gaze.smoother import create_smoother
+from voicereach.engine.gaze.zone_mapper import ZoneMapper, gaze_to_screen
+from voicereach.tools.benchmark.gaze_trace import GazeTrace
+
+logger = logging.getLogger(__name__)
+
+NO_ZONE = -1  # zone decision for frames without a face
+
+
+@dataclass
+class GazeReplayResult:
+    """Results from replaying a gaze trace."""
+
+    frames: int
+    faces: int
+    total_time_s: float
+    fps: float  # replayed frames per second of wall time
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    zone_ids: np.ndarray = field(repr=False)  # (N,) int16, NO_ZONE without a face
+
+    def save_decisions(self, path: str | Path) -> None:
+        """Save per-frame zone decisions for a later compare_decisions()."""
+        np.save(Path(path), self.zone_ids)
+
+
+@dataclass
+class ZoneDecisionDiff:
+    """Frame-by-frame comparison of two replays of the same trace."""
+
+    frames: int
+    changed: int
+    changed_indices: np.ndarray = field(repr=False)
+
+    @property
+    def changed_ratio(self) -> float:
+        return self.changed / self.frames if self.frames else 0.0
+
+
+def replay_trace(
+    trace: GazeTrace | str | Path,
+    estimator: GazeEstimator | None = None,
+    smoother=None,
+    mapper: ZoneMapper | None = None,
+    warmup_frames: int = 10,
+) -> GazeReplayResult:
+    """Replay a trace through the server-side gaze pipeline.
+
+    Components default to the configured ones (settings.gaze_model_path,
+    settings.gaze_smoother, settings.num_zones).  Warmup frames are run
+    through the estimator alone a first time, untimed, so model warmup
+    does not skew the latencies; smoother and mapper state is untouched.
+    """
+    if not isinstance(trace, GazeTrace):
+        trace = GazeTrace(trace)
+    own_estimator = estimator is None
+    if estimator is None:
+        estimator = GazeEstimator()
+        estimator.initialize()
+    smoother = smoother if smoother is not None else create_smoother()
+    mapper = mapper if mapper is not None else ZoneMapper(num_zones=settings.num_zones)
+
+    n = len(trace)
+    zone_ids = np.full(n, NO_ZONE, dtype=np.int16)
+    latencies = np.zeros(n)
+    try:
+        warm = [fd for fd in (trace.face_data(i) for i in range(min(warmup_frames, n))) if fd]
+        for fd in warm:
+            estimator.estimate(fd)
+
+        faces = 0
+        start = time.perf_counter()
+        for i in range(n):
+            face_data = trace.face_data(i)
+            if face_data is None:
+                continue
+            t0 = time.perf_counter()
+            gaze = estimator.estimate(face_data)
+            pitch, yaw = smoother.update(gaze.pitch, gaze.yaw)
+            zone = mapper.map(*gaze_to_screen(pitch, yaw))
+            latencies[i] = (time.perf_counter() - t0) * 1000.0
+            zone_ids[i] = zone.zone_id
+            faces += 1
+        elapsed = time.perf_counter() - start
+    finally:
+        if own_estimator:
+            estimator.close()
+
+    timed = latencies[zone_ids != NO_ZONE]
+    if len(timed) == 0:
+        timed = np.zeros(1)
+    return GazeReplayResult(
+        frames=n,
+        faces=faces,
+        total_time_s=elapsed,
+        fps=n / elapsed if elapsed > 0 else 0.0,
+        latency_p50_ms=float(np.percentile(timed, 50)),
+        latency_p95_ms=float(np.percentile(timed, 95)),
+        latency_p99_ms=float(np.percentile(timed, 99)),
+        zone_ids=zone_ids,
+    )
+
+
+def compare_decisions(
+    baseline: np.ndarray | str | Path, candidate: np.ndarray | GazeReplayResult
+) -> ZoneDecisionDiff:
+    """Compare per-frame zone decisions of two replays of the same trace."""
+    if not isinstance(baseline, np.ndarray):
+        baseline = np.load(Path(baseline))
+    if isinstance(candidate, GazeReplayResult):
+        candidate = candidate.zone_ids
+    if baseline.shape != candidate.shape:
+        raise ValueError(
+            f"Decision arrays differ in length ({len(baseline)} vs {len(candidate)}); "
+            "were they replayed from the same trace?"
+        )
+    changed = np.flatnonzero(baseline != candidate)
+    return ZoneDecisionDiff(frames=len(baseline), changed=len(changed), changed_indices=changed)
@@ -0,0 +1,229 @@
+"""Recorded FaceData streams for offline gaze benchmarking.
+
+A gaze trace is a directory of raw column files plus a small JSON header,
+so every column can be memory-mapped and sliced without loading the
+whole recording:
+
+  trace/
+    meta.json          format version, frame count, column dtypes/shapes
+    timestamp.bin      (N,)         float64  seconds since recording start
+    present.bin        (N,)         bool     False where no face was found
+    landmarks.bin      (N, L, 3)    float32  pixel coordinates
+    left_patch.bin     (N, P, P)    uint8    eye patches quantised to 0-255
+    right_patch.bin    (N, P, P)    uint8
+    left_iris.bin      (N, 2)       float32
+    right_iris.bin     (N, 2)       float32
+    head_pose.bin      (N, 3)       float32
+    face_bbox.bin      (N, 4)       int32
+    confidence.bin     (N,)         float32
+
+Frames without a face are kept (zero-filled, present=False) so replay
+sees the same gaps the live pipeline did.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from voicereach.engine.gaze.mediapipe_tracker import FaceData
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+logger = logging.getLogger(__name__)
+
+TRACE_FORMAT_VERSION = 1
+
+
+def _columns(num_landmarks: int, patch_size: int) -> dict[str, tuple[np.dtype, tuple[int, ...]]]:
+    """Column name -> (dtype, per-frame shape)."""
+    return {
+        "timestamp": (np.dtype(np.float64), ()),
+        "present": (np.dtype(np.bool_), ()),
+        "landmarks": (np.dtype(np.float32), (num_landmarks, 3)),
+        "left_patch": (np.dtype(np.uint8), (patch_size, patch_size)),
+        "right_patch": (np.dtype(np.uint8), (patch_size, patch_size)),
+        "left_iris": (np.dtype(np.float32), (2,)),
+        "right_iris": (np.dtype(np.float32), (2,)),
+        "head_pose": (np.dtype(np.float32), (3,)),
+        "face_bbox": (np.dtype(np.int32), (4,)),
+        "confidence": (np.dtype(np.float32), ()),
+    }
+
+
+class GazeTraceWriter:
+    """Appends FaceData frames to a trace directory.
+
+    Each column is streamed to its own file as frames arrive, so recording
+    costs a few small writes per frame and no in-memory buffering.
+    """
+
+    def __init__(self, path: str | Path, num_landmarks: int = 478, patch_size: int = 64) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._num_landmarks = num_landmarks
+        self._patch_size = patch_size
+        self._columns = _columns(num_landmarks, patch_size)
+        self._files = {name: (self.path / f"{name}.bin").open("wb") for name in self._columns}
+        self._rows = {
+            name: np.zeros(shape, dtype=dtype) for name, (dtype, shape) in self._columns.items()
+        }
+        self._count = 0
+
+    def __enter__(self) -> GazeTraceWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, face_data: FaceData | None) -> None:
+        """Record one frame; ``face_data`` None marks a frame without a face."""
+        rows = self._rows
+        rows["timestamp"][()] = timestamp
+        rows["present"][()] = face_data is not None
+        if face_data is None:
+            for name in ("landmarks", "left_patch", "right_patch", "left_iris",
+                         "right_iris", "head_pose", "face_bbox", "confidence"):
+                rows[name].fill(0)
+        else:
+            n = min(len(face_data.landmarks), self._num_landmarks)
+            rows["landmarks"][:n] = face_data.landmarks[:n]
+            rows["landmarks"][n:] = 0.0
+            for name, patch in (("left_patch", face_data.left_eye_patch),
+                                ("right_patch", face_data.right_eye_patch)):
+                rows[name][:] = np.rint(np.clip(patch, 0.0, 1.0) * 255.0)
+            rows["left_iris"][:] = face_data.left_iris[:2]
+            rows["right_iris"][:] = face_data.right_iris[:2]
+            rows["head_pose"][:] = face_data.head_pose
+            rows["face_bbox"][:] = face_data.face_bbox
+            rows["confidence"][()] = face_data.confidence
+        for name, row in rows.items():
+            row.tofile(self._files[name])
+        self._count += 1
+
+    def close(self) -> None:
+        """Flush the columns and write the header."""
+        if not self._files:
+            return
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        meta = {
+            "version": TRACE_FORMAT_VERSION,
+            "frames": self._count,
+            "num_landmarks": self._num_landmarks,
+            "patch_size": self._patch_size,
+            "columns": {
+                name: {"dtype": dtype.str, "shape": list(shape)}
+                for name, (dtype, shape) in self._columns.items()
+            },
+        }
+        (self.path / "meta.json").write_text(json.dumps(meta, indent=2))
+        logger.info("Wrote gaze trace with %d frames to %s", self._count, self.path)
+
+
+class GazeTrace:
+    """Read-only, memory-mapped view of a recorded gaze trace."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        meta_path = self.path / "meta.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"No gaze trace at {self.path}")
+        meta = json.loads(meta_path.read_text())
+        if meta.get("version") != TRACE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported gaze trace version: {meta.get('version')!r}")
+        self.meta = meta
+        self._count = int(meta["frames"])
+        self.columns: dict[str, np.ndarray] = {}
+        for name, spec in meta["columns"].items():
+            shape = (self._count, *spec["shape"])
+            if self._count == 0:
+                self.columns[name] = np.zeros(shape, dtype=np.dtype(spec["dtype"]))
+            else:
+                self.columns[name] = np.memmap(
+                    self.path / f"{name}.bin", dtype=np.dtype(spec["dtype"]), mode="r", shape=shape
+                )
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.columns["timestamp"]
+
+    @property
+    def present(self) -> np.ndarray:
+        return self.columns["present"]
+
+    @property
+    def duration_s(self) -> float:
+        if self._count < 2:
+            return 0.0
+        return float(self.timestamps[-1] - self.timestamps[0])
+
+    def face_data(self, index: int) -> FaceData | None:
+        """FaceData for frame ``index``, or None if no face was recorded."""
+        c = self.columns
+        if not c["present"][index]:
+            return None
+        return FaceData(
+            landmarks=np.asarray(c["landmarks"][index]),
+            left_eye_patch=c["left_patch"][index].astype(np.float32) / 255.0,
+            right_eye_patch=c["right_patch"][index].astype(np.float32) / 255.0,
+            left_iris=np.asarray(c["left_iris"][index]),
+            right_iris=np.asarray(c["right_iris"][index]),
+            head_pose=np.asarray(c["head_pose"][index]),
+            face_bbox=tuple(int(v) for v in c["face_bbox"][index]),
+            confidence=float(c["confidence"][index]),
+        )
+
+    def __iter__(self) -> Iterator[tuple[float, FaceData | None]]:
+        timestamps = self.timestamps
+        for i in range(self._count):
+            yield float(timestamps[i]), self.face_data(i)
+
+
+def record_gaze_trace(
+    path: str | Path,
+    camera_id: int = 0,
+    duration_s: float = 60.0,
+) -> int:
+    """Record FaceData from a live camera into a trace directory.
+
+    Returns:
+        Number of frames recorded.
+
+    Raises:
+        RuntimeError: If the camera cannot be opened.
+    """
+    import cv2
+
+    from voicereach.engine.gaze.mediapipe_tracker import MediaPipeTracker
+
+    cap = cv2.VideoCapture(camera_id)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open camera {camera_id}")
+    tracker = MediaPipeTracker.from_settings(reuse_buffers=True)  # append() copies each frame
+    tracker.initialize()
+    try:
+        with GazeTraceWriter(path) as writer:
+            start = time.monotonic()
+            while (now := time.monotonic()) - start < duration_s:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                writer.append(now - start, tracker.process_frame(frame))
+            return len(writer)
+    finally:
+        tracker.close()
+        cap.release()
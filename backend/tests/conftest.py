@@ -2,6 +2,7 @@
 
 import pytest
 
+from voicereach.config import settings
 from voicereach.models.events import (
     Candidate,
     CandidateSet,
@@ -14,6 +15,12 @@ from voicereach.models.events import (
 from voicereach.models.context import ContextFrame, PatientState
 
 
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep caches persisted by the code under test out of the working tree."""
+    monkeypatch.setattr(settings, "cache_dir", tmp_path / "cache")
+
+
 @pytest.fixture
 def sample_ial_event() -> IALEvent:
     return IALEvent(
@@ -33,3 +33,10 @@ class TestHealthEndpoint:
         data = client.get("/health").json()
         assert isinstance(data, dict)
         assert set(data.keys()) >= {"status", "version"}
+
+    def test_tts_health_reports_execution_mode(self, client: TestClient):
+        """GET /health/tts reports how TTS runs and whether the model loaded."""
+        data = client.get("/health/tts").json()
+        assert data["status"] == "ok"
+        assert data["execution"] == "inline"
+        assert data["model_loaded"] is False
@@ -222,6 +222,7 @@ class TestOrchestratorMockGeneration:
         orchestrator = HybridLLMOrchestrator(
             local_client=local_client,
             cloud_client=cloud_client,
+            streaming=False,
         )
 
         context = _make_rich_context()
@@ -258,6 +259,7 @@ class TestOrchestratorMockGeneration:
         orchestrator = HybridLLMOrchestrator(
             local_client=local_client,
             cloud_client=cloud_client,
+            streaming=False,
         )
 
         request_ids = set()
@@ -278,6 +280,7 @@ class TestOrchestratorMockGeneration:
         orchestrator = HybridLLMOrchestrator(
             local_client=local_client,
             cloud_client=cloud_client,
+            streaming=False,
         )
 
         final_flags = {}
@@ -303,6 +306,7 @@ class TestOrchestratorFailover:
         orchestrator = HybridLLMOrchestrator(
             local_client=local_client,
             cloud_client=cloud_client,
+            streaming=False,
         )
 
         candidate_sets = []
@@ -325,6 +329,7 @@ class TestOrchestratorFailover:
         orchestrator = HybridLLMOrchestrator(
             local_client=local_client,
             cloud_client=cloud_client,
+            streaming=False,
         )
 
         candidate_sets = []
@@ -349,6 +354,7 @@ class TestOrchestratorFailover:
         orchestrator = HybridLLMOrchestrator(
             local_client=local_client,
             cloud_client=cloud_client,
+            streaming=False,
         )
 
         candidate_sets = []
@@ -371,6 +377,7 @@ class TestOrchestratorFailover:
         orchestrator = HybridLLMOrchestrator(
             local_client=local_client,
             cloud_client=cloud_client,
+            streaming=False,
         )
 
         candidate_sets = []
@@ -407,6 +414,7 @@ class TestOrchestratorCancel:
         orchestrator = HybridLLMOrchestrator(
             local_client=local_client,
             cloud_client=cloud_client,
+            streaming=False,
         )
 
         candidate_sets = []
@@ -446,6 +454,7 @@ class TestOrchestratorPromptIntegration:
         orchestrator = HybridLLMOrchestrator(
             local_client=local_client,
             cloud_client=cloud_client,
+            streaming=False,
         )
 
         context = _make_rich_context()
@@ -461,3 +470,318 @@ class TestOrchestratorPromptIntegration:
             # Conversation history should be present
             content_texts = [m["content"] for m in msgs]
             assert any("お元気ですか？" in t for t in content_texts)
+
+
+# ---------------------------------------------------------------------------
+# Streaming generation
+# ---------------------------------------------------------------------------
+
+def _stream_from(text: str, chunk: int = 8, delay: float = 0.0, log: list | None = None):
+    """Build a generate_stream replacement yielding ``text`` in chunks."""
+
+    async def generate_stream(*args, **kwargs):
+        try:
+            for i in range(0, len(text), chunk):
+                if delay:
+                    await asyncio.sleep(delay)
+                yield text[i:i + chunk]
+        finally:
+            if log is not None:
+                log.append("closed")
+
+    return generate_stream
+
+
+class TestOrchestratorStreaming:
+
+    @pytest.mark.asyncio
+    async def test_partial_sets_precede_complete_set(self):
+        local_client = MagicMock(spec=LocalLLMClient)
+        local_client.generate_stream = _stream_from(MOCK_JSON_RESPONSE)
+        cloud_client = MagicMock(spec=CloudLLMClient)
+        cloud_client.generate_stream = _stream_from(MOCK_CLOUD_RESPONSE, delay=0.01)
+
+        orchestrator = HybridLLMOrchestrator(local_client, cloud_client, streaming=True)
+        sets = [cs async for cs in orchestrator.generate_candidates(ContextFrame())]
+
+        cloud = [cs for cs in sets if cs.stage == GenerationStage.CLOUD]
+        # One partial set per candidate except the last, then the complete set
+        assert [len(cs.candidates) for cs in cloud] == [1, 2, 3, 4]
+        assert [cs.is_partial for cs in cloud] == [True, True, True, False]
+        assert cloud[-1].is_final and not any(cs.is_final for cs in cloud[:-1])
+        assert cloud[-1].candidates[0].text == "ありがとう、元気にしてるよ"
+
+    @pytest.mark.asyncio
+    async def test_first_candidate_before_stream_finishes(self):
+        local_client = MagicMock(spec=LocalLLMClient)
+        local_client.generate_stream = _stream_from(MOCK_JSON_RESPONSE, chunk=4, delay=0.005)
+        cloud_client = MagicMock(spec=CloudLLMClient)
+        cloud_client.generate_stream = _stream_from("")
+
+        orchestrator = HybridLLMOrchestrator(local_client, cloud_client, streaming=True)
+        start = asyncio.get_running_loop().time()
+        first_at = None
+        async for _ in orchestrator.generate_candidates(ContextFrame()):
+            if first_at is None:
+                first_at = asyncio.get_running_loop().time() - start
+        total = asyncio.get_running_loop().time() - start
+        assert first_at is not None
+        assert first_at < total / 2
+
+    @pytest.mark.asyncio
+    async def test_stream_closed_after_enough_candidates(self):
+        log: list[str] = []
+        # Extra trailing output the stage should never wait for
+        text = MOCK_JSON_RESPONSE[:-1] + ', {"text": "extra"}]' + " " * 200
+        local_client = MagicMock(spec=LocalLLMClient)
+        local_client.generate_stream = _stream_from(text, delay=0.001, log=log)
+        cloud_client = MagicMock(spec=CloudLLMClient)
+        cloud_client.generate_stream = _stream_from("")
+
+        orchestrator = HybridLLMOrchestrator(local_client, cloud_client, streaming=True)
+        sets = [cs async for cs in orchestrator.generate_candidates(ContextFrame(), 4)]
+
+        complete = [cs for cs in sets if not cs.is_partial]
+        assert all(len(cs.candidates) == 4 for cs in complete)
+        assert log == ["closed", "closed"]
+
+    @pytest.mark.asyncio
+    async def test_plain_text_stream_falls_back_to_lines(self):
+        local_client = MagicMock(spec=LocalLLMClient)
+        local_client.generate_stream = _stream_from("1. すごいね\n2. 何があったの？")
+        cloud_client = MagicMock(spec=CloudLLMClient)
+        cloud_client.generate_stream = _stream_from("")
+
+        orchestrator = HybridLLMOrchestrator(local_client, cloud_client, streaming=True)
+        sets = [cs async for cs in orchestrator.generate_candidates(ContextFrame())]
+        assert len(sets) == 2
+        assert all(not cs.is_partial for cs in sets)
+        assert sets[0].candidates[0].text == "すごいね"
+
+    @pytest.mark.asyncio
+    async def test_lower_stage_partials_dropped_after_higher_stage_completes(self):
+        local_client = MagicMock(spec=LocalLLMClient)
+        local_client.generate_stream = _stream_from(MOCK_JSON_RESPONSE, delay=0.02)
+        cloud_client = MagicMock(spec=CloudLLMClient)
+        cloud_client.generate_stream = _stream_from(MOCK_CLOUD_RESPONSE, chunk=1000)
+
+        orchestrator = HybridLLMOrchestrator(local_client, cloud_client, streaming=True)
+        sets = [cs async for cs in orchestrator.generate_candidates(ContextFrame())]
+        assert sets[0].stage == GenerationStage.CLOUD and not sets[0].is_partial
+        assert not any(cs.is_partial for cs in sets)
+
+
+class TestOrchestratorCancellation:
+
+    @pytest.mark.asyncio
+    async def test_cancel_pending_closes_running_streams(self):
+        log: list[str] = []
+        local_client = MagicMock(spec=LocalLLMClient)
+        local_client.generate_stream = _stream_from(
+            MOCK_JSON_RESPONSE, chunk=4, delay=0.05, log=log
+        )
+        cloud_client = MagicMock(spec=CloudLLMClient)
+        cloud_client.generate_stream = _stream_from(
+            MOCK_CLOUD_RESPONSE, chunk=4, delay=0.05, log=log
+        )
+
+        orchestrator = HybridLLMOrchestrator(local_client, cloud_client, streaming=True)
+        start = asyncio.get_running_loop().time()
+        sets = []
+        async for cs in orchestrator.generate_candidates(ContextFrame()):
+            sets.append(cs)
+            await orchestrator.cancel_pending(cs.request_id)
+        elapsed = asyncio.get_running_loop().time() - start
+
+        await asyncio.sleep(0)
+        assert len(sets) == 1
+        assert log == ["closed", "closed", "closed"]
+        assert elapsed < 1.0  # far less than streaming every response
+        assert orchestrator.active_requests == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_ids_are_bounded(self):
+        from voicereach.engine.llm.orchestrator import MAX_CANCELLED_IDS
+
+        orchestrator = HybridLLMOrchestrator(
+            AsyncMock(spec=LocalLLMClient), AsyncMock(spec=CloudLLMClient), streaming=False
+        )
+        for i in range(MAX_CANCELLED_IDS + 10):
+            await orchestrator.cancel_pending(f"req-{i}")
+        assert len(orchestrator._cancelled) == MAX_CANCELLED_IDS
+        assert "req-0" not in orchestrator._cancelled
+        assert f"req-{MAX_CANCELLED_IDS + 9}" in orchestrator._cancelled
+
+    @pytest.mark.asyncio
+    async def test_new_generation_supersedes_running_one(self):
+        from voicereach.engine.pipeline import Pipeline
+
+        log: list[str] = []
+        local_client = MagicMock(spec=LocalLLMClient)
+        local_client.generate_stream = _stream_from(
+            MOCK_JSON_RESPONSE, chunk=2, delay=0.05, log=log
+        )
+        cloud_client = MagicMock(spec=CloudLLMClient)
+        cloud_client.generate_stream = _stream_from("")
+
+        pipeline = Pipeline()
+        pipeline._llm = HybridLLMOrchestrator(local_client, cloud_client, streaming=True)
+        pipeline.add_partner_utterance("おはよう")
+        first = pipeline._generation_task
+        await asyncio.sleep(0.02)
+        pipeline.add_partner_utterance("調子はどう？")
+        second = pipeline._generation_task
+        await asyncio.sleep(0.02)
+
+        assert first.cancelled()
+        assert log[:2] == ["closed", "closed"]  # both local stages of the first request
+        second.cancel()
+        await asyncio.gather(second, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_awaited_generation_is_not_superseded(self):
+        from voicereach.engine.pipeline import Pipeline
+
+        local_client = MagicMock(spec=LocalLLMClient)
+        local_client.generate_stream = _stream_from(MOCK_JSON_RESPONSE, chunk=2, delay=0.05)
+        cloud_client = MagicMock(spec=CloudLLMClient)
+        cloud_client.generate_stream = _stream_from("")
+
+        pipeline = Pipeline()
+        pipeline._llm = HybridLLMOrchestrator(local_client, cloud_client, streaming=True)
+        caller = asyncio.create_task(pipeline.trigger_generation())
+        await asyncio.sleep(0.02)
+        pipeline.add_partner_utterance("おはよう")
+        await asyncio.sleep(0.02)
+
+        assert not caller.done()
+        for task in (caller, pipeline._generation_task):
+            task.cancel()
+        await asyncio.gather(caller, pipeline._generation_task, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_selecting_from_warm_set_cancels_generation(self):
+        from voicereach.engine.pipeline import Pipeline
+        from voicereach.models.events import Candidate
+
+        log: list[str] = []
+        local_client = MagicMock(spec=LocalLLMClient)
+        local_client.generate_stream = _stream_from(
+            MOCK_JSON_RESPONSE, chunk=2, delay=0.05, log=log
+        )
+        cloud_client = MagicMock(spec=CloudLLMClient)
+        cloud_client.generate_stream = _stream_from(
+            MOCK_CLOUD_RESPONSE, chunk=2, delay=0.05, log=log
+        )
+
+        pipeline = Pipeline()
+        pipeline._llm = HybridLLMOrchestrator(local_client, cloud_client, streaming=True)
+        pipeline._tts_router.synthesize = AsyncMock(return_value=None)
+        published: list[CandidateSet] = []
+
+        async def capture(msg):
+            published.append(msg.candidate_set)
+
+        pipeline.set_message_callback(capture)
+        warm = CandidateSet(
+            candidates=[Candidate(text="元気だよ", intent_axis=IntentAxis.EMOTIONAL_RESPONSE,
+                                  confidence=0.9, generation_stage=GenerationStage.LOCAL_QUALITY,
+                                  latency_ms=0)],
+            stage=GenerationStage.LOCAL_QUALITY, request_id="warm-set",
+        )
+        generation = asyncio.create_task(pipeline.trigger_generation(warm))
+        await asyncio.sleep(0.02)
+        await pipeline.handle_candidate_selected("warm-set", 0)
+        await asyncio.wait_for(generation, timeout=1.0)
+
+        # The stages were aborted; nothing replaced the selected set
+        assert [cs.request_id for cs in published] == ["warm-set"]
+        assert log == ["closed", "closed", "closed"]
+        assert pipeline._llm.active_requests == 0
+
+
+class TestOrchestratorCandidateCache:
+
+    @pytest.mark.asyncio
+    async def test_cached_set_is_yielded_first_and_best_set_stored(self):
+        from voicereach.engine.llm.candidate_cache import CandidateCache
+
+        local_client = AsyncMock(spec=LocalLLMClient)
+        local_client.generate.return_value = MOCK_JSON_RESPONSE
+        cloud_client = AsyncMock(spec=CloudLLMClient)
+        cloud_client.generate.return_value = MOCK_CLOUD_RESPONSE
+        cache = CandidateCache()
+        orchestrator = HybridLLMOrchestrator(
+            local_client, cloud_client, streaming=False, candidate_cache=cache
+        )
+        context = _make_rich_context()
+
+        first_run = [cs async for cs in orchestrator.generate_candidates(context)]
+        assert GenerationStage.INSTANT not in [cs.stage for cs in first_run]
+        assert cache.stats.stores == 1
+
+        second_run = [cs async for cs in orchestrator.generate_candidates(context)]
+        assert second_run[0].stage == GenerationStage.INSTANT
+        assert second_run[0].request_id == second_run[1].request_id
+        assert second_run[0].candidates[0].text == "ありがとう、元気にしてるよ"  # the cloud set
+
+    @pytest.mark.asyncio
+    async def test_local_only_runs_skip_the_cache(self):
+        from voicereach.engine.llm.candidate_cache import CandidateCache
+
+        local_client = AsyncMock(spec=LocalLLMClient)
+        local_client.generate.return_value = MOCK_JSON_RESPONSE
+        cache = CandidateCache()
+        orchestrator = HybridLLMOrchestrator(
+            local_client, AsyncMock(spec=CloudLLMClient), streaming=False, candidate_cache=cache
+        )
+        stages = (GenerationStage.LOCAL_FAST, GenerationStage.LOCAL_QUALITY)
+        async for _ in orchestrator.generate_candidates(_make_rich_context(), stages=stages):
+            pass
+        assert cache.stats.lookups == 0
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_templates_answer_when_every_llm_is_down(self):
+        from voicereach.engine.llm.templates import TemplateCandidateGenerator
+
+        local_client = AsyncMock(spec=LocalLLMClient)
+        local_client.generate.side_effect = ConnectionError("local server down")
+        cloud_client = AsyncMock(spec=CloudLLMClient)
+        cloud_client.generate.return_value = None  # every provider failed
+        orchestrator = HybridLLMOrchestrator(
+            local_client, cloud_client, streaming=False, templates=TemplateCandidateGenerator()
+        )
+        context = _make_rich_context()
+        context.template_sentences = ["元気だよ", "ちょっと疲れた"]
+
+        sets = [cs async for cs in orchestrator.generate_candidates(context)]
+        assert [cs.stage for cs in sets] == [GenerationStage.INSTANT]
+        assert {c.text for c in sets[0].candidates} == {"元気だよ", "ちょっと疲れた"}
+
+    @pytest.mark.asyncio
+    async def test_cached_candidates_are_topped_up_with_templates(self):
+        from voicereach.engine.llm.candidate_cache import CandidateCache
+        from voicereach.engine.llm.templates import TemplateCandidateGenerator
+
+        cache = CandidateCache()
+        context = _make_rich_context()
+        context.template_sentences = ["元気だよ", "お茶が飲みたい"]
+        cache.store(context, CandidateSet(
+            candidates=parse_candidates(MOCK_JSON_RESPONSE, GenerationStage.CLOUD, 0, 2),
+            stage=GenerationStage.CLOUD,
+            request_id="old",
+        ))
+        local_client = AsyncMock(spec=LocalLLMClient)
+        local_client.generate.return_value = None
+        cloud_client = AsyncMock(spec=CloudLLMClient)
+        cloud_client.generate.return_value = None
+        orchestrator = HybridLLMOrchestrator(
+            local_client, cloud_client, streaming=False,
+            candidate_cache=cache, templates=TemplateCandidateGenerator(),
+        )
+
+        sets = [cs async for cs in orchestrator.generate_candidates(context)]
+        assert [c.text for c in sets[0].candidates] == [
+            "元気だよ", "最近何してた？", "お茶が飲みたい"
+        ]
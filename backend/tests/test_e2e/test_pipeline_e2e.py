@@ -104,7 +104,7 @@ def _make_face_data() -> FaceData:
     )
 
 
-async def _mock_generate_candidates(context, num_candidates=4):
+async def _mock_generate_candidates(context, num_candidates=4, request_id=None):
     """Async generator that yields a single CandidateSet."""
     cs = _make_candidate_set()
     yield cs
@@ -504,7 +504,7 @@ class TestPipelineFullRoundTrip:
         pipeline.set_message_callback(capture)
 
         # Mock LLM to yield a known candidate set
-        async def mock_gen(context, num_candidates=4):
+        async def mock_gen(context, num_candidates=4, request_id=None):
             yield _make_candidate_set()
 
         pipeline._llm.generate_candidates = mock_gen
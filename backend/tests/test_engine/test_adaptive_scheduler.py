@@ -0,0 +1,100 @@
+"""Tests for the adaptive frame scheduler."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from voicereach.engine.gaze.adaptive_scheduler import AdaptiveFrameScheduler
+from voicereach.engine.gaze.mediapipe_tracker import LEFT_EYE_INDICES, RIGHT_EYE_INDICES
+
+FPS = 30.0
+
+
+def _landmarks(shift: float = 0.0) -> np.ndarray:
+    lm = np.zeros((478, 3), dtype=np.float32)
+    lm[LEFT_EYE_INDICES, 0] = np.linspace(90, 110, len(LEFT_EYE_INDICES)) + shift
+    lm[RIGHT_EYE_INDICES, 0] = np.linspace(190, 210, len(RIGHT_EYE_INDICES)) + shift
+    lm[LEFT_EYE_INDICES + RIGHT_EYE_INDICES, 1] = 100.0
+    return lm
+
+
+def _frame(value: int = 100) -> np.ndarray:
+    return np.full((240, 320, 3), value, dtype=np.uint8)
+
+
+def _run(scheduler, n, start=0, zone=0, frame=None, landmarks=None, saccade_at=()):
+    """Feed ``n`` frames at 30 fps; return the indices that were processed."""
+    processed = []
+    frame = _frame() if frame is None else frame
+    landmarks = _landmarks() if landmarks is None else landmarks
+    for i in range(start, start + n):
+        ts = i / FPS
+        if scheduler.should_process(ts, frame):
+            processed.append(i)
+            scheduler.record(
+                ts, frame, zone, saccade=i in saccade_at, landmarks=landmarks, processing_ms=8.0
+            )
+    return processed
+
+
+class TestAdaptiveFrameScheduler:
+    def test_full_rate_until_stable(self):
+        s = AdaptiveFrameScheduler(reduced_fps=10.0, stable_after_s=1.0)
+        processed = _run(s, 30)
+        assert processed == list(range(30))
+        assert not s.reduced
+
+    def test_reduces_rate_during_fixation(self):
+        s = AdaptiveFrameScheduler(reduced_fps=10.0, stable_after_s=1.0)
+        _run(s, 31)
+        assert s.reduced
+        processed = _run(s, 60, start=31)
+        # ~10 fps over 2 s instead of 30 fps
+        assert 15 <= len(processed) <= 25
+        stats = s.stats
+        assert stats.frames_skipped == 60 - len(processed)
+        assert stats.cpu_saved_ms == pytest.approx(stats.frames_skipped * 8.0)
+        assert 0 < stats.added_latency_ms_max <= 1000.0 / 10.0 + 1e-6
+        assert stats.skip_ratio > 0.3
+
+    def test_saccade_restores_full_rate(self):
+        s = AdaptiveFrameScheduler(reduced_fps=10.0, stable_after_s=1.0)
+        _run(s, 40)
+        assert s.reduced
+        # Next processed frame reports a saccade
+        _run(s, 6, start=40, saccade_at=set(range(40, 46)))
+        assert not s.reduced
+        assert _run(s, 5, start=46, saccade_at=set(range(46, 51))) == list(range(46, 51))
+        assert s.stats.rate_restores == 1
+
+    def test_zone_change_restores_full_rate(self):
+        s = AdaptiveFrameScheduler(reduced_fps=10.0, stable_after_s=1.0)
+        _run(s, 40, zone=0)
+        _run(s, 6, start=40, zone=1)
+        assert not s.reduced
+
+    def test_landmark_motion_restores_full_rate(self):
+        s = AdaptiveFrameScheduler(reduced_fps=10.0, stable_after_s=1.0, landmark_motion_px=3.0)
+        _run(s, 40)
+        _run(s, 6, start=40, landmarks=_landmarks(shift=10.0))
+        assert not s.reduced
+
+    def test_pixel_motion_on_skipped_frame_processes_immediately(self):
+        s = AdaptiveFrameScheduler(reduced_fps=10.0, stable_after_s=1.0)
+        _run(s, 40)
+        assert s.reduced
+        # Find a frame that would be skipped, then change the eye region
+        ts = s._last_processed_ts + 1.0 / FPS
+        moved = _frame()
+        moved[80:120, 60:240] = 250
+        assert s.should_process(ts, moved)
+        assert not s.reduced
+
+    def test_lost_face_returns_to_full_rate(self):
+        s = AdaptiveFrameScheduler(reduced_fps=10.0, stable_after_s=1.0)
+        _run(s, 40)
+        ts = s._last_processed_ts + 0.2
+        assert s.should_process(ts, _frame())
+        s.record(ts, _frame(), None)
+        assert not s.reduced
@@ -0,0 +1,158 @@
+"""Tests for the threaded CameraSource capture stage."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from voicereach.engine.gaze.camera_source import CameraSource
+
+
+class FakeCapture:
+    """cv2.VideoCapture stand-in producing ``num_frames`` numbered frames.
+
+    Each frame's pixels are filled with its index so tests can tell which
+    frame they received.  ``gate`` lets a test release frames one by one.
+    """
+
+    def __init__(
+        self, num_frames: int, interval_s: float = 0.0, gate: threading.Semaphore | None = None
+    ) -> None:
+        self.num_frames = num_frames
+        self.interval_s = interval_s
+        self.gate = gate
+        self.count = 0
+        self.released = False
+        self.buffers_passed: list[np.ndarray | None] = []
+
+    def isOpened(self) -> bool:  # noqa: N802 - mirrors cv2 API
+        return True
+
+    def read(self, image: np.ndarray | None = None):
+        self.buffers_passed.append(image)
+        if self.gate is not None:
+            self.gate.acquire()
+        if self.count >= self.num_frames:
+            return False, None
+        if self.interval_s:
+            time.sleep(self.interval_s)
+        self.count += 1
+        if image is None:
+            image = np.empty((4, 4, 3), dtype=np.uint8)
+        image.fill(self.count % 256)
+        return True, image
+
+    def release(self) -> None:
+        self.released = True
+
+
+def make_source(capture: FakeCapture, **kwargs) -> CameraSource:
+    return CameraSource(camera_id=0, capture_factory=lambda _id: capture, **kwargs)
+
+
+class TestCameraSource:
+    def test_rejects_small_buffer(self):
+        with pytest.raises(ValueError):
+            CameraSource(buffer_size=2)
+
+    def test_unopened_camera_raises(self):
+        cap = FakeCapture(0)
+        cap.isOpened = lambda: False
+        with pytest.raises(RuntimeError):
+            make_source(cap).start()
+        assert cap.released
+
+    def test_latest_frame_wins(self):
+        cap = FakeCapture(10)
+        source = make_source(cap, max_age_s=None)
+        source.start()
+        source._thread.join(timeout=2.0)
+
+        frame = source.read(timeout=1.0)
+        assert frame is not None
+        assert frame.seq == 10
+        assert int(frame.image[0, 0, 0]) == 10
+        stats = source.stats
+        assert stats.frames_captured == 10
+        assert stats.frames_dropped == 9
+        assert stats.frames_delivered == 1
+        source.stop()
+        assert cap.released
+
+    def test_read_returns_none_after_end_of_stream(self):
+        source = make_source(FakeCapture(1), max_age_s=None)
+        source.start()
+        assert source.read(timeout=1.0) is not None
+        assert source.read(timeout=1.0) is None
+        source.stop()
+
+    def test_stale_frames_are_skipped(self):
+        source = make_source(FakeCapture(1), max_age_s=0.01)
+        source.start()
+        source._thread.join(timeout=2.0)
+        time.sleep(0.05)
+        assert source.read(timeout=0.1) is None
+        assert source.stats.frames_stale == 1
+        source.stop()
+
+    def test_held_frame_is_not_overwritten(self):
+        gate = threading.Semaphore(0)
+        cap = FakeCapture(20, gate=gate)
+        source = make_source(cap, max_age_s=None)
+        source.start()
+        gate.release()
+        held = source.read(timeout=1.0)
+        assert held is not None and held.seq == 1
+
+        # Capture many more frames while the consumer keeps holding frame 1
+        for _ in range(10):
+            gate.release()
+        deadline = time.monotonic() + 2.0
+        while source.stats.frames_captured < 11 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert int(held.image[0, 0, 0]) == 1
+        for buf in cap.buffers_passed:
+            assert buf is not held.image
+
+        for _ in range(20):
+            gate.release()
+        source.stop()
+
+    def test_ring_buffers_are_reused(self):
+        cap = FakeCapture(12)
+        source = make_source(cap, max_age_s=None)
+        source.start()
+        source._thread.join(timeout=2.0)
+        distinct = {id(b) for b in cap.buffers_passed if b is not None}
+        assert len(distinct) <= 3
+        source.stop()
+
+
+class TestAsyncFrames:
+    @pytest.mark.asyncio
+    async def test_async_iterator_yields_until_stopped(self):
+        source = make_source(FakeCapture(5, interval_s=0.005), max_age_s=None)
+        source.start()
+        seqs = [frame.seq async for frame in source]
+        source.stop()
+        assert seqs
+        assert seqs == sorted(seqs)
+        assert seqs[-1] == 5
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_sees_bounded_latency(self):
+        source = make_source(FakeCapture(30, interval_s=0.002), max_age_s=None)
+        source.start()
+        seqs = []
+        async for frame in source.frames():
+            seqs.append(frame.seq)
+            await asyncio.sleep(0.02)  # consumer much slower than the camera
+        source.stop()
+        stats = source.stats
+        assert stats.frames_dropped > 0
+        assert stats.frames_delivered == len(seqs)
+        assert stats.frames_delivered + stats.frames_dropped == stats.frames_captured
@@ -4,7 +4,12 @@ import numpy as np
 import pytest
 
 from voicereach.engine.gaze.calibration import GazeCalibrator
-from voicereach.engine.gaze.smoother import DualAxisSmoother, GazeSmoother
+from voicereach.engine.gaze.smoother import (
+    ConstantVelocitySmoother,
+    DualAxisSmoother,
+    GazeSmoother,
+    create_smoother,
+)
 from voicereach.engine.gaze.zone_mapper import ZoneMapper
 
 
@@ -33,6 +38,101 @@ class TestGazeSmoother:
         assert p == 5.0
         assert y == 10.0
 
+    def test_dual_axis_reports_last_saccade(self):
+        d = DualAxisSmoother()
+        d.update(0.0, 0.0)
+        assert not d.last_saccade
+        d.update(0.0, 20.0)
+        assert d.last_saccade
+        d.reset()
+        assert not d.last_saccade
+
+
+def _gaze_trace(n: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Random-walk gaze with a saccade every 40 frames."""
+    rng = np.random.default_rng(seed)
+    pitches = np.cumsum(rng.normal(0, 1.0, n))
+    yaws = np.cumsum(rng.normal(0, 1.0, n))
+    pitches[::40] += rng.normal(0, 30, len(pitches[::40]))
+    return pitches, yaws
+
+
+class TestConstantVelocitySmoother:
+    def test_first_measurement_passes_through(self):
+        s = ConstantVelocitySmoother()
+        assert s.update(5.0, -3.0) == (5.0, -3.0)
+
+    def test_constant_converges(self):
+        s = ConstantVelocitySmoother()
+        for _ in range(100):
+            p, y = s.update(5.0, -8.0)
+        assert abs(p - 5.0) < 0.1
+        assert abs(y + 8.0) < 0.1
+
+    def test_ramp_tracked_without_lag(self):
+        cv = ConstantVelocitySmoother()
+        rw = DualAxisSmoother()
+        for i in range(100):
+            cv_p, _ = cv.update(0.5 * i, 0.0)
+            rw_p, _ = rw.update(0.5 * i, 0.0)
+        target = 0.5 * 99
+        assert abs(cv_p - target) < 0.1
+        assert abs(cv_p - target) < abs(rw_p - target)
+        assert cv.velocity[0] == pytest.approx(0.5, abs=0.01)
+
+    def test_saccade_flag_and_reset(self):
+        s = ConstantVelocitySmoother(saccade_threshold=5.0)
+        s.update(0.0, 0.0)
+        s.update(0.0, 1.0)
+        assert not s.last_saccade
+        s.update(20.0, 1.0)
+        assert s.last_saccade
+        s.reset()
+        assert not s.last_saccade
+        assert s.update(3.0, 4.0) == (3.0, 4.0)
+
+    def test_batch_matches_sequential(self):
+        pitches, yaws = _gaze_trace(2000)
+        seq = ConstantVelocitySmoother()
+        expected = np.array(
+            [seq.update(float(p), float(y)) for p, y in zip(pitches, yaws, strict=True)]
+        )
+        batch = ConstantVelocitySmoother()
+        bp, by = batch.update_batch(pitches, yaws)
+        np.testing.assert_allclose(bp, expected[:, 0], atol=1e-9)
+        np.testing.assert_allclose(by, expected[:, 1], atol=1e-9)
+        assert batch.last_saccade == seq.last_saccade
+        # Filter state carries over to later updates
+        assert batch.update(1.0, 2.0) == pytest.approx(seq.update(1.0, 2.0), abs=1e-9)
+
+    def test_batch_in_chunks(self):
+        pitches, yaws = _gaze_trace(1000, seed=1)
+        whole, _ = ConstantVelocitySmoother().update_batch(pitches, yaws)
+        s = ConstantVelocitySmoother()
+        parts = [s.update_batch(pitches[i:i + 97], yaws[i:i + 97])[0] for i in range(0, 1000, 97)]
+        np.testing.assert_allclose(np.concatenate(parts), whole, atol=1e-9)
+
+    def test_batch_short_and_empty(self):
+        s = ConstantVelocitySmoother()
+        p, y = s.update_batch([], [])
+        assert len(p) == len(y) == 0
+        p, y = s.update_batch([1.0], [2.0])
+        assert (p[0], y[0]) == (1.0, 2.0)
+        seq = ConstantVelocitySmoother()
+        seq.update(1.0, 2.0)
+        p, _ = s.update_batch([1.5, 2.0, 2.5], [2.0, 2.0, 2.0])
+        np.testing.assert_allclose(p, [seq.update(v, 2.0)[0] for v in (1.5, 2.0, 2.5)])
+
+
+class TestCreateSmoother:
+    def test_kinds(self):
+        assert isinstance(create_smoother("dual_axis"), DualAxisSmoother)
+        assert isinstance(create_smoother("constant_velocity"), ConstantVelocitySmoother)
+
+    def test_unknown_kind(self):
+        with pytest.raises(ValueError):
+            create_smoother("particle")
+
 
 class TestZoneMapper:
     def test_4_zones_center_top(self):
@@ -78,6 +178,49 @@ class TestZoneMapper:
         result = zm.map(0.5, 0.5)
         assert result.zone_id == 4
 
+    def test_grid_resolution_must_be_power_of_two(self):
+        with pytest.raises(ValueError):
+            ZoneMapper(num_zones=4, grid_resolution=100)
+
+    @pytest.mark.parametrize("num_zones", [4, 9, 16, 25])
+    def test_lookup_grid_matches_full_scan(self, num_zones):
+        rng = np.random.default_rng(num_zones)
+        # Random walk plus points on zone and grid boundaries
+        walk = np.cumsum(rng.normal(0, 0.03, (1500, 2)), axis=0) % 1.0
+        edges = np.round(rng.uniform(0, 1, (500, 2)) * 20) / 20
+        outside = rng.uniform(-0.1, 1.1, (200, 2))
+        pts = np.concatenate([walk, edges, outside])
+
+        zm = ZoneMapper(num_zones=num_zones, grid_resolution=32)
+        state = -1
+        for x, y in pts:
+            expected = zm._map_exact(x, y, state)
+            assert zm.map(x, y).zone_id == expected
+            state = expected
+
+    def test_map_batch_matches_sequential_map(self):
+        rng = np.random.default_rng(7)
+        pts = np.cumsum(rng.normal(0, 0.05, (2000, 2)), axis=0) % 1.0
+
+        seq = ZoneMapper(num_zones=16)
+        expected = [seq.map(x, y) for x, y in pts]
+
+        batch = ZoneMapper(num_zones=16)
+        result = batch.map_batch(pts[:, 0], pts[:, 1])
+        assert result.zone_ids.tolist() == [r.zone_id for r in expected]
+        assert result.confidences.tolist() == [r.confidence for r in expected]
+        assert result.center_x.tolist() == [r.center_x for r in expected]
+        assert batch.current_zone == seq.current_zone
+
+    def test_map_batch_keeps_hysteresis_across_sequence(self):
+        zm = ZoneMapper(num_zones=4, hysteresis_margin=0.05)
+        result = zm.map_batch([0.5, 0.5], [0.1, 0.33])
+        assert result.zone_ids.tolist() == [0, 0]
+
+    def test_map_batch_rejects_mismatched_shapes(self):
+        with pytest.raises(ValueError):
+            ZoneMapper().map_batch([0.1, 0.2], [0.1])
+
 
 class TestCalibration:
     def test_calibrate_with_5_points(self):
@@ -233,3 +233,83 @@ class TestOnnxFallback:
         r = est.estimate(fd)
         assert r.method == "heuristic"
         assert r.yaw > 0  # still produces a meaningful result
+
+
+# ---------------------------------------------------------------------------
+# Batched ONNX path (fake session, no model file needed)
+# ---------------------------------------------------------------------------
+
+class _FakeNode:
+    def __init__(self, name: str, shape: list) -> None:
+        self.name = name
+        self.shape = shape
+
+
+class _FakeSession:
+    """Minimal stand-in for onnxruntime.InferenceSession.
+
+    Returns logits peaked at ``peak_bin`` for every item in the batch and
+    records the batch size of each run.
+    """
+
+    def __init__(self, batch_dim, peak_bin: int = 45) -> None:
+        self._batch_dim = batch_dim
+        self._peak_bin = peak_bin
+        self.run_batches: list[int] = []
+
+    def get_inputs(self):
+        return [_FakeNode("input", [self._batch_dim, 3, 224, 224])]
+
+    def get_outputs(self):
+        return [_FakeNode("pitch", [self._batch_dim, 90]), _FakeNode("yaw", [self._batch_dim, 90])]
+
+    def io_binding(self):
+        raise RuntimeError("no IO binding in fake session")
+
+    def run(self, output_names, feeds):
+        x = feeds["input"]
+        assert x.shape[1:] == (3, 224, 224)
+        self.run_batches.append(x.shape[0])
+        logits = np.full((x.shape[0], 90), -10.0, dtype=np.float32)
+        logits[:, self._peak_bin] = 10.0
+        return [logits, logits.copy()]
+
+
+def _onnx_estimator(session: _FakeSession) -> GazeEstimator:
+    est = GazeEstimator(model_path="/nonexistent/model.onnx")
+    est._session = session
+    est._bind_session()
+    est._available = True
+    return est
+
+
+class TestBatchedOnnx:
+    def test_single_run_per_frame_with_dynamic_batch(self):
+        session = _FakeSession(batch_dim="batch")
+        est = _onnx_estimator(session)
+        r = est.estimate(make_fake_face_data())
+        assert r.method == "onnx"
+        assert session.run_batches == [2]
+
+    def test_static_batch_of_one_runs_per_eye(self):
+        session = _FakeSession(batch_dim=1)
+        est = _onnx_estimator(session)
+        r = est.estimate(make_fake_face_data())
+        assert r.method == "onnx"
+        assert session.run_batches == [1, 1]
+
+    def test_decoded_angle_matches_peak_bin(self):
+        # Bin 45 of 90 over [-180, 180) is centred at +2 degrees
+        est = _onnx_estimator(_FakeSession(batch_dim="batch", peak_bin=45))
+        r = est.estimate(make_fake_face_data())
+        assert r.pitch == pytest.approx(2.0, abs=1e-3)
+        assert r.yaw == pytest.approx(2.0, abs=1e-3)
+
+    def test_decode_gaze_is_vectorized(self):
+        logits = np.zeros((2, 90), dtype=np.float32)
+        logits[0, 0] = 50.0
+        logits[1, 89] = 50.0
+        pitches, yaws = GazeEstimator._decode_gaze([logits, logits])
+        assert pitches.shape == (2,)
+        assert pitches[0] == pytest.approx(-178.0, abs=1e-3)
+        assert yaws[1] == pytest.approx(178.0, abs=1e-3)
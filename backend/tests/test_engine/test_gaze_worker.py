@@ -0,0 +1,136 @@
+"""Tests for the out-of-process gaze worker.
+
+These spawn a real worker process (heuristic gaze path, no ONNX model)
+and compare its results with the inline pipeline.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from voicereach.engine.gaze.gaze_estimator import GazeEstimator
+from voicereach.engine.gaze.gaze_worker import GazeWorker, SharedGazeBuffers
+from voicereach.engine.gaze.mediapipe_tracker import (
+    LEFT_EYE_INDICES,
+    RIGHT_EYE_INDICES,
+    FaceData,
+)
+from voicereach.engine.gaze.smoother import DualAxisSmoother
+from voicereach.engine.gaze.zone_mapper import ZoneMapper, gaze_to_screen
+
+NO_MODEL = "/nonexistent/model.onnx"
+
+
+def _make_face_data(iris_dx: float = 0.0, iris_dy: float = 0.0) -> FaceData:
+    landmarks = np.zeros((478, 3), dtype=np.float32)
+    for indices, cx in ((LEFT_EYE_INDICES, 100.0), (RIGHT_EYE_INDICES, 200.0)):
+        landmarks[indices, 0] = cx
+        landmarks[indices, 1] = 100.0
+        landmarks[indices[0], 0] = cx - 15.0
+        landmarks[indices[1], 0] = cx + 15.0
+    return FaceData(
+        landmarks=landmarks,
+        left_eye_patch=np.zeros((64, 64), dtype=np.float32),
+        right_eye_patch=np.zeros((64, 64), dtype=np.float32),
+        left_iris=np.array([100.0 + iris_dx, 100.0 + iris_dy], dtype=np.float32),
+        right_iris=np.array([200.0 + iris_dx, 100.0 + iris_dy], dtype=np.float32),
+        head_pose=np.zeros(3, dtype=np.float32),
+        face_bbox=(50, 50, 200, 150),
+        confidence=1.0,
+    )
+
+
+@pytest.fixture
+def worker():
+    w = GazeWorker(model_path=NO_MODEL, num_zones=4, max_frame_shape=(120, 160, 3))
+    w.start()
+    yield w
+    w.stop()
+
+
+class TestSharedGazeBuffers:
+    def test_layout_fits_and_is_aligned(self):
+        shape = (121, 161, 3)  # odd frame size forces realignment
+        size = SharedGazeBuffers.size_for(shape)
+        bufs = SharedGazeBuffers(bytearray(size), shape)
+        assert bufs.frame.size == 121 * 161 * 3
+        assert bufs.landmarks.shape == (478, 3)
+        assert bufs.patches.shape == (2, 64, 64)
+        for arr in (bufs.landmarks, bufs.patches, bufs.iris, bufs.head_pose):
+            assert arr.ctypes.data % arr.dtype.alignment == 0
+        bufs.release()
+
+
+class TestGazeWorker:
+    @pytest.mark.asyncio
+    async def test_matches_inline_pipeline(self, worker):
+        estimator = GazeEstimator(model_path=NO_MODEL)
+        estimator.initialize()
+        smoother = DualAxisSmoother()
+        mapper = ZoneMapper(num_zones=4)
+
+        for dx, dy in [(0, 0), (8, 0), (8, 0), (-8, 0), (0, -5), (0, 5)]:
+            fd = _make_face_data(dx, dy)
+            gaze = estimator.estimate(fd)
+            expected = mapper.map(*gaze_to_screen(*smoother.update(gaze.pitch, gaze.yaw)))
+            result = await worker.process_face_data(fd)
+            assert result == expected
+
+        assert worker.stats.requests == 6
+        assert worker.stats.failures == 0
+        assert worker.stats.last_roundtrip_ms >= worker.stats.last_compute_ms
+
+    @pytest.mark.asyncio
+    async def test_set_num_zones(self, worker):
+        await worker.set_num_zones(9)
+        result = await worker.process_face_data(_make_face_data())
+        assert 0 <= result.zone_id < 9
+
+    @pytest.mark.asyncio
+    async def test_oversized_frame_rejected(self, worker):
+        with pytest.raises(ValueError):
+            await worker.process_frame(np.zeros((240, 320, 3), dtype=np.uint8))
+
+    @pytest.mark.asyncio
+    async def test_stop_then_request_raises(self):
+        w = GazeWorker(model_path=NO_MODEL, max_frame_shape=(8, 8, 3))
+        w.start()
+        assert w.running
+        w.stop()
+        assert not w.running
+        with pytest.raises(RuntimeError):
+            await w.reset()
+
+    @pytest.mark.asyncio
+    async def test_timed_out_request_is_answered_before_buffers_are_reused(self, worker):
+        worker._timeout = 0.0  # give up before the worker can answer
+        assert await worker.process_face_data(_make_face_data()) is None
+        assert worker._stale_seq is not None
+        pid = worker._process.pid
+
+        worker._timeout = 1.0
+        result = await worker.process_face_data(_make_face_data(8, 0))
+        assert result is not None
+        assert worker._stale_seq is None
+        assert worker._process.pid == pid  # drained, not restarted
+        assert worker.stats.restarts == 0
+
+    @pytest.mark.asyncio
+    async def test_dead_worker_is_restarted_by_next_request(self, worker):
+        pid = worker._process.pid
+        worker._process.kill()
+        worker._process.join()
+
+        result = await worker.process_face_data(_make_face_data())
+        assert result is not None
+        assert worker.running
+        assert worker._process.pid != pid
+        assert worker.stats.restarts == 1
+
+    def test_worker_dying_during_startup_is_cleaned_up(self):
+        w = GazeWorker(model_path=NO_MODEL, num_zones=0, max_frame_shape=(8, 8, 3))
+        with pytest.raises(RuntimeError):
+            w.start()
+        assert not w.running
+        assert w._shm is None
@@ -4,7 +4,7 @@ import json
 
 import pytest
 
-from voicereach.engine.llm.candidate import parse_candidates
+from voicereach.engine.llm.candidate import StreamingCandidateParser, parse_candidates
 from voicereach.engine.llm.prompt_builder import build_messages, build_system_prompt
 from voicereach.models.context import (
     ContextFrame,
@@ -56,6 +56,72 @@ class TestPromptBuilder:
         messages = build_messages(context)
         assert len(messages) >= 2  # system + initial prompt
 
+    def test_system_prompt_layers_are_stable(self):
+        base = ContextFrame(pvp_text="口癖: 「まじか」")
+        prompt = build_system_prompt(base)
+        static, session = prompt.layers
+        assert prompt == static + session
+        assert "まじか" in static and "場所" in session
+
+        moved = base.model_copy(
+            update={"environment": EnvironmentContext(location="病院")}
+        )
+        talked = base.model_copy(
+            update={"conversation_history": [ConversationEntry(role="partner", text="やあ")]}
+        )
+        assert build_system_prompt(moved).layers[0] == static
+        assert build_system_prompt(moved).layers[1] != session
+        assert build_system_prompt(talked).layers == (static, session)
+
+
+class TestPromptAssembler:
+    def _context(self, **kwargs):
+        return ContextFrame(
+            pvp_text="口癖: 「まじか」",
+            conversation_history=[ConversationEntry(role="partner", text="おはよう")],
+            **kwargs,
+        )
+
+    def test_matches_build_messages(self):
+        from voicereach.engine.llm.prompt_builder import PromptAssembler
+
+        context = self._context()
+        assert PromptAssembler().build_messages(context, 3) == build_messages(context, 3)
+
+    def test_prefix_is_reused_until_inputs_change(self):
+        from voicereach.engine.llm.prompt_builder import PromptAssembler
+
+        assembler = PromptAssembler()
+        context = self._context()
+        first = assembler.build_messages(context)[0]["content"]
+        context.conversation_history.append(ConversationEntry(role="patient", text="まじか"))
+        again = assembler.build_messages(context)
+        assert again[0]["content"] is first
+        assert again[-1]["content"] == "まじか"
+        assert (assembler.hits, assembler.misses) == (1, 1)
+
+        moved = context.model_copy(update={"environment": EnvironmentContext(location="病院")})
+        prefix = assembler.stable_prefix(moved)
+        assert prefix is not first
+        assert prefix.layers[0] is first.layers[0]
+        assert prefix == build_system_prompt(moved)
+
+    @pytest.mark.asyncio
+    async def test_orchestrator_prewarms_each_prefix_once(self):
+        from unittest.mock import AsyncMock
+
+        from voicereach.engine.llm.cloud_client import CloudLLMClient
+        from voicereach.engine.llm.local_client import LocalLLMClient
+        from voicereach.engine.llm.orchestrator import HybridLLMOrchestrator
+
+        local = AsyncMock(spec=LocalLLMClient)
+        orchestrator = HybridLLMOrchestrator(local, AsyncMock(spec=CloudLLMClient))
+        context = self._context()
+        await orchestrator.prewarm(context)
+        await orchestrator.prewarm(context)
+        assert local.warm_prefix.await_count == 2  # fast + quality model, once
+        assert local.warm_prefix.await_args.args[1] == build_system_prompt(context)
+
 
 class TestCandidateParsing:
     def test_parse_json_output(self):
@@ -123,3 +189,730 @@ class TestCandidateParsing:
         raw = '[{"text": "test", "intent": "unknown_intent", "confidence": 0.5}]'
         candidates = parse_candidates(raw, GenerationStage.LOCAL_FAST, 150)
         assert candidates[0].intent_axis in list(IntentAxis)
+
+
+def _chunks(text: str, size: int = 5) -> list[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestStreamingCandidateParser:
+    RAW = json.dumps([
+        {"text": "すごいじゃん！", "intent": "emotional_response", "confidence": 0.8},
+        {"text": "何で表彰されたの？", "intent": "question", "confidence": 0.7},
+        {"text": "俺も嬉しい", "intent": "self_reference", "confidence": 0.6},
+    ], ensure_ascii=False)
+
+    def test_emits_each_candidate_when_object_closes(self):
+        parser = StreamingCandidateParser(GenerationStage.LOCAL_FAST)
+        emitted = []
+        first_at = None
+        for i, chunk in enumerate(_chunks(self.RAW)):
+            new = parser.feed(chunk, latency_ms=i)
+            if new and first_at is None:
+                first_at = i
+            emitted.extend(new)
+        assert [c.text for c in emitted] == ["すごいじゃん！", "何で表彰されたの？", "俺も嬉しい"]
+        # First candidate is available well before the stream ends
+        assert first_at < len(_chunks(self.RAW)) // 2
+        assert parser.done
+
+    def test_matches_batch_parser(self):
+        parser = StreamingCandidateParser(GenerationStage.CLOUD)
+        for chunk in _chunks(self.RAW, 3):
+            parser.feed(chunk, 10)
+        batch = parse_candidates(self.RAW, GenerationStage.CLOUD, 10)
+        assert parser.finish(10) == batch
+
+    def test_brackets_and_escapes_inside_strings(self):
+        raw = '```json\n[{"text": "a]}\\"b", "intent": "humor"}, {"text": "c"}]\n```'
+        parser = StreamingCandidateParser(GenerationStage.LOCAL_FAST)
+        emitted = [c for chunk in _chunks(raw, 2) for c in parser.feed(chunk, 0)]
+        assert [c.text for c in emitted] == ['a]}"b', "c"]
+
+    def test_stops_at_max_candidates(self):
+        parser = StreamingCandidateParser(GenerationStage.LOCAL_FAST, max_candidates=2)
+        emitted = [c for chunk in _chunks(self.RAW) for c in parser.feed(chunk, 0)]
+        assert len(emitted) == 2
+        assert parser.done
+
+    def test_line_fallback_on_finish(self):
+        parser = StreamingCandidateParser(GenerationStage.LOCAL_FAST)
+        for chunk in _chunks("1. すごいね\n2. 何があったの？"):
+            assert parser.feed(chunk, 0) == []
+        assert [c.text for c in parser.finish(50)] == ["すごいね", "何があったの？"]
+
+    def test_invalid_item_skipped(self):
+        raw = '[{"text": "ok"}, {"bad": 1}, {"text": "fine"}]'
+        parser = StreamingCandidateParser(GenerationStage.LOCAL_FAST)
+        emitted = parser.feed(raw, 0)
+        assert [c.text for c in emitted] == ["ok", "fine"]
+
+
+class TestCloudStreamFailover:
+    @pytest.mark.asyncio
+    async def test_fails_over_before_first_token_only(self, monkeypatch):
+        from voicereach.engine.llm.cloud_client import CloudLLMClient, CloudProvider
+
+        client = CloudLLMClient()
+        client._providers = [CloudProvider.GEMINI, CloudProvider.ANTHROPIC, CloudProvider.OPENAI]
+        calls = []
+
+        async def fake_stream(provider, *args):
+            calls.append(provider)
+            if provider == CloudProvider.GEMINI:
+                raise ConnectionError("down")
+            yield "abc"
+            if provider == CloudProvider.ANTHROPIC:
+                raise ConnectionError("dropped mid-stream")
+
+        monkeypatch.setattr(client, "_stream_provider", fake_stream)
+        chunks = [c async for c in client.generate_stream([{"role": "user", "content": "x"}])]
+        assert chunks == ["abc"]
+        assert calls == [CloudProvider.GEMINI, CloudProvider.ANTHROPIC]
+
+
+class TestCloudConnections:
+    @pytest.mark.asyncio
+    async def test_sdk_client_is_reused(self, monkeypatch):
+        from voicereach.config import settings
+        from voicereach.engine.llm.cloud_client import CloudLLMClient, CloudProvider
+
+        monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+        client = CloudLLMClient()
+        first = client._sdk_client(CloudProvider.OPENAI)
+        assert client._sdk_client(CloudProvider.OPENAI) is first
+        await client.aclose()
+        assert client._sdk_client(CloudProvider.OPENAI) is not first
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_sdk_clients_do_not_retry(self, monkeypatch):
+        from voicereach.config import settings
+        from voicereach.engine.llm.cloud_client import CloudLLMClient, CloudProvider
+
+        for key in ("gemini_api_key", "anthropic_api_key", "openai_api_key"):
+            monkeypatch.setattr(settings, key, "test-key")
+        client = CloudLLMClient()
+        gemini = client._sdk_client(CloudProvider.GEMINI)
+        assert gemini._api_client._http_options.retry_options.attempts == 1
+        assert client._sdk_client(CloudProvider.ANTHROPIC).max_retries == 0
+        assert client._sdk_client(CloudProvider.OPENAI).max_retries == 0
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_warmup_preconnects_each_provider(self, monkeypatch):
+        import httpx
+
+        from voicereach.config import settings
+        from voicereach.engine.llm.cloud_client import CloudLLMClient, CloudProvider
+
+        monkeypatch.setattr(settings, "cloud_keepalive_interval_s", 0.0)
+        hosts = []
+
+        def handler(request):
+            hosts.append(request.url.host)
+            return httpx.Response(404)
+
+        client = CloudLLMClient()
+        client._providers = [CloudProvider.GEMINI, CloudProvider.ANTHROPIC]
+        monkeypatch.setattr(
+            client, "_new_http_client",
+            lambda provider: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        await client.warmup()
+        assert sorted(hosts) == ["api.anthropic.com", "generativelanguage.googleapis.com"]
+        assert client._keepalive_task is None
+        await client.aclose()
+        assert client._http == {}
+
+    @pytest.mark.asyncio
+    async def test_deadline_is_shared_across_failover(self, monkeypatch):
+        import asyncio
+        import time
+
+        from voicereach.engine.llm.cloud_client import CloudLLMClient, CloudProvider
+
+        client = CloudLLMClient()
+        client._providers = [CloudProvider.GEMINI, CloudProvider.ANTHROPIC, CloudProvider.OPENAI]
+        calls = []
+
+        async def slow_call(provider, messages, temperature, max_tokens, timeout_s):
+            calls.append(provider)
+            await asyncio.sleep(1.0)
+            return "late"
+
+        monkeypatch.setattr(client, "_call_provider", slow_call)
+        start = time.monotonic()
+        result = await client.generate([{"role": "user", "content": "x"}], timeout_s=0.1)
+        assert result is None
+        assert time.monotonic() - start < 0.5
+        assert calls == [CloudProvider.GEMINI]
+
+
+class TestCloudHedging:
+    @pytest.fixture
+    def client(self, monkeypatch):
+        from voicereach.config import settings
+        from voicereach.engine.llm.cloud_client import CloudLLMClient, CloudProvider
+
+        monkeypatch.setattr(settings, "cloud_hedge_default_delay_ms", 50)
+        monkeypatch.setattr(settings, "cloud_hedge_min_delay_ms", 10)
+        client = CloudLLMClient()
+        client._providers = [CloudProvider.GEMINI, CloudProvider.ANTHROPIC]
+        return client
+
+    @staticmethod
+    def _fake_calls(client, monkeypatch, delays):
+        import asyncio
+
+        events = []
+
+        async def call(provider, messages, temperature, max_tokens, timeout_s):
+            events.append(("start", provider))
+            try:
+                await asyncio.sleep(delays[provider])
+            except asyncio.CancelledError:
+                events.append(("cancelled", provider))
+                raise
+            return provider.value
+
+        monkeypatch.setattr(client, "_call_provider", call)
+        return events
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self, client, monkeypatch):
+        from voicereach.engine.llm.cloud_client import CloudProvider
+
+        events = self._fake_calls(
+            client, monkeypatch, {CloudProvider.GEMINI: 1.0, CloudProvider.ANTHROPIC: 0.01}
+        )
+        result = await client.generate([{"role": "user", "content": "x"}], timeout_s=2.0)
+        assert result == "anthropic"
+        assert ("cancelled", CloudProvider.GEMINI) in events
+        assert client.stats.hedges == 1
+        assert client.stats.hedge_wins == 1
+        assert len(client.latency[CloudProvider.ANTHROPIC]) == 1
+        # The cancelled primary still counts, as a censored sample
+        gemini = client.latency[CloudProvider.GEMINI]
+        assert len(gemini) == 1
+        assert gemini.percentile(50) >= 50
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self, client, monkeypatch):
+        from voicereach.engine.llm.cloud_client import CloudProvider
+
+        events = self._fake_calls(
+            client, monkeypatch, {CloudProvider.GEMINI: 0.0, CloudProvider.ANTHROPIC: 0.0}
+        )
+        assert await client.generate([{"role": "user", "content": "x"}]) == "gemini"
+        assert events == [("start", CloudProvider.GEMINI)]
+        assert client.stats.hedges == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_hedging_waits_for_primary(self, client, monkeypatch):
+        from voicereach.config import settings
+        from voicereach.engine.llm.cloud_client import CloudProvider
+
+        monkeypatch.setattr(settings, "cloud_hedging", False)
+        events = self._fake_calls(
+            client, monkeypatch, {CloudProvider.GEMINI: 0.2, CloudProvider.ANTHROPIC: 0.0}
+        )
+        assert await client.generate([{"role": "user", "content": "x"}]) == "gemini"
+        assert events == [("start", CloudProvider.GEMINI)]
+
+    def test_hedge_delay_tracks_latency_percentile(self, client):
+        from voicereach.engine.llm.cloud_client import CloudProvider
+        from voicereach.engine.metrics import LatencyHistogram
+
+        assert client.hedge_delay_s(CloudProvider.GEMINI) == pytest.approx(0.05)
+        histogram = client.latency[CloudProvider.GEMINI] = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.record(float(ms))
+        assert client.hedge_delay_s(CloudProvider.GEMINI) == pytest.approx(0.09)
+
+    @pytest.mark.asyncio
+    async def test_stream_hedge_closes_losing_stream(self, client, monkeypatch):
+        import asyncio
+
+        from voicereach.engine.llm.cloud_client import CloudProvider
+
+        closed = []
+
+        async def fake_stream(provider, *args):
+            try:
+                if provider == CloudProvider.GEMINI:
+                    await asyncio.sleep(1.0)
+                yield provider.value
+                yield "!"
+            finally:
+                closed.append(provider)
+
+        monkeypatch.setattr(client, "_stream_provider", fake_stream)
+        chunks = [c async for c in client.generate_stream([{"role": "user", "content": "x"}])]
+        assert chunks == ["anthropic", "!"]
+        assert set(closed) == {CloudProvider.GEMINI, CloudProvider.ANTHROPIC}
+        assert len(client.first_token_latency[CloudProvider.ANTHROPIC]) == 1
+
+
+class TestPromptCaching:
+    def test_anthropic_system_blocks_carry_cache_markers(self):
+        from voicereach.engine.llm.cloud_client import _anthropic_system
+
+        messages = build_messages(ContextFrame(pvp_text="PVP本文"))
+        system, turns = _anthropic_system(messages)
+        assert [b["text"] for b in system] == list(messages[0]["content"].layers)
+        assert all(b["cache_control"] == {"type": "ephemeral"} for b in system)
+        assert all(t["role"] != "system" for t in turns)
+
+        plain, _ = _anthropic_system([{"role": "system", "content": "x"}])
+        assert plain == "x"
+
+    def test_cache_stats_ratios(self):
+        from voicereach.engine.llm.prompt_cache import PromptCacheStats
+
+        stats = PromptCacheStats()
+        stats.record(1000, 0)
+        stats.record(1000, 800)
+        assert stats.hit_ratio == pytest.approx(0.5)
+        assert stats.token_hit_ratio == pytest.approx(0.4)
+
+    @pytest.mark.asyncio
+    async def test_gemini_context_cache_lifecycle(self, monkeypatch):
+        import asyncio
+        from types import SimpleNamespace
+
+        from voicereach.engine.llm import prompt_cache
+        from voicereach.engine.llm.prompt_cache import GeminiContextCache
+
+        calls = []
+
+        async def create(model, config):
+            calls.append(("create", config.system_instruction))
+            return SimpleNamespace(name=f"cachedContents/{len(calls)}")
+
+        async def update(name, config):
+            calls.append(("update", name))
+
+        caches = SimpleNamespace(create=create, update=update)
+        fake = SimpleNamespace(aio=SimpleNamespace(caches=caches))
+        cache = GeminiContextCache(lambda: fake, "gemini-test", ttl_s=600, refresh_margin_s=60)
+
+        assert cache.lookup("SYSTEM") is None
+        assert cache.lookup("SYSTEM") is None  # creation already in flight
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert calls == [("create", "SYSTEM")]
+        assert cache.lookup("SYSTEM") == "cachedContents/1"
+
+        now = prompt_cache.time.monotonic()
+        monkeypatch.setattr(prompt_cache.time, "monotonic", lambda: now + 590)
+        assert cache.lookup("SYSTEM") == "cachedContents/1"
+        await asyncio.sleep(0)
+        assert calls[-1] == ("update", "cachedContents/1")
+        await cache.aclose()
+
+    @pytest.mark.asyncio
+    async def test_gemini_context_cache_backs_off_after_failure(self):
+        import asyncio
+        from types import SimpleNamespace
+
+        from voicereach.engine.llm.prompt_cache import GeminiContextCache
+
+        attempts = []
+
+        async def create(model, config):
+            attempts.append(1)
+            raise ValueError("Cached content is too small")
+
+        fake = SimpleNamespace(aio=SimpleNamespace(caches=SimpleNamespace(create=create)))
+        cache = GeminiContextCache(lambda: fake, "gemini-test")
+        assert cache.lookup("short") is None
+        await asyncio.sleep(0)
+        assert cache.lookup("short") is None
+        await asyncio.sleep(0)
+        assert len(attempts) == 1
+
+    @pytest.mark.asyncio
+    async def test_gemini_request_uses_cached_content(self):
+        from voicereach.engine.llm.cloud_client import CloudLLMClient
+
+        client = CloudLLMClient()
+        messages = build_messages(ContextFrame())
+        client._gemini_cache.lookup = lambda text: "cachedContents/abc"
+        config = client._gemini_request(messages, 0.5, 100, 2.0)["config"]
+        assert config.cached_content == "cachedContents/abc"
+        assert config.system_instruction is None
+
+        client._gemini_cache.lookup = lambda text: None
+        config = client._gemini_request(messages, 0.5, 100, 2.0)["config"]
+        assert config.cached_content is None
+        assert config.system_instruction == messages[0]["content"]
+
+
+def _candidate_set(stage, texts, request_id="r", is_partial=False):
+    from voicereach.models.events import Candidate, CandidateSet
+
+    return CandidateSet(
+        candidates=[
+            Candidate(text=t, intent_axis=IntentAxis.QUESTION, confidence=c,
+                      generation_stage=stage, latency_ms=0)
+            for t, c in texts
+        ],
+        stage=stage,
+        request_id=request_id,
+        is_partial=is_partial,
+    )
+
+
+class FakeOrchestrator:
+    """Yields one Stage 1 and one Stage 2 set per call, echoing the partner's last turn."""
+
+    def __init__(self, delay_s=0.0):
+        self.calls = []
+        self.cancelled = 0
+        self._delay = delay_s
+
+    async def generate_candidates(self, context, num_candidates=4, stages=None, priority=None):
+        import asyncio
+
+        said = context.conversation_history[-1].text
+        self.calls.append((said, tuple(stages or ())))
+        try:
+            await asyncio.sleep(self._delay)
+            yield _candidate_set(GenerationStage.LOCAL_FAST, [(f"{said}?", 0.5)])
+            yield _candidate_set(GenerationStage.LOCAL_QUALITY, [(f"{said}!", 0.9), ("うん", 0.6)])
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+
+class TestSpeculativePrefetch:
+    @staticmethod
+    def _context(text):
+        return ContextFrame(conversation_history=[ConversationEntry(role="partner", text=text)])
+
+    async def _settle(self):
+        import asyncio
+
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    @pytest.mark.asyncio
+    async def test_warm_set_for_matching_final(self):
+        from voicereach.engine.llm.prefetch import SPECULATIVE_STAGES, SpeculativePrefetcher
+
+        llm = FakeOrchestrator()
+        prefetcher = SpeculativePrefetcher(llm)
+        prefetcher.update(self._context("今日は天気が"), "今日は天気が")
+        prefetcher.update(self._context("今日は天気がいいね"), "今日は天気がいいね")
+        await self._settle()
+
+        warm = prefetcher.take("今日は天気がいいね。")
+        assert [c for _, c in llm.calls] == [SPECULATIVE_STAGES, SPECULATIVE_STAGES]
+        assert warm.stage == GenerationStage.LOCAL_QUALITY
+        texts = [c.text for c in warm.candidates]
+        assert texts[0] == "今日は天気がいいね!"  # exact-match run ranks first
+        assert texts.count("うん") == 1  # deduplicated across runs
+        assert prefetcher.stats.hits == 1
+        assert prefetcher.active_runs == 0
+
+    @pytest.mark.asyncio
+    async def test_small_growth_is_deduplicated(self):
+        from voicereach.engine.llm.prefetch import SpeculativePrefetcher
+
+        llm = FakeOrchestrator()
+        prefetcher = SpeculativePrefetcher(llm, min_growth_chars=3)
+        prefetcher.update(self._context("こん"), "こん")  # below min_chars
+        prefetcher.update(self._context("こんにちは"), "こんにちは")
+        prefetcher.update(self._context("こんにちは、"), "こんにちは、")
+        prefetcher.update(self._context("こんにちは元気"), "こんにちは元気")
+        await self._settle()
+        assert [said for said, _ in llm.calls] == ["こんにちは"]
+        assert prefetcher.stats.partials_deduplicated == 2
+
+    @pytest.mark.asyncio
+    async def test_revised_transcript_cancels_stale_run(self):
+        from voicereach.engine.llm.prefetch import SpeculativePrefetcher
+
+        llm = FakeOrchestrator(delay_s=1.0)
+        prefetcher = SpeculativePrefetcher(llm)
+        prefetcher.update(self._context("明日は雨だ"), "明日は雨だ")
+        await self._settle()
+        prefetcher.update(self._context("今日は晴れだ"), "今日は晴れだ")
+        await self._settle()
+        assert llm.cancelled == 1
+        assert prefetcher.active_runs == 1
+        assert prefetcher.take("全然違う話") is None
+        await self._settle()
+        assert llm.cancelled == 2
+        assert prefetcher.stats.misses == 1
+
+
+class TestCandidateCache:
+    @staticmethod
+    def _context(*said, location="自宅リビング"):
+        return ContextFrame(
+            environment=EnvironmentContext(location=location, time_of_day="夕方"),
+            conversation_history=[ConversationEntry(role="partner", text=t) for t in said],
+        )
+
+    def test_exact_and_similar_hits(self):
+        from voicereach.engine.llm.candidate_cache import CandidateCache
+
+        cache = CandidateCache()
+        cache.store(
+            self._context("お昼ごはんは何がいい？"),
+            _candidate_set(GenerationStage.CLOUD, [("うどん", 0.9), ("まだいい", 0.5)]),
+        )
+
+        exact = cache.lookup(self._context("お昼ごはんは 何がいい?"), "req")
+        assert exact.stage == GenerationStage.INSTANT
+        assert exact.request_id == "req"
+        assert [c.text for c in exact.candidates] == ["うどん", "まだいい"]
+        assert exact.candidates[0].confidence == pytest.approx(0.9)
+        assert all(c.generation_stage == GenerationStage.INSTANT for c in exact.candidates)
+
+        similar = cache.lookup(self._context("お昼ごはんは何がいいかな？"))
+        assert similar is not None
+        assert similar.candidates[0].confidence < 0.9  # scaled by similarity
+        assert cache.lookup(self._context("薬の時間だよ")) is None
+        assert cache.lookup(self._context("お昼ごはんは何がいい？", location="病院")) is None
+        assert cache.stats.exact_hits == 1
+        assert cache.stats.similar_hits == 1
+        assert cache.stats.hit_ratio == pytest.approx(0.5)
+
+    def test_ttl_and_lru_eviction(self, monkeypatch):
+        import time
+
+        from voicereach.engine.llm.candidate_cache import CandidateCache
+
+        cache = CandidateCache(capacity=2, ttl_s=100)
+        answer = _candidate_set(GenerationStage.CLOUD, [("はい", 0.8)])
+        cache.store(self._context("おはよう"), answer)
+        cache.store(self._context("寒くない？"), answer)
+        assert cache.lookup(self._context("おはよう")) is not None  # now most recent
+        cache.store(self._context("テレビ消す？"), answer)
+        assert len(cache) == 2
+        assert cache.lookup(self._context("寒くない？")) is None
+        assert cache.stats.evictions == 1
+
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 101)
+        assert cache.lookup(self._context("おはよう")) is None
+        assert len(cache) == 1
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        from voicereach.engine.llm.candidate_cache import CandidateCache
+
+        path = tmp_path / "patient.json"
+        cache = CandidateCache(path)
+        stored = _candidate_set(GenerationStage.CLOUD, [("はい", 0.8)])
+        cache.store(self._context("おはよう"), stored)
+        cache.save()
+
+        restored = CandidateCache(path)
+        assert restored.load() == 1
+        hit = restored.lookup(self._context("おはよう"))
+        assert [c.text for c in hit.candidates] == ["はい"]
+
+    def test_per_patient_files_under_cache_dir(self):
+        from voicereach.config import settings
+        from voicereach.engine.llm.candidate_cache import CandidateCache
+
+        expected = settings.cache_dir / "candidates" / "p1.json"
+        assert CandidateCache.for_patient("p1").path == expected
+        assert CandidateCache().load() == 0  # memory only
+
+
+class TestTemplateCandidates:
+    TEMPLATES = ["お水が飲みたい", "ありがとう", "少し休みたい", "今日は調子がいい？"]
+
+    @staticmethod
+    def _context(said, templates=TEMPLATES):
+        return ContextFrame(
+            template_sentences=list(templates),
+            conversation_history=[ConversationEntry(role="partner", text=said)],
+        )
+
+    def test_ranks_templates_by_overlap_with_partner(self):
+        from voicereach.engine.llm.templates import TemplateCandidateGenerator
+
+        generator = TemplateCandidateGenerator()
+        result = generator.generate(self._context("お水飲む？"), 2, "req")
+        assert result.stage == GenerationStage.INSTANT
+        assert result.request_id == "req"
+        assert result.candidates[0].text == "お水が飲みたい"
+        assert result.candidates[0].confidence == pytest.approx(0.5)
+        assert result.candidates[1].confidence < 0.5
+        assert len(result.candidates) == 2
+
+        question = generator.generate(self._context("今日の調子はどう"), 1)
+        assert question.candidates[0].intent_axis == IntentAxis.QUESTION
+
+    def test_frequent_selections_are_preferred(self):
+        from voicereach.engine.llm.templates import TemplateCandidateGenerator
+
+        generator = TemplateCandidateGenerator()
+        for _ in range(3):
+            generator.record_selection("テレビつけて")
+        result = generator.generate(self._context("えっと", templates=[]), 4)
+        assert [c.text for c in result.candidates] == ["テレビつけて"]
+
+        # No overlap with anything: selection counts decide
+        result = generator.generate(self._context("えっと"), 4)
+        assert result.candidates[0].text == "テレビつけて"
+
+    def test_templates_are_replaced_and_utterances_bounded(self):
+        from voicereach.engine.llm.templates import TemplateCandidateGenerator
+
+        generator = TemplateCandidateGenerator(max_utterances=2)
+        generator.set_templates(["はい", "いいえ"])
+        generator.record_selection("はい")
+        generator.set_templates(["お願いします"])
+        assert len(generator) == 2  # "はい" stays as a selected utterance
+        generator.record_selection("眠い")
+        generator.record_selection("眠い")
+        generator.record_selection("暑い")
+        assert "はい" not in [d.text for _, d in generator.rank("", 10)]
+        assert generator.generate(ContextFrame(), 4) is not None  # no partner turn yet
+
+    def test_selection_counts_round_trip(self, tmp_path):
+        from voicereach.engine.llm.templates import TemplateCandidateGenerator
+
+        path = tmp_path / "templates.json"
+        generator = TemplateCandidateGenerator(path)
+        generator.record_selection("ありがとう")
+        generator.save()
+
+        restored = TemplateCandidateGenerator(path)
+        assert restored.load() == 1
+        assert restored.generate(ContextFrame(), 4).candidates[0].text == "ありがとう"
+
+
+class TestLocalInferenceScheduler:
+    @staticmethod
+    async def _hold(scheduler, model, priority, release, log, timeout_s=None):
+        async with scheduler.slot(model, priority, timeout_s):
+            log.append(priority.name)
+            await release.wait()
+
+    @pytest.mark.asyncio
+    async def test_waiting_requests_run_by_priority(self):
+        import asyncio
+
+        from voicereach.engine.llm.scheduler import LocalInferenceScheduler, Priority
+
+        scheduler = LocalInferenceScheduler(max_concurrency=1)
+        release = asyncio.Event()
+        log = []
+        tasks = [asyncio.create_task(self._hold(scheduler, "m", p, release, log))
+                 for p in (Priority.QUALITY, Priority.QUALITY, Priority.INTERACTIVE)]
+        other_model = asyncio.create_task(
+            self._hold(scheduler, "other", Priority.QUALITY, release, log)
+        )
+        await asyncio.sleep(0)
+        assert scheduler.running == 2  # one per model
+        assert scheduler.waiting == 2
+        release.set()
+        await asyncio.gather(*tasks, other_model)
+        assert log == ["QUALITY", "QUALITY", "INTERACTIVE", "QUALITY"]
+        assert scheduler.stats[Priority.QUALITY].admitted == 3
+        assert scheduler.stats[Priority.INTERACTIVE].queue_wait.percentile(50) >= 0
+
+    @pytest.mark.asyncio
+    async def test_admission_control(self):
+        import asyncio
+
+        from voicereach.engine.llm.scheduler import (
+            AdmissionRejectedError,
+            LocalInferenceScheduler,
+            Priority,
+        )
+
+        scheduler = LocalInferenceScheduler(
+            max_concurrency=1, queue_limits={Priority.SPECULATIVE: 1}
+        )
+        release = asyncio.Event()
+        log = []
+        holder = asyncio.create_task(self._hold(scheduler, "m", Priority.QUALITY, release, log))
+        queued = asyncio.create_task(self._hold(scheduler, "m", Priority.SPECULATIVE, release, log))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejectedError, match="queue full"):
+            await self._hold(scheduler, "m", Priority.SPECULATIVE, release, log)
+        with pytest.raises(AdmissionRejectedError, match="expired"):
+            await self._hold(scheduler, "m", Priority.INTERACTIVE, release, log, timeout_s=0.01)
+        assert scheduler.waiting == 1
+
+        release.set()
+        await asyncio.gather(holder, queued)
+        assert log == ["QUALITY", "SPECULATIVE"]
+        assert scheduler.stats[Priority.SPECULATIVE].rejected == 1
+        assert scheduler.stats[Priority.INTERACTIVE].rejected == 1
+        assert scheduler.running == 0
+
+    @pytest.mark.asyncio
+    async def test_urgent_request_preempts_speculative_work(self):
+        import asyncio
+
+        from voicereach.engine.llm.scheduler import (
+            LocalInferenceScheduler,
+            PreemptedError,
+            Priority,
+        )
+
+        scheduler = LocalInferenceScheduler(max_concurrency=1)
+        release = asyncio.Event()
+        log = []
+        speculative = asyncio.create_task(
+            self._hold(scheduler, "m", Priority.SPECULATIVE, asyncio.Event(), log)
+        )
+        await asyncio.sleep(0)
+        urgent = asyncio.create_task(self._hold(scheduler, "m", Priority.INTERACTIVE, release, log))
+        await asyncio.sleep(0.01)
+
+        assert log == ["SPECULATIVE", "INTERACTIVE"]
+        with pytest.raises(PreemptedError):
+            await speculative
+        release.set()
+        await urgent
+        assert scheduler.stats[Priority.SPECULATIVE].preempted == 1
+        assert len(scheduler.stats[Priority.SPECULATIVE].service) == 1
+
+    @pytest.mark.asyncio
+    async def test_preempted_stream_ends_quietly(self):
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock
+
+        from voicereach.engine.llm.local_client import LocalLLMClient
+        from voicereach.engine.llm.scheduler import Priority
+
+        class SlowStream:
+            closed = False
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                await asyncio.sleep(10)
+
+            async def close(self):
+                self.closed = True
+
+        stream = SlowStream()
+        client = LocalLLMClient()
+        client._client.chat.completions.create = AsyncMock(return_value=stream)
+
+        async def consume():
+            return [d async for d in client.generate_stream(
+                "m", [], timeout_s=5, priority=Priority.SPECULATIVE
+            )]
+
+        speculative = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+        response = MagicMock()
+        response.choices[0].message.content = "はい"
+        client._client.chat.completions.create = AsyncMock(return_value=response)
+        assert await client.generate("m", [], priority=Priority.INTERACTIVE) == "はい"
+        assert await speculative == []
+        assert stream.closed
@@ -0,0 +1,412 @@
+"""Tests for the MediaPipeTracker module.
+
+MediaPipe itself is replaced with a fake FaceMesh that returns a fixed
+landmark set, so these tests cover our own per-frame processing:
+  - Landmark conversion to pixel coordinates
+  - Eye patch extraction and the reusable buffer pool
+  - FaceData.copy() detaching from pooled buffers
+  - Head pose: Euler conversion, warm start and every-N-frames mode
+  - ROI tracking: cropping to the previous face and mapping back
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from voicereach.engine.gaze.mediapipe_tracker import (
+    HEAD_POSE_INDICES,
+    LEFT_EYE_INDICES,
+    MODEL_POINTS,
+    RIGHT_EYE_INDICES,
+    MediaPipeTracker,
+    rotation_to_euler,
+    wrap_degrees,
+)
+
+FRAME_W, FRAME_H = 640, 480
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_normalized_landmarks(num: int = 478) -> np.ndarray:
+    """Plausible normalised landmarks: face in the centre, eyes 100 px apart."""
+    rng = np.random.default_rng(0)
+    pts = np.empty((num, 3), dtype=np.float32)
+    pts[:, 0] = rng.uniform(0.35, 0.65, num)
+    pts[:, 1] = rng.uniform(0.3, 0.8, num)
+    pts[:, 2] = rng.uniform(-0.05, 0.05, num)
+
+    for indices, cx in ((LEFT_EYE_INDICES, 270.0), (RIGHT_EYE_INDICES, 370.0)):
+        for k, idx in enumerate(indices):
+            # First two indices are the eye corners (30 px apart)
+            dx = (-15.0, 15.0)[k] if k < 2 else rng.uniform(-8, 8)
+            dy = 0.0 if k < 2 else rng.uniform(-4, 4)
+            pts[idx, 0] = (cx + dx) / FRAME_W
+            pts[idx, 1] = (200.0 + dy) / FRAME_H
+    return pts
+
+
+class FakeFaceMesh:
+    """Stand-in for mp.solutions.face_mesh.FaceMesh."""
+
+    def __init__(self, normalized: np.ndarray | None) -> None:
+        self.normalized = normalized
+        self.inputs: list[np.ndarray] = []
+
+    def process(self, rgb: np.ndarray):
+        self.inputs.append(rgb)
+        if self.normalized is None:
+            return SimpleNamespace(multi_face_landmarks=None)
+        landmark = [
+            SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in self.normalized
+        ]
+        return SimpleNamespace(multi_face_landmarks=[SimpleNamespace(landmark=landmark)])
+
+    def close(self) -> None:
+        pass
+
+
+class CropAwareFaceMesh:
+    """Fake FaceMesh with a face fixed in frame pixels.
+
+    Landmarks are returned normalised to whatever region the tracker is
+    currently searching (its ROI, or the full frame), like the real model.
+    """
+
+    def __init__(self, tracker: MediaPipeTracker, pixels: np.ndarray | None) -> None:
+        self.tracker = tracker
+        self.pixels = pixels
+        self.inputs: list[np.ndarray] = []
+
+    def process(self, rgb: np.ndarray):
+        self.inputs.append(rgb)
+        if self.pixels is None:
+            return SimpleNamespace(multi_face_landmarks=None)
+        x1, y1, x2, y2 = self.tracker.roi or (0, 0, FRAME_W, FRAME_H)
+        pts = self.pixels.astype(np.float64)
+        norm = np.column_stack([
+            (pts[:, 0] - x1) / (x2 - x1), (pts[:, 1] - y1) / (y2 - y1), pts[:, 2] / (x2 - x1)
+        ])
+        # Faces outside the searched region are not detected
+        face = norm[:468]
+        if face[:, :2].min() < 0 or face[:, :2].max() > 1:
+            return SimpleNamespace(multi_face_landmarks=None)
+        landmark = [SimpleNamespace(x=x, y=y, z=z) for x, y, z in norm]
+        return SimpleNamespace(multi_face_landmarks=[SimpleNamespace(landmark=landmark)])
+
+    def close(self) -> None:
+        pass
+
+
+def make_roi_tracker(pixels: np.ndarray | None, **kwargs) -> MediaPipeTracker:
+    tracker = MediaPipeTracker(roi_tracking=True, **kwargs)
+    tracker._face_mesh = tracker._roi_mesh = CropAwareFaceMesh(tracker, pixels)
+    return tracker
+
+
+def face_pixels() -> np.ndarray:
+    return make_normalized_landmarks() * np.array([FRAME_W, FRAME_H, FRAME_W], dtype=np.float32)
+
+
+def make_tracker(normalized: np.ndarray | None, **kwargs) -> MediaPipeTracker:
+    tracker = MediaPipeTracker(**kwargs)
+    tracker._face_mesh = FakeFaceMesh(normalized)
+    return tracker
+
+
+def make_frame(seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (FRAME_H, FRAME_W, 3), dtype=np.uint8)
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestProcessFrame:
+    def test_requires_initialize(self):
+        with pytest.raises(RuntimeError):
+            MediaPipeTracker().process_frame(make_frame())
+
+    def test_no_face_returns_none(self):
+        tracker = make_tracker(None)
+        assert tracker.process_frame(make_frame()) is None
+
+    def test_landmarks_scaled_to_pixels(self):
+        norm = make_normalized_landmarks()
+        tracker = make_tracker(norm)
+        fd = tracker.process_frame(make_frame())
+        expected = norm * np.array([FRAME_W, FRAME_H, FRAME_W], dtype=np.float32)
+        np.testing.assert_allclose(fd.landmarks, expected, rtol=1e-6)
+        assert fd.landmarks.dtype == np.float32
+
+    def test_rgb_passed_to_mediapipe(self):
+        tracker = make_tracker(make_normalized_landmarks())
+        frame = make_frame()
+        tracker.process_frame(frame)
+        rgb = tracker._face_mesh.inputs[-1]
+        np.testing.assert_array_equal(rgb, frame[..., ::-1])
+
+    def test_eye_patches_shape_and_range(self):
+        tracker = make_tracker(make_normalized_landmarks())
+        fd = tracker.process_frame(make_frame())
+        for patch in (fd.left_eye_patch, fd.right_eye_patch):
+            assert patch.shape == (64, 64)
+            assert patch.dtype == np.float32
+            assert patch.min() >= 0.0 and patch.max() <= 1.0
+
+    def test_pooled_patch_matches_unpooled(self):
+        norm = make_normalized_landmarks()
+        frame = make_frame()
+        pooled = make_tracker(norm, reuse_buffers=True).process_frame(frame)
+        fresh = make_tracker(norm).process_frame(frame)
+        np.testing.assert_allclose(pooled.landmarks, fresh.landmarks)
+        # Resize/grayscale order differs, so allow rounding differences
+        assert np.abs(pooled.left_eye_patch - fresh.left_eye_patch).mean() < 0.02
+        assert np.abs(pooled.right_eye_patch - fresh.right_eye_patch).mean() < 0.02
+
+
+class TestBufferPool:
+    def test_buffers_reused_across_frames(self):
+        tracker = make_tracker(make_normalized_landmarks(), reuse_buffers=True)
+        first = tracker.process_frame(make_frame(1))
+        rgb_first = tracker._face_mesh.inputs[-1]
+        second = tracker.process_frame(make_frame(2))
+        assert second.landmarks is first.landmarks
+        assert second.left_eye_patch is first.left_eye_patch
+        assert second.right_eye_patch is first.right_eye_patch
+        assert tracker._face_mesh.inputs[-1] is rgb_first
+
+    def test_left_and_right_patches_are_distinct(self):
+        tracker = make_tracker(make_normalized_landmarks(), reuse_buffers=True)
+        fd = tracker.process_frame(make_frame())
+        assert not np.shares_memory(fd.left_eye_patch, fd.right_eye_patch)
+
+    def test_pool_resizes_on_frame_size_change(self):
+        tracker = make_tracker(make_normalized_landmarks(), reuse_buffers=True)
+        tracker.process_frame(make_frame())
+        small = np.zeros((240, 320, 3), dtype=np.uint8)
+        fd = tracker.process_frame(small)
+        assert tracker._face_mesh.inputs[-1].shape == small.shape
+        assert fd.landmarks[:, 0].max() <= 320
+
+    def test_copy_detaches_from_pool(self):
+        tracker = make_tracker(make_normalized_landmarks(), reuse_buffers=True)
+        kept = tracker.process_frame(make_frame(1)).copy()
+        snapshot = kept.left_eye_patch.copy()
+        latest = tracker.process_frame(make_frame(2))
+        assert not np.shares_memory(kept.landmarks, latest.landmarks)
+        np.testing.assert_array_equal(kept.left_eye_patch, snapshot)
+
+    def test_default_allocates_fresh_arrays(self):
+        tracker = make_tracker(make_normalized_landmarks())
+        first = tracker.process_frame(make_frame(1))
+        second = tracker.process_frame(make_frame(2))
+        assert not np.shares_memory(first.landmarks, second.landmarks)
+        assert not np.shares_memory(first.left_eye_patch, second.left_eye_patch)
+
+
+def _posed_landmarks(rvec, tvec=(0.0, 0.0, 1500.0)) -> np.ndarray:
+    """Landmarks whose head-pose points are an exact projection of MODEL_POINTS."""
+    camera = np.array(
+        [[FRAME_W, 0, FRAME_W / 2], [0, FRAME_W, FRAME_H / 2], [0, 0, 1]], dtype=np.float64
+    )
+    projected, _ = cv2.projectPoints(
+        MODEL_POINTS, np.array(rvec, dtype=np.float64), np.array(tvec, dtype=np.float64),
+        camera, np.zeros((4, 1)),
+    )
+    landmarks = np.zeros((478, 3), dtype=np.float32)
+    landmarks[HEAD_POSE_INDICES, :2] = projected.reshape(-1, 2)
+    return landmarks
+
+
+class TestHeadPose:
+    def test_rotation_to_euler_matches_rq_decomposition(self):
+        rng = np.random.default_rng(3)
+        for _ in range(200):
+            rotation, _ = cv2.Rodrigues(rng.normal(0, 0.7, 3))
+            expected = cv2.RQDecomp3x3(rotation)[0]
+            np.testing.assert_allclose(rotation_to_euler(rotation), expected, atol=1e-4)
+
+    def test_recovers_known_pose(self):
+        rvec = (np.pi + 0.15, 0.25, 0.05)
+        tracker = MediaPipeTracker()
+        pose = tracker._estimate_head_pose(_posed_landmarks(rvec), FRAME_W, FRAME_H)
+        expected = rotation_to_euler(cv2.Rodrigues(np.array(rvec))[0])
+        np.testing.assert_allclose(pose, expected, atol=0.5)
+
+    def test_warm_start_reuses_previous_solution(self):
+        tracker = MediaPipeTracker()
+        tracker._estimate_head_pose(_posed_landmarks((np.pi + 0.1, 0.2, 0.0)), FRAME_W, FRAME_H)
+        assert tracker._rvec is not None
+        camera = tracker._camera_matrix_for(FRAME_W, FRAME_H)
+        assert tracker._camera_matrix_for(FRAME_W, FRAME_H) is camera
+
+        rvec = (np.pi + 0.12, 0.22, 0.0)
+        pose = tracker._estimate_head_pose(_posed_landmarks(rvec), FRAME_W, FRAME_H)
+        expected = rotation_to_euler(cv2.Rodrigues(np.array(rvec))[0])
+        np.testing.assert_allclose(pose, expected, atol=0.5)
+
+    def test_frame_size_change_resets_warm_start(self):
+        tracker = MediaPipeTracker()
+        tracker._estimate_head_pose(_posed_landmarks((np.pi + 0.1, 0.2, 0.0)), FRAME_W, FRAME_H)
+        tracker._camera_matrix_for(320, 240)
+        assert tracker._rvec is None
+
+    def test_interval_extrapolates_between_solves(self):
+        tracker = MediaPipeTracker(head_pose_interval=3)
+        rvecs = [(np.pi + 0.1 + 0.02 * i, 0.2, 0.0) for i in range(7)]
+        poses = [
+            tracker._estimate_head_pose(_posed_landmarks(r), FRAME_W, FRAME_H) for r in rvecs
+        ]
+        truth = [rotation_to_euler(cv2.Rodrigues(np.array(r))[0]) for r in rvecs]
+        # Frames 0, 3 and 6 are solved; 4 and 5 are extrapolated from 0 -> 3
+        np.testing.assert_allclose(poses[3], truth[3], atol=0.5)
+        np.testing.assert_allclose(poses[4], truth[4], atol=0.5)
+        np.testing.assert_allclose(poses[5], truth[5], atol=0.5)
+        np.testing.assert_allclose(poses[6], truth[6], atol=0.5)
+        # Frames 1 and 2 have no velocity yet and hold the first pose
+        np.testing.assert_allclose(poses[1], poses[0])
+
+    def test_extrapolation_across_the_180_degree_pitch_wrap(self):
+        tracker = MediaPipeTracker(head_pose_interval=3)
+        rvecs = [(np.pi - 0.03 + 0.01 * i, 0.2, 0.0) for i in range(7)]
+        poses = [
+            tracker._estimate_head_pose(_posed_landmarks(r), FRAME_W, FRAME_H) for r in rvecs
+        ]
+        truth = [rotation_to_euler(cv2.Rodrigues(np.array(r))[0]) for r in rvecs]
+        assert np.sign(truth[0][0]) != np.sign(truth[6][0])  # pitch crosses +-180
+        for pose, expected in zip(poses[3:], truth[3:], strict=True):
+            assert np.all(np.abs(wrap_degrees(pose - expected)) < 0.5)
+            assert np.all((pose > -180.0) & (pose <= 180.0))
+
+    def test_interval_zero_disables_head_pose(self):
+        tracker = make_tracker(make_normalized_landmarks(), head_pose_interval=0)
+        fd = tracker.process_frame(make_frame())
+        assert not fd.head_pose.any()
+
+    def test_lost_face_resets_pose_state(self):
+        tracker = make_tracker(make_normalized_landmarks())
+        tracker.process_frame(make_frame())
+        tracker._face_mesh.normalized = None
+        assert tracker.process_frame(make_frame()) is None
+        assert tracker._rvec is None
+        assert tracker._last_pose is None
+
+
+class TestRoiTracking:
+    def test_disabled_by_default(self):
+        tracker = make_tracker(make_normalized_landmarks())
+        tracker.process_frame(make_frame())
+        assert tracker.roi is None
+
+    def test_second_frame_uses_crop(self):
+        tracker = make_roi_tracker(face_pixels())
+        tracker.process_frame(make_frame())
+        roi = tracker.roi
+        assert roi is not None
+        tracker.process_frame(make_frame())
+        x1, y1, x2, y2 = roi
+        assert tracker._face_mesh.inputs[-1].shape == (y2 - y1, x2 - x1, 3)
+
+    def test_crop_contents_are_rgb_of_roi(self):
+        tracker = make_roi_tracker(face_pixels())
+        frame = make_frame()
+        tracker.process_frame(frame)
+        x1, y1, x2, y2 = tracker.roi
+        tracker.process_frame(frame)
+        np.testing.assert_array_equal(tracker._face_mesh.inputs[-1], frame[y1:y2, x1:x2, ::-1])
+
+    def test_landmarks_mapped_back_to_frame(self):
+        pixels = face_pixels()
+        tracker = make_roi_tracker(pixels)
+        full = tracker.process_frame(make_frame()).copy()
+        cropped = tracker.process_frame(make_frame())
+        np.testing.assert_allclose(cropped.landmarks, pixels, atol=1e-3)
+        np.testing.assert_allclose(cropped.landmarks, full.landmarks, atol=1e-3)
+        assert cropped.face_bbox == full.face_bbox
+        np.testing.assert_allclose(cropped.left_eye_patch, full.left_eye_patch)
+
+    def test_downsampled_crop(self):
+        pixels = face_pixels()
+        tracker = make_roi_tracker(pixels, roi_max_size=96)
+        tracker.process_frame(make_frame())
+        fd = tracker.process_frame(make_frame())
+        assert max(tracker._face_mesh.inputs[-1].shape[:2]) == 96
+        np.testing.assert_allclose(fd.landmarks, pixels, atol=1e-3)
+
+    def test_lost_in_crop_falls_back_to_full_frame(self):
+        pixels = face_pixels()
+        tracker = make_roi_tracker(pixels)
+        tracker.process_frame(make_frame())
+        # Face jumps outside the crop
+        moved = pixels.copy()
+        moved[:, 0] -= 180
+        tracker._face_mesh.pixels = moved
+        fd = tracker.process_frame(make_frame())
+        assert fd is not None
+        np.testing.assert_allclose(fd.landmarks, moved, atol=1e-3)
+        # Crop was tried first, then the full frame
+        assert tracker._face_mesh.inputs[-2].shape != (FRAME_H, FRAME_W, 3)
+        assert tracker._face_mesh.inputs[-1].shape == (FRAME_H, FRAME_W, 3)
+        assert tracker.roi is not None
+
+    def test_crops_use_static_graph_and_full_frames_video_graph(self):
+        pixels = face_pixels()
+        tracker = make_roi_tracker(pixels)
+        tracker._roi_mesh = CropAwareFaceMesh(tracker, pixels)
+        for _ in range(3):
+            tracker.process_frame(make_frame())
+        moved = pixels.copy()
+        moved[:, 0] -= 180
+        tracker._face_mesh.pixels = tracker._roi_mesh.pixels = moved
+        tracker.process_frame(make_frame())  # lost in the crop, found at full size
+
+        assert len(tracker._roi_mesh.inputs) == 3
+        assert all(i.shape != (FRAME_H, FRAME_W, 3) for i in tracker._roi_mesh.inputs)
+        assert len(tracker._face_mesh.inputs) == 2
+        assert all(i.shape == (FRAME_H, FRAME_W, 3) for i in tracker._face_mesh.inputs)
+
+    def test_from_settings(self, monkeypatch):
+        from voicereach.config import settings
+
+        monkeypatch.setattr(settings, "face_roi_tracking", True)
+        monkeypatch.setattr(settings, "face_roi_max_size", 128)
+        tracker = MediaPipeTracker.from_settings(reuse_buffers=True)
+        assert tracker._roi_tracking and tracker._roi_max_size == 128
+        assert tracker._reuse_buffers
+
+    def test_face_lost_clears_roi(self):
+        tracker = make_roi_tracker(face_pixels())
+        tracker.process_frame(make_frame())
+        tracker._face_mesh.pixels = None
+        assert tracker.process_frame(make_frame()) is None
+        assert tracker.roi is None
+
+    def test_frame_size_change_clears_roi(self):
+        tracker = make_roi_tracker(face_pixels())
+        tracker.process_frame(make_frame())
+        big = np.zeros((FRAME_H * 2, FRAME_W * 2, 3), dtype=np.uint8)
+        tracker.process_frame(big)
+        assert tracker._face_mesh.inputs[-1].shape == big.shape
+
+    def test_roi_buffers_reused(self):
+        tracker = make_roi_tracker(face_pixels(), reuse_buffers=True)
+        tracker.process_frame(make_frame(1))
+        tracker.process_frame(make_frame(2))
+        first = tracker._face_mesh.inputs[-1]
+        tracker.process_frame(make_frame(3))
+        assert tracker._face_mesh.inputs[-1] is first
+
+    def test_no_reuse_mode(self):
+        pixels = face_pixels()
+        tracker = make_roi_tracker(pixels, roi_max_size=96)
+        tracker.process_frame(make_frame())
+        fd = tracker.process_frame(make_frame())
+        np.testing.assert_allclose(fd.landmarks, pixels, atol=1e-3)
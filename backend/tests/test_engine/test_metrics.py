@@ -0,0 +1,32 @@
+"""Tests for the shared latency metrics."""
+
+from voicereach.engine.metrics import LatencyHistogram
+
+
+class TestLatencyHistogram:
+    def test_nearest_rank_percentile(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(50) == 0.0
+        for ms in range(1, 101):
+            histogram.record(float(ms))
+        assert histogram.percentile(50) == 50.0
+        assert histogram.percentile(90) == 90.0
+        assert histogram.percentile(100) == 100.0
+
+    def test_window_keeps_most_recent_samples(self):
+        histogram = LatencyHistogram(window=10)
+        for ms in range(100):
+            histogram.record(float(ms))
+        assert len(histogram) == 10
+        assert histogram.percentile(0) == 90.0
+
+    def test_censored_samples_keep_percentile_from_drifting_low(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 81):
+            histogram.record(float(ms))
+        assert histogram.percentile(90) == 72.0
+        # Requests cancelled after 100 ms were slower than every completion
+        for _ in range(20):
+            histogram.record_censored(100.0)
+        assert histogram.percentile(90) == 100.0
+        assert histogram.percentile(50) == 50.0
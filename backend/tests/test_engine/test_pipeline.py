@@ -1,8 +1,16 @@
 """Tests for the main pipeline coordinator."""
 
+from types import SimpleNamespace
+
 import pytest
 
 from voicereach.engine.pipeline import Pipeline
+from voicereach.engine.tts.cosyvoice import (
+    PLACEHOLDER_SAMPLE_RATE,
+    CosyVoiceEngine,
+    _placeholder_tone,
+)
+from voicereach.engine.tts.streaming import split_audio
 
 
 class TestPipeline:
@@ -29,3 +37,237 @@ class TestPipeline:
         pipeline.add_partner_utterance("こんにちは")
         assert len(pipeline._context.conversation_history) == 1
         assert pipeline._context.conversation_history[0].text == "こんにちは"
+
+    @pytest.mark.asyncio
+    async def test_track_camera_skips_frames_without_face(self):
+        from voicereach.engine.gaze.zone_mapper import ZoneResult
+
+        class FakeCamera:
+            async def frames(self):
+                for seq in range(4):
+                    yield SimpleNamespace(image=seq)
+
+        class FakeTracker:
+            def process_frame(self, image):
+                return None if image % 2 else SimpleNamespace(seq=image, landmarks=None)
+
+        pipeline = Pipeline()
+        pipeline.process_face_data = lambda fd: ZoneResult(fd.seq, 1.0, 0.5, 0.5)
+        zones = [z.zone_id async for z in pipeline.track_camera(FakeCamera(), FakeTracker())]
+        assert zones == [0, 2]
+
+    @pytest.mark.asyncio
+    async def test_track_camera_builds_tracker_from_settings(self, monkeypatch):
+        from voicereach.engine.gaze.mediapipe_tracker import MediaPipeTracker
+        from voicereach.engine.gaze.zone_mapper import ZoneResult
+
+        class FakeCamera:
+            async def frames(self):
+                yield SimpleNamespace(image=0)
+
+        class FakeTracker:
+            closed = False
+
+            def initialize(self):
+                pass
+
+            def process_frame(self, image):
+                return SimpleNamespace(seq=image, landmarks=None)
+
+            def close(self):
+                self.closed = True
+
+        built, tracker = [], FakeTracker()
+        monkeypatch.setattr(
+            MediaPipeTracker, "from_settings",
+            classmethod(lambda cls, **kw: built.append(kw) or tracker),
+        )
+        pipeline = Pipeline()
+        pipeline.process_face_data = lambda fd: ZoneResult(fd.seq, 1.0, 0.5, 0.5)
+        assert [z.zone_id async for z in pipeline.track_camera(FakeCamera())] == [0]
+        assert built == [{"reuse_buffers": True}]
+        assert tracker.closed
+
+    def test_unknown_gaze_execution_mode(self):
+        with pytest.raises(ValueError):
+            Pipeline(gaze_execution="gpu")
+
+    @pytest.mark.asyncio
+    async def test_process_execution_mode_owns_worker(self):
+        pipeline = Pipeline(gaze_execution="process")
+        await pipeline.initialize()
+        assert pipeline._gaze_worker.running
+        await pipeline.shutdown()
+        assert not pipeline._gaze_worker.running
+
+    def test_unknown_tts_execution_mode(self):
+        with pytest.raises(ValueError):
+            Pipeline(tts_execution="gpu")
+
+    @pytest.mark.asyncio
+    async def test_process_tts_execution_synthesizes_in_worker(self):
+        pipeline = Pipeline(tts_execution="process")
+        await pipeline.initialize()
+        worker = pipeline._tts_worker
+        assert pipeline.tts_health()["running"]
+        assert await pipeline._tts_router.synthesize("はい") is not None
+        assert worker.stats.completed == 1
+        await pipeline.shutdown()
+        assert not worker.running
+
+
+class TestPipelinePrefetch:
+    @pytest.mark.asyncio
+    async def test_final_utterance_publishes_warm_set_first(self):
+        import asyncio
+
+        from voicereach.models.events import Candidate, CandidateSet, GenerationStage, IntentAxis
+
+        def make(stage, text, is_partial=False):
+            return CandidateSet(
+                candidates=[Candidate(text=text, intent_axis=IntentAxis.QUESTION, confidence=0.8,
+                                      generation_stage=stage, latency_ms=0)],
+                stage=stage, request_id=text, is_partial=is_partial,
+            )
+
+        async def generate(context, num_candidates=4, stages=None, priority=None, request_id=None):
+            if stages is not None:  # speculative run
+                yield make(GenerationStage.LOCAL_QUALITY, "warm")
+                return
+            yield make(GenerationStage.LOCAL_FAST, "stage1")
+            yield make(GenerationStage.LOCAL_QUALITY, "stage2-partial", is_partial=True)
+            yield make(GenerationStage.CLOUD, "cloud")
+
+        pipeline = Pipeline()
+        pipeline._llm.generate_candidates = generate
+        sent = []
+
+        async def capture(msg):
+            sent.append(msg.candidate_set.candidates[0].text)
+
+        pipeline.set_message_callback(capture)
+        pipeline.add_partner_partial("お元気ですか")
+        await asyncio.sleep(0.01)
+        pipeline.add_partner_utterance("お元気ですか？")
+        await asyncio.sleep(0.01)
+        assert sent == ["warm", "cloud"]
+        assert len(pipeline._context.conversation_history) == 1
+
+
+class TestPipelineStage0Persistence:
+    @pytest.mark.asyncio
+    async def test_selection_is_saved_without_shutdown(self, monkeypatch):
+        import asyncio
+        from unittest.mock import AsyncMock
+
+        from voicereach.config import settings
+        from voicereach.models.events import Candidate, CandidateSet, GenerationStage, IntentAxis
+
+        monkeypatch.setattr(settings, "stage0_save_delay_s", 0.05)
+        monkeypatch.setattr(settings, "tts_streaming", False)
+        pipeline = Pipeline()
+        pipeline._tts_router.synthesize = AsyncMock(return_value=None)
+        pipeline._current_candidates = CandidateSet(
+            candidates=[Candidate(text=text, intent_axis=IntentAxis.QUESTION, confidence=0.9,
+                                  generation_stage=GenerationStage.CLOUD, latency_ms=0)
+                        for text in ("はい", "いいえ")],
+            stage=GenerationStage.CLOUD, request_id="req",
+        )
+        await pipeline.handle_candidate_selected("req", 0)
+        await pipeline.handle_candidate_selected("req", 1)
+        saves = pipeline._stage0_save
+        assert not pipeline._templates.path.exists()
+
+        await asyncio.sleep(0.1)
+        # Both selections went out in one debounced write
+        assert saves.done() and pipeline._stage0_save is saves
+        assert pipeline._templates.path.exists()
+        restored = type(pipeline._templates)(pipeline._templates.path)
+        assert restored.load() == 2
+
+
+class TestPipelineSpeechStreaming:
+    @pytest.mark.asyncio
+    async def test_selection_streams_audio_frames(self):
+        from voicereach.engine.tts.streaming import decode_pcm_frame
+        from voicereach.models.events import Candidate, CandidateSet, GenerationStage, IntentAxis
+
+        pipeline = Pipeline()
+        await pipeline._tts_engine.initialize()
+        pipeline._tts_router.set_engine(pipeline._tts_engine)
+        pipeline._current_candidates = CandidateSet(
+            candidates=[Candidate(text="はい", intent_axis=IntentAxis.QUESTION, confidence=0.9,
+                                  generation_stage=GenerationStage.CLOUD, latency_ms=0)],
+            stage=GenerationStage.CLOUD, request_id="req",
+        )
+        messages, frames = [], []
+
+        async def on_message(msg):
+            messages.append(msg)
+
+        async def on_audio(frame):
+            frames.append(frame)
+
+        pipeline.set_message_callback(on_message)
+        pipeline.set_audio_callback(on_audio)
+        await pipeline.handle_candidate_selected("req", 0)
+
+        assert [m.type for m in messages] == ["tts_stream_start", "tts_stream_end"]
+        start, end = messages
+        assert start.text == "はい"
+        assert start.sample_rate == 24000
+        decoded = [decode_pcm_frame(f) for f in frames]
+        assert [seq for _, seq, _ in decoded] == list(range(len(frames)))
+        assert {sid for sid, _, _ in decoded} == {start.stream_id}
+        total = sum(len(samples) for *_, samples in decoded)
+        assert end.duration_ms == pytest.approx(total * 1000 / 24000, abs=1)
+
+    async def _select_streamed(self, engine, tmp_path):
+        from voicereach.engine.tts.router import TTSRouter
+        from voicereach.models.events import Candidate, CandidateSet, GenerationStage, IntentAxis
+
+        pipeline = Pipeline()
+        pipeline._tts_router = TTSRouter(cache_dir=tmp_path)
+        pipeline._tts_router.set_engine(engine)
+        pipeline._current_candidates = CandidateSet(
+            candidates=[Candidate(text="はい", intent_axis=IntentAxis.QUESTION, confidence=0.9,
+                                  generation_stage=GenerationStage.CLOUD, latency_ms=0)],
+            stage=GenerationStage.CLOUD, request_id="req",
+        )
+        messages, frames = [], []
+
+        async def on_message(msg):
+            messages.append(msg)
+
+        async def on_audio(frame):
+            frames.append(frame)
+
+        pipeline.set_message_callback(on_message)
+        pipeline.set_audio_callback(on_audio)
+        await pipeline.handle_candidate_selected("req", 0)
+        return messages, frames
+
+    @pytest.mark.asyncio
+    async def test_stream_cut_short_ends_with_error(self, tmp_path):
+        class TruncatingEngine(CosyVoiceEngine):
+            async def synthesize_stream(self, text, speaker_id="default", emotion=None,
+                                        chunk_ms=100):
+                yield next(split_audio(_placeholder_tone(text), PLACEHOLDER_SAMPLE_RATE, 50))
+                raise RuntimeError("worker died")
+
+        messages, frames = await self._select_streamed(TruncatingEngine(), tmp_path)
+        assert [m.type for m in messages] == ["tts_stream_start", "error"]
+        assert len(frames) == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_without_audio_falls_back_to_tts_ready(self, tmp_path):
+        class FailingStreamEngine(CosyVoiceEngine):
+            async def synthesize_stream(self, text, speaker_id="default", emotion=None,
+                                        chunk_ms=100):
+                raise RuntimeError("model unavailable")
+                yield
+
+        messages, frames = await self._select_streamed(FailingStreamEngine(), tmp_path)
+        assert [m.type for m in messages] == ["tts_ready"]
+        assert messages[0].text == "はい"
+        assert not frames
@@ -7,9 +7,21 @@ import numpy as np
 import pytest
 import soundfile as sf
 
+from voicereach.engine.tts.audio_cache import AudioCache
 from voicereach.engine.tts.audio_postprocess import normalize_loudness
-from voicereach.engine.tts.cosyvoice import CosyVoiceEngine
+from voicereach.engine.tts.cosyvoice import (
+    PLACEHOLDER_SAMPLE_RATE,
+    CosyVoiceEngine,
+    _placeholder_tone,
+)
 from voicereach.engine.tts.router import TTSRouter
+from voicereach.engine.tts.segments import PhraseStitcher, SegmentCache, split_phrases
+from voicereach.engine.tts.streaming import (
+    AudioChunk,
+    decode_pcm_frame,
+    encode_pcm_frame,
+    split_audio,
+)
 
 
 class TestCosyVoiceEngine:
@@ -36,10 +48,79 @@ class TestCosyVoiceEngine:
         long_data, _ = sf.read(str(long))
         assert len(long_data) > len(short_data)
 
+    @pytest.mark.asyncio
+    async def test_placeholder_stream_matches_batch_audio(self):
+        engine = CosyVoiceEngine()
+        await engine.initialize()
+        chunks = [c async for c in engine.synthesize_stream("テスト", chunk_ms=100)]
+        assert len(chunks) > 1
+        assert all(c.sample_rate == 24000 for c in chunks)
+        assert chunks[0].duration_ms == pytest.approx(100)
+        batch, _ = sf.read(str(await engine.synthesize("テスト")), dtype="float32")
+        streamed = np.concatenate([c.samples for c in chunks])
+        np.testing.assert_allclose(streamed, batch, atol=1e-4)
+
     def test_not_available_initially(self):
         engine = CosyVoiceEngine()
         assert not engine.is_available
 
+    @pytest.mark.asyncio
+    async def test_stream_failure_after_first_chunk_is_raised(self):
+        engine = CosyVoiceEngine()
+        engine._available = True
+        engine._model = _FailingModel(chunks=1)
+        stream = engine.synthesize_stream("テスト")
+        first = await stream.__anext__()
+        assert len(first.samples) == 4
+        with pytest.raises(RuntimeError, match="model crashed"):
+            await stream.__anext__()
+
+    @pytest.mark.asyncio
+    async def test_stream_failure_before_first_chunk_falls_back(self):
+        engine = CosyVoiceEngine()
+        engine._available = True
+        engine._model = _FailingModel(chunks=0)
+        chunks = [c async for c in engine.synthesize_stream("テスト", chunk_ms=100)]
+        np.testing.assert_allclose(
+            np.concatenate([c.samples for c in chunks]), _placeholder_tone("テスト")
+        )
+
+
+class _Speech:
+    """Stands in for the (1, n) torch tensor CosyVoice yields."""
+
+    def __init__(self, samples):
+        self._samples = samples
+
+    def squeeze(self, dim):
+        return self
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._samples
+
+
+class _FailingModel:
+    """A CosyVoice model whose stream crashes after ``chunks`` chunks."""
+
+    def __init__(self, chunks: int):
+        self._chunks = chunks
+
+    def inference_sft(self, text, speaker_id, stream=False):
+        for _ in range(self._chunks):
+            yield {"tts_speech": _Speech(np.zeros(4, dtype=np.float32))}
+        raise RuntimeError("model crashed")
+
+
+class _TruncatingEngine:
+    """Streams one chunk of ``text`` and then fails."""
+
+    async def synthesize_stream(self, text, speaker_id="default", emotion=None, chunk_ms=100):
+        yield next(split_audio(_placeholder_tone(text), PLACEHOLDER_SAMPLE_RATE, chunk_ms))
+        raise RuntimeError("worker died")
+
 
 class TestTTSRouter:
     @pytest.mark.asyncio
@@ -59,6 +140,55 @@ class TestTTSRouter:
         assert result2 is not None
         assert result2.exists()
 
+    @pytest.mark.asyncio
+    async def test_stream_fills_cache_then_replays_it(self, tmp_path: Path):
+        engine = CosyVoiceEngine()
+        await engine.initialize()
+        router = TTSRouter(cache_dir=tmp_path / "cache")
+        router.set_engine(engine)
+
+        first = [c async for c in router.synthesize_stream("テスト", chunk_ms=50)]
+        assert len(list((tmp_path / "cache").glob("*.wav"))) == 1
+
+        engine.synthesize_stream = None  # a hit must not reach the engine
+        second = [c async for c in router.synthesize_stream("テスト", chunk_ms=50)]
+        assert len(second) == len(first)
+        np.testing.assert_allclose(
+            np.concatenate([c.samples for c in second]),
+            np.concatenate([c.samples for c in first]),
+            atol=1e-4,
+        )
+
+    @pytest.mark.asyncio
+    async def test_truncated_stream_is_not_cached(self, tmp_path: Path):
+        router = TTSRouter(cache_dir=tmp_path / "cache")
+        router.set_engine(_TruncatingEngine())
+        chunks = []
+        with pytest.raises(RuntimeError):
+            async for chunk in router.synthesize_stream("テスト", chunk_ms=50):
+                chunks.append(chunk)
+        assert len(chunks) == 1
+        assert not router.is_cached("テスト")
+
+    @pytest.mark.asyncio
+    async def test_synthesized_file_is_moved_not_copied(self, tmp_path: Path):
+        engine = CosyVoiceEngine()
+        await engine.initialize()
+        produced = []
+        original = engine.synthesize
+
+        async def synthesize(*args):
+            produced.append(await original(*args))
+            return produced[-1]
+
+        engine.synthesize = synthesize
+        router = TTSRouter(cache_dir=tmp_path / "cache")
+        router.set_engine(engine)
+
+        result = await router.synthesize("テスト")
+        assert result.parent == tmp_path / "cache"
+        assert not produced[0].exists()
+
     @pytest.mark.asyncio
     async def test_no_engine(self, tmp_path: Path):
         router = TTSRouter(cache_dir=tmp_path / "cache")
@@ -66,6 +196,314 @@ class TestTTSRouter:
         assert result is None
 
 
+class _SlowEngine:
+    """Writes a short WAV per text after ``delay_s``, recording each call.
+
+    Streams the same audio in ``steps`` chunks spread over ``delay_s``.
+    """
+
+    def __init__(self, tmp_path: Path, delay_s: float = 0.02, steps: int = 4):
+        self.calls = []
+        self.chunks = 0  # streamed chunks produced
+        self._tmp = tmp_path
+        self._delay = delay_s
+        self._steps = steps
+
+    async def synthesize(self, text, speaker_id="default", emotion=None):
+        import asyncio
+
+        self.calls.append(text)
+        await asyncio.sleep(self._delay)
+        path = self._tmp / f"{len(self.calls)}.wav"
+        sf.write(str(path), np.zeros(240, dtype=np.float32), 24000)
+        return path
+
+    async def synthesize_stream(self, text, speaker_id="default", emotion=None, chunk_ms=100):
+        import asyncio
+
+        self.calls.append(text)
+        for _ in range(self._steps):
+            await asyncio.sleep(self._delay / self._steps)
+            self.chunks += 1
+            yield AudioChunk(np.zeros(240 // self._steps, dtype=np.float32), 24000)
+
+
+def _displayed(request_id, *texts, stage=None):
+    from voicereach.models.events import Candidate, CandidateSet, GenerationStage, IntentAxis
+
+    stage = GenerationStage.CLOUD if stage is None else stage
+    return CandidateSet(
+        candidates=[
+            Candidate(text=t, intent_axis=IntentAxis.QUESTION, confidence=c,
+                      generation_stage=stage, latency_ms=0)
+            for t, c in texts
+        ],
+        stage=stage,
+        request_id=request_id,
+    )
+
+
+class TestPreSynthesizer:
+    @pytest.fixture
+    def router(self, tmp_path: Path):
+        router = TTSRouter(cache_dir=tmp_path / "cache")
+        router.set_engine(_SlowEngine(tmp_path))
+        return router
+
+    @pytest.mark.asyncio
+    async def test_displayed_candidates_are_cached_by_confidence(self, router):
+        import asyncio
+
+        from voicereach.engine.tts.presynth import PreSynthesizer
+
+        presynth = PreSynthesizer(router)
+        presynth.schedule(_displayed("r1", ("うん", 0.5), ("ありがとう", 0.9), ("いいえ", 0.7)))
+        await asyncio.sleep(0.2)
+        assert router._engine.calls == ["ありがとう", "いいえ", "うん"]
+        assert all(router.is_cached(t) for t in ("うん", "ありがとう", "いいえ"))
+
+        presynth.selected("うん")
+        assert await router.synthesize("うん") is not None
+        assert len(router._engine.calls) == 3
+        assert presynth.stats.ready == 1
+        assert presynth.stats.synthesized == 3
+
+    @pytest.mark.asyncio
+    async def test_gazed_candidate_goes_first(self, router):
+        from voicereach.engine.tts.presynth import PreSynthesizer
+
+        presynth = PreSynthesizer(router)
+        presynth.schedule(_displayed("r1", ("A", 0.9), ("B", 0.8), ("C", 0.7), ("D", 0.6)))
+        assert presynth.pending == ["A", "B", "C", "D"]
+        presynth.note_gaze(3)
+        assert presynth.pending == ["D", "A", "B", "C"]
+        presynth.cancel_all()
+
+    @pytest.mark.asyncio
+    async def test_superseded_set_cancels_stale_work(self, router):
+        import asyncio
+
+        from voicereach.engine.tts.presynth import PreSynthesizer
+
+        router._engine._delay = 0.1
+        presynth = PreSynthesizer(router)
+        presynth.schedule(_displayed("r1", ("A", 0.9), ("B", 0.8)))
+        await asyncio.sleep(0.01)
+        presynth.schedule(_displayed("r2", ("B", 0.9), ("C", 0.8)))
+        await asyncio.sleep(0.5)
+
+        assert presynth.stats.cancelled == 1
+        assert not router.is_cached("A")
+        assert router.is_cached("B") and router.is_cached("C")
+
+    @pytest.mark.asyncio
+    async def test_each_stage_gets_a_fresh_budget(self, router):
+        import asyncio
+
+        from voicereach.engine.tts.presynth import PreSynthesizer
+        from voicereach.models.events import GenerationStage
+
+        router._engine._delay = 0.05
+        presynth = PreSynthesizer(router, max_per_set=2)
+        presynth.schedule(_displayed("r1", ("A", 0.9), stage=GenerationStage.LOCAL_FAST))
+        await asyncio.sleep(0.01)
+        presynth.schedule(_displayed("r1", ("B", 0.9), stage=GenerationStage.LOCAL_QUALITY))
+        await asyncio.sleep(0.01)
+        # Same request: the superseded stages' cancelled syntheses do not
+        # use up the final set's budget
+        presynth.schedule(_displayed("r1", ("C", 0.9), ("D", 0.8)))
+        await asyncio.sleep(0.3)
+
+        assert presynth.stats.cancelled == 2
+        assert router.is_cached("C") and router.is_cached("D")
+
+    @pytest.mark.asyncio
+    async def test_selection_joins_inflight_synthesis(self, router):
+        import asyncio
+
+        from voicereach.engine.tts.presynth import PreSynthesizer
+
+        router._engine._delay = 0.05
+        presynth = PreSynthesizer(router, max_per_set=1)
+        presynth.schedule(_displayed("r1", ("A", 0.9), ("B", 0.8)))
+        await asyncio.sleep(0.01)
+        presynth.selected("A")
+        assert await router.synthesize("A") is not None
+        await asyncio.sleep(0.1)
+        assert router._engine.calls == ["A"]  # joined, and "B" is beyond the budget
+        assert presynth.stats.ready == 1
+
+    @pytest.mark.asyncio
+    async def test_selection_stops_speculative_synthesis_between_chunks(self, router):
+        import asyncio
+
+        from voicereach.engine.tts.presynth import PreSynthesizer
+
+        router._engine._delay = 0.4  # four chunks, 0.1 s each
+        presynth = PreSynthesizer(router)
+        presynth.schedule(_displayed("r1", ("A", 0.9), ("B", 0.8)))
+        await asyncio.sleep(0.15)
+        presynth.selected("B")
+        await asyncio.sleep(0.2)
+
+        assert router._engine.chunks == 1  # "A" stopped after its first chunk
+        assert not router.is_cached("A")
+        assert presynth.stats.cancelled == 1
+
+
+def _wav(path: Path, seconds: float = 0.1) -> Path:
+    sf.write(str(path), np.zeros(int(24000 * seconds), dtype=np.float32), 24000)
+    return path
+
+
+class TestAudioCache:
+    def test_lru_eviction_by_entry_count(self, tmp_path: Path):
+        cache = AudioCache(tmp_path / "c", max_entries=2)
+        for key in ("a", "b"):
+            cache.put_file(key, _wav(tmp_path / f"{key}.wav"))
+        assert cache.get_path("a") is not None  # "b" is now least recently used
+        cache.put_file("c", _wav(tmp_path / "c.wav"))
+        assert "b" not in cache
+        assert not (tmp_path / "c" / "b.wav").exists()
+        assert cache.stats.evictions == 1
+
+    def test_lfu_eviction_by_size(self, tmp_path: Path):
+        one = _wav(tmp_path / "one.wav").stat().st_size
+        cache = AudioCache(tmp_path / "c", max_bytes=2 * one, eviction="lfu")
+        cache.put_file("a", _wav(tmp_path / "a.wav"))
+        cache.put_file("b", _wav(tmp_path / "b.wav"))
+        for _ in range(3):
+            cache.get_path("a")
+        cache.get_path("b")
+        cache.put_file("c", _wav(tmp_path / "c.wav"))
+        assert "a" in cache and "c" in cache and "b" not in cache
+        assert cache.total_bytes <= 2 * one
+
+    def test_frequent_entries_are_served_from_memory(self, tmp_path: Path):
+        cache = AudioCache(tmp_path / "c", hot_entries=1, hot_min_hits=2)
+        cache.put_samples("hai", np.full(100, 0.25, dtype=np.float32), 24000)
+        cache.get_samples("hai")
+        cache.get_samples("hai")  # promoted
+        (tmp_path / "c" / "hai.wav").unlink()
+        samples, sr = cache.get_samples("hai")
+        assert sr == 24000
+        assert samples[0] == pytest.approx(0.25, abs=1e-4)
+        assert cache.stats.hot_hits == 1
+
+    def test_index_survives_restart_and_adopts_unknown_files(self, tmp_path: Path):
+        cache = AudioCache(tmp_path / "c")
+        cache.put_file("a", _wav(tmp_path / "a.wav"))
+        cache.get_path("a")
+        cache.save_index()
+        _wav(tmp_path / "c" / "legacy.wav")
+
+        reopened = AudioCache(tmp_path / "c")
+        assert len(reopened) == 2
+        assert reopened._entries["a"].hits == 1
+        assert reopened.total_bytes == sum(
+            p.stat().st_size for p in (tmp_path / "c").glob("*.wav")
+        )
+
+    def test_unknown_eviction_policy(self, tmp_path: Path):
+        with pytest.raises(ValueError, match="eviction"):
+            AudioCache(tmp_path / "c", eviction="fifo")
+
+
+class _RecordingEngine(CosyVoiceEngine):
+    """Placeholder engine recording the texts it synthesizes."""
+
+    def __init__(self):
+        super().__init__(model_dir="/nonexistent")
+        self.calls = []
+
+    async def synthesize(self, text, speaker_id="default", emotion=None):
+        self.calls.append(text)
+        return await super().synthesize(text, speaker_id, emotion)
+
+    async def synthesize_stream(self, text, speaker_id="default", emotion=None, chunk_ms=100):
+        self.calls.append(text)
+        async for chunk in super().synthesize_stream(text, speaker_id, emotion, chunk_ms):
+            yield chunk
+
+
+class TestPhraseSegments:
+    def test_split_at_prosodic_boundaries(self):
+        text = "すみません、窓を開けてください。お願いします！ はい"
+        phrases = split_phrases(text)
+        assert phrases == ["すみません、", "窓を開けてください。", "お願いします！ ", "はい"]
+        assert "".join(phrases) == text
+        assert split_phrases("はい") == ["はい"]
+
+    def test_stitcher_crossfades_joins_only(self):
+        stitcher = PhraseStitcher(1000, crossfade_ms=10)
+        out = [stitcher.feed(np.ones(50, dtype=np.float32), 1000)]
+        out.append(stitcher.feed(np.ones(30, dtype=np.float32), 1000))  # same piece
+        stitcher.begin_piece()
+        out.append(stitcher.feed(np.full(40, -1.0, dtype=np.float32), 1000))
+        out.append(stitcher.finish())
+        audio = np.concatenate(out)
+        assert len(audio) == 50 + 30 + 40 - 10
+        np.testing.assert_array_equal(audio[:70], 1.0)
+        assert np.all(np.diff(audio[70:80]) < 0)  # smooth ramp, no step
+        np.testing.assert_array_equal(audio[80:], -1.0)
+
+    def test_plan_merges_novel_runs(self, tmp_path: Path):
+        segments = SegmentCache(tmp_path / "seg")
+        segments.put("k1", np.zeros(10, dtype=np.float32), 24000)
+        phrases, keys = ["すみません、", "水を", "ください。", "お願い"], ["k1", "k2", "k3", "k4"]
+        assert segments.plan(phrases, keys) == [
+            ("すみません、", "k1"), ("水をください。お願い", None)
+        ]
+        assert segments.plan(["水を"], ["k2"]) is None
+
+    def test_phrases_become_due_after_min_count(self, tmp_path: Path):
+        segments = SegmentCache(tmp_path / "seg", min_count=2)
+        phrases, keys = ["すみません、", "あ、", "水"], ["k1", "k2", "k3"]
+        assert segments.observe(phrases, keys) == []
+        assert segments.observe(phrases, keys) == [("すみません、", "k1")]  # "あ、" too short
+        assert segments.observe(["すみません、"], ["k1"]) == []  # whole utterance
+        segments.save()
+        assert SegmentCache(tmp_path / "seg")._counts["k1"] == 2
+
+    @pytest.mark.asyncio
+    async def test_router_synthesizes_only_the_novel_phrase(self, tmp_path: Path):
+        import asyncio
+
+        router = TTSRouter(cache_dir=tmp_path / "cache")
+        engine = _RecordingEngine()
+        router.set_engine(engine)
+        await router.synthesize("すみません、水をください")
+        await router.synthesize("すみません、窓を開けて")
+        await asyncio.gather(*router._learning)
+        assert engine.calls[-1] == "すみません、"  # learned as a segment
+
+        engine.calls.clear()
+        chunks = [c async for c in router.synthesize_stream("すみません、テレビをつけて")]
+        assert engine.calls == ["テレビをつけて"]
+        audio = np.concatenate([c.samples for c in chunks])
+        fade = PLACEHOLDER_SAMPLE_RATE * 20 // 1000
+        expected = len(_placeholder_tone("すみません、")) + len(_placeholder_tone("テレビをつけて"))
+        assert len(audio) == expected - fade
+        stats = router.segment_stats
+        assert stats.stitched == 1
+        assert 0.0 < stats.segment_ratio < 1.0
+
+        # The stitched utterance itself is cached whole
+        engine.calls.clear()
+        assert await router.synthesize("すみません、テレビをつけて") is not None
+        assert engine.calls == []
+
+
+class TestPcmFrames:
+    def test_round_trip(self):
+        samples = np.array([0.0, 0.5, -0.5, 1.0, -1.5], dtype=np.float32)
+        frame = encode_pcm_frame(7, 3, samples)
+        assert len(frame) == 8 + 2 * len(samples)
+        stream_id, seq, decoded = decode_pcm_frame(frame)
+        assert (stream_id, seq) == (7, 3)
+        np.testing.assert_allclose(decoded, np.clip(samples, -1, 1), atol=1e-4)
+
+
 class TestAudioPostprocess:
     def test_normalize_loudness(self, tmp_path: Path):
         sr = 24000
@@ -0,0 +1,124 @@
+"""Tests for the out-of-process TTS worker.
+
+These spawn a real worker process (placeholder tone, no CosyVoice model)
+and compare its audio with the inline engine's.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing as mp
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from voicereach.engine.tts.cosyvoice import PLACEHOLDER_SAMPLE_RATE, _placeholder_tone
+from voicereach.engine.tts.router import TTSRouter
+from voicereach.engine.tts.tts_worker import TTSWorker, _RequestQueue
+
+NO_MODEL = "/nonexistent/cosyvoice"
+
+
+@pytest.fixture
+def worker():
+    w = TTSWorker(model_dir=NO_MODEL, warmup_texts=["はい"], response_timeout_s=10.0)
+    w.start()
+    yield w
+    w.stop()
+
+
+class TestRequestQueue:
+    def test_cancel_drops_queued_request_and_flags_current(self):
+        parent, child = mp.Pipe()
+        queue = _RequestQueue(child)
+        parent.send(("synthesize", 1, "a", "default", None))
+        parent.send(("synthesize", 2, "b", "default", None))
+        parent.send(("cancel", 2))
+        queue.receive(block=True)
+        assert [r[1] for r in queue.requests] == [1]
+
+        queue.current = queue.requests.popleft()[1]
+        parent.send(("cancel", 1))
+        parent.send(("stop", 0))
+        queue.receive(block=False)
+        assert queue.current_cancelled
+        assert queue.stopping
+
+
+class TestTTSWorker:
+    def test_reports_warmup_and_placeholder(self, worker):
+        assert worker.running
+        assert not worker.is_available
+        assert worker.stats.warmup_ms > 0
+        health = worker.health()
+        assert health["execution"] == "process"
+        assert health["running"] and not health["model_loaded"]
+
+    @pytest.mark.asyncio
+    async def test_synthesize_matches_inline_engine(self, worker):
+        path = await worker.synthesize("こんにちは")
+        samples, sr = sf.read(str(path), dtype="float32")
+        path.unlink()
+        assert sr == PLACEHOLDER_SAMPLE_RATE
+        np.testing.assert_allclose(samples, _placeholder_tone("こんにちは"), atol=1e-4)
+        assert worker.stats.completed == 1
+        assert len(worker.stats.total) == 1
+        assert worker.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_all_chunks(self, worker):
+        chunks = [c async for c in worker.synthesize_stream("はい", chunk_ms=100)]
+        expected = _placeholder_tone("はい")
+        assert len(chunks) == -(-len(expected) // (PLACEHOLDER_SAMPLE_RATE // 10))
+        np.testing.assert_allclose(np.concatenate([c.samples for c in chunks]), expected)
+        assert len(worker.stats.first_chunk) == 1
+
+    @pytest.mark.asyncio
+    async def test_closing_stream_cancels_request(self, worker):
+        stream = worker.synthesize_stream("少し喉が渇きました", chunk_ms=20)
+        first = await stream.__anext__()
+        assert len(first.samples) == PLACEHOLDER_SAMPLE_RATE // 50
+        await stream.aclose()
+        assert worker.stats.cancelled == 1
+        assert worker.in_flight == 0
+
+        # The worker keeps serving after the cancellation
+        path = await worker.synthesize("はい")
+        assert path is not None and path.exists()
+        path.unlink()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_task_cancels_request(self, worker):
+        task = asyncio.create_task(worker.synthesize("ありがとうございます"))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert worker.stats.cancelled == 1
+        assert worker.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_cut_short_by_dead_worker_raises(self, worker):
+        stream = worker.synthesize_stream("少し喉が渇きました", chunk_ms=20)
+        await stream.__anext__()
+        worker._process.kill()
+        with pytest.raises(RuntimeError):
+            async for _ in stream:
+                pass
+        assert worker.stats.failures == 1
+
+    @pytest.mark.asyncio
+    async def test_router_caches_worker_output(self, worker, tmp_path):
+        router = TTSRouter(cache_dir=tmp_path)
+        router.set_engine(worker)
+        path = await router.synthesize("はい")
+        assert path.parent == tmp_path
+        assert router.is_cached("はい")
+
+    @pytest.mark.asyncio
+    async def test_dead_worker_refuses_requests(self, worker):
+        worker._process.kill()
+        worker._process.join()
+        with pytest.raises(RuntimeError):
+            await worker.synthesize("はい")
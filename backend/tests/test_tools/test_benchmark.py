@@ -1,14 +1,15 @@
 """Tests for the VoiceReach benchmark suite.
 
 All tests run WITHOUT cameras, LLM servers, or ML models.
-They validate dataclass construction, CLI parsing, and the TTS
-benchmark using the placeholder engine.
+They validate dataclass construction, CLI parsing, the TTS
+benchmark using the placeholder engine, and gaze trace record/replay.
 """
 
 from __future__ import annotations
 
 import argparse
 
+import numpy as np
 import pytest
 
 from voicereach.tools.benchmark.gaze_bench import GazeBenchResult
@@ -242,3 +243,117 @@ class TestPipelineBenchmarkIntegration:
         assert "ial_dispatch" in result.components
         assert "llm_generation" in result.components
         assert "tts_synthesis" in result.components
+
+
+def _face_data(seed: int):
+    from voicereach.engine.gaze.mediapipe_tracker import FaceData
+
+    rng = np.random.default_rng(seed)
+    landmarks = rng.uniform(100, 500, (478, 3)).astype(np.float32)
+    return FaceData(
+        landmarks=landmarks,
+        left_eye_patch=rng.uniform(0, 1, (64, 64)).astype(np.float32),
+        right_eye_patch=rng.uniform(0, 1, (64, 64)).astype(np.float32),
+        left_iris=landmarks[468, :2].copy(),
+        right_iris=landmarks[473, :2].copy(),
+        head_pose=rng.normal(0, 5, 3).astype(np.float32),
+        face_bbox=(100, 120, 300, 320),
+        confidence=1.0,
+    )
+
+
+def _write_trace(path, frames: int = 60):
+    from voicereach.tools.benchmark.gaze_trace import GazeTraceWriter
+
+    with GazeTraceWriter(path) as writer:
+        for i in range(frames):
+            writer.append(i / 30.0, None if i % 10 == 5 else _face_data(i))
+
+
+class TestGazeTrace:
+    def test_roundtrip(self, tmp_path):
+        from voicereach.tools.benchmark.gaze_trace import GazeTrace
+
+        _write_trace(tmp_path / "trace", frames=20)
+        trace = GazeTrace(tmp_path / "trace")
+        assert len(trace) == 20
+        assert trace.duration_s == pytest.approx(19 / 30.0)
+        assert isinstance(trace.columns["landmarks"], np.memmap)
+
+        original = _face_data(3)
+        fd = trace.face_data(3)
+        np.testing.assert_array_equal(fd.landmarks, original.landmarks)
+        np.testing.assert_array_equal(fd.head_pose, original.head_pose)
+        assert fd.face_bbox == original.face_bbox
+        # Patches are stored as uint8
+        assert np.abs(fd.left_eye_patch - original.left_eye_patch).max() <= 0.5 / 255 + 1e-6
+
+    def test_frames_without_face(self, tmp_path):
+        from voicereach.tools.benchmark.gaze_trace import GazeTrace
+
+        _write_trace(tmp_path / "trace", frames=20)
+        trace = GazeTrace(tmp_path / "trace")
+        assert trace.face_data(5) is None
+        assert trace.present.sum() == 18
+        assert [fd is None for _, fd in trace].count(True) == 2
+
+    def test_missing_trace(self, tmp_path):
+        from voicereach.tools.benchmark.gaze_trace import GazeTrace
+
+        with pytest.raises(FileNotFoundError):
+            GazeTrace(tmp_path / "nope")
+
+
+class TestGazeReplay:
+    def test_replay_reports_throughput_and_decisions(self, tmp_path):
+        from voicereach.tools.benchmark.gaze_replay import NO_ZONE, replay_trace
+
+        _write_trace(tmp_path / "trace")
+        result = replay_trace(tmp_path / "trace")
+        assert result.frames == 60
+        assert result.faces == 54
+        assert result.fps > 0
+        assert result.latency_p50_ms <= result.latency_p99_ms
+        assert (result.zone_ids == NO_ZONE).sum() == 6
+
+    def test_replay_is_deterministic(self, tmp_path):
+        from voicereach.tools.benchmark.gaze_replay import compare_decisions, replay_trace
+
+        _write_trace(tmp_path / "trace")
+        first = replay_trace(tmp_path / "trace")
+        first.save_decisions(tmp_path / "baseline.npy")
+        diff = compare_decisions(tmp_path / "baseline.npy", replay_trace(tmp_path / "trace"))
+        assert diff.changed == 0
+        assert diff.changed_ratio == 0.0
+
+    def test_compare_detects_changes(self):
+        from voicereach.tools.benchmark.gaze_replay import compare_decisions
+
+        diff = compare_decisions(np.array([0, 1, 2, -1]), np.array([0, 2, 2, -1]))
+        assert diff.changed == 1
+        assert diff.changed_indices.tolist() == [1]
+        with pytest.raises(ValueError):
+            compare_decisions(np.zeros(3), np.zeros(4))
+
+    def test_cli_skips_mismatched_baseline(self, tmp_path, capsys):
+        from voicereach.tools.benchmark.cli import _run_replay
+
+        _write_trace(tmp_path / "trace")
+        np.save(tmp_path / "baseline.npy", np.zeros(3, dtype=np.int16))
+        args = build_parser().parse_args(
+            ["replay", str(tmp_path / "trace"), "--baseline", str(tmp_path / "baseline.npy")]
+        )
+        summary = _run_replay(args)
+        assert "zone_changes" not in summary
+        assert "[SKIP] Baseline comparison" in capsys.readouterr().err
+
+    def test_cli_parser(self):
+        parser = build_parser()
+        args = parser.parse_args(["replay", "trace", "--baseline", "b.npy"])
+        assert args.command == "replay"
+        assert args.trace == "trace"
+        assert args.baseline == "b.npy"
+        assert args.save is None
+        args = parser.parse_args(["record-trace", "out", "--duration", "5"])
+        assert args.output == "out"
+        assert args.duration == 5.0
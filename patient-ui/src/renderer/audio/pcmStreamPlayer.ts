@@ -0,0 +1,67 @@
+// Gapless playback of streamed TTS audio.
+//
+// The backend announces a stream with a tts_stream_start message and then
+// sends binary frames: uint32 LE stream_id, uint32 LE seq, PCM s16le mono.
+// Each chunk is scheduled right after the previous one as soon as it
+// arrives, so playback starts on the first chunk.
+
+const FRAME_HEADER_BYTES = 8;
+const START_DELAY_S = 0.02; // scheduling headroom for the first chunk
+
+interface ActiveStream {
+  id: number;
+  sampleRate: number;
+  nextStartTime: number;
+  sources: AudioBufferSourceNode[];
+}
+
+export class PcmStreamPlayer {
+  private context: AudioContext | null = null;
+  private stream: ActiveStream | null = null;
+
+  /** Begin a new stream; a stream still playing is stopped. */
+  start(streamId: number, sampleRate: number): void {
+    this.stop();
+    this.context ??= new AudioContext();
+    void this.context.resume();
+    this.stream = {
+      id: streamId,
+      sampleRate,
+      nextStartTime: this.context.currentTime + START_DELAY_S,
+      sources: [],
+    };
+  }
+
+  /** Schedule one binary frame; frames of other streams are ignored. */
+  push(frame: ArrayBuffer): void {
+    const stream = this.stream;
+    if (!this.context || !stream || frame.byteLength <= FRAME_HEADER_BYTES) return;
+    const view = new DataView(frame);
+    if (view.getUint32(0, true) !== stream.id) return;
+
+    const pcm = new Int16Array(frame, FRAME_HEADER_BYTES);
+    const buffer = this.context.createBuffer(1, pcm.length, stream.sampleRate);
+    const samples = buffer.getChannelData(0);
+    for (let i = 0; i < pcm.length; i++) samples[i] = pcm[i] / 32767;
+
+    const source = this.context.createBufferSource();
+    source.buffer = buffer;
+    source.connect(this.context.destination);
+    // A chunk that arrives late starts now rather than in the past
+    const startAt = Math.max(stream.nextStartTime, this.context.currentTime);
+    source.start(startAt);
+    stream.nextStartTime = startAt + buffer.duration;
+    stream.sources.push(source);
+    source.onended = () => {
+      stream.sources = stream.sources.filter((s) => s !== source);
+    };
+  }
+
+  /** Stop the current stream immediately. */
+  stop(): void {
+    for (const source of this.stream?.sources ?? []) {
+      source.stop();
+    }
+    this.stream = null;
+  }
+}
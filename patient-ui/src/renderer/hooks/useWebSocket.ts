@@ -1,5 +1,6 @@
 import { useEffect, useRef, useCallback } from "react";
 import { useAppStore } from "../stores/appStore";
+import { PcmStreamPlayer } from "../audio/pcmStreamPlayer";
 
 const WS_URL = "ws://127.0.0.1:8765/ws/patient";
 const RECONNECT_DELAY_MS = 3000;
@@ -14,6 +15,7 @@ export function useWebSocket() {
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectAttempts = useRef(0);
   const reconnectTimer = useRef<ReturnType<typeof setTimeout> | undefined>(undefined);
+  const player = useRef(new PcmStreamPlayer());
 
   const setConnectionStatus = useAppStore((s) => s.setConnectionStatus);
   const setCandidates = useAppStore((s) => s.setCandidates);
@@ -24,6 +26,7 @@ export function useWebSocket() {
 
     setConnectionStatus("reconnecting");
     const ws = new WebSocket(WS_URL);
+    ws.binaryType = "arraybuffer";
 
     ws.onopen = () => {
       setConnectionStatus("connected");
@@ -41,6 +44,11 @@ export function useWebSocket() {
     };
 
     ws.onmessage = (event) => {
+      if (event.data instanceof ArrayBuffer) {
+        // Streamed TTS audio chunk
+        player.current.push(event.data);
+        return;
+      }
       try {
         const msg = JSON.parse(event.data) as ServerMessage;
         handleMessage(msg);
@@ -92,6 +100,10 @@ export function useWebSocket() {
           audio.play().catch(console.error);
           break;
         }
+        case "tts_stream_start": {
+          player.current.start(msg.stream_id as number, msg.sample_rate as number);
+          break;
+        }
         case "emergency_ack": {
           // Return to candidate mode after emergency is acknowledged
           setTimeout(() => setInputMode("candidate"), 5000);
@@ -29,7 +29,7 @@ export type IntentAxis =
   | "humor"
   | "topic_change";
 
-export type GenerationStage = 1 | 2 | 3;
+export type GenerationStage = 0 | 1 | 2 | 3;
 
 export interface Candidate {
   text: string;
@@ -45,6 +45,7 @@ export interface CandidateSet {
   request_id: string;
   timestamp_ms: number;
   is_final: boolean;
+  is_partial: boolean; // stage still streaming; more candidates may follow
 }
 
 // --- WebSocket Messages ---
@@ -85,6 +86,21 @@ export interface TTSReadyMessage {
   duration_ms: number;
 }
 
+// Followed by binary frames: uint32 LE stream_id, uint32 LE seq, PCM s16le mono
+export interface TTSStreamStartMessage {
+  type: "tts_stream_start";
+  stream_id: number;
+  text: string;
+  sample_rate: number;
+  encoding: "pcm_s16le";
+}
+
+export interface TTSStreamEndMessage {
+  type: "tts_stream_end";
+  stream_id: number;
+  duration_ms: number;
+}
+
 export interface EmergencyAckMessage {
   type: "emergency_ack";
   notified_caregivers: string[];
@@ -98,6 +114,8 @@ export interface ErrorMessage {
 export type ServerMessage =
   | CandidateUpdateMessage
   | TTSReadyMessage
+  | TTSStreamStartMessage
+  | TTSStreamEndMessage
   | EmergencyAckMessage
   | ErrorMessage;
 